@@ -16,6 +16,11 @@ from app.core.database import Base
 from app.models.user import User
 from app.models.chat import Chat
 from app.models.message import Message
+from app.models.chat_summary import ChatSummary
+from app.models.chat_archive import ChatArchive, ChatArchiveSearch
+from app.models.user_stats import UserStats
+from app.models.chat_stats import ChatStats
+from app.models.idempotency_key import IdempotencyKey
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
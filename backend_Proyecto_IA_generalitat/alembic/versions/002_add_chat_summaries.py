@@ -0,0 +1,35 @@
+"""add chat_resumenes table for rolling conversation summaries
+
+Revision ID: 002_add_chat_summaries
+Revises: 001_add_chat_status
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '002_add_chat_summaries'
+down_revision: Union[str, None] = '001_add_chat_status'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create chat_resumenes table (one rolling summary per chat)"""
+    op.create_table(
+        'chat_resumenes',
+        sa.Column('id_chat', sa.Integer, sa.ForeignKey('chats.id_chat', ondelete='CASCADE'), primary_key=True),
+        sa.Column('contenido', sa.Text, nullable=False),
+        sa.Column('id_ultimo_mensaje', sa.Integer, nullable=False),
+        sa.Column('mensajes_resumidos', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Drop chat_resumenes table"""
+    op.drop_table('chat_resumenes')
@@ -0,0 +1,60 @@
+"""add ON DELETE CASCADE foreign keys and chats.deleted_at
+
+Revision ID: 003_chat_cascade_soft_delete
+Revises: 002_add_chat_summaries
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '003_chat_cascade_soft_delete'
+down_revision: Union[str, None] = '002_add_chat_summaries'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, column, referred table, referred column, constraint name used by db/init.sql)
+CASCADE_FOREIGN_KEYS = [
+    ('chats', 'id_usuario', 'users', 'id_usuario', 'fk_chats_usuario'),
+    ('mensajes', 'id_chat', 'chats', 'id_chat', 'fk_mensajes_chat'),
+]
+
+
+def _recreate_foreign_key(table, column, referred_table, referred_column, name, ondelete):
+    """Replace the foreign key on ``table.column`` with one using the given ON DELETE rule"""
+    inspector = sa.inspect(op.get_bind())
+    existing = [
+        fk for fk in inspector.get_foreign_keys(table)
+        if fk['constrained_columns'] == [column] and fk['referred_table'] == referred_table
+    ]
+    if any((fk.get('options') or {}).get('ondelete', '').upper() == (ondelete or '') for fk in existing):
+        return
+
+    with op.batch_alter_table(table) as batch_op:
+        for fk in existing:
+            if fk.get('name'):
+                batch_op.drop_constraint(fk['name'], type_='foreignkey')
+        batch_op.create_foreign_key(name, referred_table, [column], [referred_column], ondelete=ondelete)
+
+
+def upgrade() -> None:
+    """Let the database cascade chat/message deletes and add soft delete to chats"""
+    for table, column, referred_table, referred_column, name in CASCADE_FOREIGN_KEYS:
+        _recreate_foreign_key(table, column, referred_table, referred_column, name, 'CASCADE')
+
+    op.add_column('chats', sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_index('ix_chats_deleted_at', 'chats', ['deleted_at'])
+
+
+def downgrade() -> None:
+    """Remove soft delete and restore plain foreign keys"""
+    op.drop_index('ix_chats_deleted_at', table_name='chats')
+    op.drop_column('chats', 'deleted_at')
+
+    for table, column, referred_table, referred_column, name in CASCADE_FOREIGN_KEYS:
+        _recreate_foreign_key(table, column, referred_table, referred_column, name, None)
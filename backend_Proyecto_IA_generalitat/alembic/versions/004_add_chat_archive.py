@@ -0,0 +1,36 @@
+"""add chat_archivos table and chats.archived_at for cold storage of old interviews
+
+Revision ID: 004_add_chat_archive
+Revises: 003_chat_cascade_soft_delete
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '004_add_chat_archive'
+down_revision: Union[str, None] = '003_chat_cascade_soft_delete'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create chat_archivos table (one compressed transcript per chat) and chats.archived_at"""
+    op.create_table(
+        'chat_archivos',
+        sa.Column('id_chat', sa.Integer, sa.ForeignKey('chats.id_chat', ondelete='CASCADE'), primary_key=True),
+        sa.Column('transcript', sa.LargeBinary(length=16 * 1024 * 1024), nullable=False),
+        sa.Column('mensajes', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    op.add_column('chats', sa.Column('archived_at', sa.DateTime, nullable=True))
+
+
+def downgrade() -> None:
+    """Drop chat_archivos table and chats.archived_at (archived messages are lost)"""
+    op.drop_column('chats', 'archived_at')
+    op.drop_table('chat_archivos')
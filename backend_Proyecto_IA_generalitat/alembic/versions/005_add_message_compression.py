@@ -0,0 +1,46 @@
+"""add formato and contenido_comprimido to mensajes for compressed message storage
+
+Revision ID: 005_add_message_compression
+Revises: 004_add_chat_archive
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '005_add_message_compression'
+down_revision: Union[str, None] = '004_add_chat_archive'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add storage format marker and compressed content columns (existing rows stay 'plain')"""
+    op.add_column('mensajes',
+        sa.Column('formato', sa.String(10), server_default='plain', nullable=False)
+    )
+    op.add_column('mensajes',
+        sa.Column('contenido_comprimido', sa.LargeBinary(length=16 * 1024 * 1024), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    """Decompress compressed rows back into contenido and drop the new columns"""
+    import zlib
+
+    bind = op.get_bind()
+    rows = bind.execute(sa.text(
+        "SELECT id_mensaje, contenido_comprimido FROM mensajes WHERE formato = 'zlib'"
+    )).fetchall()
+    for id_mensaje, compressed in rows:
+        bind.execute(
+            sa.text("UPDATE mensajes SET contenido = :contenido WHERE id_mensaje = :id"),
+            {"contenido": zlib.decompress(compressed).decode("utf-8"), "id": id_mensaje},
+        )
+
+    op.drop_column('mensajes', 'contenido_comprimido')
+    op.drop_column('mensajes', 'formato')
@@ -0,0 +1,80 @@
+"""add mensajes_busqueda full-text index table
+
+Revision ID: 006_add_message_search
+Revises: 005_add_message_compression
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from datetime import datetime
+from typing import Sequence, Union
+import json
+import zlib
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '006_add_message_search'
+down_revision: Union[str, None] = '005_add_message_compression'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SQLITE_FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS mensajes_busqueda_fts USING fts5("
+    "contenido, content='mensajes_busqueda', content_rowid='id_mensaje', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS mensajes_busqueda_ai AFTER INSERT ON mensajes_busqueda BEGIN "
+    "INSERT INTO mensajes_busqueda_fts(rowid, contenido) VALUES (new.id_mensaje, new.contenido); END",
+    "CREATE TRIGGER IF NOT EXISTS mensajes_busqueda_ad AFTER DELETE ON mensajes_busqueda BEGIN "
+    "INSERT INTO mensajes_busqueda_fts(mensajes_busqueda_fts, rowid, contenido) "
+    "VALUES ('delete', old.id_mensaje, old.contenido); END",
+]
+
+
+def upgrade() -> None:
+    """Create the search table and index every existing (plain, compressed and archived) message"""
+    bind = op.get_bind()
+    op.create_table(
+        'mensajes_busqueda',
+        sa.Column('id_mensaje', sa.Integer, primary_key=True, autoincrement=False),
+        sa.Column('id_chat', sa.Integer, sa.ForeignKey('chats.id_chat', ondelete='CASCADE'), nullable=False),
+        sa.Column('emisor', sa.Text(10), nullable=False),
+        sa.Column('contenido', sa.Text, nullable=False),
+        sa.Column('sent_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index('ix_mensajes_busqueda_id_chat', 'mensajes_busqueda', ['id_chat'])
+    if bind.dialect.name == 'mysql':
+        op.create_index('ft_mensajes_busqueda_contenido', 'mensajes_busqueda', ['contenido'], mysql_prefix='FULLTEXT')
+    elif bind.dialect.name == 'sqlite':
+        for statement in SQLITE_FTS_DDL:
+            op.execute(statement)
+
+    # Backfill: plain rows in one statement, compressed rows and archived transcripts in Python
+    op.execute(
+        "INSERT INTO mensajes_busqueda (id_mensaje, id_chat, emisor, contenido, sent_at) "
+        "SELECT id_mensaje, id_chat, emisor, contenido, sent_at FROM mensajes WHERE formato = 'plain'"
+    )
+    rows = []
+    for id_mensaje, id_chat, emisor, compressed, sent_at in bind.execute(sa.text(
+        "SELECT id_mensaje, id_chat, emisor, contenido_comprimido, sent_at FROM mensajes WHERE formato = 'zlib'"
+    )):
+        rows.append({'id_mensaje': id_mensaje, 'id_chat': id_chat, 'emisor': emisor,
+                     'contenido': zlib.decompress(compressed).decode('utf-8'), 'sent_at': sent_at})
+    for id_chat, transcript in bind.execute(sa.text("SELECT id_chat, transcript FROM chat_archivos")):
+        for id_mensaje, emisor, contenido, sent_at in json.loads(zlib.decompress(transcript).decode('utf-8')):
+            rows.append({'id_mensaje': id_mensaje, 'id_chat': id_chat, 'emisor': emisor, 'contenido': contenido,
+                         'sent_at': datetime.fromisoformat(sent_at) if sent_at else datetime.now()})
+    if rows:
+        bind.execute(sa.text(
+            "INSERT INTO mensajes_busqueda (id_mensaje, id_chat, emisor, contenido, sent_at) "
+            "VALUES (:id_mensaje, :id_chat, :emisor, :contenido, :sent_at)"
+        ), rows)
+
+
+def downgrade() -> None:
+    """Drop the search table (and the SQLite FTS5 index)"""
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute("DROP TABLE IF EXISTS mensajes_busqueda_fts")
+    op.drop_table('mensajes_busqueda')
@@ -0,0 +1,76 @@
+"""add user_stats and chat_stats tables
+
+Revision ID: 007_add_stats_tables
+Revises: 006_add_message_search
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+import json
+import zlib
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '007_add_stats_tables'
+down_revision: Union[str, None] = '006_add_message_search'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the stats tables and compute them once from the existing chats and messages"""
+    bind = op.get_bind()
+    op.create_table(
+        'chat_stats',
+        sa.Column('id_chat', sa.Integer, sa.ForeignKey('chats.id_chat', ondelete='CASCADE'), primary_key=True),
+        sa.Column('user_turns', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('ai_turns', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('employability_level', sa.String(20), nullable=True),
+        sa.Column('report_at', sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_table(
+        'user_stats',
+        sa.Column('id_usuario', sa.Integer, sa.ForeignKey('users.id_usuario', ondelete='CASCADE'), primary_key=True),
+        sa.Column('total_chats', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('completed_chats', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('completed_turns', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('last_employability_level', sa.String(20), nullable=True),
+        sa.Column('last_report_at', sa.DateTime(timezone=True), nullable=True),
+    )
+
+    # Backfill: turns of live messages in one statement, archived transcripts in Python
+    op.execute(
+        "INSERT INTO chat_stats (id_chat, user_turns, ai_turns) "
+        "SELECT c.id_chat, "
+        "COALESCE(SUM(CASE WHEN m.emisor = 'USER' THEN 1 ELSE 0 END), 0), "
+        "COALESCE(SUM(CASE WHEN m.emisor = 'IA' THEN 1 ELSE 0 END), 0) "
+        "FROM chats c LEFT JOIN mensajes m ON m.id_chat = c.id_chat GROUP BY c.id_chat"
+    )
+    archived = []
+    for id_chat, transcript in bind.execute(sa.text("SELECT id_chat, transcript FROM chat_archivos")):
+        rows = json.loads(zlib.decompress(transcript).decode('utf-8'))
+        user_turns = sum(1 for row in rows if row[1] == 'USER')
+        archived.append({'id_chat': id_chat, 'user_turns': user_turns, 'ai_turns': len(rows) - user_turns})
+    if archived:
+        bind.execute(sa.text(
+            "UPDATE chat_stats SET user_turns = user_turns + :user_turns, ai_turns = ai_turns + :ai_turns "
+            "WHERE id_chat = :id_chat"
+        ), archived)
+
+    op.execute(
+        "INSERT INTO user_stats (id_usuario, total_chats, completed_chats, completed_turns) "
+        "SELECT u.id_usuario, COUNT(c.id_chat), "
+        "COALESCE(SUM(CASE WHEN c.status = 'completed' THEN 1 ELSE 0 END), 0), "
+        "COALESCE(SUM(CASE WHEN c.status = 'completed' THEN s.user_turns ELSE 0 END), 0) "
+        "FROM users u LEFT JOIN chats c ON c.id_usuario = u.id_usuario "
+        "LEFT JOIN chat_stats s ON s.id_chat = c.id_chat GROUP BY u.id_usuario"
+    )
+
+
+def downgrade() -> None:
+    """Drop the stats tables"""
+    op.drop_table('user_stats')
+    op.drop_table('chat_stats')
@@ -0,0 +1,39 @@
+"""add interview profile and configuration step to chats
+
+Revision ID: 008_add_interview_profile
+Revises: 007_add_stats_tables
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '008_add_interview_profile'
+down_revision: Union[str, None] = '007_add_stats_tables'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add chats.config_step and the four profile columns"""
+    # Existing chats were configured by the agent: they must keep talking to it
+    op.add_column('chats', sa.Column('config_step', sa.String(20), server_default='done', nullable=False))
+    op.alter_column('chats', 'config_step', existing_type=sa.String(20), server_default='welcome', existing_nullable=False)
+
+    op.add_column('chats', sa.Column('rol_laboral', sa.String(20), nullable=True))
+    op.add_column('chats', sa.Column('nivel_academico', sa.String(50), nullable=True))
+    op.add_column('chats', sa.Column('ciclo_formativo', sa.String(150), nullable=True))
+    op.add_column('chats', sa.Column('duracion', sa.String(20), nullable=True))
+
+
+def downgrade() -> None:
+    """Drop the interview profile columns"""
+    op.drop_column('chats', 'duracion')
+    op.drop_column('chats', 'ciclo_formativo')
+    op.drop_column('chats', 'nivel_academico')
+    op.drop_column('chats', 'rol_laboral')
+    op.drop_column('chats', 'config_step')
@@ -0,0 +1,40 @@
+"""add idempotency_keys table
+
+Revision ID: 009_add_idempotency_keys
+Revises: 008_add_interview_profile
+Create Date: 2026-10-19 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '009_add_idempotency_keys'
+down_revision: Union[str, None] = '008_add_interview_profile'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the idempotency_keys table shared by every worker"""
+    op.create_table(
+        'idempotency_keys',
+        sa.Column('id', sa.Integer, primary_key=True, autoincrement=True),
+        sa.Column('id_usuario', sa.Integer, sa.ForeignKey('users.id_usuario', ondelete='CASCADE'), nullable=False),
+        sa.Column('route', sa.String(30), nullable=False),
+        sa.Column('idem_key', sa.String(255), nullable=False),
+        sa.Column('fingerprint', sa.String(64), nullable=False),
+        sa.Column('id_mensaje', sa.Integer, nullable=True),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.UniqueConstraint('id_usuario', 'route', 'idem_key', name='uq_idempotency_key'),
+    )
+    op.create_index('ix_idempotency_keys_expires_at', 'idempotency_keys', ['expires_at'])
+
+
+def downgrade() -> None:
+    """Drop the idempotency_keys table"""
+    op.drop_index('ix_idempotency_keys_expires_at', table_name='idempotency_keys')
+    op.drop_table('idempotency_keys')
@@ -0,0 +1,83 @@
+"""move the full-text index from mensajes_busqueda onto mensajes
+
+Revision ID: 010_search_on_messages
+Revises: 009_add_idempotency_keys
+Create Date: 2026-10-19 23:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '010_search_on_messages'
+down_revision: Union[str, None] = '009_add_idempotency_keys'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SQLITE_FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS mensajes_fts USING fts5("
+    "contenido, content='mensajes', content_rowid='id_mensaje', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS mensajes_fts_ai AFTER INSERT ON mensajes BEGIN "
+    "INSERT INTO mensajes_fts(rowid, contenido) VALUES (new.id_mensaje, new.contenido); END",
+    "CREATE TRIGGER IF NOT EXISTS mensajes_fts_ad AFTER DELETE ON mensajes BEGIN "
+    "INSERT INTO mensajes_fts(mensajes_fts, rowid, contenido) "
+    "VALUES ('delete', old.id_mensaje, old.contenido); END",
+    "CREATE TRIGGER IF NOT EXISTS mensajes_fts_au AFTER UPDATE OF contenido ON mensajes BEGIN "
+    "INSERT INTO mensajes_fts(mensajes_fts, rowid, contenido) "
+    "VALUES ('delete', old.id_mensaje, old.contenido); "
+    "INSERT INTO mensajes_fts(rowid, contenido) VALUES (new.id_mensaje, new.contenido); END",
+]
+
+SQLITE_FTS_TRIGGERS = ['mensajes_fts_ai', 'mensajes_fts_ad', 'mensajes_fts_au']
+
+
+def upgrade() -> None:
+    """Index mensajes.contenido directly and drop the mensajes_busqueda copy"""
+    bind = op.get_bind()
+    if bind.dialect.name == 'mysql':
+        op.create_index('ft_mensajes_contenido', 'mensajes', ['contenido'], mysql_prefix='FULLTEXT')
+    elif bind.dialect.name == 'sqlite':
+        op.execute("DROP TABLE IF EXISTS mensajes_busqueda_fts")
+        for statement in SQLITE_FTS_DDL:
+            op.execute(statement)
+        # Index the rows that already exist
+        op.execute("INSERT INTO mensajes_fts(mensajes_fts) VALUES ('rebuild')")
+    op.drop_table('mensajes_busqueda')
+
+
+def downgrade() -> None:
+    """Recreate mensajes_busqueda from the plain rows and drop the index on mensajes"""
+    bind = op.get_bind()
+    op.create_table(
+        'mensajes_busqueda',
+        sa.Column('id_mensaje', sa.Integer, primary_key=True, autoincrement=False),
+        sa.Column('id_chat', sa.Integer, sa.ForeignKey('chats.id_chat', ondelete='CASCADE'), nullable=False),
+        sa.Column('emisor', sa.Text(10), nullable=False),
+        sa.Column('contenido', sa.Text, nullable=False),
+        sa.Column('sent_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index('ix_mensajes_busqueda_id_chat', 'mensajes_busqueda', ['id_chat'])
+    if bind.dialect.name == 'mysql':
+        op.drop_index('ft_mensajes_contenido', table_name='mensajes')
+        op.create_index('ft_mensajes_busqueda_contenido', 'mensajes_busqueda', ['contenido'], mysql_prefix='FULLTEXT')
+    elif bind.dialect.name == 'sqlite':
+        for trigger in SQLITE_FTS_TRIGGERS:
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS mensajes_fts")
+        op.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS mensajes_busqueda_fts USING fts5("
+            "contenido, content='mensajes_busqueda', content_rowid='id_mensaje', "
+            "tokenize='unicode61 remove_diacritics 2')"
+        )
+    # Compressed and archived messages are not copied back
+    op.execute(
+        "INSERT INTO mensajes_busqueda (id_mensaje, id_chat, emisor, contenido, sent_at) "
+        "SELECT id_mensaje, id_chat, emisor, contenido, sent_at FROM mensajes WHERE formato = 'plain'"
+    )
+    if bind.dialect.name == 'sqlite':
+        op.execute("INSERT INTO mensajes_busqueda_fts(mensajes_busqueda_fts) VALUES ('rebuild')")
@@ -0,0 +1,151 @@
+"""index the words of compressed and archived messages for search
+
+Revision ID: 011_index_compressed_and_archived
+Revises: 010_search_on_messages
+Create Date: 2026-10-20 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '011_index_compressed_and_archived'
+down_revision: Union[str, None] = '010_search_on_messages'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SQLITE_FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS mensajes_fts USING fts5("
+    "contenido, terminos, content='mensajes', content_rowid='id_mensaje', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS mensajes_fts_ai AFTER INSERT ON mensajes BEGIN "
+    "INSERT INTO mensajes_fts(rowid, contenido, terminos) "
+    "VALUES (new.id_mensaje, new.contenido, new.terminos); END",
+    "CREATE TRIGGER IF NOT EXISTS mensajes_fts_ad AFTER DELETE ON mensajes BEGIN "
+    "INSERT INTO mensajes_fts(mensajes_fts, rowid, contenido, terminos) "
+    "VALUES ('delete', old.id_mensaje, old.contenido, old.terminos); END",
+    "CREATE TRIGGER IF NOT EXISTS mensajes_fts_au AFTER UPDATE OF contenido, terminos ON mensajes BEGIN "
+    "INSERT INTO mensajes_fts(mensajes_fts, rowid, contenido, terminos) "
+    "VALUES ('delete', old.id_mensaje, old.contenido, old.terminos); "
+    "INSERT INTO mensajes_fts(rowid, contenido, terminos) "
+    "VALUES (new.id_mensaje, new.contenido, new.terminos); END",
+]
+
+SQLITE_PREVIOUS_FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS mensajes_fts USING fts5("
+    "contenido, content='mensajes', content_rowid='id_mensaje', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS mensajes_fts_ai AFTER INSERT ON mensajes BEGIN "
+    "INSERT INTO mensajes_fts(rowid, contenido) VALUES (new.id_mensaje, new.contenido); END",
+    "CREATE TRIGGER IF NOT EXISTS mensajes_fts_ad AFTER DELETE ON mensajes BEGIN "
+    "INSERT INTO mensajes_fts(mensajes_fts, rowid, contenido) "
+    "VALUES ('delete', old.id_mensaje, old.contenido); END",
+    "CREATE TRIGGER IF NOT EXISTS mensajes_fts_au AFTER UPDATE OF contenido ON mensajes BEGIN "
+    "INSERT INTO mensajes_fts(mensajes_fts, rowid, contenido) "
+    "VALUES ('delete', old.id_mensaje, old.contenido); "
+    "INSERT INTO mensajes_fts(rowid, contenido) VALUES (new.id_mensaje, new.contenido); END",
+]
+
+SQLITE_ARCHIVE_FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS chat_archivos_busqueda_fts USING fts5("
+    "terminos, content='chat_archivos_busqueda', content_rowid='id_mensaje', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS chat_archivos_busqueda_fts_ai AFTER INSERT ON chat_archivos_busqueda BEGIN "
+    "INSERT INTO chat_archivos_busqueda_fts(rowid, terminos) VALUES (new.id_mensaje, new.terminos); END",
+    "CREATE TRIGGER IF NOT EXISTS chat_archivos_busqueda_fts_ad AFTER DELETE ON chat_archivos_busqueda BEGIN "
+    "INSERT INTO chat_archivos_busqueda_fts(chat_archivos_busqueda_fts, rowid, terminos) "
+    "VALUES ('delete', old.id_mensaje, old.terminos); END",
+]
+
+SQLITE_FTS_TRIGGERS = ['mensajes_fts_ai', 'mensajes_fts_ad', 'mensajes_fts_au']
+
+
+def _index_terms(text: str) -> str:
+    """Unique lowercase words of a text (same as app.models.message.index_terms)"""
+    import re
+
+    return " ".join(dict.fromkeys(word.lower() for word in re.findall(r"\w+", text)))
+
+
+def _recreate_sqlite_fts(statements: list[str]) -> None:
+    """Replace the mensajes FTS5 table and triggers"""
+    for trigger in SQLITE_FTS_TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.execute("DROP TABLE IF EXISTS mensajes_fts")
+    for statement in statements:
+        op.execute(statement)
+
+
+def upgrade() -> None:
+    """Add mensajes.terminos and chat_archivos_busqueda, and fill them from existing rows"""
+    import json
+    import zlib
+
+    bind = op.get_bind()
+    op.add_column('mensajes', sa.Column('terminos', sa.Text, nullable=True))
+    op.create_table(
+        'chat_archivos_busqueda',
+        sa.Column('id_mensaje', sa.Integer, primary_key=True, autoincrement=False),
+        sa.Column('id_chat', sa.Integer, sa.ForeignKey('chat_archivos.id_chat', ondelete='CASCADE'), nullable=False),
+        sa.Column('emisor', sa.String(10), nullable=False),
+        sa.Column('terminos', sa.Text, nullable=False),
+        sa.Column('sent_at', sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index('ix_chat_archivos_busqueda_id_chat', 'chat_archivos_busqueda', ['id_chat'])
+
+    # Compressed rows and archived transcripts only exist compressed, so their words are extracted here
+    rows = bind.execute(sa.text(
+        "SELECT id_mensaje, contenido_comprimido FROM mensajes WHERE formato = 'zlib'"
+    )).fetchall()
+    for id_mensaje, compressed in rows:
+        bind.execute(
+            sa.text("UPDATE mensajes SET terminos = :terminos WHERE id_mensaje = :id"),
+            {"terminos": _index_terms(zlib.decompress(compressed).decode("utf-8")), "id": id_mensaje},
+        )
+    archives = bind.execute(sa.text("SELECT id_chat, transcript FROM chat_archivos")).fetchall()
+    for id_chat, transcript in archives:
+        entries = [
+            {"id": id_mensaje, "chat": id_chat, "emisor": emisor, "terminos": _index_terms(contenido), "sent_at": sent_at}
+            for id_mensaje, emisor, contenido, sent_at in json.loads(zlib.decompress(transcript).decode("utf-8"))
+        ]
+        if entries:
+            bind.execute(
+                sa.text(
+                    "INSERT INTO chat_archivos_busqueda (id_mensaje, id_chat, emisor, terminos, sent_at) "
+                    "VALUES (:id, :chat, :emisor, :terminos, :sent_at)"
+                ),
+                entries,
+            )
+
+    if bind.dialect.name == 'mysql':
+        op.drop_index('ft_mensajes_contenido', table_name='mensajes')
+        op.create_index('ft_mensajes_contenido', 'mensajes', ['contenido', 'terminos'], mysql_prefix='FULLTEXT')
+        op.create_index(
+            'ft_chat_archivos_busqueda_terminos', 'chat_archivos_busqueda', ['terminos'], mysql_prefix='FULLTEXT'
+        )
+    elif bind.dialect.name == 'sqlite':
+        _recreate_sqlite_fts(SQLITE_FTS_DDL)
+        for statement in SQLITE_ARCHIVE_FTS_DDL:
+            op.execute(statement)
+        # Index the rows that already exist
+        op.execute("INSERT INTO mensajes_fts(mensajes_fts) VALUES ('rebuild')")
+        op.execute("INSERT INTO chat_archivos_busqueda_fts(chat_archivos_busqueda_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Drop the indexed words of compressed and archived messages"""
+    bind = op.get_bind()
+    if bind.dialect.name == 'mysql':
+        op.drop_index('ft_mensajes_contenido', table_name='mensajes')
+        op.create_index('ft_mensajes_contenido', 'mensajes', ['contenido'], mysql_prefix='FULLTEXT')
+    elif bind.dialect.name == 'sqlite':
+        op.execute("DROP TABLE IF EXISTS chat_archivos_busqueda_fts")
+        _recreate_sqlite_fts(SQLITE_PREVIOUS_FTS_DDL)
+    op.drop_table('chat_archivos_busqueda')
+    op.drop_column('mensajes', 'terminos')
+    if bind.dialect.name == 'sqlite':
+        op.execute("INSERT INTO mensajes_fts(mensajes_fts) VALUES ('rebuild')")
@@ -0,0 +1,156 @@
+"""
+Conditional Responses.
+
+This module derives HTTP validators (``ETag``/``Last-Modified``) from a chat's
+timestamps and answers conditional requests (``If-None-Match``/``If-Modified-Since``)
+with 304, so clients re-viewing an interview do not download it again.
+
+Completed interviews cannot receive messages, so their message pages are also
+marked as long-lived cacheable and kept serialized in ``completed_pages``.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from app.core.config import settings
+from app.models.chat import Chat
+
+# Active chats change with every turn: clients must revalidate before reusing a copy
+REVALIDATE = "private, no-cache"
+# Message pages of a completed interview only change if the chat is reopened (which changes the validator)
+COMPLETED_PAGE = "private, max-age=86400"
+
+
+def _database_timezone() -> timezone:
+    """Return the timezone of naive database timestamps (``settings.timezone``, e.g. '+02:00')."""
+    value = settings.timezone.strip()
+    sign = -1 if value.startswith("-") else 1
+    hours, _, minutes = value.lstrip("+-").partition(":")
+    return timezone(sign * timedelta(hours=int(hours or 0), minutes=int(minutes or 0)))
+
+
+def chat_validators(chat: Chat, *parts: object) -> tuple[str, datetime]:
+    """
+    Compute the validators of a representation derived from a chat.
+
+    Args:
+        chat (Chat): The chat.
+        *parts (object): Anything else the representation depends on (query parameters,
+            latest message ID, ...).
+
+    Returns:
+        tuple[str, datetime]: The strong ETag (quoted) and the last modification time (UTC).
+    """
+    fingerprint = "|".join(
+        str(value) for value in (
+            chat.id_chat, chat.status, chat.title, chat.created_at, chat.last_message_at, chat.completed_at,
+            chat.archived_at, *parts
+        )
+    )
+    etag = '"' + hashlib.sha1(fingerprint.encode("utf-8")).hexdigest()[:20] + '"'
+
+    modified = max(dt for dt in (chat.created_at, chat.last_message_at, chat.completed_at) if dt is not None)
+    if modified.tzinfo is None:
+        modified = modified.replace(tzinfo=_database_timezone())
+    return etag, modified.astimezone(timezone.utc).replace(microsecond=0)
+
+
+def validator_headers(etag: str, last_modified: datetime, cache_control: str) -> dict[str, str]:
+    """
+    Build the caching headers of a response.
+
+    Args:
+        etag (str): The ETag.
+        last_modified (datetime): Last modification time (UTC).
+        cache_control (str): The Cache-Control policy.
+
+    Returns:
+        dict[str, str]: Headers to send with both 200 and 304 responses.
+    """
+    return {
+        "ETag": etag,
+        "Last-Modified": format_datetime(last_modified, usegmt=True),
+        "Cache-Control": cache_control,
+    }
+
+
+def is_not_modified(request: Request, etag: str, last_modified: datetime) -> bool:
+    """
+    Evaluate the request's preconditions (RFC 9110: If-None-Match takes precedence).
+
+    ETags are compared weakly, so copies whose ETag was weakened by response
+    compression still match.
+
+    Args:
+        request (Request): The incoming request.
+        etag (str): Current ETag of the representation.
+        last_modified (datetime): Current last modification time (UTC).
+
+    Returns:
+        bool: True if the client's copy is current and a 304 can be sent.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or etag.removeprefix("W/") in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return last_modified <= since
+    return False
+
+
+def not_modified(headers: dict[str, str]) -> Response:
+    """Return an empty 304 response carrying the validators."""
+    return Response(status_code=304, headers=headers)
+
+
+class CompletedPageCache:
+    """In-memory LRU of serialized message pages of completed interviews."""
+
+    def __init__(self, max_entries: int):
+        """
+        Args:
+            max_entries (int): Pages kept in memory (0 disables the cache).
+        """
+        self.max_entries = max_entries
+        self._pages: OrderedDict[tuple, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> bytes | None:
+        """Return a cached page body, or None."""
+        with self._lock:
+            body = self._pages.get(key)
+            if body is not None:
+                self._pages.move_to_end(key)
+            return body
+
+    def put(self, key: tuple, body: bytes) -> None:
+        """Store a page body, evicting the least recently used pages beyond the limit."""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._pages[key] = body
+            self._pages.move_to_end(key)
+            while len(self._pages) > self.max_entries:
+                self._pages.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every cached page."""
+        with self._lock:
+            self._pages.clear()
+
+
+completed_pages = CompletedPageCache(settings.completed_page_cache_entries)
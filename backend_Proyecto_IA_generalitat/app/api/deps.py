@@ -2,24 +2,63 @@
 API Dependencies.
 
 This module defines dependencies used across API endpoints, such as
-authentication and user retrieval.
+authentication, user retrieval and read-only database sessions.
 """
 
 from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from jose import JWTError
 
-from app.core.database import get_db
+from app.core.database import get_async_db, get_db, read_session_for
 from app.core.security import decode_token
-from app.repositories.user_repo import user_repo
+from app.repositories.user_repo import async_user_repo, user_repo
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
+def _token_user_id(token: str) -> int:
+    """Return the user ID in a JWT token, raising 401 if the token is not valid."""
+    try:
+        payload = decode_token(token)
+        sub = payload.get("sub")
+        if not sub:
+            raise HTTPException(status_code=401, detail="Invalid token")
+        return int(sub)
+    except (JWTError, ValueError):
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+
+def authenticate_token(db: Session, token: str):
+    """
+    Validate a JWT token and load its user.
+
+    Used by the dependencies below and by WebSocket endpoints, which receive the
+    token in their first frame instead of an Authorization header.
+
+    Args:
+        db (Session): The database session.
+        token (str): The JWT token.
+
+    Returns:
+        User: The authenticated user object.
+
+    Raises:
+        HTTPException: If the token is invalid or user not found.
+    """
+    user = user_repo.get_by_id(db, _token_user_id(token))
+    if not user:
+        raise HTTPException(status_code=401, detail="User not found")
+    return user
+
+
 def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)):
     """
     Validate JWT token and return the authenticated user.
 
+    The user is recorded on the session so that its commits count as the user's
+    writes (read-your-writes for ``get_read_db``).
+
     Args:
         db (Session): The database session.
         token (str): The JWT token extracted from the Authorization header.
@@ -30,16 +69,86 @@ def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_
     Raises:
         HTTPException: If the token is invalid, expired, or the user does not exist.
     """
+    user = authenticate_token(db, token)
+    db.info["user_id"] = user.id_usuario
+    return user
+
+
+def get_read_user_id(token: str = Depends(oauth2_scheme)) -> int:
+    """
+    Decode the JWT of a read-only request.
+
+    Both ``get_read_db`` and ``get_current_read_user`` depend on it; FastAPI runs a
+    dependency once per request, so the token is decoded a single time.
+
+    Args:
+        token (str): The JWT token extracted from the Authorization header.
+
+    Returns:
+        int: ID of the user in the token.
+
+    Raises:
+        HTTPException: If the token is invalid or expired.
+    """
+    return _token_user_id(token)
+
+
+def get_read_db(user_id: int = Depends(get_read_user_id)):
+    """
+    Database session dependency for read-only routes.
+
+    Reads go to the replica (``database_replica_url``) unless there is none or the
+    user committed a write within ``replica_read_your_writes_seconds``.
+
+    Args:
+        user_id (int): ID of the user in the request's token.
+
+    Yields:
+        Session: A SQLAlchemy database session.
+    """
+    db = read_session_for(user_id)
     try:
-        payload = decode_token(token)
-        sub = payload.get("sub")
-        if not sub:
-            raise HTTPException(status_code=401, detail="Invalid token")
-        user_id = int(sub)
-    except (JWTError, ValueError):
-        raise HTTPException(status_code=401, detail="Invalid token")
+        yield db
+    finally:
+        db.close()
+
+
+def get_current_read_user(db: Session = Depends(get_read_db), user_id: int = Depends(get_read_user_id)):
+    """
+    Same as ``get_current_user`` for read-only routes (uses the ``get_read_db`` session).
+
+    Args:
+        db (Session): The read-only database session.
+        user_id (int): ID of the user in the request's token (already decoded).
 
+    Returns:
+        User: The authenticated user object.
+
+    Raises:
+        HTTPException: If the user does not exist.
+    """
     user = user_repo.get_by_id(db, user_id)
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
     return user
+
+
+async def get_current_user_async(db: AsyncSession = Depends(get_async_db), token: str = Depends(oauth2_scheme)):
+    """
+    Same as ``get_current_user`` for async routes (uses the ``get_async_db`` session).
+
+    Args:
+        db (AsyncSession): The async database session.
+        token (str): The JWT token extracted from the Authorization header.
+
+    Returns:
+        User: The authenticated user object.
+
+    Raises:
+        HTTPException: If the token is invalid, expired, or the user does not exist.
+    """
+    user = await async_user_repo.get_by_id(db, _token_user_id(token))
+    if not user:
+        raise HTTPException(status_code=401, detail="User not found")
+    db.info["user_id"] = user.id_usuario
+    return user
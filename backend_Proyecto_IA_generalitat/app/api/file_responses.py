@@ -0,0 +1,155 @@
+"""
+File Responses.
+
+This module builds streaming responses for seekable files (e.g. generated PDFs),
+sending them in bounded chunks with Content-Length and single-range support.
+"""
+
+import os
+import re
+from typing import BinaryIO, Iterator
+
+from fastapi import Request
+from fastapi.responses import Response, StreamingResponse
+from starlette.background import BackgroundTask
+
+from app.core.config import settings
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def _file_size(fileobj: BinaryIO) -> int:
+    """
+    Return the total size of a seekable file without reading it.
+    
+    Args:
+        fileobj (BinaryIO): The file to measure.
+        
+    Returns:
+        int: Size of the file in bytes.
+    """
+    fileobj.seek(0, os.SEEK_END)
+    size = fileobj.tell()
+    fileobj.seek(0)
+    return size
+
+
+def parse_range_header(range_header: str | None, size: int) -> tuple[int, int] | None:
+    """
+    Parse a single-range ``Range`` header into inclusive byte offsets.
+    
+    Multi-range and malformed headers are ignored (the full file is served),
+    as allowed by RFC 9110. No range of an empty file can be satisfied.
+    
+    Args:
+        range_header (str | None): Raw value of the Range header.
+        size (int): Total size of the resource.
+        
+    Returns:
+        tuple[int, int] | None: (start, end) inclusive, or None to serve the full file.
+        
+    Raises:
+        ValueError: If the range is well-formed but cannot be satisfied.
+    """
+    if not range_header:
+        return None
+    match = _RANGE_RE.match(range_header.strip())
+    if not match:
+        return None
+
+    start_str, end_str = match.groups()
+    if not start_str and not end_str:
+        return None
+    if size == 0:
+        raise ValueError("Unsatisfiable range")
+
+    if not start_str:
+        # Suffix range: last N bytes
+        length = int(end_str)
+        if length == 0:
+            raise ValueError("Unsatisfiable range")
+        return max(size - length, 0), size - 1
+
+    start = int(start_str)
+    end = int(end_str) if end_str else size - 1
+    if start >= size or end < start:
+        raise ValueError("Unsatisfiable range")
+    return start, min(end, size - 1)
+
+
+def iter_file_range(fileobj: BinaryIO, start: int, end: int, chunk_size: int) -> Iterator[bytes]:
+    """
+    Yield the bytes between ``start`` and ``end`` (inclusive) in bounded chunks.
+    
+    Args:
+        fileobj (BinaryIO): Seekable source file.
+        start (int): First byte offset.
+        end (int): Last byte offset (inclusive).
+        chunk_size (int): Maximum size of each chunk.
+        
+    Yields:
+        bytes: Consecutive chunks of the requested range.
+    """
+    fileobj.seek(start)
+    remaining = end - start + 1
+    while remaining > 0:
+        chunk = fileobj.read(min(chunk_size, remaining))
+        if not chunk:
+            break
+        remaining -= len(chunk)
+        yield chunk
+
+
+def file_streaming_response(
+    request: Request,
+    fileobj: BinaryIO,
+    filename: str,
+    media_type: str = "application/pdf",
+    allow_range: bool = True,
+) -> Response:
+    """
+    Stream a seekable file with Content-Length and ``Range`` support.
+    
+    The file is closed once the response has been sent (or immediately when
+    the requested range cannot be satisfied).
+    
+    Args:
+        request (Request): The incoming request (used to read the Range header).
+        fileobj (BinaryIO): Seekable file positioned anywhere.
+        filename (str): Name announced in Content-Disposition.
+        media_type (str): Content type of the file.
+        allow_range (bool): Whether the Range header is honored. Files that were just
+            generated are always sent whole, since a later range request would not get
+            the same bytes.
+        
+    Returns:
+        Response: 200 with the full file, 206 with the requested range, or 416.
+    """
+    size = _file_size(fileobj)
+    headers = {
+        "Content-Disposition": f"attachment; filename={filename}",
+        "Accept-Ranges": "bytes" if allow_range else "none",
+    }
+
+    try:
+        byte_range = parse_range_header(request.headers.get("range"), size) if allow_range else None
+    except ValueError:
+        fileobj.close()
+        headers["Content-Range"] = f"bytes */{size}"
+        return Response(status_code=416, headers=headers)
+
+    status_code = 200
+    start, end = 0, size - 1
+    if byte_range is not None:
+        start, end = byte_range
+        status_code = 206
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1 if size else 0)
+
+    return StreamingResponse(
+        iter_file_range(fileobj, start, end, settings.pdf_stream_chunk_size),
+        status_code=status_code,
+        media_type=media_type,
+        headers=headers,
+        background=BackgroundTask(fileobj.close),
+    )
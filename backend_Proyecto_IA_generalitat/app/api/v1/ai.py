@@ -4,43 +4,100 @@ AI-powered interview endpoints.
 This module provides endpoints for:
 - Initializing a chat with an AI greeting.
 - Generating AI replies to user messages.
+- Running an interview over a WebSocket with streamed replies.
 - Generating a comprehensive PDF report of the interview.
+- Exporting the reports of several completed interviews as a ZIP archive.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import (
+    APIRouter, BackgroundTasks, Depends, Header, HTTPException, Request, Response,
+    WebSocket, WebSocketDisconnect, status,
+)
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import StreamingResponse
+from limits import parse
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
 from slowapi import Limiter
 from slowapi.util import get_remote_address
+import asyncio
 import logging
-import re
 from datetime import datetime
 
+from app.core.chat_lock import chat_locks
 from app.core.database import get_db
-from app.api.deps import get_current_user
+from app.core.idempotency import IdempotencyGuard, idempotency_store
+from app.api.deps import authenticate_token, get_current_user
+from app.api.file_responses import file_streaming_response
 from app.repositories.chat_repo import chat_repo
 from app.repositories.message_repo import message_repo
-from app.schemas.ai import AiReplyRequest, InitializeChatRequest, GenerateReportRequest
+from app.repositories.stats_repo import stats_repo
+from app.schemas.ai import (
+    AiReplyRequest, InitializeChatRequest, GenerateReportRequest, GenerateReportsBatchRequest, InterviewSocketAuth,
+    InterviewSocketMessage,
+)
 from app.schemas.message import MessageResponse
-from app.services.ai.bedrock_service import bedrock_chat, generate_initial_greeting, generate_reply
-from app.services.ai.pdf_service import generate_pdf_report
-from app.services.message_service import message_service
+from app.services.ai.bedrock_service import bedrock_chat, bedrock_stream_chat, generate_initial_greeting
+from app.services.ai.pdf_pool import (
+    PdfPoolBusyError, PdfPoolUnavailableError, PdfRenderTimeoutError, get_pdf_render_pool,
+)
+from app.services.ai.report_cache import report_cache
+from app.services.interview_service import interview_service
+from app.services.report_service import NotEnoughMessagesError, report_filename, report_service
+from app.services.summary_service import summary_service
 
 logger = logging.getLogger(__name__)
 limiter = Limiter(key_func=get_remote_address)
+REPLY_RATE = "15/minute"  # Max 15 mensajes por minuto por IP
+REPLY_RATE_SCOPE = "ai_reply"  # One budget for POST /reply and the turns of every WebSocket of an IP
+SOCKET_AUTH_TIMEOUT_SECONDS = 10  # Time a new WebSocket has to send its auth frame
 
 router = APIRouter()
 
 
+def _replay_idempotent(db: Session, guard: IdempotencyGuard, chat_id: int, response: Response | None = None):
+    """
+    Return the message already produced for a retried request.
+
+    Args:
+        db (Session): Database session.
+        guard (IdempotencyGuard): Guard holding the cached message ID.
+        chat_id (int): Chat the retried request targets.
+        response (Response | None): Response used to flag the replay (None for WebSocket turns).
+
+    Returns:
+        Message: The stored message.
+
+    Raises:
+        HTTPException: If the message no longer exists.
+    """
+    message = message_repo.get_by_id(db, guard.cached_id)
+    if message is None or message.id_chat != chat_id:
+        raise HTTPException(status_code=404, detail="Message not found")
+    logger.info(f"♻️ Idempotent replay of message {message.id_mensaje} for chat {chat_id}")
+    if response is not None:
+        response.headers["Idempotent-Replayed"] = "true"
+    return message
+
+
 @router.post("/initialize", response_model=MessageResponse)
-def initialize_chat(payload: InitializeChatRequest, db: Session = Depends(get_db), user=Depends(get_current_user)):
+def initialize_chat(
+    payload: InitializeChatRequest,
+    response: Response,
+    idempotency_key: str | None = Header(None, alias="Idempotency-Key", max_length=255),
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user)
+):
     """
     Initialize a chat with Evalio's greeting message.
     
     This endpoint creates the first AI message in a chat with the presentation.
+    Like the reply endpoint it runs under the chat's lock.
 
     Args:
         payload (InitializeChatRequest): Request containing the chat ID.
+        response (Response): Outgoing response (flags idempotent replays).
+        idempotency_key (str | None): Optional key; a retry with the same key returns the same greeting.
         db (Session): Database session.
         user (User): Authenticated user.
 
@@ -50,40 +107,68 @@ def initialize_chat(payload: InitializeChatRequest, db: Session = Depends(get_db
     Raises:
         HTTPException: If the chat is not found or initialization fails.
     """
-    chat = chat_repo.get_for_user(db, payload.chat_id, user.id_usuario)
-    if not chat:
-        raise HTTPException(status_code=404, detail="Chat not found")
+    with chat_locks.hold(payload.chat_id):
+        guard = idempotency_store.guard(db, user.id_usuario, "ai_initialize", idempotency_key, payload.chat_id)
+        if guard.cached_id is not None:
+            return _replay_idempotent(db, guard, payload.chat_id, response)
 
-    try:
-        # Generate initial greeting from Evalio
-        greeting = generate_initial_greeting()
-        
-        # Save AI greeting message
-        ia_msg = message_repo.create(db, payload.chat_id, "IA", greeting)
-        logger.info(f"Initial greeting created: {ia_msg.id_mensaje}")
+        chat = chat_repo.get_for_user(db, payload.chat_id, user.id_usuario)
+        if not chat:
+            raise HTTPException(status_code=404, detail="Chat not found")
+
+        try:
+            # Generate initial greeting from Evalio
+            greeting = generate_initial_greeting()
         
-        db.commit()
+            # Save AI greeting message
+            ia_msg = message_repo.add(db, payload.chat_id, "IA", greeting)
+            logger.info(f"Initial greeting created: {ia_msg.id_mensaje}")
         
-        return ia_msg
+            guard.complete(db, ia_msg.id_mensaje)
+            db.commit()
+            return ia_msg
         
-    except Exception as e:
-        db.rollback()
-        logger.error(f"Error initializing chat: {str(e)}", exc_info=True)
-        raise HTTPException(status_code=500, detail="Error initializing chat")
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error initializing chat: {str(e)}", exc_info=True)
+            raise HTTPException(status_code=500, detail="Error initializing chat")
 
 
 @router.post("/reply", response_model=MessageResponse)
-@limiter.limit("15/minute")  # Max 15 mensajes por minuto por IP
-def ai_reply(request: Request, payload: AiReplyRequest, db: Session = Depends(get_db), user=Depends(get_current_user)):
+@limiter.shared_limit(REPLY_RATE, scope=REPLY_RATE_SCOPE)
+def ai_reply(
+    request: Request,
+    payload: AiReplyRequest,
+    background_tasks: BackgroundTasks,
+    response: Response,
+    idempotency_key: str | None = Header(None, alias="Idempotency-Key", max_length=255),
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user)
+):
     """
     Generate an AI reply to a user message in a chat.
     
     This endpoint is atomic: if any step fails (Bedrock error, DB error),
     both user and AI messages are rolled back to maintain data integrity.
 
+    Clients may send an ``Idempotency-Key`` header: a retry with the same key
+    returns the AI message already produced instead of storing the user message
+    again and calling Bedrock a second time. The key is stored in the turn's
+    transaction, so it holds across workers.
+
+    Turns of the same chat are serialized: while a reply is being generated,
+    another request for the chat waits up to ``CHAT_LOCK_TIMEOUT_SECONDS`` and
+    is otherwise rejected with 409.
+
+    The message is validated before anything is stored or the agent is called
+    (blank or too long, prompt injection, completed chat, duplicate turn).
+
     Args:
         request (Request): The incoming request (used for rate limiting).
         payload (AiReplyRequest): Request containing chat ID and user message content.
+        background_tasks (BackgroundTasks): Used to refresh the conversation summary after replying.
+        response (Response): Outgoing response (flags idempotent replays).
+        idempotency_key (str | None): Optional key identifying this turn across client retries.
         db (Session): Database session.
         user (User): Authenticated user.
 
@@ -91,89 +176,211 @@ def ai_reply(request: Request, payload: AiReplyRequest, db: Session = Depends(ge
         MessageResponse: The AI's response message.
 
     Raises:
-        HTTPException: If chat not found, interview completed, or generation fails.
+        HTTPException: If the message is rejected, chat not found, interview completed,
+            another turn of the chat is in progress, or generation fails.
     """
-    chat = chat_repo.get_for_user(db, payload.chat_id, user.id_usuario)
-    if not chat:
-        raise HTTPException(status_code=404, detail="Chat not found")
-    
-    # Check if chat is completed
-    if chat.status == "completed":
-        raise HTTPException(
-            status_code=400, 
-            detail="Esta entrevista ha finalizado. No se pueden enviar más mensajes. Crea una nueva entrevista para continuar."
+    interview_service.check_input(payload.contenido)
+
+    with chat_locks.hold(payload.chat_id):
+        guard = idempotency_store.guard(
+            db, user.id_usuario, "ai_reply", idempotency_key, payload.chat_id, payload.contenido
         )
+        if guard.cached_id is not None:
+            return _replay_idempotent(db, guard, payload.chat_id, response)
 
-    try:
-        # Step 1: Save user message
-        user_msg = message_repo.create(db, payload.chat_id, "USER", payload.contenido)
-        logger.info(f"User message created: {user_msg.id_mensaje}")
-        
-        # Step 2: Generate AI response
-        history = message_service.build_bedrock_history(db, payload.chat_id, user.id_usuario, limit=50)
-        ai_text = bedrock_chat(history, payload.chat_id)
-        logger.info(f"AI response length: {len(ai_text)} characters")
-        logger.info(f"AI response content: {ai_text[:500]}...")  # Primeros 500 caracteres
-        
-        # Step 3: Save AI message
-        ia_msg = message_repo.create(db, payload.chat_id, "IA", ai_text)
-        logger.info(f"AI message created: {ia_msg.id_mensaje}")
+        interview_service.open_turn(db, payload.chat_id, user.id_usuario, payload.contenido)
+
+        try:
+            turn = interview_service.take_turn(db, payload.chat_id, user.id_usuario, payload.contenido, bedrock_chat)
+            interview_service.remember_turn(db, payload.chat_id, user.id_usuario, payload.contenido)
+            guard.complete(db, turn.ai_message.id_mensaje)
         
-        # Step 4: Check if interview has been completed by the agent
-        from app.services.ai.bedrock_service import is_interview_completed, mark_chat_completed
-        logger.info(f"🔍 Buscando señales de fin de entrevista en respuesta...")
+            # Commit atomic transaction
+            db.commit()
+            logger.info(f"✅ Transacción completada para chat {payload.chat_id}")
         
-        # Opción 1: Buscar marcador explícito
-        if is_interview_completed(ai_text):
-            logger.info(f"🎯 ✅ Marcador explícito ENTREVISTA_FINALIZADA detectado")
-            mark_chat_completed(db, payload.chat_id)
-            logger.info(f"🎉 Entrevista {payload.chat_id} finalizada (marcador explícito)")
-        else:
-            # Opción 2: Detectar frases de cierre que indican fin de entrevista
-            text_lower = ai_text.lower()
-            end_phrases = [
-                'se generará un informe',
-                'se generara un informe',
-                'informe en pdf',
-                'informe en PDF',
-                'generaré un informe',
-                'generaré el informe',
-                'genero un informe',
-                'genero el informe',
-                'hemos terminado',
-                'hemos llegado al final',
-                'fin de la entrevista',
-                'final de la entrevista',
-                'gracias por tu tiempo',
-                'gracias por tu participación',
-                'evaluación detallada',
-                'informe detallado',
-                'espera un momento mientras finalizamos',
-            ]
-            
-            interview_ended = False
-            for phrase in end_phrases:
-                if phrase in text_lower:
-                    logger.info(f"🎯 ✅ Frase de cierre detectada: '{phrase}'")
-                    interview_ended = True
-                    break
-            
-            if interview_ended:
-                mark_chat_completed(db, payload.chat_id)
-                logger.info(f"🎉 Entrevista {payload.chat_id} finalizada (frase de cierre detectada)")
-            else:
-                logger.info(f"⏳ Sin señales de fin detectadas")
+            # Condense older turns once enough have accumulated (after the response is sent)
+            background_tasks.add_task(summary_service.refresh_in_background, payload.chat_id)
         
-        # Step 5: Commit atomic transaction
-        db.commit()
-        logger.info(f"✅ Transacción completada para chat {payload.chat_id}")
+            return turn.ai_message
         
-        return ia_msg
-        
-    except Exception as e:
-        db.rollback()
-        logger.error(f"Error in AI reply: {str(e)}", exc_info=True)
-        raise HTTPException(status_code=500, detail="Error generating reply")
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error in AI reply: {str(e)}", exc_info=True)
+            raise HTTPException(status_code=500, detail="Error generating reply")
+
+
+def _socket_turn(
+    db: Session, chat_id: int, user_id: int, contenido: str, idempotency_key: str | None, push
+) -> tuple[dict, bool]:
+    """
+    Run one WebSocket turn in a worker thread, pushing reply chunks as they arrive.
+
+    The session is closed afterwards so an idle connection does not keep a pooled
+    database connection checked out between turns.
+
+    Args:
+        db (Session): Database session of the connection.
+        chat_id (int): ID of the chat.
+        user_id (int): ID of the user.
+        contenido (str): The user's message.
+        idempotency_key (str | None): Optional key identifying this turn across client retries.
+        push (Callable): Thread-safe callback taking each chunk, then ``None`` once the turn ends.
+
+    Returns:
+        tuple[dict, bool]: The ``message`` event and whether the interview ended.
+
+    Raises:
+        HTTPException: If the chat is busy, not found or completed, the message repeats
+            the last turn, the idempotency key was used with another message, or generation fails.
+    """
+    try:
+        with chat_locks.hold(chat_id):
+            # Same route as POST /reply, so a turn can be retried over either channel
+            guard = idempotency_store.guard(db, user_id, "ai_reply", idempotency_key, chat_id, contenido)
+            if guard.cached_id is not None:
+                message = _replay_idempotent(db, guard, chat_id)
+                completed = message.chat.status == "completed"
+                event = {
+                    "type": "message",
+                    "message": MessageResponse.model_validate(message).model_dump(mode="json"),
+                    "user_message": None,
+                    "completed": completed,
+                    "replayed": True,
+                }
+                return event, completed
+
+            interview_service.open_turn(db, chat_id, user_id, contenido)
+            try:
+                turn = interview_service.take_turn(
+                    db, chat_id, user_id, contenido,
+                    lambda history, turn_chat_id: bedrock_stream_chat(history, turn_chat_id, push),
+                )
+                interview_service.remember_turn(db, chat_id, user_id, contenido)
+                guard.complete(db, turn.ai_message.id_mensaje)
+                db.commit()
+                logger.info(f"✅ Transacción completada para chat {chat_id} (WebSocket)")
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Error in AI reply: {str(e)}", exc_info=True)
+                raise HTTPException(status_code=500, detail="Error generating reply")
+
+            event = {
+                "type": "message",
+                "message": MessageResponse.model_validate(turn.ai_message).model_dump(mode="json"),
+                "user_message": MessageResponse.model_validate(turn.user_message).model_dump(mode="json"),
+                "completed": turn.completed,
+            }
+            return event, turn.completed
+    finally:
+        db.close()
+        push(None)
+
+
+@router.websocket("/ws/{chat_id}")
+async def interview_socket(
+    websocket: WebSocket,
+    chat_id: int,
+    db: Session = Depends(get_db),
+):
+    """
+    Interview channel: one connection per chat instead of one HTTP request per turn.
+
+    Browsers cannot set headers on WebSockets, and a token in the URL would end up in
+    access logs, so the client authenticates with its first frame,
+    ``{"type": "auth", "token": ...}``, within ``SOCKET_AUTH_TIMEOUT_SECONDS``. The token
+    and the chat are checked once; a failure closes the connection with code 1008.
+    The server then sends ``ready``, the client sends
+    ``{"type": "message", "contenido": ..., "idempotency_key": ...}`` per turn and receives:
+
+    - ``chunk``: a fragment of the agent's reply, as soon as Bedrock streams it.
+    - ``message``: the stored AI message (and ``user_message``) once the turn is committed,
+      with a ``completed`` flag (``replayed`` when the idempotency key was already served).
+    - ``completed``: the interview has ended; the report can be generated.
+    - ``error``: the turn failed or was rejected (``status`` mirrors the HTTP endpoint).
+
+    Turns follow the same rules as ``POST /reply``: they hold the chat's lock, honour
+    idempotency keys and draw from the same rate budget of 15 per minute per IP.
+
+    Args:
+        websocket (WebSocket): The connection.
+        chat_id (int): ID of the chat.
+        db (Session): Database session, kept for the whole connection.
+    """
+    await websocket.accept()
+    try:
+        frame = await asyncio.wait_for(websocket.receive_json(), SOCKET_AUTH_TIMEOUT_SECONDS)
+        auth = InterviewSocketAuth.model_validate(frame)
+        user = await run_in_threadpool(authenticate_token, db, auth.token)
+        await run_in_threadpool(interview_service.get_open_chat, db, chat_id, user.id_usuario)
+    except WebSocketDisconnect:
+        return
+    except (asyncio.TimeoutError, ValueError):
+        # ValueError covers frames that are not JSON and pydantic validation errors
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Authentication required")
+        return
+    except HTTPException as e:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=e.detail)
+        return
+    finally:
+        await run_in_threadpool(db.close)
+    user_id = user.id_usuario
+    db.info["user_id"] = user_id
+
+    await websocket.send_json({"type": "ready", "chat_id": chat_id})
+    client_ip = websocket.client.host if websocket.client else "unknown"
+    reply_rate = parse(REPLY_RATE)
+    loop = asyncio.get_running_loop()
+
+    while True:
+        try:
+            data = await websocket.receive_json()
+        except WebSocketDisconnect:
+            logger.info(f"🔌 WebSocket of chat {chat_id} closed")
+            return
+
+        try:
+            payload = InterviewSocketMessage.model_validate(data)
+        except ValidationError as e:
+            await websocket.send_json({"type": "error", "status": 422, "detail": e.errors(include_url=False, include_context=False)})
+            continue
+
+        if limiter.enabled and not limiter.limiter.hit(reply_rate, client_ip, REPLY_RATE_SCOPE):
+            await websocket.send_json({"type": "error", "status": 429, "detail": f"Rate limit exceeded: {REPLY_RATE}"})
+            continue
+
+        try:
+            interview_service.check_input(payload.contenido)
+        except HTTPException as e:
+            await websocket.send_json({"type": "error", "status": e.status_code, "detail": e.detail})
+            continue
+
+        chunks: asyncio.Queue = asyncio.Queue()
+        push = lambda chunk: loop.call_soon_threadsafe(chunks.put_nowait, chunk)
+        task = asyncio.ensure_future(
+            run_in_threadpool(_socket_turn, db, chat_id, user_id, payload.contenido, payload.idempotency_key, push)
+        )
+        try:
+            while (chunk := await chunks.get()) is not None:
+                await websocket.send_json({"type": "chunk", "contenido": chunk})
+        except Exception:
+            # Client gone mid-reply: the turn still completes, and must finish before the session is closed
+            await asyncio.wait([task])
+            raise
+
+        try:
+            event, completed = await task
+        except HTTPException as e:
+            await websocket.send_json({"type": "error", "status": e.status_code, "detail": e.detail})
+            continue
+
+        if not event.get("replayed"):
+            # Condense older turns once enough have accumulated, without delaying the next turn
+            loop.run_in_executor(None, summary_service.refresh_in_background, chat_id)
+
+        await websocket.send_json(event)
+        if completed:
+            await websocket.send_json({"type": "completed", "chat_id": chat_id})
 
 
 @router.post("/generate-report")
@@ -188,10 +395,11 @@ def generate_interview_report(
     Generate a PDF report of the interview evaluation.
     
     This endpoint:
-    1. Retrieves all messages from the chat
-    2. Asks the AI to generate a final comprehensive report
-    3. Converts the report to a professional PDF
-    4. Returns the PDF as a downloadable file
+    1. Returns the cached PDF if the conversation has not changed since the last report
+    2. Otherwise retrieves all messages from the chat
+    3. Asks the AI to generate a final comprehensive report
+    4. Converts the report to a professional PDF
+    5. Returns the PDF as a downloadable file
 
     Args:
         request (Request): The incoming request (used for rate limiting).
@@ -200,7 +408,8 @@ def generate_interview_report(
         user (User): Authenticated user.
 
     Returns:
-        StreamingResponse: The generated PDF file.
+        StreamingResponse: The generated PDF file, streamed in chunks with
+            Content-Length. Range requests are only honored for cached reports.
 
     Raises:
         HTTPException: If chat not found, insufficient messages, or generation fails.
@@ -209,193 +418,113 @@ def generate_interview_report(
     if not chat:
         raise HTTPException(status_code=404, detail="Chat not found")
 
-    # Validate that there are enough messages for a report
-    messages = message_repo.list_for_chat(db, payload.chat_id, limit=100)
-    if len(messages) < 5:
-        raise HTTPException(
-            status_code=400, 
-            detail="No se puede generar un informe sin haber realizado la entrevista. Necesitas al menos completar la configuración inicial y responder algunas preguntas."
-        )
+    filename = report_filename(payload.chat_id)
+
+    # Reuse the cached report if the conversation has not changed since it was rendered
+    cached_pdf = report_cache.open(chat)
+    if cached_pdf is not None:
+        logger.info(f"Serving cached report for chat {payload.chat_id}")
+        if chat.status != "completed":
+            chat_repo.mark_as_completed(db, payload.chat_id)
+        return file_streaming_response(request, cached_pdf, filename)
 
     try:
-        # Build conversation history
-        history = message_service.build_bedrock_history(db, payload.chat_id, user.id_usuario, limit=100)
-        
-        # Generate final report with AI (with higher max_tokens for comprehensive report)
-        report_prompt = {
-            "role": "user",
-            "content": (
-                "El proceso de evaluación ha finalizado. Por favor, genera un resumen analítico de evaluación "
-                "siguiendo ESTRICTAMENTE estas reglas: "
-                "\n"
-                "RESTRICCIONES OBLIGATORIAS: "
-                "1. NO incluyas la sección de datos personales ni información de identificación (nombre, fecha, rol, nivel, ciclo, duración). "
-                "   Estos datos aparecen automáticamente en el encabezado del documento. "
-                "2. NO uses bullets con información personal. "
-                "3. NO uses placeholders como [fecha], [rol], [ciclo], etc. "
-                "4. NO incluyas JSON, código, bloques técnicos ni formatos especiales. "
-                "\n"
-                "CONTENIDO REQUERIDO: "
-                "5. Comienza DIRECTAMENTE con 'Valoración general del perfil'. NO hay introducción previa. "
-                "6. Sé realista y crítico en tu análisis. Evita suavizar errores graves. "
-                "\n"
-                "DETALLES POR SECCIÓN: "
-                "7. Análisis de ortografía y expresión escrita: "
-                "   - SOLO reporta errores ortográficos REALES que hayas detectado en las respuestas. "
-                "   - Si NO hubo errores ortográficos, indica explícitamente: 'No se detectaron errores ortográficos.' "
-                "   - NO inventes ejemplos ni incluyas faltas que no ocurrieron. "
-                "   - Formato de ejemplo: Escribió 'ola' en lugar de 'hola' (entre comillas la palabra exacta mal escrita). "
-                "   - NO reportes errores técnicos, siglas, nombres propios ni anglicismos como faltas. "
-                "8. Errores conceptuales: indícalos en 'Errores críticos' con ejemplos específicos de lo respondido. "
-                "9. Nivel profesional: usa UNA SOLA de: Muy bajo | Bajo | Medio | Bueno | Muy bueno. "
-                "   Refleja el desempeño observado. 'Muy bueno' solo si realmente merece 95+/100. "
-                "\n"
-                "ESTRUCTURA DEL DOCUMENTO (usa estos títulos con ##): "
-                "   ## Valoración general "
-                "   ## Puntos fuertes (omitir si no existen) "
-                "   ## Errores críticos (omitir si no los hay) "
-                "   ## Aspectos a mejorar "
-                "   ## Ortografía y expresión escrita "
-                "   ## Recomendaciones prácticas "
-                "   ## Impacto en una entrevista profesional "
-                "   ## Acciones prioritarias (próximos 7 días) "
-                "   ## Nivel estimado profesional "
-            )
-        }
-        history.append(report_prompt)
-        
-        report_content = generate_reply(history, payload.chat_id, max_tokens=2500, temperature=0.7)
-        logger.info(f"AI report generated for chat {payload.chat_id}")
-        
-        # Extract metadata from chat history for PDF
-        # Messages already loaded for validation above
-        rol_laboral = "No especificado"
-        nivel_academico = "No especificado"
-        ciclo_formativo = "No especificado"
-        duracion = "No especificada"
-        
-        logger.info(f"Extracting metadata from {len(messages)} messages")
-        
-        for idx, msg in enumerate(messages[:30]):  # Check first 30 messages for config data
-            if not msg.contenido:
-                continue
-                
-            content_lower = msg.contenido.lower()
-            content_clean = msg.contenido.strip()
-            
-            # DETECT ROL LABORAL (more flexible matching)
-            if rol_laboral == "No especificado":
-                # Look for role keywords (case-insensitive, whole words)
-                if re.search(r'\bjunior\b', content_lower):
-                    rol_laboral = "Junior"
-                    logger.info(f"Detected rol_laboral='Junior' from message {idx}")
-                elif re.search(r'\bmiddle\b', content_lower):
-                    rol_laboral = "Middle"
-                    logger.info(f"Detected rol_laboral='Middle' from message {idx}")
-                elif re.search(r'\bsenior\b', content_lower):
-                    rol_laboral = "Senior"
-                    logger.info(f"Detected rol_laboral='Senior' from message {idx}")
-            
-            # DETECT NIVEL ACADÉMICO (more flexible matching)
-            if nivel_academico == "No especificado":
-                if 'fp básica' in content_lower or 'fp basica' in content_lower or 'fp básico' in content_lower:
-                    nivel_academico = "FP Básica"
-                    logger.info(f"Detected nivel_academico='FP Básica' from message {idx}")
-                elif 'fp media' in content_lower or 'fp medio' in content_lower:
-                    nivel_academico = "FP Media"
-                    logger.info(f"Detected nivel_academico='FP Media' from message {idx}")
-                elif 'fp superior' in content_lower:
-                    nivel_academico = "FP Superior"
-                    logger.info(f"Detected nivel_academico='FP Superior' from message {idx}")
-                elif 'máster' in content_lower or 'master' in content_lower or 'especialización' in content_lower or 'especializacion' in content_lower:
-                    nivel_academico = "Máster/Especialización"
-                    logger.info(f"Detected nivel_academico='Máster/Especialización' from message {idx}")
-                # Capture generic "FP" if nothing else matched and this looks like a config response
-                elif re.search(r'\bfp\b', content_lower) and len(content_clean) < 50:
-                    nivel_academico = "FP"
-                    logger.info(f"Detected nivel_academico='FP' (generic) from message {idx}")
-            
-            # DETECT DURACIÓN (more flexible matching - look for the word alone, not combined with others)
-            if duracion == "No especificada":
-                if re.search(r'\bcorta\b', content_lower):
-                    duracion = "Corta"
-                    logger.info(f"Detected duracion='Corta' from message {idx}")
-                elif re.search(r'\bmedia\b', content_lower):
-                    duracion = "Media"
-                    logger.info(f"Detected duracion='Media' from message {idx}")
-                elif re.search(r'\blarga\b', content_lower):
-                    duracion = "Larga"
-                    logger.info(f"Detected duracion='Larga' from message {idx}")
-            
-            # DETECT CICLO FORMATIVO (buscar siglas y nombres comunes)
-            if ciclo_formativo == "No especificado":
-                ciclos_conocidos = {
-                    'daw': 'DAW - Desarrollo de Aplicaciones Web',
-                    'dam': 'DAM - Desarrollo de Aplicaciones Multiplataforma',
-                    'asir': 'ASIR - Administración de Sistemas Informáticos en Red',
-                    'smr': 'SMR - Sistemas Microinformáticos y Redes',
-                    'enfermería': 'Enfermería',
-                    'enfermeria': 'Enfermería',
-                    'integración social': 'Integración Social',
-                    'integracion social': 'Integración Social',
-                    'electrónica': 'Electrónica Industrial',
-                    'electronica': 'Electrónica Industrial',
-                    'administración y finanzas': 'Administración y Finanzas',
-                    'administracion y finanzas': 'Administración y Finanzas',
-                    'comercio internacional': 'Comercio Internacional',
-                    'marketing': 'Marketing y Publicidad',
-                    'auxiliar de enfermería': 'Auxiliar de Enfermería',
-                    'auxiliar de enfermeria': 'Auxiliar de Enfermería'
-                }
-                
-                # Try to find known ciclos first
-                for sigla, nombre_completo in ciclos_conocidos.items():
-                    if sigla in content_lower:
-                        ciclo_formativo = nombre_completo
-                        logger.info(f"Detected ciclo_formativo='{nombre_completo}' from message {idx}")
-                        break
-                
-                # If no known ciclo detected but this looks like a config response, capture it
-                if ciclo_formativo == "No especificado" and msg.emisor == "USER":
-                    # Check if this is likely a ciclo response (short message, likely between messages 4-12)
-                    if 3 < len(content_clean) < 150 and idx >= 3:
-                        # Only capture if it doesn't contain question marks or common non-response words
-                        if '?' not in msg.contenido and len(content_clean) > 0:
-                            # Check if it contains ciclo-related keywords
-                            if any(palabra in content_lower for palabra in ['ciclo', 'estudio', 'estudiando', 'formativo', 'carrera', 'especialidad', 'técnico']):
-                                ciclo_formativo = content_clean
-                                logger.info(f"Detected ciclo_formativo='{content_clean}' (custom) from message {idx}")
-        
-        # Generate PDF
-        pdf_buffer = generate_pdf_report(
-            report_content=report_content,
-            candidate_name=user.nombre,
-            rol_laboral=rol_laboral,
-            nivel_academico=nivel_academico,
-            ciclo_formativo=ciclo_formativo,
-            duracion=duracion,
-            interview_date=chat.created_at,
-            messages=messages
-        )
+        prepared = report_service.prepare(db, chat, user)
+    except NotEnoughMessagesError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        pdf_file = report_service.render(prepared, render_pool=get_pdf_render_pool())
+        report_cache.store(prepared.chat_id, prepared.cache_version, pdf_file)
+        stats_repo.record_report(db, chat.id_chat, user.id_usuario, prepared.employability_level)
         
         # Mark chat as completed
         chat_repo.mark_as_completed(db, payload.chat_id)
         logger.info(f"Chat {payload.chat_id} marked as completed")
         
-        # Return PDF as downloadable file
-        filename = f"informe_entrevista_{payload.chat_id}_{datetime.now().strftime('%Y%m%d')}.pdf"
-        
-        return StreamingResponse(
-            pdf_buffer,
-            media_type="application/pdf",
-            headers={
-                "Content-Disposition": f"attachment; filename={filename}"
-            }
-        )
+        # Return PDF as downloadable file (a Range request on a cache miss gets the whole file)
+        return file_streaming_response(request, pdf_file, filename, allow_range=False)
         
     except ValueError as e:
         logger.error(f"Validation error generating report: {str(e)}")
         raise HTTPException(status_code=400, detail=str(e))
+    except PdfPoolBusyError:
+        logger.warning(f"PDF render queue full, rejecting report for chat {payload.chat_id}")
+        raise HTTPException(status_code=503, detail="El servicio de informes está saturado. Inténtalo de nuevo en unos minutos.")
+    except PdfPoolUnavailableError:
+        logger.error(f"PDF render worker failed for chat {payload.chat_id}")
+        raise HTTPException(status_code=503, detail="El servicio de informes se está reiniciando. Inténtalo de nuevo en unos segundos.")
+    except PdfRenderTimeoutError:
+        raise HTTPException(status_code=504, detail="La generación del informe ha tardado demasiado. Inténtalo de nuevo.")
     except Exception as e:
         logger.error(f"Error generating report: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail="Error generating report")
+
+
+@router.post("/generate-reports")
+@limiter.limit("5/hour")  # Max 5 exportaciones por hora por IP
+def generate_interview_reports_batch(
+    request: Request,
+    payload: GenerateReportsBatchRequest,
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user)
+):
+    """
+    Export the PDF reports of several completed interviews as a ZIP archive.
+    
+    Cached reports are reused; the rest are generated in parallel with bounded
+    concurrency and each one is streamed into the archive as soon as it is ready.
+
+    Args:
+        request (Request): The incoming request (used for rate limiting).
+        payload (GenerateReportsBatchRequest): Request containing the chat IDs.
+        db (Session): Database session.
+        user (User): Authenticated user.
+
+    Returns:
+        StreamingResponse: The ZIP archive, streamed while reports are generated.
+
+    Raises:
+        HTTPException: If a chat is not found, not completed or has too few messages.
+    """
+    chats = {chat.id_chat: chat for chat in chat_repo.list_for_user_by_ids(db, user.id_usuario, payload.chat_ids)}
+    missing = [chat_id for chat_id in payload.chat_ids if chat_id not in chats]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Chats not found: {missing}")
+
+    not_completed = [chat_id for chat_id in payload.chat_ids if chats[chat_id].status != "completed"]
+    if not_completed:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Solo se pueden exportar entrevistas finalizadas. Entrevistas sin finalizar: {not_completed}"
+        )
+
+    # All database work happens here; the archive is produced after the session is released
+    cached = {}
+    pending = []
+    prepared_all = False
+    try:
+        for chat_id in payload.chat_ids:
+            chat = chats[chat_id]
+            cached_pdf = report_cache.open(chat)
+            if cached_pdf is not None:
+                cached[chat_id] = cached_pdf
+            else:
+                pending.append(report_service.prepare(db, chat, user))
+        prepared_all = True
+    except NotEnoughMessagesError as e:
+        raise HTTPException(status_code=400, detail=f"Chat {chat_id}: {e}")
+    finally:
+        # From here on stream_batch_zip owns the open files
+        if not prepared_all:
+            for cached_pdf in cached.values():
+                cached_pdf.close()
+
+    logger.info(f"Batch report export: {len(cached)} cached, {len(pending)} to generate")
+
+    filename = f"informes_entrevistas_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
+    return StreamingResponse(
+        report_service.stream_batch_zip(cached, pending, render_pool=get_pdf_render_pool()),
+        media_type="application/zip",
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
@@ -12,7 +12,7 @@ from app.core.database import get_db
 from app.schemas.auth import RegisterRequest, LoginRequest, TokenResponse
 from app.schemas.user import UserResponse
 from app.services.auth_service import auth_service
-from app.api.deps import get_current_user
+from app.api.deps import get_current_read_user
 
 router = APIRouter()
 
@@ -47,7 +47,7 @@ def login(payload: LoginRequest, db: Session = Depends(get_db)):
     return TokenResponse(access_token=token)
 
 @router.get("/me", response_model=UserResponse)
-def get_current_user_info(user=Depends(get_current_user)):
+def get_current_user_info(user=Depends(get_current_read_user)):
     """
     Retrieve the authenticated user's profile.
 
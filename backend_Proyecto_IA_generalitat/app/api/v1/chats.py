@@ -5,12 +5,23 @@ This module provides endpoints for creating, retrieving, updating, and deleting
 chats for the authenticated user.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Path, Body
+from fastapi import APIRouter, Depends, HTTPException, Path, Body, Request, Response
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 
+from app.api.conditional import REVALIDATE, chat_validators, is_not_modified, not_modified, validator_headers
 from app.core.database import get_db
-from app.api.deps import get_current_user
-from app.schemas.chat import ChatResponse, CreateChatResponse, UpdateChatTitleRequest, UpdateChatStatusRequest
+from app.api.deps import get_current_read_user, get_current_user, get_read_db
+from app.schemas.chat import (
+    BulkDeleteChatsRequest,
+    BulkDeleteChatsResponse,
+    ChatResponse,
+    CreateChatResponse,
+    StartChatRequest,
+    StartChatResponse,
+    UpdateChatTitleRequest,
+    UpdateChatStatusRequest,
+)
 from app.services.chat_service import chat_service
 from app.repositories.chat_repo import chat_repo
 
@@ -33,31 +44,64 @@ def create_chat(db: Session = Depends(get_db), user=Depends(get_current_user)):
     return CreateChatResponse(id_chat=chat.id_chat)
 
 
+@router.post("/start", response_model=StartChatResponse)
+def start_chat(
+    request_body: StartChatRequest | None = Body(None),
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    """
+    Start a new interview: create the chat and Evalio's greeting in one transaction.
+
+    Replaces the ``POST /chats`` + ``PUT /chats/{id}/title`` + ``POST /ai/initialize``
+    sequence with a single request and a single commit.
+
+    Args:
+        request_body (StartChatRequest | None): Optional chat title.
+        db (Session): The database session.
+        user (User): The authenticated user.
+
+    Returns:
+        StartChatResponse: The new chat and its greeting message.
+    """
+    title = request_body.title if request_body else None
+    return chat_service.start_chat(db, user.id_usuario, title)
+
+
 @router.get("", response_model=list[ChatResponse])
-def list_chats(db: Session = Depends(get_db), user=Depends(get_current_user)):
+def list_chats(db: Session = Depends(get_read_db), user=Depends(get_current_read_user)):
     """
     Retrieve all chats for the authenticated user.
 
+    The rows are serialized directly with orjson; ``response_model`` only documents them.
+
     Args:
         db (Session): The database session.
         user (User): The authenticated user.
 
     Returns:
-        list[ChatResponse]: A list of chats belonging to the user.
+        ORJSONResponse: A list of chats (``ChatResponse``) belonging to the user.
     """
-    return chat_service.list_chats(db, user.id_usuario)
+    return ORJSONResponse(chat_service.list_chat_rows(db, user.id_usuario))
 
 
 @router.get("/{chat_id}", response_model=ChatResponse)
 def get_chat(
+    request: Request,
+    response: Response,
     chat_id: int = Path(..., ge=1),
-    db: Session = Depends(get_db),
-    user=Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+    user=Depends(get_current_read_user),
 ):
     """
     Retrieve a specific chat (validates ownership).
 
+    Responses carry ``ETag``/``Last-Modified`` derived from the chat's timestamps;
+    a conditional request whose copy is still current gets 304 without a body.
+
     Args:
+        request (Request): The incoming request (conditional headers).
+        response (Response): Outgoing response (caching headers).
         chat_id (int): The ID of the chat to retrieve.
         db (Session): The database session.
         user (User): The authenticated user.
@@ -71,6 +115,12 @@ def get_chat(
     chat = chat_repo.get_for_user(db, chat_id, user.id_usuario)
     if not chat:
         raise HTTPException(status_code=404, detail="Chat not found")
+
+    etag, last_modified = chat_validators(chat)
+    headers = validator_headers(etag, last_modified, REVALIDATE)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(headers)
+    response.headers.update(headers)
     return chat
 
 
@@ -149,6 +199,8 @@ def delete_chat(
     """
     Delete a chat (validates ownership).
 
+    The chat is hidden immediately and purged with its messages in the background.
+
     Args:
         chat_id (int): The ID of the chat to delete.
         db (Session): The database session.
@@ -160,9 +212,29 @@ def delete_chat(
     Raises:
         HTTPException: If the chat is not found.
     """
-    chat = chat_repo.get_for_user(db, chat_id, user.id_usuario)
-    if not chat:
+    if not chat_repo.soft_delete_many(db, user.id_usuario, [chat_id]):
         raise HTTPException(status_code=404, detail="Chat not found")
-    
-    chat_repo.delete(db, chat_id)
     return {"message": "Chat deleted successfully"}
+
+
+@router.post("/bulk-delete", response_model=BulkDeleteChatsResponse)
+def bulk_delete_chats(
+    request_body: BulkDeleteChatsRequest = Body(...),
+    db: Session = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    """
+    Delete several chats of the authenticated user with a single statement.
+
+    IDs that do not exist or belong to another user are ignored.
+
+    Args:
+        request_body (BulkDeleteChatsRequest): IDs of the chats to delete.
+        db (Session): The database session.
+        user (User): The authenticated user.
+
+    Returns:
+        BulkDeleteChatsResponse: Number of chats deleted.
+    """
+    deleted = chat_repo.soft_delete_many(db, user.id_usuario, request_body.chat_ids)
+    return BulkDeleteChatsResponse(deleted=deleted)
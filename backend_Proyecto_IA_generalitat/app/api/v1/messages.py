@@ -4,11 +4,15 @@ Message management API endpoints.
 This module provides endpoints for retrieving messages associated with a specific chat.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import Response
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db
-from app.api.deps import get_current_user
+from app.api.conditional import (
+    COMPLETED_PAGE, REVALIDATE, chat_validators, completed_pages, is_not_modified, not_modified, validator_headers,
+)
+from app.api.deps import get_current_read_user, get_read_db
 from app.repositories.chat_repo import chat_repo
 from app.repositories.message_repo import message_repo
 from app.schemas.message import MessageResponse
@@ -17,22 +21,29 @@ router = APIRouter()
 
 @router.get("", response_model=list[MessageResponse])
 def list_messages(
+    request: Request,
     chat_id: int = Query(...),
     limit: int = Query(50, ge=1, le=200),
-    db: Session = Depends(get_db),
-    user=Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+    user=Depends(get_current_read_user),
 ):
     """
     Retrieve messages from a chat (validates chat ownership).
 
+    The rows are serialized directly with orjson; ``response_model`` only documents them.
+    Responses carry ``ETag``/``Last-Modified`` and conditional requests get 304.
+    Pages of completed chats never change, so they are cacheable for a day and
+    served from ``completed_pages`` without querying the messages.
+
     Args:
+        request (Request): The incoming request (conditional headers).
         chat_id (int): The ID of the chat to retrieve messages from.
         limit (int): The maximum number of messages to retrieve (default 50, max 200).
         db (Session): The database session.
         user (User): The authenticated user.
 
     Returns:
-        list[MessageResponse]: A list of messages from the specified chat.
+        Response: A JSON list of messages (``MessageResponse``) from the specified chat, or 304.
 
     Raises:
         HTTPException: If the chat is not found or does not belong to the user.
@@ -40,4 +51,21 @@ def list_messages(
     chat = chat_repo.get_for_user(db, chat_id, user.id_usuario)
     if not chat:
         raise HTTPException(status_code=404, detail="Chat not found")
-    return message_repo.list_for_chat(db, chat_id, limit=limit)
+
+    completed = chat.status == "completed"
+    if completed:
+        etag, last_modified = chat_validators(chat, limit)
+    else:
+        # Several messages can share a last_message_at second, so the newest ID is part of the validator
+        etag, last_modified = chat_validators(chat, limit, message_repo.last_id(db, chat_id))
+    headers = validator_headers(etag, last_modified, COMPLETED_PAGE if completed else REVALIDATE)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(headers)
+
+    key = (chat_id, limit, etag)
+    body = completed_pages.get(key) if completed else None
+    if body is None:
+        body = orjson.dumps(message_repo.list_rows_for_chat(db, chat_id, limit=limit))
+        if completed:
+            completed_pages.put(key, body)
+    return Response(body, media_type="application/json", headers=headers)
@@ -2,14 +2,16 @@
 API V1 Router configuration.
 
 This module aggregates all the routers for version 1 of the API,
-including authentication, chats, messages, and AI-related endpoints.
+including authentication, chats, messages, search, stats, and AI-related endpoints.
 """
 
 from fastapi import APIRouter
-from app.api.v1 import auth, chats, messages, ai
+from app.api.v1 import auth, chats, messages, search, stats, ai
 
 router = APIRouter()
 router.include_router(auth.router, prefix="/auth", tags=["auth"])
 router.include_router(chats.router, prefix="/chats", tags=["chats"])
 router.include_router(messages.router, prefix="/messages", tags=["messages"])
+router.include_router(search.router, prefix="/search", tags=["search"])
+router.include_router(stats.router, prefix="/stats", tags=["stats"])
 router.include_router(ai.router, prefix="/ai", tags=["ai"])
@@ -0,0 +1,60 @@
+"""
+Search API endpoints.
+
+This module provides full-text search over the messages of the authenticated
+user's interviews.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_current_read_user, get_read_db
+from app.repositories.search_repo import make_snippet, search_repo, search_terms
+from app.schemas.search import SearchHit, SearchResponse
+
+router = APIRouter()
+
+
+@router.get("", response_model=SearchResponse)
+def search_messages(
+    q: str = Query(..., min_length=2, max_length=200, description="Texto a buscar"),
+    page: int = Query(1, ge=1, le=100),
+    page_size: int = Query(20, ge=1, le=50),
+    db: Session = Depends(get_read_db),
+    user=Depends(get_current_read_user),
+):
+    """
+    Search the messages of the user's chats, returning ranked snippets.
+
+    Args:
+        q (str): Text to search (words are matched independently, accents ignored).
+        page (int): Page number (1-based).
+        page_size (int): Results per page.
+        db (Session): The database session.
+        user (User): The authenticated user.
+
+    Returns:
+        SearchResponse: One page of results, best matches first.
+
+    Raises:
+        HTTPException: If the query contains no searchable words.
+    """
+    terms = search_terms(q)
+    if not terms:
+        raise HTTPException(status_code=400, detail="La búsqueda debe contener al menos una palabra")
+
+    # Fetch one extra row to know whether there is a next page without counting
+    rows = search_repo.search(db, user.id_usuario, terms, limit=page_size + 1, offset=(page - 1) * page_size)
+    results = [
+        SearchHit(
+            id_chat=row["id_chat"],
+            chat_title=row["title"],
+            id_mensaje=row["id_mensaje"],
+            emisor=row["emisor"],
+            snippet=make_snippet(row["contenido"], terms),
+            score=row["score"],
+            sent_at=row["sent_at"],
+        )
+        for row in rows[:page_size]
+    ]
+    return SearchResponse(query=q, page=page, page_size=page_size, has_more=len(rows) > page_size, results=results)
@@ -0,0 +1,63 @@
+"""
+Stats API endpoints.
+
+This module provides the user's progress statistics, read from incrementally
+maintained summary tables (constant cost regardless of history size).
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Path
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_current_read_user, get_read_db
+from app.repositories.chat_repo import chat_repo
+from app.repositories.stats_repo import stats_repo
+from app.schemas.stats import ChatStatsResponse, UserStatsResponse
+
+router = APIRouter()
+
+
+@router.get("/me", response_model=UserStatsResponse)
+def get_my_stats(db: Session = Depends(get_read_db), user=Depends(get_current_read_user)):
+    """
+    Retrieve the progress summary of the authenticated user.
+
+    Args:
+        db (Session): The database session.
+        user (User): The authenticated user.
+
+    Returns:
+        UserStatsResponse: Interview counters and last employability level.
+    """
+    stats = stats_repo.get_user_stats(db, user.id_usuario)
+    if stats is None:
+        return UserStatsResponse()
+    return stats
+
+
+@router.get("/chats/{chat_id}", response_model=ChatStatsResponse)
+def get_chat_stats(
+    chat_id: int = Path(..., ge=1),
+    db: Session = Depends(get_read_db),
+    user=Depends(get_current_read_user),
+):
+    """
+    Retrieve the summary of one of the user's interviews.
+
+    Args:
+        chat_id (int): The ID of the chat.
+        db (Session): The database session.
+        user (User): The authenticated user.
+
+    Returns:
+        ChatStatsResponse: Turn counters and employability level of the chat.
+
+    Raises:
+        HTTPException: If the chat is not found.
+    """
+    chat = chat_repo.get_for_user(db, chat_id, user.id_usuario)
+    if not chat:
+        raise HTTPException(status_code=404, detail="Chat not found")
+    stats = stats_repo.get_chat_stats(db, chat_id)
+    if stats is None:
+        return ChatStatsResponse(id_chat=chat_id)
+    return stats
@@ -0,0 +1,157 @@
+"""
+Per-Chat Locks.
+
+This module serializes AI turns of the same chat so that two overlapping requests
+never call the agent on the same session at the same time or interleave their
+messages. Every worker holds an in-process lock per chat; with the ``mysql``
+backend a named MySQL lock (``GET_LOCK``) extends the exclusion across workers
+and hosts. ``database_lock`` is also used on its own by the maintenance tasks.
+
+``summary_locks`` is a separate set of locks (other names, no waiting) that keeps
+two background summary refreshes of a chat from running at once without ever
+blocking the chat's turns.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from fastapi import HTTPException
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database import engine
+
+logger = logging.getLogger(__name__)
+
+CHAT_BUSY_DETAIL = "Ya hay una respuesta en curso para esta entrevista. Espera a que termine antes de enviar otro mensaje."
+
+
+@contextmanager
+def database_lock(name: str, timeout: float) -> Iterator[bool]:
+    """
+    Hold a MySQL named lock on a dedicated connection.
+
+    Named locks belong to the connection, and request sessions hand theirs back
+    to the pool on every commit, so the lock gets its own connection. On other
+    databases (SQLite in development and tests) there is nothing to share and
+    the lock is always granted.
+
+    Args:
+        name (str): Name of the lock.
+        timeout (float): Seconds to wait for it (0 returns immediately).
+
+    Yields:
+        bool: Whether the lock is held.
+    """
+    if engine.dialect.name != "mysql":
+        yield True
+        return
+
+    with engine.connect() as conn:
+        acquired = conn.execute(text("SELECT GET_LOCK(:name, :timeout)"), {"name": name, "timeout": timeout}).scalar() == 1
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                conn.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": name})
+
+
+class ChatLocks:
+    """Per-chat single-flight locks with an optional cross-worker backend."""
+
+    def __init__(self, backend: str, timeout: float, name: str = "chat"):
+        """
+        Args:
+            backend (str): 'local' (per process) or 'mysql' (named database locks).
+            timeout (float): Seconds to wait for a busy chat (0 rejects immediately).
+            name (str): Part of the MySQL lock names, so separate sets of locks never collide.
+        """
+        self.backend = backend
+        self.timeout = timeout
+        self.name = name
+        self._locks: dict[int, list] = {}  # chat_id -> [lock, holders and waiters]
+        self._guard = threading.Lock()
+
+    def _acquire_local(self, chat_id: int, timeout: float) -> bool:
+        with self._guard:
+            entry = self._locks.setdefault(chat_id, [threading.Lock(), 0])
+            entry[1] += 1
+        acquired = entry[0].acquire(timeout=timeout) if timeout > 0 else entry[0].acquire(blocking=False)
+        if not acquired:
+            self._forget(chat_id)
+        return acquired
+
+    def _release_local(self, chat_id: int) -> None:
+        self._locks[chat_id][0].release()
+        self._forget(chat_id)
+
+    def _forget(self, chat_id: int) -> None:
+        with self._guard:
+            entry = self._locks[chat_id]
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._locks[chat_id]
+
+    @contextmanager
+    def _database_lock(self, chat_id: int, timeout: float) -> Iterator[None]:
+        """Hold the chat's MySQL named lock when the ``mysql`` backend is configured."""
+        if self.backend != "mysql":
+            yield
+            return
+
+        with database_lock(f"aula_{self.name}_{chat_id}", timeout) as acquired:
+            if not acquired:
+                raise HTTPException(status_code=409, detail=CHAT_BUSY_DETAIL)
+            yield
+
+    @contextmanager
+    def hold(self, chat_id: int) -> Iterator[None]:
+        """
+        Run a block while holding the lock of a chat.
+
+        Args:
+            chat_id (int): ID of the chat.
+
+        Raises:
+            HTTPException: 409 if another turn of the chat is still running after the timeout.
+        """
+        deadline = time.monotonic() + self.timeout
+        if not self._acquire_local(chat_id, self.timeout):
+            logger.warning(f"⏳ Chat {chat_id} busy, rejecting overlapping turn")
+            raise HTTPException(status_code=409, detail=CHAT_BUSY_DETAIL)
+        try:
+            with self._database_lock(chat_id, max(0.0, deadline - time.monotonic())):
+                yield
+        finally:
+            self._release_local(chat_id)
+
+
+    @contextmanager
+    def try_hold(self, chat_id: int) -> Iterator[bool]:
+        """
+        Run a block holding the lock of a chat only if it is free right now.
+
+        Args:
+            chat_id (int): ID of the chat.
+
+        Yields:
+            bool: Whether the lock is held (the block should do nothing otherwise).
+        """
+        if not self._acquire_local(chat_id, 0):
+            yield False
+            return
+        try:
+            if self.backend != "mysql":
+                yield True
+            else:
+                with database_lock(f"aula_{self.name}_{chat_id}", 0) as acquired:
+                    yield acquired
+        finally:
+            self._release_local(chat_id)
+
+
+chat_locks = ChatLocks(settings.chat_lock_backend, settings.chat_lock_timeout_seconds)
+summary_locks = ChatLocks(settings.chat_lock_backend, 0, name="summary")
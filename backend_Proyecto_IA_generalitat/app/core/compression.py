@@ -0,0 +1,141 @@
+"""
+Response Compression.
+
+This module provides an ASGI middleware that compresses HTTP responses (message
+lists, chat lists, AI replies: long Spanish text that shrinks several times) with
+gzip or, when the optional ``brotli`` package is installed, brotli.
+
+Only complete bodies are compressed: a response that arrives in several chunks
+(PDF/ZIP downloads, server-sent events, any ``StreamingResponse``) is passed
+through untouched so that it is never buffered. Already-compressed content types
+are skipped as well.
+"""
+
+import gzip
+import logging
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # optional dependency, only needed for RESPONSE_COMPRESSION=br
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Content types that are already compressed or must reach the client chunk by chunk
+EXCLUDED_CONTENT_TYPES = (
+    "application/pdf",
+    "application/zip",
+    "application/gzip",
+    "text/event-stream",
+    "image/",
+    "audio/",
+    "video/",
+)
+
+
+def accepted_encodings(accept_encoding: str) -> set[str]:
+    """
+    Parse an ``Accept-Encoding`` header.
+
+    Args:
+        accept_encoding (str): The header value.
+
+    Returns:
+        set[str]: Encodings the client accepts (those with ``q=0`` are excluded).
+    """
+    accepted = set()
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        params = params.replace(" ", "")
+        if name and params not in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            accepted.add(name.lower())
+    return accepted
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing complete response bodies above a size threshold."""
+
+    def __init__(self, app: ASGIApp, encoding: str = "gzip", minimum_size: int = 1024, level: int = 6):
+        """
+        Args:
+            app (ASGIApp): The wrapped application.
+            encoding (str): Preferred encoding: 'gzip', 'br' or 'none' (disabled).
+            minimum_size (int): Bodies smaller than this are sent as they are.
+            level (int): Compression level (gzip 1-9, brotli quality 0-11).
+        """
+        if encoding == "br" and brotli is None:
+            logger.warning("⚠️ RESPONSE_COMPRESSION=br but the 'brotli' package is not installed; using gzip")
+            encoding = "gzip"
+        self.app = app
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.level = level
+
+    def _choose_encoding(self, scope: Scope) -> str | None:
+        """Return the encoding to use for a request, or None to leave the response as is."""
+        accepted = accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        if self.encoding in accepted:
+            return self.encoding
+        if "gzip" in accepted:
+            return "gzip"
+        return None
+
+    def _compress(self, encoding: str, body: bytes) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=min(self.level, 11))
+        return gzip.compress(body, compresslevel=min(max(self.level, 1), 9), mtime=0)
+
+    def _compressible(self, start: Message, headers: MutableHeaders, size: int) -> bool:
+        """Check whether a complete response should be compressed."""
+        if size < self.minimum_size or start["status"] in (204, 206, 304):
+            return False
+        if "content-encoding" in headers or "content-range" in headers:
+            return False
+        content_type = headers.get("content-type", "").lower()
+        return not content_type.startswith(EXCLUDED_CONTENT_TYPES)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self.encoding == "none":
+            await self.app(scope, receive, send)
+            return
+        encoding = self._choose_encoding(scope)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Message | None = None
+        started = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, started
+            if message["type"] == "http.response.start":
+                # Hold the headers until the first body chunk shows whether the body is complete
+                start = message
+                return
+            if started or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            started = True
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=start["headers"])
+            if message.get("more_body", False) or not self._compressible(start, headers, len(body)):
+                await send(start)
+                await send(message)
+                return
+
+            compressed = self._compress(encoding, body)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                # The bytes differ from the identity representation, so a strong validator no longer applies
+                headers["ETag"] = f"W/{etag}"
+            await send(start)
+            await send({"type": "http.response.body", "body": compressed, "more_body": False})
+
+        await self.app(scope, receive, send_compressed)
@@ -15,14 +15,57 @@ class Settings(BaseSettings):
     
     Attributes:
         database_url (str): The database connection URL.
+        database_replica_url (str | None): Read replica URL used by read-only routes (None disables it).
+        replica_read_your_writes_seconds (float): Seconds a user's reads stay on the primary after a write.
         jwt_secret (str): Secret key for signing JWT tokens.
         jwt_alg (str): Algorithm used for JWT signing (default: HS256).
         access_token_expire_minutes (int): Token expiration time in minutes.
         timezone (str): Default timezone offset (default: +02:00).
         aws_region (str): AWS region for Bedrock services.
         bedrock_model_id (str): ID of the Bedrock model to use.
+        bedrock_invocation_mode (str): 'agent' (Bedrock Agent session) or 'model' (direct Converse call).
+        bedrock_history_token_budget (int): Estimated tokens of history sent per direct model call.
+        bedrock_history_max_messages (int): Maximum messages of history sent per direct model call.
+        bedrock_prompt_cache (bool): Mark the system prompt as a cacheable prefix in direct calls
+            (only for models with prompt caching; others reject the request).
+        bedrock_agent_backend (str): 'live', 'record' (live calls saved to disk) or 'replay' (recorded responses).
+        bedrock_agent_recordings_dir (str): Folder of the recorded agent responses.
+        bedrock_agent_replay_speed (float): Replay timing factor (1 recorded delays, 0 no delays).
+        summary_every_n_turns (int): Turns between rolling summary refreshes (0 disables summaries).
+        summary_recent_messages (int): Most recent messages always sent verbatim next to the summary.
+        summary_max_tokens (int): Maximum tokens of a generated summary.
+        pdf_spool_max_size (int): Bytes of a rendered PDF kept in memory before spilling to disk.
+        pdf_stream_chunk_size (int): Chunk size in bytes used when streaming PDF files.
+        pdf_render_pool_size (int): Number of pre-warmed PDF renderer processes (0 renders in-process).
+        pdf_render_queue_depth (int): Render jobs allowed to wait when every renderer is busy.
+        pdf_render_timeout_seconds (float): Maximum time to wait for a single PDF render.
+        report_cache_dir (str): Folder for cached PDF reports (defaults to the system temp dir).
+        report_batch_concurrency (int): Reports generated in parallel by the batch export.
+        idempotency_ttl_seconds (int): How long an Idempotency-Key is remembered by the AI routes.
+        duplicate_turn_window_seconds (int): Seconds during which a repeated identical message is rejected (0 disables).
+        chat_lock_backend (str): 'local' (per-process chat locks) or 'mysql' (GET_LOCK across workers).
+        chat_lock_timeout_seconds (float): Time an AI turn waits for a busy chat (0 rejects immediately).
+        chat_purge_retention_days (int): Days a deleted chat is kept before it is purged.
+        chat_purge_interval_seconds (int): Seconds between purge runs (0 disables the background purge).
+        chat_purge_batch_size (int): Chats removed per DELETE statement while purging.
+        archive_after_days (int): Days after completion before an interview's messages are archived.
+        archive_interval_seconds (int): Seconds between archival runs (0 disables archiving).
+        archive_batch_size (int): Chats archived per run.
+        message_compression (str): 'none' or 'zlib' storage for long message contents.
+        message_compression_min_length (int): Minimum characters for a message to be stored compressed.
+        message_compression_level (int): zlib compression level (1-9).
+        response_compression (str): 'none', 'gzip' or 'br' (brotli, falls back to gzip) for HTTP responses.
+        response_compression_min_size (int): Minimum body size in bytes for a response to be compressed.
+        response_compression_level (int): Compression level (gzip 1-9, brotli quality 0-11).
+        completed_page_cache_entries (int): Serialized message pages of completed chats kept in memory (0 disables).
+        profiling_token (str): Value of the admin-only ``X-Profile`` header that profiles a request ('' disables it).
+        profiling_sample_rate (float): Fraction of requests profiled without the header (0 disables sampling).
+        profiling_interval_ms (float): Milliseconds between stack samples of a profiled request.
+        profiling_output_dir (str): Folder for the profiles (defaults to the system temp dir).
     """
     database_url: str
+    database_replica_url: str | None = None
+    replica_read_your_writes_seconds: float = 5.0
     jwt_secret: str
     jwt_alg: str = "HS256"
     access_token_expire_minutes: int = 60
@@ -30,6 +73,52 @@ class Settings(BaseSettings):
 
     aws_region: str = "eu-west-1"
     bedrock_model_id: str = ""
+    bedrock_invocation_mode: str = "agent"
+    bedrock_history_token_budget: int = 6000
+    bedrock_history_max_messages: int = 40
+    bedrock_prompt_cache: bool = False
+    bedrock_agent_backend: str = "live"
+    bedrock_agent_recordings_dir: str = "agent_recordings"
+    bedrock_agent_replay_speed: float = 1.0
+
+    summary_every_n_turns: int = 10
+    summary_recent_messages: int = 12
+    summary_max_tokens: int = 700
+
+    pdf_spool_max_size: int = 512 * 1024
+    pdf_stream_chunk_size: int = 64 * 1024
+    pdf_render_pool_size: int = 0
+    pdf_render_queue_depth: int = 8
+    pdf_render_timeout_seconds: float = 60.0
+    report_cache_dir: str = ""
+    report_batch_concurrency: int = 4
+
+    idempotency_ttl_seconds: int = 600
+    duplicate_turn_window_seconds: int = 10
+    chat_lock_backend: str = "local"
+    chat_lock_timeout_seconds: float = 0.0
+
+    chat_purge_retention_days: int = 7
+    chat_purge_interval_seconds: int = 3600
+    chat_purge_batch_size: int = 500
+
+    archive_after_days: int = 30
+    archive_interval_seconds: int = 3600
+    archive_batch_size: int = 200
+
+    message_compression: str = "none"
+    message_compression_min_length: int = 1024
+    message_compression_level: int = 6
+
+    response_compression: str = "gzip"
+    response_compression_min_size: int = 1024
+    response_compression_level: int = 6
+    completed_page_cache_entries: int = 256
+
+    profiling_token: str = ""
+    profiling_sample_rate: float = 0.0
+    profiling_interval_ms: float = 5.0
+    profiling_output_dir: str = ""
     
     @field_validator('jwt_secret')
     @classmethod
@@ -50,6 +139,120 @@ class Settings(BaseSettings):
             raise ValueError('JWT secret must be at least 32 characters for security')
         return v
     
+    @field_validator('bedrock_invocation_mode')
+    @classmethod
+    def validate_bedrock_invocation_mode(cls, v: str) -> str:
+        """
+        Validate the Bedrock invocation mode.
+        
+        Args:
+            v (str): The invocation mode.
+            
+        Returns:
+            str: The validated mode.
+            
+        Raises:
+            ValueError: If the mode is not 'agent' or 'model'.
+        """
+        if v not in ('agent', 'model'):
+            raise ValueError("Bedrock invocation mode must be 'agent' or 'model'")
+        return v
+
+    @field_validator('message_compression')
+    @classmethod
+    def validate_message_compression(cls, v: str) -> str:
+        """
+        Validate the message compression format.
+        
+        Args:
+            v (str): The compression format.
+            
+        Returns:
+            str: The validated format.
+            
+        Raises:
+            ValueError: If the format is not 'none' or 'zlib'.
+        """
+        if v not in ('none', 'zlib'):
+            raise ValueError("Message compression must be 'none' or 'zlib'")
+        return v
+
+    @field_validator('response_compression')
+    @classmethod
+    def validate_response_compression(cls, v: str) -> str:
+        """
+        Validate the HTTP response compression encoding.
+        
+        Args:
+            v (str): The encoding.
+            
+        Returns:
+            str: The validated encoding.
+            
+        Raises:
+            ValueError: If the encoding is not 'none', 'gzip' or 'br'.
+        """
+        if v not in ('none', 'gzip', 'br'):
+            raise ValueError("Response compression must be 'none', 'gzip' or 'br'")
+        return v
+
+    @field_validator('bedrock_agent_backend')
+    @classmethod
+    def validate_bedrock_agent_backend(cls, v: str) -> str:
+        """
+        Validate the Bedrock Agent backend.
+        
+        Args:
+            v (str): The backend name.
+            
+        Returns:
+            str: The validated backend.
+            
+        Raises:
+            ValueError: If the backend is not 'live', 'record' or 'replay'.
+        """
+        if v not in ('live', 'record', 'replay'):
+            raise ValueError("Bedrock agent backend must be 'live', 'record' or 'replay'")
+        return v
+
+    @field_validator('profiling_sample_rate')
+    @classmethod
+    def validate_profiling_sample_rate(cls, v: float) -> float:
+        """
+        Validate the profiling sample rate.
+        
+        Args:
+            v (float): The fraction of requests to profile.
+            
+        Returns:
+            float: The validated rate.
+            
+        Raises:
+            ValueError: If the rate is not between 0 and 1.
+        """
+        if not 0 <= v <= 1:
+            raise ValueError("Profiling sample rate must be between 0 and 1")
+        return v
+
+    @field_validator('chat_lock_backend')
+    @classmethod
+    def validate_chat_lock_backend(cls, v: str) -> str:
+        """
+        Validate the chat lock backend.
+        
+        Args:
+            v (str): The backend name.
+            
+        Returns:
+            str: The validated backend.
+            
+        Raises:
+            ValueError: If the backend is not 'local' or 'mysql'.
+        """
+        if v not in ('local', 'mysql'):
+            raise ValueError("Chat lock backend must be 'local' or 'mysql'")
+        return v
+
     @field_validator('timezone')
     @classmethod
     def validate_timezone(cls, v: str) -> str:
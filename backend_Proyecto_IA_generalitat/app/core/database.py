@@ -2,14 +2,25 @@
 Database Configuration.
 
 This module sets up the SQLAlchemy engine, session factory, and base class for models.
-It also configures the database timezone and provides a dependency for getting database sessions.
+It also configures the database timezone and provides dependencies for getting database
+sessions: ``get_db`` (primary), ``get_read_db`` (read replica when configured) and
+``get_async_db`` (``AsyncSession`` for async routes).
 """
 
-from sqlalchemy import create_engine, event
-from sqlalchemy.orm import sessionmaker, DeclarativeBase
+import threading
+import time
+
+from sqlalchemy import create_engine, event, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker, DeclarativeBase
+from sqlalchemy.sql.dml import UpdateBase
 from app.core.config import settings
 
 engine = create_engine(settings.database_url, pool_pre_ping=True)
+replica_engine = (
+    create_engine(settings.database_replica_url, pool_pre_ping=True)
+    if settings.database_replica_url else None
+)
 
 # Set timezone for MySQL connections from config
 @event.listens_for(engine, "connect")
@@ -21,11 +32,176 @@ def set_mysql_timezone(dbapi_conn, connection_record):
         dbapi_conn: The raw DBAPI connection object.
         connection_record: The SQLAlchemy connection record.
     """
+    if engine.dialect.name != "mysql":
+        return
     cursor = dbapi_conn.cursor()
     cursor.execute(f"SET time_zone='{settings.timezone}'")
     cursor.close()
 
+@event.listens_for(engine, "connect")
+def enable_sqlite_foreign_keys(dbapi_conn, connection_record):
+    """
+    Event listener to enforce foreign keys on SQLite connections.
+    
+    SQLite ignores foreign keys (and ON DELETE CASCADE) unless enabled per connection.
+    
+    Args:
+        dbapi_conn: The raw DBAPI connection object.
+        connection_record: The SQLAlchemy connection record.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    cursor = dbapi_conn.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+if replica_engine is not None:
+    # The replica has the same backend as the primary, so it needs the same session setup
+    event.listen(replica_engine, "connect", set_mysql_timezone)
+    event.listen(replica_engine, "connect", enable_sqlite_foreign_keys)
+
+
+class RoutingSession(Session):
+    """
+    Session that reads from the replica and sends every write to the primary.
+    
+    Once the session has flushed (written) anything, it keeps using the primary so
+    it always sees its own changes.
+    """
+
+    def __init__(self, primary, replica=None, **kwargs):
+        """
+        Args:
+            primary (Engine): Engine used for writes (and reads if there is no replica).
+            replica (Engine | None): Engine used for reads.
+            **kwargs: Passed on to ``Session`` (``bind`` is always the primary).
+        """
+        kwargs["bind"] = primary
+        super().__init__(**kwargs)
+        self.primary = primary
+        self.replica = replica
+        self.use_primary = replica is None
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        """Return the primary for flushes and INSERT/UPDATE/DELETE, else the replica."""
+        if self.use_primary or self._flushing or isinstance(clause, UpdateBase):
+            self.use_primary = True
+            return self.primary
+        return self.replica
+
+
+class RecentWrites:
+    """
+    Remember which users wrote recently (read-your-writes for ``get_read_db``).
+    
+    Replicas lag behind the primary, so a user who has just written is served from
+    the primary for ``window_seconds``. The registry is per process: run with sticky
+    sessions (or set a wider window) when several workers share the replica.
+    """
+
+    def __init__(self, window_seconds: float, max_entries: int = 10000):
+        """
+        Args:
+            window_seconds (float): How long a user's reads stay on the primary after a write.
+            max_entries (int): Entries kept before expired ones are pruned.
+        """
+        self.window_seconds = window_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._written_at: dict[int, float] = {}
+
+    def mark(self, user_id: int) -> None:
+        """Record that ``user_id`` has just committed a write."""
+        now = time.monotonic()
+        with self._lock:
+            self._written_at[user_id] = now
+            if len(self._written_at) > self.max_entries:
+                cutoff = now - self.window_seconds
+                self._written_at = {uid: at for uid, at in self._written_at.items() if at > cutoff}
+
+    def wrote_recently(self, user_id: int) -> bool:
+        """Whether ``user_id`` wrote within the read-your-writes window."""
+        with self._lock:
+            written_at = self._written_at.get(user_id)
+        return written_at is not None and time.monotonic() - written_at < self.window_seconds
+
+
+recent_writes = RecentWrites(settings.replica_read_your_writes_seconds)
+
+
+@event.listens_for(Session, "after_flush")
+def flag_session_write(session, flush_context):
+    """Remember that the session wrote something in the current transaction."""
+    session.info["wrote"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def mark_user_write(session):
+    """
+    Register a committed write for the session's user (set by ``get_current_user``).
+    
+    Sessions without a user (background jobs) are ignored.
+    """
+    user_id = session.info.get("user_id")
+    if session.info.pop("wrote", False) and user_id is not None:
+        recent_writes.mark(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def clear_session_write(session):
+    """Forget uncommitted writes."""
+    session.info.pop("wrote", None)
+
+
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+ReadSessionLocal = sessionmaker(
+    class_=RoutingSession, primary=engine, replica=replica_engine, autocommit=False, autoflush=False
+)
+
+ASYNC_DRIVERS = {"mysql": "aiomysql", "sqlite": "aiosqlite"}
+
+AsyncSessionLocal = async_sessionmaker(class_=AsyncSession, autoflush=False, expire_on_commit=False)
+_async_engine: AsyncEngine | None = None
+
+
+def async_database_url(url: str) -> str:
+    """
+    Return the async-driver equivalent of a database URL.
+    
+    Args:
+        url (str): Sync URL such as ``mysql+pymysql://...`` or ``sqlite:///...``.
+        
+    Returns:
+        str: The same database with its async driver (``mysql+aiomysql``, ``sqlite+aiosqlite``).
+    """
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None or parsed.get_driver_name() == driver:
+        return url
+    return parsed.set(drivername=f"{parsed.get_backend_name()}+{driver}").render_as_string(hide_password=False)
+
+
+def get_async_engine() -> AsyncEngine:
+    """
+    Return the async engine for the primary database, creating it on first use.
+    
+    Returns:
+        AsyncEngine: Engine on ``async_database_url(settings.database_url)``.
+    """
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = create_async_engine(async_database_url(settings.database_url), pool_pre_ping=True)
+        event.listen(_async_engine.sync_engine, "connect", set_mysql_timezone)
+        event.listen(_async_engine.sync_engine, "connect", enable_sqlite_foreign_keys)
+    return _async_engine
+
+
+async def dispose_async_engine() -> None:
+    """Close the async engine's connections (on shutdown)."""
+    global _async_engine
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
 
 class Base(DeclarativeBase):
     """Base class for all SQLAlchemy models."""
@@ -45,3 +221,31 @@ def get_db():
         yield db
     finally:
         db.close()
+
+def read_session_for(user_id: int | None) -> Session:
+    """
+    Open a session for a read-only request.
+    
+    Args:
+        user_id (int | None): The requesting user, if known.
+        
+    Returns:
+        Session: A primary session if there is no replica or the user wrote recently,
+            else a ``RoutingSession`` reading from the replica.
+    """
+    if replica_engine is None or user_id is None or recent_writes.wrote_recently(user_id):
+        return SessionLocal()
+    return ReadSessionLocal()
+
+async def get_async_db():
+    """
+    Async database session dependency for FastAPI routes.
+    
+    Yields:
+        AsyncSession: A SQLAlchemy async session (``expire_on_commit=False``, so
+            objects stay usable after commit without lazy loads).
+        
+    Ensures the session is closed after use.
+    """
+    async with AsyncSessionLocal(bind=get_async_engine()) as db:
+        yield db
@@ -0,0 +1,203 @@
+"""
+Idempotency Keys.
+
+This module maps client supplied ``Idempotency-Key`` headers to the message produced
+for that request, so a client retry returns the already generated message instead of
+repeating the Bedrock call.
+
+It also remembers the last turn of each chat for a few seconds, so a message sent
+twice without a key (a double submit) is rejected before it is stored again.
+
+Both live in the ``idempotency_keys`` table and are written in the same transaction
+as the turn, so every worker sees them and a key is only recorded if its turn was
+committed. Callers look them up while holding the chat's lock: a retry that arrives
+while the first request is still running waits for it (or gets the chat-busy 409)
+and then receives its result. The unique (user, route, key) constraint makes a turn
+committed by two workers at once fail instead of being stored twice.
+"""
+
+import hashlib
+from datetime import datetime, timedelta
+
+from fastapi import HTTPException
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.idempotency_key import IdempotencyKey
+
+RECENT_TURN_ROUTE = "recent_turn"
+
+
+def _fingerprint(*parts) -> str:
+    return hashlib.sha256(repr(parts).encode("utf-8")).hexdigest()
+
+
+def _find(db: Session, user_id: int, route: str, key: str) -> IdempotencyKey | None:
+    """Return the live row of a key (expired rows are ignored)."""
+    return db.scalars(
+        select(IdempotencyKey).where(
+            IdempotencyKey.id_usuario == user_id,
+            IdempotencyKey.route == route,
+            IdempotencyKey.idem_key == key,
+            IdempotencyKey.expires_at > datetime.now(),
+        )
+    ).first()
+
+
+def _replace(db: Session, user_id: int, route: str, key: str, fingerprint: str, message_id: int | None, ttl: int) -> None:
+    """Store a key in the session's transaction, updating its previous row if there is one."""
+    values = {
+        "fingerprint": fingerprint,
+        "id_mensaje": message_id,
+        "expires_at": datetime.now() + timedelta(seconds=ttl),
+    }
+    updated = db.execute(
+        update(IdempotencyKey)
+        .where(
+            IdempotencyKey.id_usuario == user_id,
+            IdempotencyKey.route == route,
+            IdempotencyKey.idem_key == key,
+        )
+        .values(**values)
+    ).rowcount
+    if not updated:
+        db.add(IdempotencyKey(id_usuario=user_id, route=route, idem_key=key, **values))
+
+
+class IdempotencyGuard:
+    """
+    Idempotency key of a request.
+
+    Attributes:
+        cached_id (int | None): Message ID produced by a previous request with the same key.
+    """
+
+    def __init__(
+        self,
+        store: "IdempotencyStore",
+        entry: tuple[int, str, str, str] | None,
+        cached_id: int | None = None,
+    ):
+        self._store = store
+        self._entry = entry  # (user ID, route, key, fingerprint)
+        self.cached_id = cached_id
+
+    def complete(self, db: Session, message_id: int) -> None:
+        """
+        Record the message produced for this key.
+
+        Must be called before the turn is committed: the key is stored in the same
+        transaction, so a failed request leaves no key and the client can retry.
+
+        Args:
+            db (Session): Session of the turn.
+            message_id (int): ID of the message returned to the client.
+        """
+        if self._entry is not None and self.cached_id is None:
+            user_id, route, key, fingerprint = self._entry
+            _replace(db, user_id, route, key, fingerprint, message_id, self._store.ttl_seconds)
+
+
+class IdempotencyStore:
+    """Database-backed store of idempotency key -> (payload fingerprint, message ID)."""
+
+    def __init__(self, ttl_seconds: int):
+        """
+        Args:
+            ttl_seconds (int): How long a key is remembered.
+        """
+        self.ttl_seconds = ttl_seconds
+
+    def guard(self, db: Session, user_id: int, route: str, key: str | None, *payload_parts) -> IdempotencyGuard:
+        """
+        Look up an idempotency key for a request.
+
+        Callers must hold the chat's lock, so a request with the same key cannot
+        be running at the same time.
+
+        Args:
+            db (Session): Database session.
+            user_id (int): Authenticated user (keys are scoped per user and route).
+            route (str): Name of the route.
+            key (str | None): Value of the Idempotency-Key header; None disables the guard.
+            *payload_parts: Request values that must match on a retry with the same key.
+
+        Returns:
+            IdempotencyGuard: Guard whose ``cached_id`` is set when the request was already served.
+
+        Raises:
+            HTTPException: 422 if the key was used with a different payload.
+        """
+        if not key:
+            return IdempotencyGuard(self, None)
+
+        fingerprint = _fingerprint(*payload_parts)
+        row = _find(db, user_id, route, key)
+        if row is None:
+            return IdempotencyGuard(self, (user_id, route, key, fingerprint))
+        if row.fingerprint != fingerprint:
+            raise HTTPException(status_code=422, detail="Idempotency-Key reused with a different request body")
+        return IdempotencyGuard(self, None, cached_id=row.id_mensaje)
+
+    def purge_expired(self, db: Session, now: datetime | None = None) -> int:
+        """
+        Delete expired keys and recent turns.
+
+        Args:
+            db (Session): Database session.
+            now (datetime | None): Reference time (defaults to the current time).
+
+        Returns:
+            int: Number of rows deleted.
+        """
+        result = db.execute(delete(IdempotencyKey).where(IdempotencyKey.expires_at <= (now or datetime.now())))
+        db.commit()
+        return result.rowcount
+
+
+class RecentTurns:
+    """Database-backed record of the last user message stored in each chat."""
+
+    def __init__(self, window_seconds: int):
+        """
+        Args:
+            window_seconds (int): How long a turn counts as recent (0 disables the check).
+        """
+        self.window_seconds = window_seconds
+
+    def is_duplicate(self, db: Session, user_id: int, chat_id: int, contenido: str) -> bool:
+        """
+        Check whether a message repeats the chat's last turn within the window.
+
+        Args:
+            db (Session): Database session.
+            user_id (int): Owner of the chat.
+            chat_id (int): ID of the chat.
+            contenido (str): The new user message.
+
+        Returns:
+            bool: True if the same message was stored for the chat moments ago.
+        """
+        if self.window_seconds <= 0:
+            return False
+        row = _find(db, user_id, RECENT_TURN_ROUTE, str(chat_id))
+        return row is not None and row.fingerprint == _fingerprint(contenido.strip())
+
+    def remember(self, db: Session, user_id: int, chat_id: int, contenido: str) -> None:
+        """
+        Record the user message of a turn, in the turn's transaction (before commit).
+
+        Args:
+            db (Session): Session of the turn.
+            user_id (int): Owner of the chat.
+            chat_id (int): ID of the chat.
+            contenido (str): The stored user message.
+        """
+        if self.window_seconds <= 0:
+            return
+        _replace(db, user_id, RECENT_TURN_ROUTE, str(chat_id), _fingerprint(contenido.strip()), None, self.window_seconds)
+
+
+idempotency_store = IdempotencyStore(settings.idempotency_ttl_seconds)
+recent_turns = RecentTurns(settings.duplicate_turn_window_seconds)
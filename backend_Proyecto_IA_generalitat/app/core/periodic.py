@@ -0,0 +1,80 @@
+"""
+Periodic Tasks.
+
+This module runs database maintenance jobs (purging deleted chats, archiving old
+interviews) on a background thread at a fixed interval, each run with its own session.
+Every uvicorn worker starts the threads, so on MySQL each run first takes a named lock
+(``GET_LOCK``) and is skipped if another worker is already running the same job.
+"""
+
+import logging
+import threading
+from typing import Callable
+
+from sqlalchemy.orm import Session
+
+from app.core.chat_lock import database_lock
+from app.core.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicTask:
+    """Background thread that calls a job with a fresh session every interval."""
+
+    def __init__(self, name: str, job: Callable[[Session], object], interval_seconds: Callable[[], float]):
+        """
+        Args:
+            name (str): Name of the task (used for the thread and logs).
+            job (Callable[[Session], object]): Function run on every tick.
+            interval_seconds (Callable[[], float]): Returns the interval; 0 or less disables the task.
+        """
+        self.name = name
+        self.job = job
+        self.interval_seconds = interval_seconds
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def run_once(self) -> bool:
+        """
+        Run the job once, unless another worker is running it.
+
+        Returns:
+            bool: Whether the job ran.
+        """
+        with database_lock(f"aula_task_{self.name}", 0) as acquired:
+            if not acquired:
+                logger.info(f"Periodic task {self.name} is running in another worker, skipping")
+                return False
+            db = SessionLocal()
+            try:
+                self.job(db)
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Periodic task {self.name} failed: {e}", exc_info=True)
+            finally:
+                db.close()
+            return True
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"Periodic task {self.name} could not take its lock: {e}", exc_info=True)
+            self._stop.wait(self.interval_seconds())
+
+    def start(self) -> None:
+        """Start the background thread (no-op if disabled or already running)."""
+        if self.interval_seconds() <= 0 or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+            self._thread = None
@@ -0,0 +1,183 @@
+"""
+Per-Request Profiling.
+
+This module provides an opt-in ASGI middleware that profiles single requests in
+production, to tell whether a slow reply or report spent its time in the database,
+input sanitization, Bedrock or WeasyPrint.
+
+A request is profiled when it carries ``X-Profile: <PROFILING_TOKEN>`` (the token is
+only given to administrators) or when it is picked by ``PROFILING_SAMPLE_RATE``.
+While it runs, a background thread samples the stacks of every thread executing
+application code (sync routes run in the threadpool, not in the event loop thread)
+and ``tracemalloc`` traces allocations. Two files are written per profile:
+
+- ``<id>.folded``: collapsed stacks (``frame;frame;frame count``), ready for
+  ``flamegraph.pl`` or https://www.speedscope.app,
+- ``<id>.alloc.txt``: wall time, peak traced memory and the top allocation sites.
+
+One request is profiled at a time per process; on a busy worker the samples may
+include concurrent requests running application code. When both settings are off
+the middleware is not installed at all.
+"""
+
+import hmac
+import logging
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import Counter
+from pathlib import Path
+
+from fastapi.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+APP_DIR = str(Path(__file__).resolve().parent.parent)
+TOP_ALLOCATIONS = 25
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    filename = code.co_filename
+    if filename.startswith(APP_DIR):
+        filename = "app" + filename[len(APP_DIR):]
+    else:
+        filename = Path(filename).name
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """Background thread collecting the call stacks of the threads running application code."""
+
+    def __init__(self, interval: float):
+        """
+        Args:
+            interval (float): Seconds between samples.
+        """
+        self.interval = interval
+        self.samples = 0
+        self.stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            self.samples += 1
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                in_app = False
+                while frame is not None:
+                    in_app = in_app or frame.f_code.co_filename.startswith(APP_DIR)
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                if in_app:
+                    stack.append(names.get(ident, str(ident)))
+                    self.stacks[";".join(reversed(stack))] += 1
+
+    def folded(self) -> str:
+        """Return the samples in collapsed-stack format."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class ProfilingMiddleware:
+    """ASGI middleware profiling requests chosen by an admin header or by sampling."""
+
+    def __init__(self, app: ASGIApp, token: str = "", sample_rate: float = 0.0, interval_ms: float = 5.0,
+                 output_dir: str = ""):
+        """
+        Args:
+            app (ASGIApp): The wrapped application.
+            token (str): Value of the ``X-Profile`` header that enables profiling ('' disables the header).
+            sample_rate (float): Fraction of requests profiled without the header (0-1).
+            interval_ms (float): Milliseconds between stack samples.
+            output_dir (str): Folder for the profiles (defaults to ``<tmp>/aula_profiles``).
+        """
+        self.app = app
+        self.token = token
+        self.sample_rate = sample_rate
+        self.interval = interval_ms / 1000
+        self.output_dir = Path(output_dir or Path(tempfile.gettempdir()) / "aula_profiles")
+        self._busy = threading.Lock()
+
+    def _wanted(self, scope: Scope) -> bool:
+        """Check whether a request should be profiled."""
+        header = Headers(scope=scope).get("x-profile")
+        if header is not None and self.token:
+            return hmac.compare_digest(header.encode(), self.token.encode())
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._wanted(scope) or not self._busy.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+
+        async def send_with_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)["X-Profile-Id"] = profile_id
+            await send(message)
+
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        sampler = StackSampler(self.interval)
+        sampler.start()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            wall_ms = (time.perf_counter() - start) * 1000
+            sampler.stop()
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            if started_tracing:
+                tracemalloc.stop()
+            self._busy.release()
+            route = f"{scope['method']} {scope['path']}"
+            await run_in_threadpool(self._save, profile_id, route, wall_ms, sampler, snapshot, peak)
+
+    def _save(self, profile_id: str, route: str, wall_ms: float, sampler: StackSampler,
+              snapshot: tracemalloc.Snapshot, peak: int) -> None:
+        """Write the profile files. Failures are logged and never raised."""
+        snapshot = snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ))
+        lines = [
+            f"{route}",
+            f"wall time: {wall_ms:.1f} ms, stack samples: {sampler.samples}, peak traced memory: {peak / 1024:.1f} KiB",
+            "",
+            f"Top {TOP_ALLOCATIONS} allocation sites (still allocated at the end of the request):",
+        ]
+        for stat in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]:
+            frame = stat.traceback[0]
+            lines.append(f"{stat.size / 1024:10.1f} KiB {stat.count:8} blocks  {frame.filename}:{frame.lineno}")
+
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", route).strip("_")[:60]
+        try:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            (self.output_dir / f"{profile_id}_{slug}.folded").write_text(sampler.folded(), encoding="utf-8")
+            (self.output_dir / f"{profile_id}_{slug}.alloc.txt").write_text("\n".join(lines) + "\n", encoding="utf-8")
+            logger.info(f"🔬 Profiled {route} in {wall_ms:.0f} ms -> {self.output_dir / profile_id}_{slug}.*")
+        except OSError as e:
+            logger.warning(f"⚠️ Could not save profile {profile_id}: {str(e)}")
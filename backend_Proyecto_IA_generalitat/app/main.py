@@ -9,7 +9,7 @@ and root endpoints.
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy import text
 from jose import JWTError
@@ -19,8 +19,14 @@ from slowapi.errors import RateLimitExceeded
 from datetime import datetime
 import logging
 
-from app.core.database import Base, engine
+from app.core.compression import CompressionMiddleware
+from app.core.config import settings
+from app.core.profiling import ProfilingMiddleware
+from app.core.database import Base, dispose_async_engine, engine
 from app.api.v1.router import router as v1_router
+from app.services.ai.pdf_pool import get_pdf_render_pool, shutdown_pdf_render_pool
+from app.services.archive_service import archive_service
+from app.services.chat_purge_service import chat_purge_service
 from app.core.exceptions import (
     global_exception_handler,
     validation_exception_handler,
@@ -32,12 +38,17 @@ from app.core.exceptions import (
 from app.models.user import User  # noqa: F401
 from app.models.chat import Chat  # noqa: F401
 from app.models.message import Message  # noqa: F401
+from app.models.chat_summary import ChatSummary  # noqa: F401
+from app.models.chat_archive import ChatArchive, ChatArchiveSearch  # noqa: F401
+from app.models.user_stats import UserStats  # noqa: F401
+from app.models.chat_stats import ChatStats  # noqa: F401
+from app.models.idempotency_key import IdempotencyKey  # noqa: F401
 
 
 # Initialize rate limiter
 limiter = Limiter(key_func=get_remote_address, default_limits=["100/minute"])
 
-app = FastAPI(title="Aula Virtual - IA Entrevistador", version="1.0.0")
+app = FastAPI(title="Aula Virtual - IA Entrevistador", version="1.0.0", default_response_class=ORJSONResponse)
 app.state.limiter = limiter
 
 # Register exception handlers
@@ -47,6 +58,14 @@ app.add_exception_handler(SQLAlchemyError, database_exception_handler)
 app.add_exception_handler(JWTError, jwt_exception_handler)
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
+# Compress complete JSON bodies (streamed downloads pass through untouched)
+app.add_middleware(
+    CompressionMiddleware,
+    encoding=settings.response_compression,
+    minimum_size=settings.response_compression_min_size,
+    level=settings.response_compression_level,
+)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:5173"],
@@ -55,6 +74,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Opt-in profiling of single requests (added last, so it wraps every other middleware)
+if settings.profiling_token or settings.profiling_sample_rate > 0:
+    app.add_middleware(
+        ProfilingMiddleware,
+        token=settings.profiling_token,
+        sample_rate=settings.profiling_sample_rate,
+        interval_ms=settings.profiling_interval_ms,
+        output_dir=settings.profiling_output_dir,
+    )
+
 Base.metadata.create_all(bind=engine)
 
 logger = logging.getLogger(__name__)
@@ -62,6 +91,38 @@ logger = logging.getLogger(__name__)
 app.include_router(v1_router, prefix="/api/v1")
 
 
+@app.on_event("startup")
+def start_pdf_render_pool():
+    """Spawn the pre-warmed PDF renderer processes (if enabled) before serving traffic."""
+    get_pdf_render_pool()
+
+
+@app.on_event("shutdown")
+def stop_pdf_render_pool():
+    """Terminate the PDF renderer processes on shutdown."""
+    shutdown_pdf_render_pool()
+
+
+@app.on_event("startup")
+def start_maintenance_tasks():
+    """Start the background purge of deleted chats and archival of old interviews."""
+    chat_purge_service.task.start()
+    archive_service.task.start()
+
+
+@app.on_event("shutdown")
+def stop_maintenance_tasks():
+    """Stop the background maintenance tasks."""
+    chat_purge_service.task.stop()
+    archive_service.task.stop()
+
+
+@app.on_event("shutdown")
+async def close_async_engine():
+    """Close the connections of the async engine (if it was used)."""
+    await dispose_async_engine()
+
+
 @app.get("/health")
 async def health_check(request: Request):
     """
@@ -80,7 +141,6 @@ async def health_check(request: Request):
                       and an appropriate HTTP status code (200 or 503).
     """
     from app.core.database import get_db
-    from app.core.config import settings
     import boto3
     
     checks = {
@@ -21,18 +21,35 @@ class Chat(Base):
         created_at (datetime): Timestamp when the chat was created.
         last_message_at (datetime): Timestamp of the last message in the chat.
         completed_at (datetime): Timestamp when the chat was marked as completed.
+        deleted_at (datetime): Timestamp when the user deleted the chat (purged later).
+        archived_at (datetime): Timestamp when the chat's messages were moved to the archive.
+        config_step (str): Step of the local configuration phase ('welcome', 'rol', 'nivel', 'ciclo', 'duracion' or 'done').
+        rol_laboral (str): Configured role (Junior / Middle / Senior).
+        nivel_academico (str): Configured academic level.
+        ciclo_formativo (str): Configured ciclo formativo.
+        duracion (str): Configured interview length (Corta / Media / Larga).
         user (User): Relationship to the User model.
         mensajes (list[Message]): Relationship to the Message model.
     """
     __tablename__ = "chats"
 
     id_chat: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
-    id_usuario: Mapped[int] = mapped_column(ForeignKey("users.id_usuario"), nullable=False, index=True)
+    id_usuario: Mapped[int] = mapped_column(ForeignKey("users.id_usuario", ondelete="CASCADE"), nullable=False, index=True)
     title: Mapped[str | None] = mapped_column(nullable=False, default="Nuevo Chat")
-    status: Mapped[str] = mapped_column(String(20), default="active", nullable=False)  # 'active' | 'completed'
+    # active_history: the previous status is needed to keep user_stats in sync (see ChatStats)
+    status: Mapped[str] = mapped_column(String(20), default="active", nullable=False, active_history=True)  # 'active' | 'completed'
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     last_message_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    deleted_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True, index=True)
+    archived_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    # Interview profile collected locally before the agent takes over (see interview_config_service)
+    config_step: Mapped[str] = mapped_column(String(20), default="welcome", server_default="welcome", nullable=False)
+    rol_laboral: Mapped[str | None] = mapped_column(String(20), nullable=True)
+    nivel_academico: Mapped[str | None] = mapped_column(String(50), nullable=True)
+    ciclo_formativo: Mapped[str | None] = mapped_column(String(150), nullable=True)
+    duracion: Mapped[str | None] = mapped_column(String(20), nullable=True)
 
     user = relationship("User", back_populates="chats")
-    mensajes = relationship("Message", back_populates="chat", cascade="all, delete-orphan")
+    # Messages are removed by the database (ON DELETE CASCADE), never loaded just to be deleted
+    mensajes = relationship("Message", back_populates="chat", cascade="all, delete-orphan", passive_deletes=True)
@@ -0,0 +1,80 @@
+"""
+Chat Archive Model.
+
+This module defines the ChatArchive database model: the compressed transcript of a
+completed interview whose messages were moved out of the ``mensajes`` table.
+
+Archived messages stay searchable through ``ChatArchiveSearch``: one row per message
+with its indexed words (``index_terms``), written in the same transaction as the
+transcript. Its full-text index is a MySQL ``FULLTEXT`` index or, in SQLite, the FTS5
+external-content table ``chat_archivos_busqueda_fts`` kept in sync by triggers.
+"""
+
+from sqlalchemy import DDL, DateTime, ForeignKey, Index, Integer, LargeBinary, String, Text, event, func
+from sqlalchemy.orm import Mapped, mapped_column
+from app.core.database import Base
+from datetime import datetime
+
+SQLITE_ARCHIVE_FTS_TABLE = "chat_archivos_busqueda_fts"
+
+class ChatArchive(Base):
+    """
+    Chat archive database model.
+
+    Attributes:
+        id_chat (int): Primary key and foreign key to the archived chat.
+        transcript (bytes): zlib-compressed JSON list of the chat's messages.
+        mensajes (int): Number of messages in the transcript.
+        archived_at (datetime): Timestamp when the chat was archived.
+    """
+    __tablename__ = "chat_archivos"
+
+    id_chat: Mapped[int] = mapped_column(ForeignKey("chats.id_chat", ondelete="CASCADE"), primary_key=True)
+    transcript: Mapped[bytes] = mapped_column(LargeBinary(length=16 * 1024 * 1024), nullable=False)
+    mensajes: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    archived_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+
+class ChatArchiveSearch(Base):
+    """
+    Search index entry of an archived message.
+
+    Attributes:
+        id_mensaje (int): Primary key (ID the message had in ``mensajes``).
+        id_chat (int): Foreign key to the archive containing the message.
+        emisor (str): The sender of the message ("USER" or "IA").
+        terminos (str): Indexed words of the message.
+        sent_at (datetime | None): Timestamp when the message was sent.
+    """
+    __tablename__ = "chat_archivos_busqueda"
+    __table_args__ = (
+        Index("ft_chat_archivos_busqueda_terminos", "terminos", mysql_prefix="FULLTEXT").ddl_if(dialect="mysql"),
+    )
+
+    id_mensaje: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    id_chat: Mapped[int] = mapped_column(
+        ForeignKey("chat_archivos.id_chat", ondelete="CASCADE"), nullable=False, index=True
+    )
+    emisor: Mapped[str] = mapped_column(String(10), nullable=False)
+    terminos: Mapped[str] = mapped_column(Text, nullable=False)
+    sent_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+
+SQLITE_ARCHIVE_FTS_DDL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_ARCHIVE_FTS_TABLE} USING fts5("
+    f"terminos, content='chat_archivos_busqueda', content_rowid='id_mensaje', "
+    f"tokenize='unicode61 remove_diacritics 2')",
+    f"CREATE TRIGGER IF NOT EXISTS chat_archivos_busqueda_fts_ai AFTER INSERT ON chat_archivos_busqueda BEGIN "
+    f"INSERT INTO {SQLITE_ARCHIVE_FTS_TABLE}(rowid, terminos) VALUES (new.id_mensaje, new.terminos); END",
+    f"CREATE TRIGGER IF NOT EXISTS chat_archivos_busqueda_fts_ad AFTER DELETE ON chat_archivos_busqueda BEGIN "
+    f"INSERT INTO {SQLITE_ARCHIVE_FTS_TABLE}({SQLITE_ARCHIVE_FTS_TABLE}, rowid, terminos) "
+    f"VALUES ('delete', old.id_mensaje, old.terminos); END",
+]
+
+for statement in SQLITE_ARCHIVE_FTS_DDL:
+    event.listen(ChatArchiveSearch.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+event.listen(
+    ChatArchiveSearch.__table__,
+    "before_drop",
+    DDL(f"DROP TABLE IF EXISTS {SQLITE_ARCHIVE_FTS_TABLE}").execute_if(dialect="sqlite"),
+)
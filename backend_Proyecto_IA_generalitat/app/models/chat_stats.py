@@ -0,0 +1,104 @@
+"""
+Chat Stats Model.
+
+This module defines the ChatStats database model: per-interview counters kept up to
+date as messages are inserted, plus the employability level of its report. Chat
+events also maintain the owner's ``user_stats`` row (see ``UserStats``).
+"""
+
+from sqlalchemy import DateTime, ForeignKey, Integer, String, event, insert, inspect, select, update
+from sqlalchemy.orm import Mapped, mapped_column
+from app.core.database import Base
+from app.models.chat import Chat
+from app.models.message import Message
+from app.models.user_stats import UserStats
+from datetime import datetime
+
+class ChatStats(Base):
+    """
+    Chat stats database model.
+    
+    Attributes:
+        id_chat (int): Primary key and foreign key to the chat.
+        user_turns (int): Messages sent by the candidate.
+        ai_turns (int): Messages sent by the AI.
+        employability_level (str | None): Level detected in the chat's report.
+        report_at (datetime | None): Timestamp when the report was generated.
+    """
+    __tablename__ = "chat_stats"
+
+    id_chat: Mapped[int] = mapped_column(ForeignKey("chats.id_chat", ondelete="CASCADE"), primary_key=True)
+    user_turns: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    ai_turns: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    employability_level: Mapped[str | None] = mapped_column(String(20), nullable=True)
+    report_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+
+def _add_completed(connection, chat: Chat, sign: int) -> None:
+    """Add (sign=1) or remove (sign=-1) a completed chat and its turns from its owner's stats."""
+    user_turns = select(ChatStats.user_turns).where(ChatStats.id_chat == chat.id_chat).scalar_subquery()
+    connection.execute(
+        update(UserStats.__table__)
+        .where(UserStats.id_usuario == chat.id_usuario)
+        .values(
+            completed_chats=UserStats.completed_chats + sign,
+            completed_turns=UserStats.completed_turns + sign * user_turns,
+        )
+    )
+
+
+@event.listens_for(Chat, "after_insert")
+def create_chat_stats(mapper, connection, target: Chat) -> None:
+    """
+    Create the stats row of a new chat and count it in its owner's stats.
+
+    Args:
+        mapper: The Chat mapper.
+        connection: Connection used by the flush.
+        target (Chat): The inserted chat.
+    """
+    connection.execute(insert(ChatStats.__table__).values(id_chat=target.id_chat))
+    connection.execute(
+        update(UserStats.__table__)
+        .where(UserStats.id_usuario == target.id_usuario)
+        .values(total_chats=UserStats.total_chats + 1)
+    )
+    if target.status == "completed":
+        _add_completed(connection, target, 1)
+
+
+@event.listens_for(Chat, "after_update")
+def track_chat_completion(mapper, connection, target: Chat) -> None:
+    """
+    Update the owner's completed counters when a chat's status changes.
+
+    Args:
+        mapper: The Chat mapper.
+        connection: Connection used by the flush.
+        target (Chat): The updated chat.
+    """
+    history = inspect(target).attrs.status.history
+    if not history.has_changes():
+        return
+    was_completed = "completed" in (history.deleted or ())
+    is_completed = target.status == "completed"
+    if was_completed != is_completed:
+        _add_completed(connection, target, 1 if is_completed else -1)
+
+
+@event.listens_for(Message, "after_insert")
+def count_message(mapper, connection, target: Message) -> None:
+    """
+    Count every newly inserted message in its chat's stats (same transaction).
+
+    Args:
+        mapper: The Message mapper.
+        connection: Connection used by the flush.
+        target (Message): The inserted message.
+    """
+    column = ChatStats.user_turns if target.emisor == "USER" else ChatStats.ai_turns
+    connection.execute(
+        update(ChatStats.__table__)
+        .where(ChatStats.id_chat == target.id_chat)
+        .values({column.key: column + 1})
+    )
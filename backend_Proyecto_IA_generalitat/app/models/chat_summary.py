@@ -0,0 +1,30 @@
+"""
+Chat Summary Model.
+
+This module defines the ChatSummary database model, a rolling summary of the older part
+of a conversation used to keep AI prompts bounded on long interviews.
+"""
+
+from sqlalchemy import DateTime, ForeignKey, Integer, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+from app.core.database import Base
+from datetime import datetime
+
+class ChatSummary(Base):
+    """
+    Chat summary database model.
+    
+    Attributes:
+        id_chat (int): Primary key and foreign key to the summarized chat.
+        contenido (str): Condensed summary of the covered messages.
+        id_ultimo_mensaje (int): ID of the last message folded into the summary.
+        mensajes_resumidos (int): Total number of messages covered by the summary.
+        updated_at (datetime): Timestamp of the last summary refresh.
+    """
+    __tablename__ = "chat_resumenes"
+
+    id_chat: Mapped[int] = mapped_column(ForeignKey("chats.id_chat", ondelete="CASCADE"), primary_key=True)
+    contenido: Mapped[str] = mapped_column(Text, nullable=False)
+    id_ultimo_mensaje: Mapped[int] = mapped_column(Integer, nullable=False)
+    mensajes_resumidos: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
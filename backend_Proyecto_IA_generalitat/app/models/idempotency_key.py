@@ -0,0 +1,36 @@
+"""
+Idempotency Key Model.
+
+This module defines the IdempotencyKey database model: the result of a request sent
+with an ``Idempotency-Key`` header, and the last turn of each chat used to reject
+double submits. Rows are written in the same transaction as the turn they describe.
+"""
+
+from sqlalchemy import DateTime, ForeignKey, Integer, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+from app.core.database import Base
+from datetime import datetime
+
+class IdempotencyKey(Base):
+    """
+    Idempotency key database model.
+    
+    Attributes:
+        id (int): Primary key.
+        id_usuario (int): Foreign key to the user the key belongs to.
+        route (str): Route the key was sent to (``recent_turn`` for the last turn of a chat).
+        idem_key (str): Value of the Idempotency-Key header (the chat ID for ``recent_turn``).
+        fingerprint (str): SHA-256 of the request values that must match on a retry.
+        id_mensaje (int | None): Message returned to the client.
+        expires_at (datetime): When the key stops being honored.
+    """
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (UniqueConstraint("id_usuario", "route", "idem_key", name="uq_idempotency_key"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    id_usuario: Mapped[int] = mapped_column(ForeignKey("users.id_usuario", ondelete="CASCADE"), nullable=False)
+    route: Mapped[str] = mapped_column(String(30), nullable=False)
+    idem_key: Mapped[str] = mapped_column(String(255), nullable=False)
+    fingerprint: Mapped[str] = mapped_column(String(64), nullable=False)
+    id_mensaje: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
@@ -2,13 +2,53 @@
 Message Model.
 
 This module defines the Message database model, representing a single message within a chat.
+Long message contents can be stored zlib-compressed; the ``formato`` column tells how each
+row is stored and the ``contenido`` attribute hides the difference from the rest of the app.
+
+``contenido`` is a Python-only attribute. Compressed rows keep an empty ``contenido``
+column, so message text cannot be filtered or ordered in SQL.
+
+The full-text index used by the search endpoint covers ``contenido`` and ``terminos``:
+
+- MySQL: ``FULLTEXT`` index over both columns (queried with ``MATCH ... AGAINST``).
+- SQLite (tests/dev): FTS5 external-content table ``mensajes_fts`` kept in sync by triggers.
+
+Plain rows are indexed through ``contenido``. Compressed rows store the unique words of
+their text in ``terminos`` (``index_terms``), so they stay searchable without keeping a
+plain copy. Archived messages are indexed the same way in ``chat_archivos_busqueda``.
 """
 
-from sqlalchemy import Text, DateTime, ForeignKey, func
+import re
+import zlib
+
+from sqlalchemy import DDL, Text, DateTime, ForeignKey, Index, LargeBinary, String, event, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from app.core.config import settings
 from app.core.database import Base
 from datetime import datetime
 
+FORMAT_PLAIN = "plain"
+FORMAT_ZLIB = "zlib"
+
+SQLITE_FTS_TABLE = "mensajes_fts"
+
+WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def index_terms(text: str) -> str:
+    """
+    Return the unique lowercase words of ``text``, in order of appearance.
+
+    This is what the search index stores for contents kept compressed or archived.
+
+    Args:
+        text (str): Message text.
+
+    Returns:
+        str: The words separated by spaces.
+    """
+    return " ".join(dict.fromkeys(word.lower() for word in WORD_RE.findall(text)))
+
 class Message(Base):
     """
     Message database model.
@@ -17,16 +57,84 @@ class Message(Base):
         id_mensaje (int): Primary key.
         id_chat (int): Foreign key to the chat containing this message.
         emisor (str): The sender of the message ("USER" or "IA").
-        contenido (str): The text content of the message.
+        contenido (str): The text content of the message (decompressed on first access).
+        formato (str): Storage format of the content ("plain" or "zlib").
+        contenido_comprimido (bytes): Compressed content when ``formato`` is "zlib" (deferred:
+            loaded on first access unless the query undefers it).
+        terminos (str | None): Indexed words of a compressed content (None for plain rows).
         sent_at (datetime): Timestamp when the message was sent.
         chat (Chat): Relationship to the Chat model.
     """
     __tablename__ = "mensajes"
+    __table_args__ = (
+        Index("ft_mensajes_contenido", "contenido", "terminos", mysql_prefix="FULLTEXT").ddl_if(dialect="mysql"),
+    )
 
     id_mensaje: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
-    id_chat: Mapped[int] = mapped_column(ForeignKey("chats.id_chat"), nullable=False, index=True)
+    id_chat: Mapped[int] = mapped_column(ForeignKey("chats.id_chat", ondelete="CASCADE"), nullable=False, index=True)
     emisor: Mapped[str] = mapped_column(Text(10), nullable=False)  # "USER" | "IA"
-    contenido: Mapped[str] = mapped_column(Text, nullable=False)
+    _contenido: Mapped[str] = mapped_column("contenido", Text, nullable=False)
+    formato: Mapped[str] = mapped_column(String(10), nullable=False, default=FORMAT_PLAIN, server_default=FORMAT_PLAIN)
+    contenido_comprimido: Mapped[bytes | None] = mapped_column(
+        LargeBinary(length=16 * 1024 * 1024), nullable=True, deferred=True
+    )
+    terminos: Mapped[str | None] = mapped_column(Text, nullable=True)
     sent_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
     chat = relationship("Chat", back_populates="mensajes")
+
+    @property
+    def contenido(self) -> str:
+        """Message text, decompressed lazily and cached on the instance."""
+        if self.formato != FORMAT_ZLIB:
+            return self._contenido
+        cached = self.__dict__.get("_contenido_texto")
+        if cached is None:
+            cached = zlib.decompress(self.contenido_comprimido).decode("utf-8")
+            self.__dict__["_contenido_texto"] = cached
+        return cached
+
+    @contenido.setter
+    def contenido(self, value: str) -> None:
+        """Store the text, compressing it when compression is enabled and it is long enough."""
+        self.__dict__.pop("_contenido_texto", None)
+        if (
+            value
+            and settings.message_compression == FORMAT_ZLIB
+            and len(value) >= settings.message_compression_min_length
+        ):
+            self.formato = FORMAT_ZLIB
+            self.contenido_comprimido = zlib.compress(value.encode("utf-8"), settings.message_compression_level)
+            self._contenido = ""
+            self.terminos = index_terms(value)
+        else:
+            self.formato = FORMAT_PLAIN
+            self.contenido_comprimido = None
+            self._contenido = value
+            self.terminos = None
+
+
+SQLITE_FTS_DDL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_FTS_TABLE} USING fts5("
+    f"contenido, terminos, content='mensajes', content_rowid='id_mensaje', "
+    f"tokenize='unicode61 remove_diacritics 2')",
+    f"CREATE TRIGGER IF NOT EXISTS mensajes_fts_ai AFTER INSERT ON mensajes BEGIN "
+    f"INSERT INTO {SQLITE_FTS_TABLE}(rowid, contenido, terminos) "
+    f"VALUES (new.id_mensaje, new.contenido, new.terminos); END",
+    f"CREATE TRIGGER IF NOT EXISTS mensajes_fts_ad AFTER DELETE ON mensajes BEGIN "
+    f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, contenido, terminos) "
+    f"VALUES ('delete', old.id_mensaje, old.contenido, old.terminos); END",
+    f"CREATE TRIGGER IF NOT EXISTS mensajes_fts_au AFTER UPDATE OF contenido, terminos ON mensajes BEGIN "
+    f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, contenido, terminos) "
+    f"VALUES ('delete', old.id_mensaje, old.contenido, old.terminos); "
+    f"INSERT INTO {SQLITE_FTS_TABLE}(rowid, contenido, terminos) "
+    f"VALUES (new.id_mensaje, new.contenido, new.terminos); END",
+]
+
+for statement in SQLITE_FTS_DDL:
+    event.listen(Message.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+event.listen(
+    Message.__table__,
+    "before_drop",
+    DDL(f"DROP TABLE IF EXISTS {SQLITE_FTS_TABLE}").execute_if(dialect="sqlite"),
+)
@@ -0,0 +1,56 @@
+"""
+User Stats Model.
+
+This module defines the UserStats database model: the progress summary of a user
+(interviews, completed interviews, turns, last employability level). It is updated
+incrementally by the events below and by ``stats_repo.record_report``, so reading it
+costs the same no matter how many interviews the user has.
+
+A chat stops counting when it is deleted (``stats_repo.remove_chats``, in the same
+transaction as the soft delete).
+"""
+
+from sqlalchemy import DateTime, ForeignKey, Integer, String, event, insert
+from sqlalchemy.orm import Mapped, mapped_column
+from app.core.database import Base
+from app.models.user import User
+from datetime import datetime
+
+class UserStats(Base):
+    """
+    User stats database model.
+    
+    Attributes:
+        id_usuario (int): Primary key and foreign key to the user.
+        total_chats (int): Interviews started.
+        completed_chats (int): Interviews completed.
+        completed_turns (int): Candidate messages sent in completed interviews.
+        last_employability_level (str | None): Level detected in the last generated report.
+        last_report_at (datetime | None): Timestamp of the last generated report.
+    """
+    __tablename__ = "user_stats"
+
+    id_usuario: Mapped[int] = mapped_column(ForeignKey("users.id_usuario", ondelete="CASCADE"), primary_key=True)
+    total_chats: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    completed_chats: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    completed_turns: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    last_employability_level: Mapped[str | None] = mapped_column(String(20), nullable=True)
+    last_report_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    @property
+    def average_turns(self) -> float:
+        """Average candidate messages per completed interview."""
+        return round(self.completed_turns / self.completed_chats, 1) if self.completed_chats else 0.0
+
+
+@event.listens_for(User, "after_insert")
+def create_user_stats(mapper, connection, target: User) -> None:
+    """
+    Create the (empty) stats row of every new user in the same transaction.
+
+    Args:
+        mapper: The User mapper.
+        connection: Connection used by the flush.
+        target (User): The inserted user.
+    """
+    connection.execute(insert(UserStats.__table__).values(id_usuario=target.id_usuario))
@@ -0,0 +1,135 @@
+"""
+Chat Archive Repository.
+
+This module moves the messages of finished interviews into a single compressed
+transcript per chat (plus their search index entries) and reads them back as
+(detached) Message objects.
+"""
+
+import json
+import zlib
+from datetime import datetime
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import Session, undefer
+
+from app.models.chat import Chat
+from app.models.chat_archive import ChatArchive, ChatArchiveSearch
+from app.models.message import Message, index_terms
+
+
+def _pack_transcript(messages: list[Message]) -> bytes:
+    """Serialize messages as compact JSON rows and compress them."""
+    rows = [[m.id_mensaje, m.emisor, m.contenido, m.sent_at.isoformat() if m.sent_at else None] for m in messages]
+    return zlib.compress(json.dumps(rows, ensure_ascii=False, separators=(",", ":")).encode("utf-8"), 9)
+
+
+def _unpack_transcript(chat_id: int, transcript: bytes) -> list[Message]:
+    """Rebuild detached Message objects (chronological order) from a transcript."""
+    rows = json.loads(zlib.decompress(transcript).decode("utf-8"))
+    return [
+        Message(
+            id_mensaje=id_mensaje,
+            id_chat=chat_id,
+            emisor=emisor,
+            contenido=contenido,
+            sent_at=datetime.fromisoformat(sent_at) if sent_at else None,
+        )
+        for id_mensaje, emisor, contenido, sent_at in rows
+    ]
+
+
+class ArchiveRepo:
+    """Repository class for ChatArchive model operations."""
+
+    def list_messages(self, db: Session, chat_id: int) -> list[Message] | None:
+        """
+        Retrieve the archived messages of a chat.
+        
+        Args:
+            db (Session): Database session.
+            chat_id (int): ID of the chat.
+            
+        Returns:
+            list[Message] | None: Detached messages in chronological order, or None if
+                the chat is not archived.
+        """
+        archive = db.get(ChatArchive, chat_id)
+        if archive is None:
+            return None
+        return _unpack_transcript(chat_id, archive.transcript)
+
+    def list_archivable(self, db: Session, completed_before: datetime, limit: int) -> list[int]:
+        """
+        Retrieve IDs of completed chats old enough to be archived.
+        
+        Args:
+            db (Session): Database session.
+            completed_before (datetime): Only chats completed before this moment qualify.
+            limit (int): Maximum number of IDs returned.
+            
+        Returns:
+            list[int]: IDs of the chats to archive.
+        """
+        stmt = (
+            select(Chat.id_chat)
+            .where(
+                Chat.status == "completed",
+                Chat.completed_at < completed_before,
+                Chat.archived_at.is_(None),
+                Chat.deleted_at.is_(None),
+            )
+            .order_by(Chat.id_chat)
+            .limit(limit)
+        )
+        return list(db.scalars(stmt))
+
+    def archive(self, db: Session, chat_id: int) -> int | None:
+        """
+        Move the messages of a chat into its archive in one transaction.
+        
+        Each message also gets a ``ChatArchiveSearch`` row so it stays searchable.
+        
+        The chat is claimed first with a conditional UPDATE on ``archived_at IS NULL``;
+        its row lock makes a second worker archiving the same chat wait and then
+        find it already claimed, so the transcript is written only once.
+        
+        Args:
+            db (Session): Database session.
+            chat_id (int): ID of the chat.
+            
+        Returns:
+            int | None: Number of messages archived, or None if the chat was already
+                archived (or deleted) by someone else.
+        """
+        claimed = db.execute(
+            update(Chat)
+            .where(Chat.id_chat == chat_id, Chat.archived_at.is_(None), Chat.deleted_at.is_(None))
+            .values(archived_at=datetime.now())
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if not claimed:
+            db.rollback()
+            return None
+
+        messages = list(db.scalars(
+            select(Message)
+            .options(undefer(Message.contenido_comprimido))
+            .where(Message.id_chat == chat_id)
+            .order_by(Message.id_mensaje)
+        ))
+        db.add(ChatArchive(id_chat=chat_id, transcript=_pack_transcript(messages), mensajes=len(messages)))
+        db.add_all(
+            ChatArchiveSearch(
+                id_mensaje=m.id_mensaje, id_chat=chat_id, emisor=m.emisor,
+                terminos=index_terms(m.contenido), sent_at=m.sent_at,
+            )
+            for m in messages
+        )
+        db.execute(delete(Message).where(Message.id_chat == chat_id).execution_options(synchronize_session=False))
+        db.commit()
+        for message in messages:
+            db.expunge(message)
+        return len(messages)
+
+archive_repo = ArchiveRepo()
@@ -2,12 +2,18 @@
 Chat Repository.
 
 This module provides data access methods for the Chat model, including creation,
-retrieval, updating, and deletion.
+retrieval, updating, and deletion, for sync sessions (``ChatRepo``) and async
+sessions (``AsyncChatRepo``).
 """
 
+from datetime import datetime
+
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy import delete, select, update
 from app.models.chat import Chat
+from app.models.message import Message
+from app.repositories.stats_repo import stats_repo
 
 class ChatRepo:
     """Repository class for Chat model operations."""
@@ -29,9 +35,41 @@ class ChatRepo:
         db.refresh(chat)
         return chat
 
+    def add_with_greeting(self, db: Session, user_id: int, greeting: str, title: str | None = None) -> tuple[Chat, Message]:
+        """
+        Stage a new chat together with its first AI message without committing.
+        
+        Both rows are inserted in a single flush and every column is filled in
+        Python, so the objects can be serialized without refreshing them.
+        The caller is responsible for committing the transaction.
+        
+        Args:
+            db (Session): Database session.
+            user_id (int): ID of the user.
+            greeting (str): Content of the initial AI message.
+            title (str | None): Chat title (defaults to "Nuevo Chat").
+            
+        Returns:
+            tuple[Chat, Message]: The new chat and its greeting message.
+        """
+        now = datetime.now()
+        chat = Chat(
+            id_usuario=user_id,
+            title=title or "Nuevo Chat",
+            status="active",
+            created_at=now,
+            last_message_at=now,
+            completed_at=None,
+            config_step="welcome",
+        )
+        greeting_msg = Message(chat=chat, emisor="IA", contenido=greeting, sent_at=now)
+        db.add_all([chat, greeting_msg])
+        db.flush()
+        return chat, greeting_msg
+
     def list_for_user(self, db: Session, user_id: int) -> list[Chat]:
         """
-        Retrieve all chats for a user, ordered by most recent first.
+        Retrieve all chats for a user, ordered by most recent first (deleted chats excluded).
         
         Args:
             db (Session): Database session.
@@ -40,11 +78,32 @@ class ChatRepo:
         Returns:
             list[Chat]: List of chats belonging to the user.
         """
-        return list(db.scalars(select(Chat).where(Chat.id_usuario == user_id).order_by(Chat.created_at.desc())))
+        return list(db.scalars(select(Chat).where(Chat.id_usuario == user_id, Chat.deleted_at.is_(None)).order_by(Chat.created_at.desc())))
+
+    def list_rows_for_user(self, db: Session, user_id: int) -> list[dict]:
+        """
+        Retrieve the chats of a user like ``list_for_user``, as plain dicts shaped like ``ChatResponse``.
+        
+        Args:
+            db (Session): Database session.
+            user_id (int): ID of the user.
+            
+        Returns:
+            list[dict]: The user's chats, most recent first.
+        """
+        stmt = (
+            select(
+                Chat.id_chat, Chat.id_usuario, Chat.title, Chat.status,
+                Chat.created_at, Chat.last_message_at, Chat.completed_at,
+            )
+            .where(Chat.id_usuario == user_id, Chat.deleted_at.is_(None))
+            .order_by(Chat.created_at.desc())
+        )
+        return [dict(row) for row in db.execute(stmt).mappings()]
 
     def get_for_user(self, db: Session, chat_id: int, user_id: int) -> Chat | None:
         """
-        Retrieve a specific chat if it belongs to the user.
+        Retrieve a specific chat if it belongs to the user and has not been deleted.
         
         Args:
             db (Session): Database session.
@@ -54,20 +113,88 @@ class ChatRepo:
         Returns:
             Chat | None: The chat object if found, else None.
         """
-        return db.scalar(select(Chat).where(Chat.id_chat == chat_id, Chat.id_usuario == user_id))
+        return db.scalar(select(Chat).where(Chat.id_chat == chat_id, Chat.id_usuario == user_id, Chat.deleted_at.is_(None)))
 
-    def delete(self, db: Session, chat_id: int) -> None:
+    def list_for_user_by_ids(self, db: Session, user_id: int, chat_ids: list[int]) -> list[Chat]:
         """
-        Delete a chat and all its messages (cascade).
+        Retrieve several chats of a user in a single query.
         
         Args:
             db (Session): Database session.
-            chat_id (int): ID of the chat to delete.
+            user_id (int): ID of the user.
+            chat_ids (list[int]): IDs of the chats to retrieve.
+            
+        Returns:
+            list[Chat]: The chats that exist, belong to the user and are not deleted (unordered).
         """
-        chat = db.get(Chat, chat_id)
-        if chat:
-            db.delete(chat)
-            db.commit()
+        return list(
+            db.scalars(
+                select(Chat).where(Chat.id_usuario == user_id, Chat.id_chat.in_(chat_ids), Chat.deleted_at.is_(None))
+            )
+        )
+
+    def soft_delete_many(self, db: Session, user_id: int, chat_ids: list[int]) -> int:
+        """
+        Mark chats of a user as deleted with a single UPDATE.
+        
+        Deleted chats disappear from every user-facing query immediately; their
+        rows and messages are removed later by ``purge_deleted``. They are
+        subtracted from the user's stats in the same transaction.
+        
+        Args:
+            db (Session): Database session.
+            user_id (int): ID of the user.
+            chat_ids (list[int]): IDs of the chats to delete.
+            
+        Returns:
+            int: Number of chats marked as deleted.
+        """
+        # Lock the rows so a concurrent delete cannot subtract the same chat twice
+        deleted_ids = list(
+            db.scalars(
+                select(Chat.id_chat)
+                .where(Chat.id_usuario == user_id, Chat.id_chat.in_(chat_ids), Chat.deleted_at.is_(None))
+                .with_for_update()
+            )
+        )
+        if deleted_ids:
+            stats_repo.remove_chats(db, user_id, deleted_ids)
+            db.execute(
+                update(Chat)
+                .where(Chat.id_chat.in_(deleted_ids))
+                .values(deleted_at=datetime.now())
+                .execution_options(synchronize_session=False)
+            )
+        db.commit()
+        return len(deleted_ids)
+
+    def purge_deleted(self, db: Session, deleted_before: datetime, batch_size: int = 500) -> list[int]:
+        """
+        Permanently delete one batch of chats soft-deleted before a given time.
+        
+        Rows are removed with a bulk DELETE; messages and summaries go with them
+        through ON DELETE CASCADE, so nothing is loaded into the session.
+        
+        Args:
+            db (Session): Database session.
+            deleted_before (datetime): Only chats deleted before this moment are purged.
+            batch_size (int): Maximum number of chats removed in this batch.
+            
+        Returns:
+            list[int]: IDs of the purged chats (empty when nothing is left to purge).
+        """
+        chat_ids = list(
+            db.scalars(
+                select(Chat.id_chat)
+                .where(Chat.deleted_at.is_not(None), Chat.deleted_at < deleted_before)
+                .order_by(Chat.id_chat)
+                .limit(batch_size)
+            )
+        )
+        if chat_ids:
+            db.execute(delete(Chat).where(Chat.id_chat.in_(chat_ids)).execution_options(synchronize_session=False))
+        db.commit()
+        return chat_ids
 
     def update_title(self, db: Session, chat_id: int, title: str) -> Chat | None:
         """
@@ -109,3 +236,141 @@ class ChatRepo:
         return chat
 
 chat_repo = ChatRepo()
+
+
+class AsyncChatRepo:
+    """Async counterpart of ``ChatRepo`` for ``AsyncSession`` (maintenance jobs stay sync)."""
+
+    async def create(self, db: AsyncSession, user_id: int) -> Chat:
+        """
+        Create a new chat for a user.
+        
+        Args:
+            db (AsyncSession): Async database session.
+            user_id (int): ID of the user.
+            
+        Returns:
+            Chat: The newly created chat.
+        """
+        chat = Chat(id_usuario=user_id)
+        db.add(chat)
+        await db.commit()
+        await db.refresh(chat)
+        return chat
+
+    async def add_with_greeting(
+        self, db: AsyncSession, user_id: int, greeting: str, title: str | None = None
+    ) -> tuple[Chat, Message]:
+        """
+        Stage a new chat together with its first AI message without committing.
+        
+        See ``ChatRepo.add_with_greeting``.
+        
+        Args:
+            db (AsyncSession): Async database session.
+            user_id (int): ID of the user.
+            greeting (str): Content of the initial AI message.
+            title (str | None): Chat title (defaults to "Nuevo Chat").
+            
+        Returns:
+            tuple[Chat, Message]: The new chat and its greeting message.
+        """
+        return await db.run_sync(chat_repo.add_with_greeting, user_id, greeting, title)
+
+    async def list_for_user(self, db: AsyncSession, user_id: int) -> list[Chat]:
+        """
+        Retrieve all chats for a user, ordered by most recent first (deleted chats excluded).
+        
+        Args:
+            db (AsyncSession): Async database session.
+            user_id (int): ID of the user.
+            
+        Returns:
+            list[Chat]: List of chats belonging to the user.
+        """
+        stmt = select(Chat).where(Chat.id_usuario == user_id, Chat.deleted_at.is_(None)).order_by(Chat.created_at.desc())
+        return list(await db.scalars(stmt))
+
+    async def get_for_user(self, db: AsyncSession, chat_id: int, user_id: int) -> Chat | None:
+        """
+        Retrieve a specific chat if it belongs to the user and has not been deleted.
+        
+        Args:
+            db (AsyncSession): Async database session.
+            chat_id (int): ID of the chat.
+            user_id (int): ID of the user.
+            
+        Returns:
+            Chat | None: The chat object if found, else None.
+        """
+        return await db.scalar(
+            select(Chat).where(Chat.id_chat == chat_id, Chat.id_usuario == user_id, Chat.deleted_at.is_(None))
+        )
+
+    async def list_for_user_by_ids(self, db: AsyncSession, user_id: int, chat_ids: list[int]) -> list[Chat]:
+        """
+        Retrieve several chats of a user in a single query.
+        
+        Args:
+            db (AsyncSession): Async database session.
+            user_id (int): ID of the user.
+            chat_ids (list[int]): IDs of the chats to retrieve.
+            
+        Returns:
+            list[Chat]: The chats that exist, belong to the user and are not deleted (unordered).
+        """
+        stmt = select(Chat).where(Chat.id_usuario == user_id, Chat.id_chat.in_(chat_ids), Chat.deleted_at.is_(None))
+        return list(await db.scalars(stmt))
+
+    async def soft_delete_many(self, db: AsyncSession, user_id: int, chat_ids: list[int]) -> int:
+        """
+        Mark chats of a user as deleted with a single UPDATE.
+        
+        Args:
+            db (AsyncSession): Async database session.
+            user_id (int): ID of the user.
+            chat_ids (list[int]): IDs of the chats to delete.
+            
+        Returns:
+            int: Number of chats marked as deleted.
+        """
+        return await db.run_sync(chat_repo.soft_delete_many, user_id, chat_ids)
+
+    async def update_title(self, db: AsyncSession, chat_id: int, title: str) -> Chat | None:
+        """
+        Update the title of a chat.
+        
+        Args:
+            db (AsyncSession): Async database session.
+            chat_id (int): ID of the chat.
+            title (str): New title.
+            
+        Returns:
+            Chat | None: The updated chat object if found, else None.
+        """
+        chat = await db.get(Chat, chat_id)
+        if chat:
+            chat.title = title
+            await db.commit()
+            await db.refresh(chat)
+        return chat
+
+    async def mark_as_completed(self, db: AsyncSession, chat_id: int) -> Chat | None:
+        """
+        Mark a chat as completed (finalized interview).
+        
+        Args:
+            db (AsyncSession): Async database session.
+            chat_id (int): ID of the chat.
+            
+        Returns:
+            Chat | None: The updated chat object if found, else None.
+        """
+        chat = await db.get(Chat, chat_id)
+        if chat:
+            chat.status = "completed"
+            chat.completed_at = datetime.now()
+            await db.commit()
+        return chat
+
+async_chat_repo = AsyncChatRepo()
@@ -2,20 +2,46 @@
 Message Repository.
 
 This module provides data access methods for the Message model, including creation and retrieval.
+Messages of archived chats are read transparently from their compressed transcript.
+``MessageRepo`` works with sync sessions and ``AsyncMessageRepo`` with async sessions.
 """
 
-from sqlalchemy.orm import Session
+import zlib
+from datetime import datetime
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, undefer
 from sqlalchemy import select, func
-from app.models.message import Message
+from app.models.message import FORMAT_ZLIB, Message
 from app.models.chat import Chat
+from app.repositories.archive_repo import archive_repo
+
+# Readers of many messages load the compressed contents in the same query
+WITH_CONTENT = undefer(Message.contenido_comprimido)
+
 
 class MessageRepo:
     """Repository class for Message model operations."""
 
+    def get_by_id(self, db: Session, message_id: int) -> Message | None:
+        """
+        Get a message by its ID.
+
+        Args:
+            db (Session): Database session.
+            message_id (int): ID of the message.
+
+        Returns:
+            Message | None: The message, or None if it does not exist.
+        """
+        return db.get(Message, message_id)
+
     def list_for_chat(self, db: Session, chat_id: int, limit: int = 50) -> list[Message]:
         """
         Retrieve messages for a chat in descending order by timestamp.
         
+        If the chat has no live messages, its archived transcript (if any) is used instead.
+        
         Args:
             db (Session): Database session.
             chat_id (int): ID of the chat.
@@ -24,12 +50,126 @@ class MessageRepo:
         Returns:
             list[Message]: List of messages in the chat.
         """
-        stmt = select(Message).where(Message.id_chat == chat_id).order_by(Message.sent_at.desc()).limit(limit)
-        return list(db.scalars(stmt))
+        stmt = (
+            select(Message)
+            .options(WITH_CONTENT)
+            .where(Message.id_chat == chat_id)
+            .order_by(Message.sent_at.desc(), Message.id_mensaje.desc())
+            .limit(limit)
+        )
+        messages = list(db.scalars(stmt))
+        if not messages:
+            archived = archive_repo.list_messages(db, chat_id)
+            if archived:
+                return archived[::-1][:limit]
+        return messages
 
-    def create(self, db: Session, chat_id: int, emisor: str, contenido: str) -> Message:
+    def list_rows_for_chat(self, db: Session, chat_id: int, limit: int = 50) -> list[dict]:
         """
-        Create a new message and update the chat's last_message_at timestamp.
+        Retrieve messages like ``list_for_chat``, as plain dicts shaped like ``MessageResponse``.
+        
+        Only the response columns are selected and no ORM instances are built, so list
+        endpoints can serialize the result directly (compressed contents are decoded here).
+        
+        Args:
+            db (Session): Database session.
+            chat_id (int): ID of the chat.
+            limit (int): Maximum number of messages to retrieve.
+            
+        Returns:
+            list[dict]: Messages in descending order by timestamp.
+        """
+        stmt = (
+            select(
+                Message.id_mensaje, Message.id_chat, Message.emisor, Message._contenido,
+                Message.formato, Message.contenido_comprimido, Message.sent_at,
+            )
+            .where(Message.id_chat == chat_id)
+            .order_by(Message.sent_at.desc(), Message.id_mensaje.desc())
+            .limit(limit)
+        )
+        rows = [
+            {
+                "id_mensaje": id_mensaje,
+                "id_chat": id_chat,
+                "emisor": emisor,
+                "contenido": zlib.decompress(comprimido).decode("utf-8") if formato == FORMAT_ZLIB else contenido,
+                "sent_at": sent_at,
+            }
+            for id_mensaje, id_chat, emisor, contenido, formato, comprimido, sent_at in db.execute(stmt)
+        ]
+        if not rows:
+            archived = archive_repo.list_messages(db, chat_id)
+            if archived:
+                return [
+                    {"id_mensaje": m.id_mensaje, "id_chat": m.id_chat, "emisor": m.emisor, "contenido": m.contenido, "sent_at": m.sent_at}
+                    for m in archived[::-1][:limit]
+                ]
+        return rows
+
+    def last_id(self, db: Session, chat_id: int) -> int | None:
+        """
+        Get the ID of the newest live message of a chat.
+        
+        Args:
+            db (Session): Database session.
+            chat_id (int): ID of the chat.
+            
+        Returns:
+            int | None: The highest message ID, or None if the chat has no live messages.
+        """
+        return db.scalar(select(func.max(Message.id_mensaje)).where(Message.id_chat == chat_id))
+
+    def list_after(self, db: Session, chat_id: int, after_id: int, limit: int = 50) -> list[Message]:
+        """
+        Retrieve the most recent messages of a chat newer than a given message, newest first.
+        
+        Falls back to the archived transcript like ``list_for_chat``.
+        
+        Args:
+            db (Session): Database session.
+            chat_id (int): ID of the chat.
+            after_id (int): Only messages with a greater ID are returned.
+            limit (int): Maximum number of messages to retrieve.
+            
+        Returns:
+            list[Message]: List of messages in descending order.
+        """
+        stmt = (
+            select(Message)
+            .options(WITH_CONTENT)
+            .where(Message.id_chat == chat_id, Message.id_mensaje > after_id)
+            .order_by(Message.id_mensaje.desc())
+            .limit(limit)
+        )
+        messages = list(db.scalars(stmt))
+        if not messages:
+            archived = archive_repo.list_messages(db, chat_id)
+            if archived:
+                return [m for m in reversed(archived) if m.id_mensaje > after_id][:limit]
+        return messages
+
+    def count_after(self, db: Session, chat_id: int, after_id: int = 0) -> int:
+        """
+        Count the messages of a chat newer than a given message.
+        
+        Args:
+            db (Session): Database session.
+            chat_id (int): ID of the chat.
+            after_id (int): Only messages with a greater ID are counted.
+            
+        Returns:
+            int: Number of messages.
+        """
+        stmt = select(func.count()).select_from(Message).where(Message.id_chat == chat_id, Message.id_mensaje > after_id)
+        return db.scalar(stmt) or 0
+
+    def add(self, db: Session, chat_id: int, emisor: str, contenido: str) -> Message:
+        """
+        Stage a new message and update the chat's last_message_at timestamp without committing.
+        
+        The row is flushed, so its ID is available, and the timestamps are set in
+        Python. The caller is responsible for committing the transaction.
         
         Args:
             db (Session): Database session.
@@ -38,17 +178,148 @@ class MessageRepo:
             contenido (str): Content of the message.
             
         Returns:
-            Message: The newly created message.
+            Message: The new message.
         """
-        msg = Message(id_chat=chat_id, emisor=emisor, contenido=contenido)
+        now = datetime.now()
+        msg = Message(id_chat=chat_id, emisor=emisor, contenido=contenido, sent_at=now)
         db.add(msg)
 
         chat = db.get(Chat, chat_id)
         if chat:
-            chat.last_message_at = func.now()
+            chat.last_message_at = now
+
+        db.flush()
+        return msg
 
+    def create(self, db: Session, chat_id: int, emisor: str, contenido: str) -> Message:
+        """
+        Create a new message and update the chat's last_message_at timestamp (commits).
+        
+        Args:
+            db (Session): Database session.
+            chat_id (int): ID of the chat.
+            emisor (str): Sender of the message ("USER" or "IA").
+            contenido (str): Content of the message.
+            
+        Returns:
+            Message: The newly created message.
+        """
+        msg = self.add(db, chat_id, emisor, contenido)
         db.commit()
         db.refresh(msg)
         return msg
 
 message_repo = MessageRepo()
+
+
+class AsyncMessageRepo:
+    """Async counterpart of ``MessageRepo`` for ``AsyncSession``."""
+
+    async def get_by_id(self, db: AsyncSession, message_id: int) -> Message | None:
+        """
+        Get a message by its ID.
+
+        Args:
+            db (AsyncSession): Async database session.
+            message_id (int): ID of the message.
+
+        Returns:
+            Message | None: The message, or None if it does not exist.
+        """
+        return await db.get(Message, message_id)
+
+    async def list_for_chat(self, db: AsyncSession, chat_id: int, limit: int = 50) -> list[Message]:
+        """
+        Retrieve messages for a chat in descending order by timestamp (see ``MessageRepo.list_for_chat``).
+        
+        Args:
+            db (AsyncSession): Async database session.
+            chat_id (int): ID of the chat.
+            limit (int): Maximum number of messages to retrieve.
+            
+        Returns:
+            list[Message]: List of messages in the chat.
+        """
+        stmt = (
+            select(Message)
+            .options(WITH_CONTENT)
+            .where(Message.id_chat == chat_id)
+            .order_by(Message.sent_at.desc(), Message.id_mensaje.desc())
+            .limit(limit)
+        )
+        messages = list(await db.scalars(stmt))
+        if not messages:
+            archived = await db.run_sync(archive_repo.list_messages, chat_id)
+            if archived:
+                return archived[::-1][:limit]
+        return messages
+
+    async def list_after(self, db: AsyncSession, chat_id: int, after_id: int, limit: int = 50) -> list[Message]:
+        """
+        Retrieve the most recent messages of a chat newer than a given message (see ``MessageRepo.list_after``).
+        
+        Args:
+            db (AsyncSession): Async database session.
+            chat_id (int): ID of the chat.
+            after_id (int): Only messages with a greater ID are returned.
+            limit (int): Maximum number of messages to retrieve.
+            
+        Returns:
+            list[Message]: List of messages in descending order.
+        """
+        stmt = (
+            select(Message)
+            .options(WITH_CONTENT)
+            .where(Message.id_chat == chat_id, Message.id_mensaje > after_id)
+            .order_by(Message.id_mensaje.desc())
+            .limit(limit)
+        )
+        messages = list(await db.scalars(stmt))
+        if not messages:
+            archived = await db.run_sync(archive_repo.list_messages, chat_id)
+            if archived:
+                return [m for m in reversed(archived) if m.id_mensaje > after_id][:limit]
+        return messages
+
+    async def count_after(self, db: AsyncSession, chat_id: int, after_id: int = 0) -> int:
+        """
+        Count the messages of a chat newer than a given message.
+        
+        Args:
+            db (AsyncSession): Async database session.
+            chat_id (int): ID of the chat.
+            after_id (int): Only messages with a greater ID are counted.
+            
+        Returns:
+            int: Number of messages.
+        """
+        stmt = select(func.count()).select_from(Message).where(Message.id_chat == chat_id, Message.id_mensaje > after_id)
+        return await db.scalar(stmt) or 0
+
+    async def create(self, db: AsyncSession, chat_id: int, emisor: str, contenido: str) -> Message:
+        """
+        Create a new message and update the chat's last_message_at timestamp.
+        
+        Args:
+            db (AsyncSession): Async database session.
+            chat_id (int): ID of the chat.
+            emisor (str): Sender of the message ("USER" or "IA").
+            contenido (str): Content of the message.
+            
+        Returns:
+            Message: The newly created message.
+        """
+        msg = Message(id_chat=chat_id, emisor=emisor, contenido=contenido)
+        db.add(msg)
+
+        chat = await db.get(Chat, chat_id)
+        if chat:
+            # Python-side timestamp: a SQL expression would leave the attribute expired,
+            # and expired attributes cannot be lazy-loaded from async code
+            chat.last_message_at = datetime.now()
+
+        await db.commit()
+        await db.refresh(msg)
+        return msg
+
+async_message_repo = AsyncMessageRepo()
@@ -0,0 +1,158 @@
+"""
+Search Repository.
+
+This module runs full-text searches over the messages of a user's chats, using
+MySQL ``MATCH ... AGAINST`` or SQLite FTS5 depending on the database. Live messages
+(plain or compressed) and archived messages are searched together.
+"""
+
+import unicodedata
+import zlib
+
+from sqlalchemy import column, func, literal, literal_column, null, select, table, union_all
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.orm import Session
+
+from app.models.chat import Chat
+from app.models.chat_archive import SQLITE_ARCHIVE_FTS_TABLE, ChatArchiveSearch
+from app.models.message import FORMAT_ZLIB, SQLITE_FTS_TABLE, WORD_RE, Message
+from app.repositories.archive_repo import archive_repo
+
+ARCHIVED = "archived"
+
+
+def search_terms(query: str) -> list[str]:
+    """
+    Split a free-text query into lowercase search terms (operators and punctuation are dropped).
+
+    Args:
+        query (str): Text typed by the user.
+
+    Returns:
+        list[str]: Unique terms in order of appearance.
+    """
+    return list(dict.fromkeys(term.lower() for term in WORD_RE.findall(query) if len(term) > 1))
+
+
+def _fold(text: str) -> str:
+    """Lowercase and strip accents character by character (keeps string positions)."""
+    return "".join(unicodedata.normalize("NFD", ch)[0] for ch in text.lower())
+
+
+def make_snippet(text: str, terms: list[str], width: int = 160) -> str:
+    """
+    Cut a fragment of ``text`` around the first occurrence of any term.
+
+    Args:
+        text (str): Full message content.
+        terms (list[str]): Search terms.
+        width (int): Approximate length of the snippet.
+
+    Returns:
+        str: The snippet, with "…" where the text was cut.
+    """
+    folded = _fold(text)
+    positions = [pos for pos in (folded.find(_fold(term)) for term in terms) if pos >= 0]
+    first = min(positions) if positions else 0
+    start = max(0, first - width // 3)
+    end = min(len(text), start + width)
+    snippet = " ".join(text[start:end].split())
+    return f"{'…' if start > 0 else ''}{snippet}{'…' if end < len(text) else ''}"
+
+
+def _fts_match(fts_table: str, terms: list[str]):
+    """Return the SQLite FTS5 source table, MATCH condition and score for the terms."""
+    fts = table(fts_table, column("rowid"))
+    condition = literal_column(fts_table).op("MATCH")(" OR ".join(f'"{term}"' for term in terms))
+    return fts, condition, -func.bm25(literal_column(fts_table))
+
+
+class SearchRepo:
+    """Repository class for full-text message search."""
+
+    def search(self, db: Session, user_id: int, terms: list[str], limit: int, offset: int) -> list[dict]:
+        """
+        Find messages of the user's chats matching the terms, best matches first.
+
+        Compressed and archived messages are matched through their indexed words and
+        decoded here, only for the returned page.
+
+        Args:
+            db (Session): Database session.
+            user_id (int): ID of the user (only their non-deleted chats are searched).
+            terms (list[str]): Search terms (any of them may match; more matches rank higher).
+            limit (int): Maximum number of rows.
+            offset (int): Rows to skip (pagination).
+
+        Returns:
+            list[dict]: Rows with id_mensaje, id_chat, emisor, contenido, sent_at, title and score.
+        """
+        live_columns = (
+            Message.id_mensaje,
+            Message.id_chat,
+            Message.emisor,
+            Message._contenido.label("contenido"),
+            Message.formato,
+            Message.contenido_comprimido,
+            Message.sent_at,
+        )
+        archived_columns = (
+            ChatArchiveSearch.id_mensaje,
+            ChatArchiveSearch.id_chat,
+            ChatArchiveSearch.emisor,
+            literal("").label("contenido"),
+            literal(ARCHIVED).label("formato"),
+            null().label("contenido_comprimido"),
+            ChatArchiveSearch.sent_at,
+        )
+        if db.get_bind().dialect.name == "sqlite":
+            fts, condition, score = _fts_match(SQLITE_FTS_TABLE, terms)
+            live = (
+                select(*live_columns, score.label("score"))
+                .select_from(fts)
+                .join(Message, Message.id_mensaje == fts.c.rowid)
+                .where(condition)
+            )
+            fts, condition, score = _fts_match(SQLITE_ARCHIVE_FTS_TABLE, terms)
+            archived = (
+                select(*archived_columns, score.label("score"))
+                .select_from(fts)
+                .join(ChatArchiveSearch, ChatArchiveSearch.id_mensaje == fts.c.rowid)
+                .where(condition)
+            )
+        else:
+            against = " ".join(terms)
+            score = match(Message._contenido, Message.terminos, against=against).in_natural_language_mode()
+            live = select(*live_columns, score.label("score")).where(score > 0)
+            score = match(ChatArchiveSearch.terminos, against=against).in_natural_language_mode()
+            archived = select(*archived_columns, score.label("score")).where(score > 0)
+
+        live = live.join(Chat, Chat.id_chat == Message.id_chat)
+        archived = archived.join(Chat, Chat.id_chat == ChatArchiveSearch.id_chat)
+        hits = union_all(
+            *(
+                stmt.add_columns(Chat.title).where(Chat.id_usuario == user_id, Chat.deleted_at.is_(None))
+                for stmt in (live, archived)
+            )
+        ).subquery()
+        stmt = (
+            select(hits)
+            .order_by(hits.c.score.desc(), hits.c.id_mensaje.desc())
+            .limit(limit)
+            .offset(offset)
+        )
+        rows = [dict(row._mapping) for row in db.execute(stmt)]
+
+        archived_contents = {}
+        for chat_id in {row["id_chat"] for row in rows if row["formato"] == ARCHIVED}:
+            archived_contents.update((m.id_mensaje, m.contenido) for m in archive_repo.list_messages(db, chat_id) or [])
+        for row in rows:
+            formato = row.pop("formato")
+            comprimido = row.pop("contenido_comprimido")
+            if formato == FORMAT_ZLIB:
+                row["contenido"] = zlib.decompress(comprimido).decode("utf-8")
+            elif formato == ARCHIVED:
+                row["contenido"] = archived_contents.get(row["id_mensaje"], "")
+        return rows
+
+search_repo = SearchRepo()
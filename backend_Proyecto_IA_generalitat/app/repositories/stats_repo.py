@@ -0,0 +1,100 @@
+"""
+Stats Repository.
+
+This module provides data access methods for the UserStats and ChatStats models.
+The counters themselves are maintained by model events (see ``app.models.chat_stats``).
+"""
+
+from datetime import datetime
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from app.models.chat import Chat
+from app.models.chat_stats import ChatStats
+from app.models.user_stats import UserStats
+
+class StatsRepo:
+    """Repository class for UserStats and ChatStats model operations."""
+
+    def get_user_stats(self, db: Session, user_id: int) -> UserStats | None:
+        """
+        Retrieve the stats of a user.
+        
+        Args:
+            db (Session): Database session.
+            user_id (int): ID of the user.
+            
+        Returns:
+            UserStats | None: The stats row, or None if the user has none.
+        """
+        return db.get(UserStats, user_id)
+
+    def get_chat_stats(self, db: Session, chat_id: int) -> ChatStats | None:
+        """
+        Retrieve the stats of a chat.
+        
+        Args:
+            db (Session): Database session.
+            chat_id (int): ID of the chat.
+            
+        Returns:
+            ChatStats | None: The stats row, or None if the chat has none.
+        """
+        return db.get(ChatStats, chat_id)
+
+    def record_report(self, db: Session, chat_id: int, user_id: int, employability_level: str) -> None:
+        """
+        Store the employability level detected in a chat's report (does not commit).
+        
+        Args:
+            db (Session): Database session.
+            chat_id (int): The chat the report belongs to.
+            user_id (int): Owner of the chat.
+            employability_level (str): Level detected in the report ('' if none).
+        """
+        if not employability_level:
+            return
+        now = datetime.now()
+        db.execute(
+            update(ChatStats)
+            .where(ChatStats.id_chat == chat_id)
+            .values(employability_level=employability_level, report_at=now)
+        )
+        db.execute(
+            update(UserStats)
+            .where(UserStats.id_usuario == user_id)
+            .values(last_employability_level=employability_level, last_report_at=now)
+        )
+
+    def remove_chats(self, db: Session, user_id: int, chat_ids: list[int]) -> None:
+        """
+        Subtract chats that are being deleted from their owner's stats (does not commit).
+        
+        Must run in the transaction that soft-deletes them, with only the chats
+        that were not deleted yet, so each chat is subtracted once.
+        
+        Args:
+            db (Session): Database session.
+            user_id (int): Owner of the chats.
+            chat_ids (list[int]): IDs of the chats being deleted.
+        """
+        if not chat_ids:
+            return
+        completed_chats, completed_turns = db.execute(
+            select(func.count(Chat.id_chat), func.coalesce(func.sum(ChatStats.user_turns), 0))
+            .select_from(Chat)
+            .outerjoin(ChatStats, ChatStats.id_chat == Chat.id_chat)
+            .where(Chat.id_chat.in_(chat_ids), Chat.status == "completed")
+        ).one()
+        db.execute(
+            update(UserStats)
+            .where(UserStats.id_usuario == user_id)
+            .values(
+                total_chats=UserStats.total_chats - len(chat_ids),
+                completed_chats=UserStats.completed_chats - completed_chats,
+                completed_turns=UserStats.completed_turns - completed_turns,
+            )
+        )
+
+stats_repo = StatsRepo()
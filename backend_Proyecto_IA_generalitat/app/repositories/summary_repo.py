@@ -0,0 +1,68 @@
+"""
+Chat Summary Repository.
+
+This module provides data access methods for the ChatSummary model.
+"""
+
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.models.chat_summary import ChatSummary
+
+class SummaryRepo:
+    """Repository class for ChatSummary model operations."""
+
+    def get(self, db: Session, chat_id: int) -> ChatSummary | None:
+        """
+        Retrieve the summary of a chat.
+        
+        Args:
+            db (Session): Database session.
+            chat_id (int): ID of the chat.
+            
+        Returns:
+            ChatSummary | None: The summary if the chat has one, else None.
+        """
+        return db.get(ChatSummary, chat_id)
+
+    def upsert(self, db: Session, chat_id: int, contenido: str, id_ultimo_mensaje: int, mensajes_resumidos: int) -> ChatSummary:
+        """
+        Store the summary of a chat unless the stored one already covers as much.
+        
+        A refresh that finished late never overwrites a summary that is further
+        ahead, and two first summaries inserted at once keep the one covering more.
+        
+        Args:
+            db (Session): Database session.
+            chat_id (int): ID of the chat.
+            contenido (str): Summary text.
+            id_ultimo_mensaje (int): ID of the last message covered by the summary.
+            mensajes_resumidos (int): Total number of messages covered.
+            
+        Returns:
+            ChatSummary: The summary stored after the call (this one or the one further ahead).
+        """
+        values = {
+            "contenido": contenido,
+            "id_ultimo_mensaje": id_ultimo_mensaje,
+            "mensajes_resumidos": mensajes_resumidos,
+        }
+        advance = (
+            update(ChatSummary)
+            .where(ChatSummary.id_chat == chat_id, ChatSummary.mensajes_resumidos < mensajes_resumidos)
+            .values(**values)
+        )
+        if not db.execute(advance).rowcount and db.get(ChatSummary, chat_id, populate_existing=True) is None:
+            db.add(ChatSummary(id_chat=chat_id, **values))
+            try:
+                db.commit()
+            except IntegrityError:
+                # Another refresh inserted the first summary meanwhile
+                db.rollback()
+                db.execute(advance)
+                db.commit()
+        else:
+            db.commit()
+        return db.get(ChatSummary, chat_id)
+
+summary_repo = SummaryRepo()
@@ -1,9 +1,11 @@
 """
 User Repository.
 
-This module provides data access methods for the User model, including creation and retrieval.
+This module provides data access methods for the User model, including creation and retrieval,
+for sync sessions (``UserRepo``) and async sessions (``AsyncUserRepo``).
 """
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy import select
 from app.models.user import User
@@ -57,3 +59,54 @@ class UserRepo:
         return user
 
 user_repo = UserRepo()
+
+
+class AsyncUserRepo:
+    """Async counterpart of ``UserRepo`` for ``AsyncSession``."""
+
+    async def get_by_email(self, db: AsyncSession, email: str) -> User | None:
+        """
+        Retrieve a user by email address.
+        
+        Args:
+            db (AsyncSession): Async database session.
+            email (str): Email address to search for.
+            
+        Returns:
+            User | None: The user object if found, else None.
+        """
+        return await db.scalar(select(User).where(User.email == email))
+
+    async def get_by_id(self, db: AsyncSession, user_id: int) -> User | None:
+        """
+        Retrieve a user by ID.
+        
+        Args:
+            db (AsyncSession): Async database session.
+            user_id (int): ID of the user.
+            
+        Returns:
+            User | None: The user object if found, else None.
+        """
+        return await db.get(User, user_id)
+
+    async def create(self, db: AsyncSession, email: str, password_hash: str, nombre: str) -> User:
+        """
+        Create a new user in the database.
+        
+        Args:
+            db (AsyncSession): Async database session.
+            email (str): User's email.
+            password_hash (str): Hashed password.
+            nombre (str): User's name.
+            
+        Returns:
+            User: The newly created user.
+        """
+        user = User(email=email, password_hash=password_hash, nombre=nombre)
+        db.add(user)
+        await db.commit()
+        await db.refresh(user)
+        return user
+
+async_user_repo = AsyncUserRepo()
@@ -5,7 +5,11 @@ This module defines Pydantic models for AI-related requests, such as generating
 initializing chats, and generating reports.
 """
 
-from pydantic import BaseModel, Field
+from typing import Literal
+
+from pydantic import BaseModel, Field, field_validator
+
+MAX_MESSAGE_LENGTH = 8000  # Characters of a user turn
 
 class AiReplyRequest(BaseModel):
     """
@@ -16,7 +20,7 @@ class AiReplyRequest(BaseModel):
         contenido (str): The content of the user's message.
     """
     chat_id: int = Field(..., ge=1)
-    contenido: str = Field(..., min_length=1, max_length=8000)
+    contenido: str = Field(..., min_length=1, max_length=MAX_MESSAGE_LENGTH)
 
 class InitializeChatRequest(BaseModel):
     """
@@ -35,3 +39,48 @@ class GenerateReportRequest(BaseModel):
         chat_id (int): The ID of the chat to generate a report for.
     """
     chat_id: int = Field(..., ge=1)
+
+
+class GenerateReportsBatchRequest(BaseModel):
+    """
+    Schema for a request to export the reports of several completed chats.
+    
+    Attributes:
+        chat_ids (list[int]): IDs of the completed chats to export (1-50, no duplicates).
+    """
+    chat_ids: list[int] = Field(..., min_length=1, max_length=50)
+
+    @field_validator('chat_ids')
+    @classmethod
+    def validate_chat_ids(cls, v: list[int]) -> list[int]:
+        """Valida que los IDs sean positivos y elimina duplicados conservando el orden."""
+        if any(chat_id < 1 for chat_id in v):
+            raise ValueError('Los IDs de chat deben ser positivos')
+        return list(dict.fromkeys(v))
+
+
+class InterviewSocketAuth(BaseModel):
+    """
+    Schema for the first frame of the interview WebSocket.
+    
+    Attributes:
+        type (str): Event type, "auth".
+        token (str): JWT access token (sent in a frame so it stays out of URLs and access logs).
+    """
+    type: Literal["auth"]
+    token: str = Field(..., min_length=1)
+
+
+class InterviewSocketMessage(BaseModel):
+    """
+    Schema for a user turn sent over the interview WebSocket.
+    
+    Attributes:
+        type (str): Event type; after authenticating, clients only send "message".
+        contenido (str): The content of the user's message.
+        idempotency_key (str | None): Optional key; a turn resent with the same key returns
+            the AI message already produced (shared with the ``Idempotency-Key`` of ``POST /reply``).
+    """
+    type: Literal["message"]
+    contenido: str = Field(..., min_length=1, max_length=MAX_MESSAGE_LENGTH)
+    idempotency_key: str | None = Field(None, min_length=1, max_length=255)
@@ -8,6 +8,8 @@ including chat creation, updates, and retrieval.
 from pydantic import BaseModel, Field, field_validator
 from datetime import datetime
 
+from app.schemas.message import MessageResponse
+
 
 class ChatResponse(BaseModel):
     """
@@ -44,6 +46,64 @@ class CreateChatResponse(BaseModel):
     id_chat: int
 
 
+class StartChatRequest(BaseModel):
+    """
+    Schema for starting a new interview.
+    
+    Attributes:
+        title (str | None): Optional title for the chat.
+    """
+    title: str | None = Field(None, max_length=200, description="Título del chat")
+
+    @field_validator('title')
+    @classmethod
+    def validate_title(cls, v: str | None) -> str | None:
+        """Limpia el título; un título vacío usa el valor por defecto."""
+        if v is None:
+            return None
+        return v.strip() or None
+
+
+class StartChatResponse(BaseModel):
+    """
+    Schema for the response of starting a new interview.
+    
+    Attributes:
+        chat (ChatResponse): The newly created chat.
+        greeting (MessageResponse): Evalio's initial greeting message.
+    """
+    chat: ChatResponse
+    greeting: MessageResponse
+
+
+class BulkDeleteChatsRequest(BaseModel):
+    """
+    Schema for deleting several chats at once.
+    
+    Attributes:
+        chat_ids (list[int]): IDs of the chats to delete (1-100).
+    """
+    chat_ids: list[int] = Field(..., min_length=1, max_length=100, description="IDs de los chats a eliminar")
+
+    @field_validator('chat_ids')
+    @classmethod
+    def validate_chat_ids(cls, v: list[int]) -> list[int]:
+        """Valida que los IDs sean positivos y elimina duplicados."""
+        if any(chat_id < 1 for chat_id in v):
+            raise ValueError('Los IDs de chat deben ser positivos')
+        return list(dict.fromkeys(v))
+
+
+class BulkDeleteChatsResponse(BaseModel):
+    """
+    Schema for the bulk delete response.
+    
+    Attributes:
+        deleted (int): Number of chats deleted.
+    """
+    deleted: int
+
+
 class UpdateChatTitleRequest(BaseModel):
     """
     Schema for updating chat title request.
@@ -0,0 +1,48 @@
+"""
+Search Schemas.
+
+This module defines Pydantic models for the full-text search endpoint.
+"""
+
+from pydantic import BaseModel
+from datetime import datetime
+
+
+class SearchHit(BaseModel):
+    """
+    Schema for a single search result.
+    
+    Attributes:
+        id_chat (int): The chat containing the message.
+        chat_title (str): Title of the chat.
+        id_mensaje (int): The matching message.
+        emisor (str): The sender ("USER" or "IA").
+        snippet (str): Fragment of the message around the first match.
+        score (float): Relevance (higher is better; only comparable within one search).
+        sent_at (datetime | None): Timestamp of the message.
+    """
+    id_chat: int
+    chat_title: str
+    id_mensaje: int
+    emisor: str
+    snippet: str
+    score: float
+    sent_at: datetime | None
+
+
+class SearchResponse(BaseModel):
+    """
+    Schema for a page of search results.
+    
+    Attributes:
+        query (str): The search text.
+        page (int): Page number (1-based).
+        page_size (int): Results per page.
+        has_more (bool): Whether a next page exists.
+        results (list[SearchHit]): Results of this page, best first.
+    """
+    query: str
+    page: int
+    page_size: int
+    has_more: bool
+    results: list[SearchHit]
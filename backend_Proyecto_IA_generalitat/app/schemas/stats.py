@@ -0,0 +1,50 @@
+"""
+Stats Schemas.
+
+This module defines Pydantic models for the progress statistics endpoints.
+"""
+
+from pydantic import BaseModel
+from datetime import datetime
+
+
+class UserStatsResponse(BaseModel):
+    """
+    Schema for the user's progress summary.
+    
+    Attributes:
+        total_chats (int): Interviews started.
+        completed_chats (int): Interviews completed.
+        average_turns (float): Average candidate messages per completed interview.
+        last_employability_level (str | None): Level detected in the last generated report.
+        last_report_at (datetime | None): Timestamp of the last generated report.
+    """
+    total_chats: int = 0
+    completed_chats: int = 0
+    average_turns: float = 0.0
+    last_employability_level: str | None = None
+    last_report_at: datetime | None = None
+
+    class Config:
+        from_attributes = True
+
+
+class ChatStatsResponse(BaseModel):
+    """
+    Schema for the summary of a single interview.
+    
+    Attributes:
+        id_chat (int): The chat ID.
+        user_turns (int): Messages sent by the candidate.
+        ai_turns (int): Messages sent by the AI.
+        employability_level (str | None): Level detected in the chat's report.
+        report_at (datetime | None): Timestamp when the report was generated.
+    """
+    id_chat: int
+    user_turns: int = 0
+    ai_turns: int = 0
+    employability_level: str | None = None
+    report_at: datetime | None = None
+
+    class Config:
+        from_attributes = True
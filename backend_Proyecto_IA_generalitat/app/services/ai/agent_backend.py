@@ -0,0 +1,182 @@
+"""
+Bedrock Agent Backends.
+
+``bedrock_service`` talks to the agent through any object with the ``invoke_agent``
+method of the boto3 ``bedrock-agent-runtime`` client. Besides the live client, this
+module provides a recorder that saves every response stream (chunk boundaries and
+timing) to local files and a replayer that serves those recordings back
+deterministically, so the reply pipeline, completion detection and report
+generation can be profiled and benchmarked offline with real-shaped data.
+
+Recordings are JSON Lines files, one per agent session (``chat_12.jsonl``), with
+one line per invocation::
+
+    {"input_text": "...", "first_byte_ms": 812.4,
+     "chunks": [{"after_ms": 0.0, "text": "..."}, {"after_ms": 31.2, "text": "..."}]}
+"""
+
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Iterator, Protocol
+
+logger = logging.getLogger(__name__)
+
+
+class AgentBackend(Protocol):
+    """
+    Interface of the agent client used by ``bedrock_service``.
+
+    The live boto3 client satisfies it structurally; the recorder and the replayer
+    declare it explicitly.
+    """
+
+    def invoke_agent(self, agentId: str, agentAliasId: str, sessionId: str, inputText: str, **kwargs) -> dict:
+        """
+        Invoke the agent like ``bedrock-agent-runtime.invoke_agent``.
+
+        Returns:
+            dict: A response whose ``completion`` iterates over ``{"chunk": {"bytes": ...}}`` events.
+        """
+        ...
+
+
+class AgentRecorder(AgentBackend):
+    """Pass-through backend that records every response stream it serves."""
+
+    def __init__(self, client, directory: str):
+        """
+        Args:
+            client: The wrapped agent client (normally the live boto3 client).
+            directory (str): Folder where the recordings are written (created on demand).
+        """
+        self.client = client
+        self.directory = Path(directory)
+        self._lock = threading.Lock()
+
+    def invoke_agent(self, agentId: str, agentAliasId: str, sessionId: str, inputText: str, **kwargs) -> dict:
+        start = time.perf_counter()
+        response = self.client.invoke_agent(
+            agentId=agentId, agentAliasId=agentAliasId, sessionId=sessionId, inputText=inputText, **kwargs
+        )
+        turn = {"input_text": inputText, "first_byte_ms": round((time.perf_counter() - start) * 1000, 1), "chunks": []}
+        return {**response, "completion": self._record(sessionId, turn, response.get("completion", []))}
+
+    def _record(self, session_id: str, turn: dict, completion) -> Iterator[dict]:
+        """Yield the events of a stream, saving its chunks once it has been consumed."""
+        last = time.perf_counter()
+        try:
+            for event in completion:
+                if "bytes" in event.get("chunk", {}):
+                    now = time.perf_counter()
+                    turn["chunks"].append({
+                        "after_ms": round((now - last) * 1000, 1),
+                        "text": event["chunk"]["bytes"].decode("utf-8"),
+                    })
+                    last = now
+                yield event
+        finally:
+            self._save(session_id, turn)
+
+    def _save(self, session_id: str, turn: dict) -> None:
+        """Append a turn to the session's recording. Failures are logged and never raised."""
+        try:
+            with self._lock:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                with open(self.directory / f"{session_id}.jsonl", "a", encoding="utf-8") as f:
+                    f.write(json.dumps(turn, ensure_ascii=False) + "\n")
+        except OSError as e:
+            logger.warning(f"⚠️ Could not record agent turn of {session_id}: {str(e)}")
+
+
+class AgentReplayer(AgentBackend):
+    """
+    Backend that serves recorded response streams instead of calling the agent.
+
+    A session whose ID has a recording replays it; any other session is assigned
+    the next unused recording (in file name order, cycling when all are taken), so
+    the same sequence of requests always gets the same replies. Each invocation
+    returns the session's next recorded turn, whatever its input.
+    """
+
+    def __init__(self, directory: str, speed: float = 1.0):
+        """
+        Args:
+            directory (str): Folder with the ``*.jsonl`` recordings.
+            speed (float): Timing factor: 1 replays the recorded delays, 2 halves them, 0 removes them.
+
+        Raises:
+            ValueError: If the folder has no recordings.
+        """
+        self.speed = speed
+        self.recordings: dict[str, list[dict]] = {}
+        for path in sorted(Path(directory).glob("*.jsonl")):
+            with open(path, encoding="utf-8") as f:
+                turns = [json.loads(line) for line in f if line.strip()]
+            if turns:
+                self.recordings[path.stem] = turns
+        if not self.recordings:
+            raise ValueError(f"No agent recordings found in '{directory}'")
+
+        self._names = list(self.recordings)
+        self._next_name = 0
+        self._sessions: dict[str, list] = {}  # session ID -> [recording name, next turn]
+        self._lock = threading.Lock()
+
+    def _next_turn(self, session_id: str) -> tuple[str, int, dict]:
+        with self._lock:
+            if session_id not in self._sessions:
+                if session_id in self.recordings:
+                    name = session_id
+                else:
+                    name = self._names[self._next_name % len(self._names)]
+                    self._next_name += 1
+                self._sessions[session_id] = [name, 0]
+            entry = self._sessions[session_id]
+            name, index = entry
+            entry[1] += 1
+
+        turns = self.recordings[name]
+        if index >= len(turns):
+            raise RuntimeError(f"Agent recording '{name}' has no turn {index + 1} (session {session_id})")
+        return name, index, turns[index]
+
+    def _delay(self, ms: float) -> None:
+        if self.speed > 0 and ms > 0:
+            time.sleep(ms / 1000 / self.speed)
+
+    def _stream(self, chunks: list[dict]) -> Iterator[dict]:
+        for chunk in chunks:
+            self._delay(chunk["after_ms"])
+            yield {"chunk": {"bytes": chunk["text"].encode("utf-8")}}
+
+    def invoke_agent(self, agentId: str, agentAliasId: str, sessionId: str, inputText: str, **kwargs) -> dict:
+        name, index, turn = self._next_turn(sessionId)
+        if turn["input_text"] != inputText:
+            logger.debug(f"Replaying turn {index + 1} of '{name}' for a different input")
+        self._delay(turn["first_byte_ms"])
+        return {"completion": self._stream(turn["chunks"]), "sessionId": sessionId}
+
+
+def create_agent_backend(live_client, backend: str, directory: str, speed: float = 1.0) -> AgentBackend:
+    """
+    Build the agent client configured by ``BEDROCK_AGENT_BACKEND``.
+
+    Args:
+        live_client: The boto3 ``bedrock-agent-runtime`` client.
+        backend (str): 'live', 'record' (live calls saved to ``directory``) or 'replay'.
+        directory (str): Folder of the recordings.
+        speed (float): Replay timing factor.
+
+    Returns:
+        AgentBackend: The object ``bedrock_service`` calls ``invoke_agent`` on.
+    """
+    if backend == "record":
+        logger.info(f"🎙️ Recording Bedrock Agent responses to {directory}")
+        return AgentRecorder(live_client, directory)
+    if backend == "replay":
+        logger.info(f"📼 Replaying Bedrock Agent responses from {directory} (speed {speed})")
+        return AgentReplayer(directory, speed)
+    return live_client
@@ -7,13 +7,18 @@ It handles prompt injection protection, agent invocation, and response processin
 
 import os
 import logging
+import math
+import time
 import boto3
 import re
+from dataclasses import dataclass
+from typing import Callable, Iterator
 from botocore.exceptions import BotoCoreError, ClientError
 from pathlib import Path
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.services.ai.agent_backend import create_agent_backend
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -21,13 +26,30 @@ logger = logging.getLogger(__name__)
 BASE_DIR = Path(__file__).resolve().parent
 SYSTEM_PROMPT = (BASE_DIR / "system_prompt.txt").read_text(encoding="utf-8").strip()
 
+SUMMARY_PROMPT = (
+    "Eres un asistente que resume entrevistas técnicas simuladas para que el entrevistador pueda continuar "
+    "sin releer la conversación completa. Actualiza el RESUMEN PREVIO con los NUEVOS MENSAJES. "
+    "Conserva SIEMPRE: los datos de configuración (rol laboral, nivel académico, ciclo formativo, duración), "
+    "cada pregunta técnica formulada y una valoración breve de la respuesta del candidato, los errores "
+    "conceptuales y las faltas de ortografía citando entre comillas la palabra exacta escrita por el candidato. "
+    "No inventes información. Responde solo con el resumen en texto plano, en español, en menos de 400 palabras."
+)
+
 AWS_REGION = os.getenv("AWS_REGION") or getattr(settings, "aws_region", None) or "us-east-1"
 BEDROCK_MODEL_ID = os.getenv("BEDROCK_MODEL_ID") or getattr(settings, "bedrock_model_id", None) or "amazon.nova-micro-v1:0"
 
 AGENT_ID = os.getenv("BEDROCK_AGENT_ID") or "YWPZKUZ1W2"
 AGENT_ALIAS_ID = os.getenv("BEDROCK_AGENT_ALIAS_ID") or "AG2TCM3LTP"
 
-_client = boto3.client("bedrock-agent-runtime", region_name=AWS_REGION)
+_client = create_agent_backend(
+    boto3.client("bedrock-agent-runtime", region_name=AWS_REGION),
+    settings.bedrock_agent_backend,
+    settings.bedrock_agent_recordings_dir,
+    settings.bedrock_agent_replay_speed,
+)
+_runtime_client = None
+# Set once the first call with a cache point has been checked for cache activity
+_prompt_cache_checked = False
 
 # Robust separator to prevent prompt injection
 SYSTEM_SEPARATOR = "\n" + "=" * 60 + "\n[SYSTEM CONTEXT]\n" + "=" * 60 + "\n"
@@ -94,31 +116,292 @@ def _sanitize_user_input(text: str) -> str:
     return text.strip()
 
 
-def generate_reply(
+@dataclass
+class TokenUsage:
+    """
+    Token accounting for a single direct model invocation.
+    
+    Attributes:
+        input_tokens: Prompt tokens billed (excluding cache reads)
+        output_tokens: Generated tokens
+        cache_read_tokens: Prompt tokens served from the prompt cache
+        cache_write_tokens: Prompt tokens written to the prompt cache
+        latency_ms: Model latency reported by Bedrock
+        wall_ms: End-to-end time of the API call measured locally
+        history_messages: Conversation messages sent after windowing
+    """
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
+    latency_ms: int = 0
+    wall_ms: int = 0
+    history_messages: int = 0
+
+
+@dataclass
+class ModelReply:
+    """
+    Result of a direct model invocation.
+    
+    Attributes:
+        text: Generated response text
+        usage: Token and latency accounting for the call
+    """
+    text: str
+    usage: TokenUsage
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Cheap token estimate used for history budgeting (~4 characters per token).
+    
+    Args:
+        text: Text to measure
+        
+    Returns:
+        Estimated token count
+    """
+    return math.ceil(len(text or "") / 4)
+
+
+def window_history(history: list[dict], token_budget: int, max_messages: int) -> list[dict]:
+    """
+    Keep the most recent turns that fit in the token budget, in Converse format.
+    
+    Walks the history backwards, always keeping the latest message, and stops when
+    either the budget or ``max_messages`` would be exceeded. The result starts with
+    a user turn and consecutive messages with the same role are merged, as required
+    by the Converse API.
+    
+    Args:
+        history: Chronological list of {"role": "user"|"assistant", "content": str}
+        token_budget: Maximum estimated tokens for the windowed history
+        max_messages: Maximum number of messages to keep
+        
+    Returns:
+        Windowed history as Converse messages ({"role", "content": [{"text"}]})
+    """
+    window: list[dict] = []
+    used = 0
+    for m in reversed(history):
+        if m.get("role") not in ("user", "assistant"):
+            continue
+        content = (m.get("content") or "").strip()
+        if not content:
+            continue
+        cost = estimate_tokens(content)
+        if window and (used + cost > token_budget or len(window) >= max_messages):
+            break
+        window.append({"role": m["role"], "content": content})
+        used += cost
+    window.reverse()
+
+    while window and window[0]["role"] != "user":
+        window.pop(0)
+
+    merged: list[dict] = []
+    for m in window:
+        if merged and merged[-1]["role"] == m["role"]:
+            merged[-1]["content"][0]["text"] += "\n\n" + m["content"]
+        else:
+            merged.append({"role": m["role"], "content": [{"text": m["content"]}]})
+    return merged
+
+
+def _get_runtime_client():
+    """Return the shared bedrock-runtime client, creating it on first use."""
+    global _runtime_client
+    if _runtime_client is None:
+        _runtime_client = boto3.client("bedrock-runtime", region_name=AWS_REGION)
+    return _runtime_client
+
+
+def _check_prompt_cache(usage: TokenUsage) -> None:
+    """
+    Warn once per process if BEDROCK_PROMPT_CACHE is on but the model reports no cache activity.
+    
+    Either the model does not support prompt caching or the system prompt is shorter
+    than its minimum cacheable prefix; in both cases the setting only adds overhead.
+    
+    Args:
+        usage: Token accounting of the first call sent with a cache point
+    """
+    global _prompt_cache_checked
+    if _prompt_cache_checked:
+        return
+    _prompt_cache_checked = True
+    if usage.cache_read_tokens or usage.cache_write_tokens:
+        logger.info(f"✅ Prompt cache active for model {BEDROCK_MODEL_ID}")
+    else:
+        logger.warning(
+            f"⚠️ BEDROCK_PROMPT_CACHE is enabled but model {BEDROCK_MODEL_ID} reported no cache reads or writes; "
+            "check that the model supports prompt caching",
+            extra={"model_id": BEDROCK_MODEL_ID}
+        )
+
+
+def _converse(
+    system: list[dict],
+    messages: list[dict],
+    chat_id: int,
+    max_tokens: int,
+    temperature: float,
+    top_p: float,
+) -> ModelReply:
+    """
+    Call the Converse API on BEDROCK_MODEL_ID and collect token accounting.
+    
+    Args:
+        system: Converse system content blocks
+        messages: Converse messages (alternating roles, starting with user)
+        chat_id: Chat ID (used for logging)
+        max_tokens: Maximum tokens in response
+        temperature: Sampling temperature 0.0-1.0
+        top_p: Nucleus sampling parameter
+        
+    Returns:
+        ModelReply with the generated text and token accounting
+        
+    Raises:
+        RuntimeError: If the Bedrock API call fails
+    """
+    started = time.perf_counter()
+    try:
+        resp = _get_runtime_client().converse(
+            modelId=BEDROCK_MODEL_ID,
+            system=system,
+            messages=messages,
+            inferenceConfig={"maxTokens": max_tokens, "temperature": temperature, "topP": top_p},
+        )
+    except (ClientError, BotoCoreError) as e:
+        logger.error(
+            f"❌ Bedrock Converse API error: {str(e)}",
+            extra={
+                "model_id": BEDROCK_MODEL_ID,
+                "region": AWS_REGION,
+                "error_type": type(e).__name__
+            },
+            exc_info=True
+        )
+        raise RuntimeError(f"Failed to generate AI response: {str(e)}")
+    wall_ms = int((time.perf_counter() - started) * 1000)
+
+    blocks = resp.get("output", {}).get("message", {}).get("content", [])
+    text = "".join(block.get("text", "") for block in blocks).strip()
+
+    raw_usage = resp.get("usage", {})
+    usage = TokenUsage(
+        input_tokens=raw_usage.get("inputTokens", 0),
+        output_tokens=raw_usage.get("outputTokens", 0),
+        cache_read_tokens=raw_usage.get("cacheReadInputTokens", 0),
+        cache_write_tokens=raw_usage.get("cacheWriteInputTokens", 0),
+        latency_ms=resp.get("metrics", {}).get("latencyMs", 0),
+        wall_ms=wall_ms,
+        history_messages=len(messages),
+    )
+    logger.info(
+        f"📊 Model usage chat={chat_id} in={usage.input_tokens} out={usage.output_tokens} "
+        f"cache_read={usage.cache_read_tokens} cache_write={usage.cache_write_tokens} "
+        f"latency={usage.latency_ms}ms wall={usage.wall_ms}ms messages={usage.history_messages}",
+        extra={"chat_id": chat_id, "model_id": BEDROCK_MODEL_ID, **usage.__dict__}
+    )
+
+    return ModelReply(text=text, usage=usage)
+
+
+def converse_reply(
     history: list[dict],
     chat_id: int,
     max_tokens: int = 200,
     temperature: float = 0.7,
     top_p: float = 0.9,
-) -> str:
+) -> ModelReply:
     """
-    Generate an AI reply using AWS Bedrock Agent with prompt injection protection.
+    Generate a reply by invoking BEDROCK_MODEL_ID directly through the Converse API.
+    
+    Unlike the agent path, the windowed conversation history is sent explicitly, so
+    the reply does not depend on the agent's session memory. With BEDROCK_PROMPT_CACHE
+    the system prompt is sent as a cacheable prefix (only for models that support
+    prompt caching; others reject the cache point). Entries with role "system" in the
+    history (e.g. the rolling conversation summary) are appended after it.
     
     Args:
-        history: List of message dictionaries with 'role' and 'content' keys
-        chat_id: Chat ID to use as session ID for the agent
-        max_tokens: Maximum tokens in response (default: 200)
-        temperature: Sampling temperature 0.0-1.0 (default: 0.7)
-        top_p: Nucleus sampling parameter (default: 0.9)
+        history: Chronological list of message dictionaries (last one is the user turn)
+        chat_id: Chat ID (used for logging)
+        max_tokens: Maximum tokens in response
+        temperature: Sampling temperature 0.0-1.0
+        top_p: Nucleus sampling parameter
         
     Returns:
-        Generated AI response text
+        ModelReply with the generated text and token accounting
         
     Raises:
-        ValueError: If prompt injection is detected
-        RuntimeError: If Bedrock Agent API call fails
+        ValueError: If the windowed history is empty
+        RuntimeError: If the Bedrock API call fails
+    """
+    messages = window_history(
+        history,
+        token_budget=settings.bedrock_history_token_budget,
+        max_messages=settings.bedrock_history_max_messages,
+    )
+    if not messages:
+        raise ValueError("No user message found in history")
+
+    system = [{"text": SYSTEM_PROMPT}]
+    if settings.bedrock_prompt_cache:
+        system.append({"cachePoint": {"type": "default"}})
+    system.extend({"text": m["content"]} for m in history if m.get("role") == "system" and m.get("content"))
+
+    reply = _converse(system, messages, chat_id, max_tokens, temperature, top_p)
+    if settings.bedrock_prompt_cache:
+        _check_prompt_cache(reply.usage)
+    reply.text = reply.text or "Unable to generate a response at this moment."
+    return reply
+
+
+def summarize_conversation(previous_summary: str | None, history: list[dict], chat_id: int) -> ModelReply:
+    """
+    Condense older interview messages (and any previous summary) into a new summary.
+    
+    Args:
+        previous_summary: Summary covering the messages before ``history``, if any
+        history: Chronological messages to fold into the summary
+        chat_id: Chat ID (used for logging)
+        
+    Returns:
+        ModelReply with the new summary text and token accounting
+        
+    Raises:
+        RuntimeError: If the Bedrock API call fails
+    """
+    transcript = "\n".join(
+        f"{'CANDIDATO' if m['role'] == 'user' else 'EVALIO'}: {m['content']}" for m in history
+    )
+    content = (
+        f"RESUMEN PREVIO:\n{previous_summary or '(ninguno)'}\n\n"
+        f"NUEVOS MENSAJES:\n{transcript}"
+    )
+    return _converse(
+        [{"text": SUMMARY_PROMPT}],
+        [{"role": "user", "content": [{"text": content}]}],
+        chat_id,
+        max_tokens=settings.summary_max_tokens,
+        temperature=0.2,
+        top_p=0.9,
+    )
+
+
+EMPTY_REPLY = "Unable to generate a response at this moment."
+
+
+def _last_user_message(history: list[dict]) -> str:
+    """
+    Return the last user message of the history, sanitized against prompt injection.
+    
+    Raises:
+        ValueError: If prompt injection is detected or there is no user message
     """
-    # Get the last user message from history
     user_message = ""
     for m in reversed(history):
         if m.get("role") == "user":
@@ -133,7 +416,16 @@ def generate_reply(
     
     if not user_message:
         raise ValueError("No user message found in history")
+    return user_message
+
 
+def _agent_chunks(user_message: str, chat_id: int) -> Iterator[str]:
+    """
+    Invoke the Bedrock Agent and yield the text chunks of its response as they arrive.
+    
+    Raises:
+        RuntimeError: If the Bedrock Agent API call fails or its stream cannot be parsed
+    """
     try:
         # Invoke the Bedrock Agent
         session_id = f"chat_{chat_id}"  # Format: "chat_1", "chat_2", etc. (min 2 chars)
@@ -162,27 +454,95 @@ def generate_reply(
         )
         raise RuntimeError(f"Failed to generate AI response: {str(e)}")
 
-    # Parse the response stream and accumulate text chunks
-    text = ""
+    # Parse the response stream and yield text chunks
+    total_length = 0
     chunk_count = 0
     try:
         for event in resp.get("completion", []):
             if "chunk" in event:
                 chunk_data = event["chunk"]
                 if "bytes" in chunk_data:
-                    # Decode bytes to string and accumulate
+                    # Decode bytes to string
                     chunk_text = chunk_data["bytes"].decode("utf-8")
-                    text += chunk_text
+                    total_length += len(chunk_text)
                     chunk_count += 1
                     logger.debug(f"📦 Chunk {chunk_count}: {len(chunk_text)} chars")
+                    yield chunk_text
         
-        logger.info(f"✨ Agent response complete - Total chunks: {chunk_count}, Total response length: {len(text)}")
+        logger.info(f"✨ Agent response complete - Total chunks: {chunk_count}, Total response length: {total_length}")
         
     except Exception as e:
         logger.error(f"Error parsing agent response stream: {str(e)}", exc_info=True)
         raise RuntimeError(f"Failed to parse agent response: {str(e)}")
 
-    return text.strip() or "Unable to generate a response at this moment."
+
+def stream_reply(
+    history: list[dict],
+    chat_id: int,
+    max_tokens: int = 200,
+    temperature: float = 0.7,
+    top_p: float = 0.9,
+) -> Iterator[str]:
+    """
+    Generate an AI reply like ``generate_reply``, yielding the text as it is produced.
+    
+    The agent streams its completion in chunks; with ``BEDROCK_INVOCATION_MODE=model``
+    the whole reply is yielded as a single chunk. Join the chunks and strip the result
+    to obtain the same text ``generate_reply`` returns.
+    
+    Args:
+        history: List of message dictionaries with 'role' and 'content' keys
+        chat_id: Chat ID to use as session ID for the agent
+        max_tokens: Maximum tokens in response (default: 200)
+        temperature: Sampling temperature 0.0-1.0 (default: 0.7)
+        top_p: Nucleus sampling parameter (default: 0.9)
+        
+    Yields:
+        Consecutive fragments of the AI response text
+        
+    Raises:
+        ValueError: If prompt injection is detected
+        RuntimeError: If Bedrock Agent API call fails
+    """
+    user_message = _last_user_message(history)
+
+    if settings.bedrock_invocation_mode == "model":
+        yield converse_reply(history, chat_id, max_tokens=max_tokens, temperature=temperature, top_p=top_p).text
+        return
+
+    yield from _agent_chunks(user_message, chat_id)
+
+
+def generate_reply(
+    history: list[dict],
+    chat_id: int,
+    max_tokens: int = 200,
+    temperature: float = 0.7,
+    top_p: float = 0.9,
+) -> str:
+    """
+    Generate an AI reply using AWS Bedrock with prompt injection protection.
+    
+    By default the Bedrock Agent is invoked with the last user message (the agent
+    keeps the conversation in its session). With ``BEDROCK_INVOCATION_MODE=model``
+    the model is called directly with the windowed history instead.
+    
+    Args:
+        history: List of message dictionaries with 'role' and 'content' keys
+        chat_id: Chat ID to use as session ID for the agent
+        max_tokens: Maximum tokens in response (default: 200)
+        temperature: Sampling temperature 0.0-1.0 (default: 0.7)
+        top_p: Nucleus sampling parameter (default: 0.9)
+        
+    Returns:
+        Generated AI response text
+        
+    Raises:
+        ValueError: If prompt injection is detected
+        RuntimeError: If Bedrock Agent API call fails
+    """
+    text = "".join(stream_reply(history, chat_id, max_tokens=max_tokens, temperature=temperature, top_p=top_p))
+    return text.strip() or EMPTY_REPLY
 
 
 def bedrock_chat(history: list[dict], chat_id: int) -> str:
@@ -199,6 +559,25 @@ def bedrock_chat(history: list[dict], chat_id: int) -> str:
     return generate_reply(history, chat_id)
 
 
+def bedrock_stream_chat(history: list[dict], chat_id: int, on_chunk: Callable[[str], None]) -> str:
+    """
+    Like ``bedrock_chat``, handing every chunk of the reply to a callback as it arrives.
+    
+    Args:
+        history (list[dict]): Conversation history.
+        chat_id (int): The chat ID.
+        on_chunk (Callable[[str], None]): Called with each fragment of the reply.
+        
+    Returns:
+        str: The complete generated AI response.
+    """
+    parts = []
+    for chunk in stream_reply(history, chat_id):
+        parts.append(chunk)
+        on_chunk(chunk)
+    return "".join(parts).strip() or EMPTY_REPLY
+
+
 def is_interview_completed(response_text: str) -> bool:
     """
     Detecta si el agente ha indicado que la entrevista finalizó.
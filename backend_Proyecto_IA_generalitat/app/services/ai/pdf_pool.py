@@ -0,0 +1,239 @@
+"""
+PDF Render Pool.
+
+This module provides a pool of pre-warmed worker processes that render report HTML
+to PDF bytes with WeasyPrint. Rendering is CPU-bound and holds the GIL, so running it
+out of process keeps the API worker responsive while reports are generated.
+
+Each worker is a process owned by the pool and talks to it over its own pipe. A
+render that exceeds the timeout, or a worker that crashes, only costs that worker:
+it is terminated and replaced, while renders running in the other workers carry on.
+"""
+
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+_WARMUP_HTML = (
+    '<html lang="es"><body><div class="header"><h1>Evalio</h1></div>'
+    '<p>Calentando fuentes: áéíóú ñ <strong>negrita</strong></p></body></html>'
+)
+
+# Per-process state, populated by _init_worker in each worker process
+_worker_stylesheet = None
+
+
+class PdfPoolBusyError(RuntimeError):
+    """Raised when the render queue is full and a job cannot be accepted."""
+
+
+class PdfRenderTimeoutError(RuntimeError):
+    """Raised when a render job does not finish within the configured timeout."""
+
+
+class PdfPoolUnavailableError(RuntimeError):
+    """Raised when a worker crashed (or was restarted) before finishing the job."""
+
+
+def _init_worker() -> None:
+    """
+    Initialize a worker process: import WeasyPrint, parse the report stylesheet
+    and render a small document so fonts and layout caches are loaded at spawn.
+    """
+    global _worker_stylesheet
+    from weasyprint import CSS, HTML
+    from app.services.ai.pdf_service import REPORT_STYLESHEET
+
+    _worker_stylesheet = CSS(string=REPORT_STYLESHEET)
+    HTML(string=_WARMUP_HTML).write_pdf(stylesheets=[_worker_stylesheet])
+
+
+def _render_in_worker(html_content: str) -> bytes:
+    """
+    Render sanitized report HTML to PDF bytes inside a worker process.
+    
+    Args:
+        html_content (str): Report HTML built without an inline stylesheet.
+        
+    Returns:
+        bytes: The rendered PDF document.
+    """
+    from weasyprint import HTML
+
+    return HTML(string=html_content).write_pdf(stylesheets=[_worker_stylesheet])
+
+
+def _worker_main(conn, initializer, job) -> None:
+    """
+    Serve render jobs received over a pipe until it is closed.
+    
+    Args:
+        conn (Connection): Worker end of the pipe (receives HTML, sends results).
+        initializer (Callable): Runs once before the first job.
+        job (Callable): Turns the HTML into PDF bytes.
+    """
+    initializer()
+    while True:
+        try:
+            html_content = conn.recv()
+        except EOFError:
+            return
+        try:
+            conn.send((True, job(html_content)))
+        except Exception as exc:
+            conn.send((False, exc))
+
+
+class _RenderWorker:
+    """A renderer process and the pool's end of its pipe."""
+
+    def __init__(self, context, initializer, job):
+        """Spawn the process; it warms up (runs ``initializer``) right away."""
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn, initializer, job), daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    def stop(self) -> None:
+        """Terminate the process, including one stuck in a render."""
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process.join(timeout=5)
+        self.conn.close()
+
+
+class PdfRenderPool:
+    """Bounded pool of pre-warmed WeasyPrint renderer processes."""
+
+    def __init__(self, size: int, queue_depth: int, timeout: float, initializer=_init_worker, job=_render_in_worker):
+        """
+        Create the pool and spawn its workers.
+        
+        Args:
+            size (int): Number of renderer processes.
+            queue_depth (int): Jobs allowed to wait when every worker is busy.
+            timeout (float): Seconds to wait for a single render (queueing included) before failing.
+            initializer (Callable): Runs once in each new worker process.
+            job (Callable): Picklable function turning the HTML into PDF bytes in a worker.
+        """
+        self.size = size
+        self.timeout = timeout
+        self.initializer = initializer
+        self.job = job
+        self._context = multiprocessing.get_context("spawn")
+        self._slots = threading.BoundedSemaphore(size + queue_depth)
+        self._idle: queue.Queue[_RenderWorker] = queue.Queue()
+        self._lock = threading.Lock()
+        self._workers: set[_RenderWorker] = set()
+        for _ in range(size):
+            self._idle.put(self._spawn())
+        logger.info(f"PDF render pool started with {size} workers")
+
+    def _spawn(self) -> _RenderWorker:
+        """Start a new worker process."""
+        worker = _RenderWorker(self._context, self.initializer, self.job)
+        with self._lock:
+            self._workers.add(worker)
+        return worker
+
+    def _replace(self, worker: _RenderWorker) -> _RenderWorker:
+        """Terminate a stuck or crashed worker and start a fresh one in its place."""
+        with self._lock:
+            self._workers.discard(worker)
+        worker.stop()
+        return self._spawn()
+
+    def render(self, html_content: str) -> bytes:
+        """
+        Render report HTML to PDF bytes in a worker process.
+        
+        Args:
+            html_content (str): Report HTML built without an inline stylesheet.
+            
+        Returns:
+            bytes: The rendered PDF document.
+            
+        Raises:
+            PdfPoolBusyError: If the queue is full.
+            PdfRenderTimeoutError: If the job exceeds the configured timeout (its worker is replaced).
+            PdfPoolUnavailableError: If the worker crashed before finishing the job (it is replaced).
+        """
+        if not self._slots.acquire(blocking=False):
+            raise PdfPoolBusyError("PDF render queue is full")
+
+        try:
+            deadline = time.monotonic() + self.timeout
+            try:
+                worker = self._idle.get(timeout=self.timeout)
+            except queue.Empty:
+                raise PdfRenderTimeoutError("PDF rendering timed out waiting for a worker")
+
+            # The worker goes back to the idle queue only if it is known to be
+            # waiting for its next job; otherwise a fresh one takes its place.
+            healthy = False
+            try:
+                worker.conn.send(html_content)
+                if not worker.conn.poll(max(0.0, deadline - time.monotonic())):
+                    logger.error(f"PDF render exceeded {self.timeout}s timeout, terminating its worker")
+                    raise PdfRenderTimeoutError("PDF rendering timed out")
+                succeeded, result = worker.conn.recv()
+                healthy = True
+            except (EOFError, OSError):
+                logger.error("PDF render worker crashed")
+                raise PdfPoolUnavailableError("PDF render worker crashed, it was replaced")
+            finally:
+                self._idle.put(worker if healthy else self._replace(worker))
+        finally:
+            self._slots.release()
+
+        if not succeeded:
+            raise result
+        return result
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        with self._lock:
+            workers, self._workers = list(self._workers), set()
+        for worker in workers:
+            worker.stop()
+
+
+_pool: PdfRenderPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_pdf_render_pool() -> PdfRenderPool | None:
+    """
+    Return the shared render pool, creating it on first use.
+    
+    Returns:
+        PdfRenderPool | None: The pool, or None when out-of-process rendering
+        is disabled (``PDF_RENDER_POOL_SIZE=0``).
+    """
+    global _pool
+    from app.core.config import settings
+
+    if settings.pdf_render_pool_size <= 0:
+        return None
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = PdfRenderPool(
+                    size=settings.pdf_render_pool_size,
+                    queue_depth=settings.pdf_render_queue_depth,
+                    timeout=settings.pdf_render_timeout_seconds,
+                )
+    return _pool
+
+
+def shutdown_pdf_render_pool() -> None:
+    """Shut down the shared render pool if it was started."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
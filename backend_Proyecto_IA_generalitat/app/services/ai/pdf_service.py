@@ -7,6 +7,7 @@ using WeasyPrint.
 
 from weasyprint import HTML, CSS
 from io import BytesIO
+from tempfile import SpooledTemporaryFile
 from datetime import datetime
 import logging
 import re
@@ -14,6 +15,121 @@ from typing import List, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Stylesheet shared by in-process rendering and the pre-warmed render pool workers
+REPORT_STYLESHEET = """
+@page {
+    size: A4;
+    margin: 2cm;
+    @bottom-right {
+        content: "Página " counter(page) " de " counter(pages);
+        font-size: 10px;
+        color: #666;
+    }
+}
+body {
+    font-family: 'Arial', 'Helvetica', sans-serif;
+    line-height: 1.6;
+    color: #333;
+    font-size: 11pt;
+}
+.header {
+    text-align: center;
+    border-bottom: 3px solid #2563eb;
+    padding-bottom: 20px;
+    margin-bottom: 30px;
+}
+.header h1 {
+    color: #1e40af;
+    font-size: 24pt;
+    margin: 0 0 10px 0;
+}
+.header .subtitle {
+    color: #64748b;
+    font-size: 12pt;
+}
+.metadata {
+    background-color: #f1f5f9;
+    padding: 15px;
+    border-radius: 8px;
+    margin-bottom: 25px;
+}
+.metadata-row {
+    display: flex;
+    justify-content: space-between;
+    margin-bottom: 8px;
+}
+.metadata-label {
+    font-weight: bold;
+    color: #475569;
+}
+.metadata-value {
+    color: #1e293b;
+}
+h2 {
+    color: #1e40af;
+    border-bottom: 2px solid #93c5fd;
+    padding-bottom: 8px;
+    margin-top: 30px;
+    margin-bottom: 15px;
+    font-size: 16pt;
+}
+h3 {
+    color: #3b82f6;
+    font-size: 13pt;
+    margin-top: 20px;
+    margin-bottom: 10px;
+}
+.section {
+    margin-bottom: 25px;
+}
+.highlight-box {
+    background-color: #dbeafe;
+    border-left: 4px solid #2563eb;
+    padding: 15px;
+    margin: 15px 0;
+}
+.warning-box {
+    background-color: #fef3c7;
+    border-left: 4px solid #f59e0b;
+    padding: 15px;
+    margin: 15px 0;
+}
+.success-box {
+    background-color: #d1fae5;
+    border-left: 4px solid #10b981;
+    padding: 15px;
+    margin: 15px 0;
+}
+ul {
+    margin: 10px 0;
+    padding-left: 25px;
+}
+li {
+    margin-bottom: 8px;
+}
+.empleabilidad {
+    text-align: center;
+    padding: 20px;
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    color: white;
+    border-radius: 10px;
+    margin: 20px 0;
+}
+.empleabilidad-nivel {
+    font-size: 28pt;
+    font-weight: bold;
+    margin: 10px 0;
+}
+.footer {
+    margin-top: 40px;
+    padding-top: 20px;
+    border-top: 2px solid #e2e8f0;
+    text-align: center;
+    font-size: 9pt;
+    color: #64748b;
+}
+"""
+
 
 def generate_pdf_report(
     report_content: str,
@@ -41,7 +157,101 @@ def generate_pdf_report(
     Returns:
         BytesIO: PDF file in memory.
     """
+    html_content, _ = build_report_html(
+        report_content, candidate_name, rol_laboral, nivel_academico,
+        ciclo_formativo, duracion, interview_date, messages,
+    )
+
+    # Generate PDF
+    pdf_buffer = BytesIO()
+    HTML(string=html_content).write_pdf(pdf_buffer)
+    pdf_buffer.seek(0)
     
+    logger.info(f"PDF report generated successfully for candidate: {candidate_name}")
+    
+    return pdf_buffer
+
+
+def generate_pdf_report_spooled(
+    report_content: str,
+    candidate_name: str,
+    rol_laboral: str,
+    nivel_academico: str,
+    ciclo_formativo: str,
+    duracion: str,
+    interview_date: datetime,
+    messages: List[object],
+    max_memory_size: int = 512 * 1024,
+    render_pool=None,
+) -> tuple[SpooledTemporaryFile, str]:
+    """
+    Generate the PDF report into a spooled temporary file.
+    
+    Small documents stay in memory; once the output grows beyond
+    ``max_memory_size`` bytes it is transparently moved to disk, so the
+    memory held per concurrent report is bounded. The caller owns the
+    returned file and must close it once it has been streamed.
+    
+    Args:
+        report_content (str): The full interview report text from AI.
+        candidate_name (str): Name of the candidate.
+        rol_laboral (str): Job role (Junior/Middle/Senior).
+        nivel_academico (str): Academic level.
+        ciclo_formativo (str): Specific training cycle (DAW, DAM, etc.).
+        duracion (str): Interview duration (Corta/Media/Larga).
+        interview_date (datetime): Date of the interview.
+        messages (List[object]): List of chat messages for validation.
+        max_memory_size (int): Bytes kept in memory before spilling to disk.
+        render_pool (PdfRenderPool | None): Optional process pool that renders the
+            sanitized HTML out of process instead of in the calling thread.
+        
+    Returns:
+        tuple[SpooledTemporaryFile, str]: PDF file positioned at offset 0 and the
+        employability level shown in its banner ('' if none is found).
+    """
+    html_content, detected_level = build_report_html(
+        report_content, candidate_name, rol_laboral, nivel_academico,
+        ciclo_formativo, duracion, interview_date, messages,
+        inline_stylesheet=render_pool is None,
+    )
+
+    pdf_file = SpooledTemporaryFile(max_size=max_memory_size, mode="w+b")
+    try:
+        if render_pool is not None:
+            pdf_file.write(render_pool.render(html_content))
+        else:
+            HTML(string=html_content).write_pdf(pdf_file)
+        pdf_file.seek(0)
+    except Exception:
+        pdf_file.close()
+        raise
+
+    logger.info(f"PDF report spooled successfully for candidate: {candidate_name}")
+
+    return pdf_file, detected_level
+
+
+def build_report_html(
+    report_content: str,
+    candidate_name: str,
+    rol_laboral: str,
+    nivel_academico: str,
+    ciclo_formativo: str,
+    duracion: str,
+    interview_date: datetime,
+    messages: List[object],
+    inline_stylesheet: bool = True,
+) -> tuple[str, str]:
+    """
+    Sanitize the AI report and render the full HTML document for WeasyPrint.
+    
+    Returns the HTML together with the employability level shown in its banner
+    ('' if none is found), so callers can store it without sanitizing again.
+    
+    When ``inline_stylesheet`` is False the ``<style>`` block is omitted and
+    the renderer is expected to apply ``REPORT_STYLESHEET`` itself (the render
+    pool workers keep it pre-parsed).
+    """
     # Sanitize and normalize report content: remove duplicated "DATOS DE LA ENTREVISTA",
     # replace placeholders with real metadata, verify orthography examples against messages,
     # and extract a single employability level to render consistently.
@@ -58,6 +268,8 @@ def generate_pdf_report(
     sections = _parse_report_sections(report_content)
     
     # Generate HTML with professional styling
+    stylesheet_html = f"<style>{REPORT_STYLESHEET}</style>" if inline_stylesheet else ""
+
     empleabilidad_html = ""
     if detected_level:
         empleabilidad_html = f'<div class="empleabilidad"><div>Nivel de Empleabilidad</div><div class="empleabilidad-nivel">{detected_level}</div></div>'
@@ -68,119 +280,7 @@ def generate_pdf_report(
     <head>
         <meta charset="UTF-8">
         <title>Informe de Entrevista Técnica - {candidate_name}</title>
-        <style>
-            @page {{
-                size: A4;
-                margin: 2cm;
-                @bottom-right {{
-                    content: "Página " counter(page) " de " counter(pages);
-                    font-size: 10px;
-                    color: #666;
-                }}
-            }}
-            body {{
-                font-family: 'Arial', 'Helvetica', sans-serif;
-                line-height: 1.6;
-                color: #333;
-                font-size: 11pt;
-            }}
-            .header {{
-                text-align: center;
-                border-bottom: 3px solid #2563eb;
-                padding-bottom: 20px;
-                margin-bottom: 30px;
-            }}
-            .header h1 {{
-                color: #1e40af;
-                font-size: 24pt;
-                margin: 0 0 10px 0;
-            }}
-            .header .subtitle {{
-                color: #64748b;
-                font-size: 12pt;
-            }}
-            .metadata {{
-                background-color: #f1f5f9;
-                padding: 15px;
-                border-radius: 8px;
-                margin-bottom: 25px;
-            }}
-            .metadata-row {{
-                display: flex;
-                justify-content: space-between;
-                margin-bottom: 8px;
-            }}
-            .metadata-label {{
-                font-weight: bold;
-                color: #475569;
-            }}
-            .metadata-value {{
-                color: #1e293b;
-            }}
-            h2 {{
-                color: #1e40af;
-                border-bottom: 2px solid #93c5fd;
-                padding-bottom: 8px;
-                margin-top: 30px;
-                margin-bottom: 15px;
-                font-size: 16pt;
-            }}
-            h3 {{
-                color: #3b82f6;
-                font-size: 13pt;
-                margin-top: 20px;
-                margin-bottom: 10px;
-            }}
-            .section {{
-                margin-bottom: 25px;
-            }}
-            .highlight-box {{
-                background-color: #dbeafe;
-                border-left: 4px solid #2563eb;
-                padding: 15px;
-                margin: 15px 0;
-            }}
-            .warning-box {{
-                background-color: #fef3c7;
-                border-left: 4px solid #f59e0b;
-                padding: 15px;
-                margin: 15px 0;
-            }}
-            .success-box {{
-                background-color: #d1fae5;
-                border-left: 4px solid #10b981;
-                padding: 15px;
-                margin: 15px 0;
-            }}
-            ul {{
-                margin: 10px 0;
-                padding-left: 25px;
-            }}
-            li {{
-                margin-bottom: 8px;
-            }}
-            .empleabilidad {{
-                text-align: center;
-                padding: 20px;
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                color: white;
-                border-radius: 10px;
-                margin: 20px 0;
-            }}
-            .empleabilidad-nivel {{
-                font-size: 28pt;
-                font-weight: bold;
-                margin: 10px 0;
-            }}
-            .footer {{
-                margin-top: 40px;
-                padding-top: 20px;
-                border-top: 2px solid #e2e8f0;
-                text-align: center;
-                font-size: 9pt;
-                color: #64748b;
-            }}
-        </style>
+        {stylesheet_html}
     </head>
     <body>
         <div class="header">
@@ -227,15 +327,8 @@ def generate_pdf_report(
     </body>
     </html>
     """
-    
-    # Generate PDF
-    pdf_buffer = BytesIO()
-    HTML(string=html_content).write_pdf(pdf_buffer)
-    pdf_buffer.seek(0)
-    
-    logger.info(f"PDF report generated successfully for candidate: {candidate_name}")
-    
-    return pdf_buffer
+
+    return html_content, detected_level
 
 
 def _parse_report_sections(content: str) -> dict:
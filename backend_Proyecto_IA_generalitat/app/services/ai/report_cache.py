@@ -0,0 +1,111 @@
+"""
+Report Cache.
+
+This module keeps generated PDF reports on disk so that a report for an unchanged
+conversation can be served again without another Bedrock call or WeasyPrint render.
+Entries are keyed by chat ID and the timestamp of the chat's last message, so any
+new message invalidates the cached report.
+"""
+
+import logging
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import BinaryIO
+
+from app.core.config import settings
+from app.models.chat import Chat
+
+logger = logging.getLogger(__name__)
+
+
+class ReportCache:
+    """Disk-backed cache of rendered interview reports."""
+
+    def __init__(self, directory: str):
+        """
+        Args:
+            directory (str): Folder where cached PDFs are stored (created on demand).
+        """
+        self.directory = Path(directory)
+
+    @staticmethod
+    def version(chat: Chat) -> datetime | None:
+        """
+        Return the value that identifies the current state of a chat.
+
+        Args:
+            chat (Chat): The chat.
+
+        Returns:
+            datetime | None: Timestamp of the last message (or creation date).
+        """
+        return chat.last_message_at or chat.created_at
+
+    def _path(self, chat_id: int, version: datetime | None) -> Path:
+        """Return the cache path for a chat at a given version."""
+        stamp = version.strftime("%Y%m%d%H%M%S%f") if version else "0"
+        return self.directory / f"chat_{chat_id}_{stamp}.pdf"
+
+    def open(self, chat: Chat) -> BinaryIO | None:
+        """
+        Open the cached report for a chat, if one exists for its current state.
+
+        Args:
+            chat (Chat): The chat.
+
+        Returns:
+            BinaryIO | None: The PDF opened for reading, or None on a cache miss.
+        """
+        try:
+            return open(self._path(chat.id_chat, self.version(chat)), "rb")
+        except FileNotFoundError:
+            return None
+
+    def store(self, chat_id: int, version: datetime | None, pdf_file: BinaryIO) -> None:
+        """
+        Save a rendered report, replacing older entries for the same chat.
+
+        The file is copied from offset 0 and rewound afterwards so the caller
+        can still stream it. Cache failures are logged and never raised. It takes
+        plain values instead of the ``Chat`` so it can run outside the request session.
+
+        Args:
+            chat_id (int): The chat the report belongs to.
+            version (datetime | None): ``version(chat)`` when the report was prepared.
+            pdf_file (BinaryIO): Seekable PDF file.
+        """
+        path = self._path(chat_id, version)
+        tmp_name = None
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as tmp:
+                pdf_file.seek(0)
+                shutil.copyfileobj(pdf_file, tmp)
+            os.replace(tmp_name, path)
+            tmp_name = None
+            for stale in self.directory.glob(f"chat_{chat_id}_*.pdf"):
+                if stale != path:
+                    stale.unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning(f"Could not cache report for chat {chat_id}: {e}")
+        finally:
+            if tmp_name:
+                Path(tmp_name).unlink(missing_ok=True)
+            pdf_file.seek(0)
+
+    def discard(self, chat_id: int) -> None:
+        """
+        Remove every cached report of a chat.
+
+        Args:
+            chat_id (int): ID of the chat.
+        """
+        for path in self.directory.glob(f"chat_{chat_id}_*.pdf"):
+            path.unlink(missing_ok=True)
+
+
+report_cache = ReportCache(settings.report_cache_dir or os.path.join(tempfile.gettempdir(), "aula_reports"))
@@ -0,0 +1,55 @@
+"""
+Archive Service.
+
+This module keeps the ``mensajes`` table small: messages of interviews completed more
+than ``ARCHIVE_AFTER_DAYS`` ago are moved into one compressed transcript per chat.
+Reads go through ``message_repo``, which falls back to the archive transparently.
+"""
+
+import logging
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.periodic import PeriodicTask
+from app.repositories.archive_repo import archive_repo
+
+logger = logging.getLogger(__name__)
+
+
+class ArchiveService:
+    """Service class for archiving completed interviews."""
+
+    def __init__(self):
+        self.task = PeriodicTask("chat-archive", self.archive_completed, lambda: settings.archive_interval_seconds)
+
+    def archive_completed(self, db: Session, now: datetime | None = None) -> int:
+        """
+        Archive one batch of chats completed before the archival threshold.
+
+        Args:
+            db (Session): Database session.
+            now (datetime | None): Reference time (defaults to the current time).
+
+        Returns:
+            int: Number of chats archived.
+        """
+        cutoff = (now or datetime.now()) - timedelta(days=settings.archive_after_days)
+        archived = 0
+        for chat_id in archive_repo.list_archivable(db, cutoff, settings.archive_batch_size):
+            try:
+                count = archive_repo.archive(db, chat_id)
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Could not archive chat {chat_id}: {e}", exc_info=True)
+                continue
+            if count is None:
+                logger.info(f"Chat {chat_id} already archived by another worker")
+                continue
+            logger.info(f"📦 Chat {chat_id} archived ({count} messages)")
+            archived += 1
+        return archived
+
+
+archive_service = ArchiveService()
@@ -8,6 +8,7 @@ from fastapi import HTTPException
 from sqlalchemy.orm import Session
 from app.repositories.user_repo import user_repo
 from app.core.security import hash_password, verify_password, create_access_token
+from app.core.database import recent_writes
 
 class AuthService:
     """Service class for handling authentication logic."""
@@ -31,6 +32,8 @@ class AuthService:
         if user_repo.get_by_email(db, email):
             raise HTTPException(status_code=409, detail="Email already registered")
         user = user_repo.create(db, email=email, password_hash=hash_password(password), nombre=nombre)
+        # The replica may not have the new account yet: serve the user's first reads from the primary
+        recent_writes.mark(user.id_usuario)
         return create_access_token(str(user.id_usuario))
 
     def login(self, db: Session, email: str, password: str) -> str:
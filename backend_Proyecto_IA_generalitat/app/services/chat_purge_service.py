@@ -0,0 +1,57 @@
+"""
+Chat Purge Service.
+
+This module permanently removes chats that users deleted more than the retention
+period ago. Deleting a chat only marks it (``deleted_at``); the purge runs in the
+background, removes the rows in batches with bulk DELETE statements and lets the
+database cascade the delete to messages and summaries. The same task deletes
+expired idempotency keys.
+"""
+
+import logging
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.idempotency import idempotency_store
+from app.core.periodic import PeriodicTask
+from app.repositories.chat_repo import chat_repo
+from app.services.ai.report_cache import report_cache
+
+logger = logging.getLogger(__name__)
+
+
+class ChatPurgeService:
+    """Service class for purging soft-deleted chats."""
+
+    def __init__(self):
+        self.task = PeriodicTask("chat-purge", self.purge, lambda: settings.chat_purge_interval_seconds)
+
+    def purge(self, db: Session, now: datetime | None = None) -> int:
+        """
+        Purge every chat deleted before the retention period.
+
+        Args:
+            db (Session): Database session.
+            now (datetime | None): Reference time (defaults to the current time).
+
+        Returns:
+            int: Number of chats purged.
+        """
+        cutoff = (now or datetime.now()) - timedelta(days=settings.chat_purge_retention_days)
+        purged = 0
+        while True:
+            chat_ids = chat_repo.purge_deleted(db, cutoff, settings.chat_purge_batch_size)
+            if not chat_ids:
+                break
+            for chat_id in chat_ids:
+                report_cache.discard(chat_id)
+            purged += len(chat_ids)
+        if purged:
+            logger.info(f"🧹 Purged {purged} deleted chats")
+        idempotency_store.purge_expired(db, now)
+        return purged
+
+
+chat_purge_service = ChatPurgeService()
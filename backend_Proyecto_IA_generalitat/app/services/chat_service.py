@@ -9,6 +9,9 @@ from sqlalchemy.orm import Session
 
 from app.repositories.chat_repo import chat_repo
 from app.models.chat import Chat
+from app.schemas.chat import ChatResponse, StartChatResponse
+from app.schemas.message import MessageResponse
+from app.services.ai.bedrock_service import generate_initial_greeting
 
 
 class ChatService:
@@ -27,6 +30,33 @@ class ChatService:
         """
         return chat_repo.create(db, user_id)
 
+    def start_chat(self, db: Session, user_id: int, title: str | None = None) -> StartChatResponse:
+        """
+        Create a chat and Evalio's greeting in a single transaction.
+        
+        The response is built from the flushed objects before committing, so
+        starting an interview costs two inserts and one commit.
+        
+        Args:
+            db (Session): Database session.
+            user_id (int): ID of the user starting the interview.
+            title (str | None): Optional chat title.
+            
+        Returns:
+            StartChatResponse: The created chat and its greeting message.
+        """
+        try:
+            chat, greeting = chat_repo.add_with_greeting(db, user_id, generate_initial_greeting(), title)
+            response = StartChatResponse(
+                chat=ChatResponse.model_validate(chat),
+                greeting=MessageResponse.model_validate(greeting),
+            )
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        return response
+
     def list_chats(self, db: Session, user_id: int) -> list[Chat]:
         """
         Retrieve all chats for the user.
@@ -40,6 +70,19 @@ class ChatService:
         """
         return chat_repo.list_for_user(db, user_id)
 
+    def list_chat_rows(self, db: Session, user_id: int) -> list[dict]:
+        """
+        Retrieve all chats for the user as plain dicts (serialization fast path).
+        
+        Args:
+            db (Session): Database session.
+            user_id (int): ID of the user.
+            
+        Returns:
+            list[dict]: Chats shaped like ``ChatResponse``.
+        """
+        return chat_repo.list_rows_for_user(db, user_id)
+
     def get_chat_for_user_or_404(self, db: Session, chat_id: int, user_id: int) -> Chat:
         """
         Validate that the chat exists and belongs to the user.
@@ -0,0 +1,283 @@
+"""
+Interview Configuration Service.
+
+This module runs the configuration phase of an interview on the server. The four
+configuration questions (rol, nivel académico, ciclo formativo y duración) have a
+fixed order and a closed set of valid answers, so they are asked and validated
+locally instead of costing a Bedrock round trip each. The answers are stored on the
+chat as the interview profile; once it is complete the agent is invoked for the
+first time with a message carrying the profile, and it goes straight to the
+candidate's presentation and the technical questions.
+
+The step the chat is in is kept in ``Chat.config_step``:
+``welcome`` (waiting for "empezar") → ``rol`` → ``nivel`` → ``ciclo`` → ``duracion`` → ``done``.
+"""
+
+import logging
+import re
+import unicodedata
+from dataclasses import dataclass, field
+
+from app.models.chat import Chat
+from app.services.ai.bedrock_service import _sanitize_user_input
+
+logger = logging.getLogger(__name__)
+
+WELCOME = "welcome"
+ROL = "rol"
+NIVEL = "nivel"
+CICLO = "ciclo"
+DURACION = "duracion"
+DONE = "done"
+
+NEXT_STEP = {WELCOME: ROL, ROL: NIVEL, NIVEL: CICLO, CICLO: DURACION, DURACION: DONE}
+
+# Chat column filled by each step
+PROFILE_FIELDS = {
+    ROL: "rol_laboral",
+    NIVEL: "nivel_academico",
+    CICLO: "ciclo_formativo",
+    DURACION: "duracion",
+}
+
+QUESTIONS = {
+    ROL: "**Pregunta 1 de 4.** ¿Qué rol laboral simulado quieres? (Junior / Middle / Senior)",
+    NIVEL: "**Pregunta 2 de 4.** ¿Cuál es tu nivel académico? (FP Básica / FP Media / FP Superior / Máster / Especialización)",
+    CICLO: (
+        "**Pregunta 3 de 4.** ¿Qué ciclo formativo específico estudias o has estudiado? "
+        "(Ejemplos: DAW - Desarrollo de Aplicaciones Web, DAM - Desarrollo de Aplicaciones Multiplataforma, "
+        "ASIR - Administración de Sistemas Informáticos en Red, Enfermería, Integración Social, Electrónica Industrial...)"
+    ),
+    DURACION: "**Pregunta 4 de 4.** ¿Cuánta duración prefieres? (Corta / Media / Larga)",
+}
+
+REJECTIONS = {
+    WELCOME: 'Cuando estés listo/a, escribe "empezar" para comenzar la configuración de la entrevista.',
+    ROL: "Esa respuesta no es un rol válido. Elige una de las opciones:",
+    NIVEL: "Ese nivel académico no es válido. Elige una de las opciones:",
+    CICLO: (
+        "Necesito el nombre específico de tu ciclo formativo, no la familia profesional "
+        "(por ejemplo DAW en lugar de Informática, o Enfermería en lugar de Sanidad)."
+    ),
+    DURACION: "Esa duración no es válida. Elige una de las opciones:",
+}
+
+FIRST_QUESTION_INTRO = "¡Perfecto! Vamos con las preguntas de configuración."
+
+ROLES = {"junior": "Junior", "middle": "Middle", "senior": "Senior"}
+DURATIONS = {"corta": "Corta", "media": "Media", "larga": "Larga"}
+
+# Checked in order, so "FP Superior" wins over answers that also mention "medio"
+ACADEMIC_LEVELS = [
+    (r"\bbasic[ao]\b", "FP Básica"),
+    (r"\bsuperior\b", "FP Superior"),
+    (r"\bmedi[ao]\b", "FP Media"),
+    (r"\bmaster\b|\bespecializacion\b", "Máster/Especialización"),
+]
+
+# Keys are accent-free; the more specific names go first
+KNOWN_CICLOS = [
+    ("desarrollo de aplicaciones web", "DAW - Desarrollo de Aplicaciones Web"),
+    ("desarrollo de aplicaciones multiplataforma", "DAM - Desarrollo de Aplicaciones Multiplataforma"),
+    ("administracion de sistemas informaticos", "ASIR - Administración de Sistemas Informáticos en Red"),
+    ("sistemas microinformaticos", "SMR - Sistemas Microinformáticos y Redes"),
+    ("daw", "DAW - Desarrollo de Aplicaciones Web"),
+    ("dam", "DAM - Desarrollo de Aplicaciones Multiplataforma"),
+    ("asir", "ASIR - Administración de Sistemas Informáticos en Red"),
+    ("smr", "SMR - Sistemas Microinformáticos y Redes"),
+    ("auxiliar de enfermeria", "Auxiliar de Enfermería"),
+    ("enfermeria", "Enfermería"),
+    ("integracion social", "Integración Social"),
+    ("electronica", "Electrónica Industrial"),
+    ("administracion y finanzas", "Administración y Finanzas"),
+    ("comercio internacional", "Comercio Internacional"),
+    ("marketing", "Marketing y Publicidad"),
+]
+
+# Professional families and vague answers that do not name a ciclo
+GENERIC_CICLOS = {
+    "informatica", "informatica y comunicaciones", "sanidad", "administracion", "administracion y gestion",
+    "comercio", "comercio y marketing", "electricidad", "electricidad y electronica", "servicios socioculturales",
+    "servicios socioculturales y a la comunidad", "hosteleria", "hosteleria y turismo", "fp", "ciclo",
+    "ciclo formativo", "no lo se", "no se", "ninguno", "otro",
+}
+GENERIC_PREFIX = re.compile(r"^(?:(?:un|una|el|la) )?(?:ciclo(?: formativo)?|familia(?: profesional)?|rama)(?: de)? ")
+
+MIN_CICLO_LENGTH = 3
+MAX_CICLO_LENGTH = 150
+
+
+def _normalize(text: str) -> str:
+    """Lowercase a text, remove accents and collapse punctuation into single spaces."""
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return " ".join(re.sub(r"[^\w]+", " ", text).split())
+
+
+def _single_option(normalized: str, options: dict[str, str]) -> str | None:
+    """Return the option named in the answer, or None if there is none or more than one."""
+    found = [value for key, value in options.items() if re.search(rf"\b{key}\b", normalized)]
+    return found[0] if len(found) == 1 else None
+
+
+@dataclass
+class ConfigAnswer:
+    """
+    Outcome of a candidate answer during the configuration phase.
+
+    Attributes:
+        step (str): The step the chat moves to (the same one if the answer was rejected).
+        profile (dict[str, str]): Chat columns to store (empty if the answer was rejected).
+        reply (str): Local reply for the candidate; empty when the turn goes to the agent.
+        agent_prompt (str): Message that seeds the agent with the profile (set on the last step).
+    """
+    step: str
+    profile: dict[str, str] = field(default_factory=dict)
+    reply: str = ""
+    agent_prompt: str = ""
+
+    @property
+    def handoff(self) -> bool:
+        """Whether the turn must be answered by the agent."""
+        return bool(self.agent_prompt)
+
+    def apply(self, chat: Chat) -> None:
+        """Store the new step and profile values on the chat."""
+        chat.config_step = self.step
+        for column, value in self.profile.items():
+            setattr(chat, column, value)
+
+
+class InterviewConfigService:
+    """Service class for the local configuration phase of an interview."""
+
+    def is_configuring(self, chat: Chat) -> bool:
+        """
+        Check whether a chat is still in the configuration phase.
+
+        Args:
+            chat (Chat): The chat.
+
+        Returns:
+            bool: True until the four configuration answers have been collected.
+        """
+        return (chat.config_step or DONE) != DONE
+
+    def validate(self, step: str, answer: str) -> str | None:
+        """
+        Validate the answer to a configuration step.
+
+        Args:
+            step (str): The current step.
+            answer (str): The candidate's message.
+
+        Returns:
+            str | None: The canonical value to store (``"empezar"`` for the welcome step),
+            or None if the answer is not valid.
+        """
+        normalized = _normalize(answer)
+        if step == WELCOME:
+            return "empezar" if re.search(r"\bempezar\b", normalized) else None
+        if step == ROL:
+            return _single_option(normalized, ROLES)
+        if step == DURACION:
+            return _single_option(normalized, DURATIONS)
+        if step == NIVEL:
+            for pattern, level in ACADEMIC_LEVELS:
+                if re.search(pattern, normalized):
+                    return level
+            return None
+        if step == CICLO:
+            return self._validate_ciclo(answer, normalized)
+        raise ValueError(f"Unknown configuration step '{step}'")
+
+    def _validate_ciclo(self, answer: str, normalized: str) -> str | None:
+        """Map a ciclo to its canonical name, accept other specific names and reject generic ones."""
+        for key, name in KNOWN_CICLOS:
+            if re.search(rf"\b{key}\b", normalized):
+                return name
+
+        answer = answer.strip()
+        if not MIN_CICLO_LENGTH <= len(answer) <= MAX_CICLO_LENGTH or "?" in answer:
+            return None
+        if normalized in GENERIC_CICLOS or GENERIC_PREFIX.sub("", normalized) in GENERIC_CICLOS:
+            return None
+        try:
+            # The free-text answer is sent to the agent inside the profile
+            answer = _sanitize_user_input(answer)
+        except ValueError:
+            return None
+        return answer[0].upper() + answer[1:]
+
+    def answer(self, chat: Chat, text: str) -> ConfigAnswer:
+        """
+        Process a candidate message sent during the configuration phase.
+
+        Nothing is written to the chat; the caller applies the result with
+        ``ConfigAnswer.apply`` once the turn has succeeded.
+
+        Args:
+            chat (Chat): The chat (``is_configuring`` must be True).
+            text (str): The candidate's message.
+
+        Returns:
+            ConfigAnswer: The next step, the profile value to store and the reply
+            (or the agent prompt when the profile is complete).
+        """
+        step = chat.config_step
+        value = self.validate(step, text)
+        if value is None:
+            logger.info(f"⚙️ Respuesta de configuración no válida para el paso '{step}' del chat {chat.id_chat}")
+            reply = REJECTIONS[step] if step == WELCOME else f"{REJECTIONS[step]}\n\n{QUESTIONS[step]}"
+            return ConfigAnswer(step=step, reply=reply)
+
+        next_step = NEXT_STEP[step]
+        profile = {PROFILE_FIELDS[step]: value} if step in PROFILE_FIELDS else {}
+        logger.info(f"⚙️ Chat {chat.id_chat}: paso '{step}' completado, siguiente '{next_step}'")
+
+        if next_step == DONE:
+            full_profile = {column: getattr(chat, column) for column in PROFILE_FIELDS.values()}
+            full_profile.update(profile)
+            return ConfigAnswer(step=DONE, profile=profile, agent_prompt=self.build_agent_prompt(full_profile))
+        if step == WELCOME:
+            return ConfigAnswer(step=next_step, reply=f"{FIRST_QUESTION_INTRO}\n\n{QUESTIONS[next_step]}")
+        return ConfigAnswer(step=next_step, profile=profile, reply=QUESTIONS[next_step])
+
+    def build_agent_prompt(self, profile: dict[str, str]) -> str:
+        """
+        Build the first message sent to the agent, carrying the validated profile.
+
+        Args:
+            profile (dict[str, str]): Values of the ``rol_laboral``, ``nivel_academico``,
+                ``ciclo_formativo`` and ``duracion`` columns.
+
+        Returns:
+            str: The message that replaces the candidate's last answer for the agent.
+        """
+        return (
+            "El candidato ha escrito \"empezar\" y ya ha respondido a las 4 preguntas de configuración "
+            "(FASE 0 y FASE 1 completadas y validadas):\n"
+            f"- Rol laboral: {profile['rol_laboral']}\n"
+            f"- Nivel académico: {profile['nivel_academico']}\n"
+            f"- Ciclo formativo: {profile['ciclo_formativo']}\n"
+            f"- Duración: {profile['duracion']}\n"
+            "No repitas la bienvenida ni las preguntas de configuración. Continúa con la FASE 2: "
+            "invita al candidato a presentarse brevemente y adapta después la entrevista a estos datos."
+        )
+
+    def profile(self, chat: Chat) -> dict[str, str] | None:
+        """
+        Return the interview profile stored on a chat.
+
+        Args:
+            chat (Chat): The chat.
+
+        Returns:
+            dict[str, str] | None: The four configuration values, or None for chats
+            configured by the agent before the profile was stored.
+        """
+        values = {column: getattr(chat, column) for column in PROFILE_FIELDS.values()}
+        return values if all(values.values()) else None
+
+
+interview_config_service = InterviewConfigService()
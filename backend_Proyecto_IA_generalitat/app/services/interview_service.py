@@ -0,0 +1,252 @@
+"""
+Interview Service.
+
+This module runs one interview turn (store the user message, ask the agent, store
+its reply and detect the end of the interview). It is shared by the HTTP reply
+endpoint and the interview WebSocket, which only differ in how the reply reaches
+the client. Turns of the configuration phase are answered locally by
+``interview_config_service`` without calling the agent.
+
+Every turn first goes through a validation pipeline that touches neither the
+database nor the agent: ``check_input`` (length and prompt injection, before the
+chat's lock is taken) and ``open_turn`` (chat status and duplicate turn, under the
+lock). Rejected messages are answered with a 4xx and are never stored.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Callable
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.core.idempotency import recent_turns
+from app.models.chat import Chat
+from app.models.message import Message
+from app.repositories.chat_repo import chat_repo
+from app.repositories.message_repo import message_repo
+from app.schemas.ai import MAX_MESSAGE_LENGTH
+from app.services.ai.bedrock_service import _sanitize_user_input, is_interview_completed, mark_chat_completed
+from app.services.interview_config_service import interview_config_service
+from app.services.message_service import message_service
+
+logger = logging.getLogger(__name__)
+
+COMPLETED_DETAIL = "Esta entrevista ha finalizado. No se pueden enviar más mensajes. Crea una nueva entrevista para continuar."
+EMPTY_DETAIL = "El mensaje no puede estar vacío."
+TOO_LONG_DETAIL = f"El mensaje no puede superar los {MAX_MESSAGE_LENGTH} caracteres."
+INJECTION_DETAIL = "Tu mensaje contiene instrucciones que no están permitidas en la entrevista. Reformúlalo, por favor."
+DUPLICATE_DETAIL = "Este mensaje ya se ha enviado. Espera la respuesta antes de volver a enviarlo."
+
+# Frases de cierre que indican fin de entrevista cuando el agente no emite el marcador explícito
+END_PHRASES = [
+    'se generará un informe',
+    'se generara un informe',
+    'informe en pdf',
+    'generaré un informe',
+    'generaré el informe',
+    'genero un informe',
+    'genero el informe',
+    'hemos terminado',
+    'hemos llegado al final',
+    'fin de la entrevista',
+    'final de la entrevista',
+    'gracias por tu tiempo',
+    'gracias por tu participación',
+    'evaluación detallada',
+    'informe detallado',
+    'espera un momento mientras finalizamos',
+]
+
+
+@dataclass
+class InterviewTurn:
+    """Messages stored by one turn and whether it ended the interview."""
+    user_message: Message
+    ai_message: Message
+    completed: bool
+
+
+class InterviewService:
+    """Service class for interview turns."""
+
+    def get_open_chat(self, db: Session, chat_id: int, user_id: int) -> Chat:
+        """
+        Retrieve a chat that still accepts messages.
+
+        Args:
+            db (Session): Database session.
+            chat_id (int): ID of the chat.
+            user_id (int): ID of the user.
+
+        Returns:
+            Chat: The chat.
+
+        Raises:
+            HTTPException: 404 if the chat is not found, 400 if the interview is completed.
+        """
+        chat = chat_repo.get_for_user(db, chat_id, user_id)
+        if not chat:
+            raise HTTPException(status_code=404, detail="Chat not found")
+        if chat.status == "completed":
+            raise HTTPException(status_code=400, detail=COMPLETED_DETAIL)
+        return chat
+
+    def check_input(self, contenido: str) -> None:
+        """
+        Validate a user message before anything is stored or locked.
+
+        Args:
+            contenido (str): The user's message.
+
+        Raises:
+            HTTPException: 422 if the message is blank or too long,
+                400 if it contains a prompt injection pattern.
+        """
+        if not contenido.strip():
+            raise HTTPException(status_code=422, detail=EMPTY_DETAIL)
+        if len(contenido) > MAX_MESSAGE_LENGTH:
+            raise HTTPException(status_code=422, detail=TOO_LONG_DETAIL)
+        try:
+            _sanitize_user_input(contenido)
+        except ValueError:
+            raise HTTPException(status_code=400, detail=INJECTION_DETAIL)
+
+    def open_turn(self, db: Session, chat_id: int, user_id: int, contenido: str) -> Chat:
+        """
+        Check that a chat can take a new turn with this message.
+
+        Callers must hold the chat's lock, so the last turn cannot change
+        between this check and ``take_turn``.
+
+        Args:
+            db (Session): Database session.
+            chat_id (int): ID of the chat.
+            user_id (int): ID of the user.
+            contenido (str): The user's message (already passed ``check_input``).
+
+        Returns:
+            Chat: The chat.
+
+        Raises:
+            HTTPException: 404 if the chat is not found, 400 if the interview is completed,
+                409 if the message repeats the turn the chat has just stored.
+        """
+        chat = self.get_open_chat(db, chat_id, user_id)
+        if recent_turns.is_duplicate(db, user_id, chat_id, contenido):
+            logger.info(f"🔁 Duplicate turn rejected for chat {chat_id}")
+            raise HTTPException(status_code=409, detail=DUPLICATE_DETAIL)
+        return chat
+
+    def remember_turn(self, db: Session, chat_id: int, user_id: int, contenido: str) -> None:
+        """
+        Record a turn for the duplicate-turn check, in the turn's transaction (before commit).
+
+        Args:
+            db (Session): Database session.
+            chat_id (int): ID of the chat.
+            user_id (int): ID of the user.
+            contenido (str): The stored user message.
+        """
+        recent_turns.remember(db, user_id, chat_id, contenido)
+
+    def detect_completion(self, ai_text: str) -> bool:
+        """
+        Check whether an agent reply closes the interview.
+
+        Args:
+            ai_text (str): The agent's reply.
+
+        Returns:
+            bool: True if the reply carries the end marker or a closing phrase.
+        """
+        logger.info(f"🔍 Buscando señales de fin de entrevista en respuesta...")
+
+        # Opción 1: Buscar marcador explícito
+        if is_interview_completed(ai_text):
+            logger.info(f"🎯 ✅ Marcador explícito ENTREVISTA_FINALIZADA detectado")
+            return True
+
+        # Opción 2: Detectar frases de cierre que indican fin de entrevista
+        text_lower = ai_text.lower()
+        for phrase in END_PHRASES:
+            if phrase in text_lower:
+                logger.info(f"🎯 ✅ Frase de cierre detectada: '{phrase}'")
+                return True
+
+        logger.info(f"⏳ Sin señales de fin detectadas")
+        return False
+
+    def take_turn(
+        self,
+        db: Session,
+        chat_id: int,
+        user_id: int,
+        contenido: str,
+        generate: Callable[[list[dict], int], str],
+    ) -> InterviewTurn:
+        """
+        Add a user message, generate the agent's reply and add it too.
+
+        The messages and the chat changes are flushed in the caller's transaction, so
+        a failed generation leaves nothing behind once the caller rolls back.
+        Callers must hold the chat's lock and have validated the turn with
+        ``check_input`` and ``open_turn``. During the configuration phase the reply is built
+        locally; the answer that completes the profile is the first one sent
+        to the agent, replaced by a message carrying the profile.
+
+        Args:
+            db (Session): Database session.
+            chat_id (int): ID of the chat.
+            user_id (int): ID of the user.
+            contenido (str): The user's message.
+            generate (Callable): Produces the reply from the Bedrock history and the chat ID
+                (``bedrock_chat`` or a streaming variant).
+
+        Returns:
+            InterviewTurn: The stored messages and whether the interview ended.
+
+        Note:
+            NO hace commit - el commit (o rollback) se debe hacer en el endpoint llamante
+        """
+        chat = db.get(Chat, chat_id)
+        config = interview_config_service.answer(chat, contenido) if interview_config_service.is_configuring(chat) else None
+
+        # Step 1: Save user message
+        user_msg = message_repo.add(db, chat_id, "USER", contenido)
+        logger.info(f"User message created: {user_msg.id_mensaje}")
+
+        # Configuration questions are validated and asked locally
+        if config is not None and not config.handoff:
+            config.apply(chat)
+            ia_msg = message_repo.add(db, chat_id, "IA", config.reply)
+            logger.info(f"⚙️ Configuration reply created: {ia_msg.id_mensaje} (step '{config.step}')")
+            return InterviewTurn(user_message=user_msg, ai_message=ia_msg, completed=False)
+
+        # Step 2: Generate AI response
+        history = message_service.build_bedrock_history(db, chat_id, user_id, limit=50)
+        if config is not None:
+            # Profile complete: the agent's first turn is seeded with it instead of the last answer
+            last_user = max(i for i, m in enumerate(history) if m["role"] == "user")
+            history[last_user] = {"role": "user", "content": config.agent_prompt}
+            logger.info(f"🤝 Handing chat {chat_id} over to the agent with the interview profile")
+        ai_text = generate(history, chat_id)
+        logger.info(f"AI response length: {len(ai_text)} characters")
+        logger.info(f"AI response content: {ai_text[:500]}...")  # Primeros 500 caracteres
+        if config is not None:
+            config.apply(chat)
+
+        # Step 3: Save AI message
+        ia_msg = message_repo.add(db, chat_id, "IA", ai_text)
+        logger.info(f"AI message created: {ia_msg.id_mensaje}")
+
+        # Step 4: Check if interview has been completed by the agent
+        completed = self.detect_completion(ai_text)
+        if completed:
+            mark_chat_completed(db, chat_id)
+            logger.info(f"🎉 Entrevista {chat_id} finalizada")
+
+        return InterviewTurn(user_message=user_msg, ai_message=ia_msg, completed=completed)
+
+
+interview_service = InterviewService()
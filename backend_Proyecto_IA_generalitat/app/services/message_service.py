@@ -9,6 +9,7 @@ from fastapi import HTTPException
 from sqlalchemy.orm import Session
 
 from app.repositories.message_repo import message_repo
+from app.repositories.summary_repo import summary_repo
 from app.services.chat_service import chat_service
 from app.models.message import Message
 
@@ -80,6 +81,9 @@ class MessageService:
         """
         Build Bedrock API message history in [{"role": "user"|"assistant", "content": "..."}] format (chronological order).
         
+        If the chat has a rolling summary, the history starts with a {"role": "system"} entry
+        holding it, followed only by the messages the summary does not cover yet.
+        
         Args:
             db (Session): Database session.
             chat_id (int): ID of the chat.
@@ -90,10 +94,19 @@ class MessageService:
             list[dict]: List of message dictionaries formatted for Bedrock.
         """
         chat_service.get_chat_for_user_or_404(db, chat_id, user_id)
-        msgs = message_repo.list_for_chat(db, chat_id, limit=limit)
+        summary = summary_repo.get(db, chat_id)
+        if summary:
+            msgs = message_repo.list_after(db, chat_id, summary.id_ultimo_mensaje, limit=limit)
+        else:
+            msgs = message_repo.list_for_chat(db, chat_id, limit=limit)
         msgs = list(reversed(msgs))
 
         history: list[dict] = []
+        if summary:
+            history.append({
+                "role": "system",
+                "content": f"Resumen de la entrevista hasta ahora ({summary.mensajes_resumidos} mensajes anteriores):\n{summary.contenido}",
+            })
         for m in msgs:
             role = "user" if m.emisor == "USER" else "assistant"
             history.append({"role": role, "content": m.contenido})
@@ -0,0 +1,462 @@
+"""
+Report Service.
+
+This module provides the business logic for interview reports: building the report
+prompt, extracting the interview configuration from the conversation and rendering
+the final PDF. It is shared by the single-report and batch export endpoints.
+"""
+
+import logging
+import re
+import zipfile
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import datetime
+from tempfile import SpooledTemporaryFile
+from typing import BinaryIO, Iterator
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.chat import Chat
+from app.repositories.message_repo import message_repo
+from app.repositories.stats_repo import stats_repo
+from app.services.ai.bedrock_service import generate_reply
+from app.services.ai.pdf_service import generate_pdf_report_spooled
+from app.services.ai.report_cache import report_cache
+from app.services.interview_config_service import interview_config_service
+from app.services.message_service import message_service
+
+logger = logging.getLogger(__name__)
+
+MIN_REPORT_MESSAGES = 5
+
+REPORT_PROMPT = (
+    "El proceso de evaluación ha finalizado. Por favor, genera un resumen analítico de evaluación "
+    "siguiendo ESTRICTAMENTE estas reglas: "
+    "\n"
+    "RESTRICCIONES OBLIGATORIAS: "
+    "1. NO incluyas la sección de datos personales ni información de identificación (nombre, fecha, rol, nivel, ciclo, duración). "
+    "   Estos datos aparecen automáticamente en el encabezado del documento. "
+    "2. NO uses bullets con información personal. "
+    "3. NO uses placeholders como [fecha], [rol], [ciclo], etc. "
+    "4. NO incluyas JSON, código, bloques técnicos ni formatos especiales. "
+    "\n"
+    "CONTENIDO REQUERIDO: "
+    "5. Comienza DIRECTAMENTE con 'Valoración general del perfil'. NO hay introducción previa. "
+    "6. Sé realista y crítico en tu análisis. Evita suavizar errores graves. "
+    "\n"
+    "DETALLES POR SECCIÓN: "
+    "7. Análisis de ortografía y expresión escrita: "
+    "   - SOLO reporta errores ortográficos REALES que hayas detectado en las respuestas. "
+    "   - Si NO hubo errores ortográficos, indica explícitamente: 'No se detectaron errores ortográficos.' "
+    "   - NO inventes ejemplos ni incluyas faltas que no ocurrieron. "
+    "   - Formato de ejemplo: Escribió 'ola' en lugar de 'hola' (entre comillas la palabra exacta mal escrita). "
+    "   - NO reportes errores técnicos, siglas, nombres propios ni anglicismos como faltas. "
+    "8. Errores conceptuales: indícalos en 'Errores críticos' con ejemplos específicos de lo respondido. "
+    "9. Nivel profesional: usa UNA SOLA de: Muy bajo | Bajo | Medio | Bueno | Muy bueno. "
+    "   Refleja el desempeño observado. 'Muy bueno' solo si realmente merece 95+/100. "
+    "\n"
+    "ESTRUCTURA DEL DOCUMENTO (usa estos títulos con ##): "
+    "   ## Valoración general "
+    "   ## Puntos fuertes (omitir si no existen) "
+    "   ## Errores críticos (omitir si no los hay) "
+    "   ## Aspectos a mejorar "
+    "   ## Ortografía y expresión escrita "
+    "   ## Recomendaciones prácticas "
+    "   ## Impacto en una entrevista profesional "
+    "   ## Acciones prioritarias (próximos 7 días) "
+    "   ## Nivel estimado profesional "
+)
+
+
+class NotEnoughMessagesError(ValueError):
+    """Raised when a chat does not have enough messages to write a report."""
+
+
+@dataclass(frozen=True)
+class ReportMessage:
+    """
+    Plain copy of a chat message, safe to read outside the database session.
+    
+    Attributes:
+        emisor (str): ``"USER"`` or ``"IA"``.
+        contenido (str): Message text.
+        sent_at (datetime): When the message was sent.
+    """
+    emisor: str
+    contenido: str
+    sent_at: datetime
+
+
+@dataclass
+class PreparedReport:
+    """
+    Everything needed to generate a report once the database work is done.
+    
+    Attributes:
+        chat_id (int): The chat the report belongs to.
+        user_id (int): Owner of the chat.
+        candidate_name (str): Name shown in the report header.
+        interview_date (datetime): Creation date of the chat.
+        messages (list[ReportMessage]): Recent messages (newest first) used for metadata and validation.
+        history (list[dict]): Bedrock history ending with the report prompt.
+        cache_version (datetime | None): Chat version the report is cached under.
+        metadata (dict[str, str] | None): Interview profile stored on the chat (None for older chats).
+        employability_level (str): Level detected in the report (set by ``render``).
+    """
+    chat_id: int
+    user_id: int
+    candidate_name: str
+    interview_date: datetime
+    messages: list[ReportMessage]
+    history: list[dict]
+    cache_version: datetime | None = None
+    metadata: dict[str, str] | None = None
+    employability_level: str = ""
+
+
+def report_filename(chat_id: int) -> str:
+    """
+    Build the download filename for a chat report.
+    
+    Args:
+        chat_id (int): The chat ID.
+        
+    Returns:
+        str: Filename such as ``informe_entrevista_12_20260115.pdf``.
+    """
+    return f"informe_entrevista_{chat_id}_{datetime.now().strftime('%Y%m%d')}.pdf"
+
+
+def extract_interview_metadata(messages: list[ReportMessage]) -> dict[str, str]:
+    """
+    Detect the interview configuration (rol, nivel, ciclo, duración) from the conversation.
+    
+    Args:
+        messages (list[ReportMessage]): Chat messages, newest first.
+        
+    Returns:
+        dict[str, str]: Keys ``rol_laboral``, ``nivel_academico``, ``ciclo_formativo`` and ``duracion``.
+    """
+    rol_laboral = "No especificado"
+    nivel_academico = "No especificado"
+    ciclo_formativo = "No especificado"
+    duracion = "No especificada"
+
+    logger.info(f"Extracting metadata from {len(messages)} messages")
+
+    for idx, msg in enumerate(messages[:30]):  # Check first 30 messages for config data
+        if not msg.contenido:
+            continue
+
+        content_lower = msg.contenido.lower()
+        content_clean = msg.contenido.strip()
+
+        # DETECT ROL LABORAL (more flexible matching)
+        if rol_laboral == "No especificado":
+            # Look for role keywords (case-insensitive, whole words)
+            if re.search(r'\bjunior\b', content_lower):
+                rol_laboral = "Junior"
+                logger.info(f"Detected rol_laboral='Junior' from message {idx}")
+            elif re.search(r'\bmiddle\b', content_lower):
+                rol_laboral = "Middle"
+                logger.info(f"Detected rol_laboral='Middle' from message {idx}")
+            elif re.search(r'\bsenior\b', content_lower):
+                rol_laboral = "Senior"
+                logger.info(f"Detected rol_laboral='Senior' from message {idx}")
+
+        # DETECT NIVEL ACADÉMICO (more flexible matching)
+        if nivel_academico == "No especificado":
+            if 'fp básica' in content_lower or 'fp basica' in content_lower or 'fp básico' in content_lower:
+                nivel_academico = "FP Básica"
+                logger.info(f"Detected nivel_academico='FP Básica' from message {idx}")
+            elif 'fp media' in content_lower or 'fp medio' in content_lower:
+                nivel_academico = "FP Media"
+                logger.info(f"Detected nivel_academico='FP Media' from message {idx}")
+            elif 'fp superior' in content_lower:
+                nivel_academico = "FP Superior"
+                logger.info(f"Detected nivel_academico='FP Superior' from message {idx}")
+            elif 'máster' in content_lower or 'master' in content_lower or 'especialización' in content_lower or 'especializacion' in content_lower:
+                nivel_academico = "Máster/Especialización"
+                logger.info(f"Detected nivel_academico='Máster/Especialización' from message {idx}")
+            # Capture generic "FP" if nothing else matched and this looks like a config response
+            elif re.search(r'\bfp\b', content_lower) and len(content_clean) < 50:
+                nivel_academico = "FP"
+                logger.info(f"Detected nivel_academico='FP' (generic) from message {idx}")
+
+        # DETECT DURACIÓN (more flexible matching - look for the word alone, not combined with others)
+        if duracion == "No especificada":
+            if re.search(r'\bcorta\b', content_lower):
+                duracion = "Corta"
+                logger.info(f"Detected duracion='Corta' from message {idx}")
+            elif re.search(r'\bmedia\b', content_lower):
+                duracion = "Media"
+                logger.info(f"Detected duracion='Media' from message {idx}")
+            elif re.search(r'\blarga\b', content_lower):
+                duracion = "Larga"
+                logger.info(f"Detected duracion='Larga' from message {idx}")
+
+        # DETECT CICLO FORMATIVO (buscar siglas y nombres comunes)
+        if ciclo_formativo == "No especificado":
+            ciclos_conocidos = {
+                'daw': 'DAW - Desarrollo de Aplicaciones Web',
+                'dam': 'DAM - Desarrollo de Aplicaciones Multiplataforma',
+                'asir': 'ASIR - Administración de Sistemas Informáticos en Red',
+                'smr': 'SMR - Sistemas Microinformáticos y Redes',
+                'enfermería': 'Enfermería',
+                'enfermeria': 'Enfermería',
+                'integración social': 'Integración Social',
+                'integracion social': 'Integración Social',
+                'electrónica': 'Electrónica Industrial',
+                'electronica': 'Electrónica Industrial',
+                'administración y finanzas': 'Administración y Finanzas',
+                'administracion y finanzas': 'Administración y Finanzas',
+                'comercio internacional': 'Comercio Internacional',
+                'marketing': 'Marketing y Publicidad',
+                'auxiliar de enfermería': 'Auxiliar de Enfermería',
+                'auxiliar de enfermeria': 'Auxiliar de Enfermería'
+            }
+
+            # Try to find known ciclos first
+            for sigla, nombre_completo in ciclos_conocidos.items():
+                if sigla in content_lower:
+                    ciclo_formativo = nombre_completo
+                    logger.info(f"Detected ciclo_formativo='{nombre_completo}' from message {idx}")
+                    break
+
+            # If no known ciclo detected but this looks like a config response, capture it
+            if ciclo_formativo == "No especificado" and msg.emisor == "USER":
+                # Check if this is likely a ciclo response (short message, likely between messages 4-12)
+                if 3 < len(content_clean) < 150 and idx >= 3:
+                    # Only capture if it doesn't contain question marks or common non-response words
+                    if '?' not in msg.contenido and len(content_clean) > 0:
+                        # Check if it contains ciclo-related keywords
+                        if any(palabra in content_lower for palabra in ['ciclo', 'estudio', 'estudiando', 'formativo', 'carrera', 'especialidad', 'técnico']):
+                            ciclo_formativo = content_clean
+                            logger.info(f"Detected ciclo_formativo='{content_clean}' (custom) from message {idx}")
+
+    return {
+        "rol_laboral": rol_laboral,
+        "nivel_academico": nivel_academico,
+        "ciclo_formativo": ciclo_formativo,
+        "duracion": duracion,
+    }
+
+
+class _ZipChunkBuffer:
+    """Write-only sink for ``zipfile`` that hands out what was written so far."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ReportService:
+    """Service class for generating interview reports."""
+
+    def prepare(self, db: Session, chat: Chat, user) -> PreparedReport:
+        """
+        Load everything the report needs from the database.
+        
+        Only plain values are kept, so the result can be rendered in another
+        thread after the request session is closed.
+        
+        Args:
+            db (Session): Database session.
+            chat (Chat): The chat (ownership already validated).
+            user (User): The chat owner.
+            
+        Returns:
+            PreparedReport: Data for ``render``; it no longer needs the session.
+            
+        Raises:
+            NotEnoughMessagesError: If the chat does not have enough messages for a report.
+        """
+        # Validate that there are enough messages for a report
+        messages = message_repo.list_for_chat(db, chat.id_chat, limit=100)
+        if len(messages) < MIN_REPORT_MESSAGES:
+            raise NotEnoughMessagesError(
+                "No se puede generar un informe sin haber realizado la entrevista. Necesitas al menos completar la configuración inicial y responder algunas preguntas."
+            )
+
+        history = message_service.build_bedrock_history(db, chat.id_chat, user.id_usuario, limit=100)
+        history.append({"role": "user", "content": REPORT_PROMPT})
+
+        return PreparedReport(
+            chat_id=chat.id_chat,
+            user_id=user.id_usuario,
+            candidate_name=user.nombre,
+            interview_date=chat.created_at,
+            messages=[ReportMessage(m.emisor, m.contenido, m.sent_at) for m in messages],
+            history=history,
+            cache_version=report_cache.version(chat),
+            metadata=interview_config_service.profile(chat),
+        )
+
+    def render(self, prepared: PreparedReport, render_pool=None) -> SpooledTemporaryFile:
+        """
+        Ask the AI for the final report and render it to PDF.
+        
+        Also stores the detected employability level in ``prepared.employability_level``.
+        
+        Args:
+            prepared (PreparedReport): Output of ``prepare``.
+            render_pool (PdfRenderPool | None): Optional out-of-process renderer.
+            
+        Returns:
+            SpooledTemporaryFile: The PDF, positioned at offset 0.
+        """
+        # Generate final report with AI (with higher max_tokens for comprehensive report)
+        report_content = generate_reply(prepared.history, prepared.chat_id, max_tokens=2500, temperature=0.7)
+        logger.info(f"AI report generated for chat {prepared.chat_id}")
+
+        # Chats configured by the agent (before the profile was stored) are parsed from the messages
+        metadata = prepared.metadata or extract_interview_metadata(prepared.messages)
+
+        # Generate PDF (spooled to disk past the memory threshold)
+        pdf_file, prepared.employability_level = generate_pdf_report_spooled(
+            report_content=report_content,
+            candidate_name=prepared.candidate_name,
+            interview_date=prepared.interview_date,
+            messages=prepared.messages,
+            max_memory_size=settings.pdf_spool_max_size,
+            render_pool=render_pool,
+            **metadata,
+        )
+        return pdf_file
+
+    def _render_and_cache(self, prepared: PreparedReport, render_pool=None) -> SpooledTemporaryFile:
+        """Render a report and store it in the report cache."""
+        pdf_file = self.render(prepared, render_pool=render_pool)
+        report_cache.store(prepared.chat_id, prepared.cache_version, pdf_file)
+        return pdf_file
+
+    def _record_levels(self, reports: list[PreparedReport]) -> None:
+        """
+        Store the employability levels of batch reports in the stats.
+        
+        Uses a session of its own: the request session is closed while the
+        archive streams.
+        """
+        reports = [prepared for prepared in reports if prepared.employability_level]
+        if not reports:
+            return
+        db = SessionLocal()
+        try:
+            for prepared in reports:
+                stats_repo.record_report(db, prepared.chat_id, prepared.user_id, prepared.employability_level)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error recording the employability level of batch reports: {str(e)}", exc_info=True)
+        finally:
+            db.close()
+
+    def _discard_render(self, prepared: PreparedReport, future: Future) -> None:
+        """Record and close a batch report whose archive entry was never written (client gone)."""
+        if future.cancelled() or future.exception() is not None:
+            return
+        future.result().close()
+        self._record_levels([prepared])
+
+    def stream_batch_zip(
+        self,
+        cached: dict[int, BinaryIO],
+        pending: list[PreparedReport],
+        render_pool=None,
+    ) -> Iterator[bytes]:
+        """
+        Stream a ZIP archive of reports, emitting each entry as soon as it is ready.
+        
+        Cached reports are written first; the remaining ones are generated in
+        parallel (at most ``REPORT_BATCH_CONCURRENCY`` at a time) and appended in
+        completion order. A report that fails is replaced by a short ``.txt``
+        entry so the rest of the archive is still delivered. The employability level of
+        every generated report is recorded in the stats. The cached files are closed
+        even if the client disconnects before they are written; in that case the
+        renders not started yet are cancelled and the PDFs nobody will read are closed.
+        
+        Args:
+            cached (dict[int, BinaryIO]): Already rendered PDFs by chat ID.
+            pending (list[PreparedReport]): Reports still to generate.
+            render_pool (PdfRenderPool | None): Optional out-of-process renderer.
+            
+        Yields:
+            bytes: Consecutive chunks of the ZIP archive.
+        """
+        sink = _ZipChunkBuffer()
+        chunk_size = settings.pdf_stream_chunk_size
+
+        try:
+            with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+
+                def add_pdf(chat_id: int, pdf_file: BinaryIO) -> Iterator[bytes]:
+                    try:
+                        with archive.open(report_filename(chat_id), mode="w") as entry:
+                            while chunk := pdf_file.read(chunk_size):
+                                entry.write(chunk)
+                                yield sink.drain()
+                    finally:
+                        pdf_file.close()
+                    yield sink.drain()
+
+                for chat_id, pdf_file in cached.items():
+                    yield from add_pdf(chat_id, pdf_file)
+
+                if pending:
+                    workers = max(1, min(settings.report_batch_concurrency, len(pending)))
+                    executor = ThreadPoolExecutor(max_workers=workers)
+                    futures = {
+                        executor.submit(self._render_and_cache, prepared, render_pool): prepared
+                        for prepared in pending
+                    }
+                    written = []
+                    try:
+                        for future in as_completed(futures):
+                            prepared = futures[future]
+                            written.append(future)
+                            try:
+                                pdf_file = future.result()
+                            except Exception as e:
+                                logger.error(
+                                    f"Error generating report for chat {prepared.chat_id} in batch: {str(e)}", exc_info=True
+                                )
+                                archive.writestr(
+                                    f"informe_entrevista_{prepared.chat_id}_ERROR.txt",
+                                    "No se pudo generar el informe de esta entrevista. Inténtalo de nuevo más tarde.\n",
+                                )
+                                yield sink.drain()
+                                continue
+                            yield from add_pdf(prepared.chat_id, pdf_file)
+                    finally:
+                        # On a client disconnect, skip the renders not started yet and let the
+                        # running ones finish in the background instead of waiting for them
+                        for future, prepared in futures.items():
+                            if future not in written:
+                                future.cancel()
+                                future.add_done_callback(lambda done, prepared=prepared: self._discard_render(prepared, done))
+                        executor.shutdown(wait=False)
+                        self._record_levels([
+                            futures[future] for future in written if future.exception() is None
+                        ])
+        finally:
+            for pdf_file in cached.values():
+                pdf_file.close()
+
+        yield sink.drain()
+
+
+report_service = ReportService()
@@ -0,0 +1,106 @@
+"""
+Summary Service.
+
+This module maintains a rolling summary per chat: every N turns the older messages are
+condensed into a stored summary, so AI prompts are built from the summary plus a recent
+window instead of growing linearly with the length of the interview.
+"""
+
+import logging
+
+from sqlalchemy.orm import Session
+
+from app.core.chat_lock import summary_locks
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.chat_summary import ChatSummary
+from app.repositories.message_repo import message_repo
+from app.repositories.summary_repo import summary_repo
+from app.services.ai.bedrock_service import summarize_conversation
+
+logger = logging.getLogger(__name__)
+
+
+class SummaryService:
+    """Service class for rolling conversation summaries."""
+
+    def enabled(self) -> bool:
+        """
+        Check whether summarization applies.
+        
+        Summaries only matter when the history is sent explicitly (direct model
+        mode); the Bedrock Agent keeps the conversation in its own session.
+        
+        Returns:
+            bool: True if summaries should be maintained.
+        """
+        return settings.summary_every_n_turns > 0 and settings.bedrock_invocation_mode == "model"
+
+    def maybe_refresh(self, db: Session, chat_id: int) -> ChatSummary | None:
+        """
+        Fold older messages into the chat summary once enough new turns accumulated.
+        
+        The summary is refreshed when the messages not yet covered exceed the recent
+        window by ``SUMMARY_EVERY_N_TURNS`` turns (user + AI message each); everything
+        but the recent window is then condensed together with the previous summary.
+        
+        Args:
+            db (Session): Database session.
+            chat_id (int): ID of the chat.
+            
+        Returns:
+            ChatSummary | None: The current summary (refreshed or not), if any.
+        """
+        summary = summary_repo.get(db, chat_id)
+        if not self.enabled():
+            return summary
+
+        after_id = summary.id_ultimo_mensaje if summary else 0
+        uncovered = message_repo.count_after(db, chat_id, after_id)
+        recent = settings.summary_recent_messages
+        if uncovered < recent + 2 * settings.summary_every_n_turns:
+            return summary
+
+        msgs = list(reversed(message_repo.list_after(db, chat_id, after_id, limit=uncovered)))
+        to_fold = msgs[: len(msgs) - recent]
+        if not to_fold:
+            return summary
+
+        history = [{"role": "user" if m.emisor == "USER" else "assistant", "content": m.contenido} for m in to_fold]
+        reply = summarize_conversation(summary.contenido if summary else None, history, chat_id)
+        if not reply.text:
+            logger.warning(f"Empty summary returned for chat {chat_id}, keeping the previous one")
+            return summary
+
+        covered = (summary.mensajes_resumidos if summary else 0) + len(to_fold)
+        logger.info(f"Chat {chat_id} summary refreshed: {covered} messages covered")
+        return summary_repo.upsert(db, chat_id, reply.text, to_fold[-1].id_mensaje, covered)
+
+    def refresh_in_background(self, chat_id: int) -> None:
+        """
+        Refresh the summary of a chat using its own session (for background tasks).
+        
+        Refreshes of the same chat do not overlap: if one is already running this
+        call does nothing, and a later turn picks up whatever it left uncovered.
+        Failures are logged and never propagated: the next turn will retry.
+        
+        Args:
+            chat_id (int): ID of the chat.
+        """
+        if not self.enabled():
+            return
+        with summary_locks.try_hold(chat_id) as held:
+            if not held:
+                logger.info(f"Summary of chat {chat_id} is already being refreshed, skipping")
+                return
+            db = SessionLocal()
+            try:
+                self.maybe_refresh(db, chat_id)
+            except Exception as e:
+                db.rollback()
+                logger.warning(f"Could not refresh summary for chat {chat_id}: {str(e)}")
+            finally:
+                db.close()
+
+
+summary_service = SummaryService()
@@ -0,0 +1,145 @@
+"""
+Benchmark: sync vs. async stack for the message list under concurrency.
+
+Serves two equivalent routes from one in-process ASGI app on a temporary SQLite
+database and fires requests at them with a fixed number in flight:
+
+- sync:  the real ``GET /api/v1/messages`` (``def`` route, ``Session``, threadpool),
+- async: the same logic as an ``async def`` route on ``get_async_db`` and the async
+  repositories (aiosqlite).
+
+Reports throughput and p50/p95 latency per stack and concurrency level. With SQLite
+both drivers end up in worker threads; the gap grows with network databases (MySQL).
+
+Usage:
+    python benchmarks/async_messages.py --requests 2000 --concurrency 10 50 200
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def build_app():
+    """Return the API app with an async twin of the message list route."""
+    from fastapi import Depends, HTTPException, Query
+
+    from app.api.deps import get_current_user_async
+    from app.core.database import get_async_db
+    from app.main import app
+    from app.repositories.chat_repo import async_chat_repo
+    from app.repositories.message_repo import async_message_repo
+    from app.schemas.message import MessageResponse
+
+    @app.get("/bench/async/messages", response_model=list[MessageResponse])
+    async def list_messages_async(
+        chat_id: int = Query(...),
+        limit: int = Query(50, ge=1, le=200),
+        db=Depends(get_async_db),
+        user=Depends(get_current_user_async),
+    ):
+        chat = await async_chat_repo.get_for_user(db, chat_id, user.id_usuario)
+        if not chat:
+            raise HTTPException(status_code=404, detail="Chat not found")
+        return await async_message_repo.list_for_chat(db, chat_id, limit=limit)
+
+    return app
+
+
+def seed(messages: int) -> tuple[str, int]:
+    """Create a user with one chat of ``messages`` messages; return a token and the chat ID."""
+    from app.core.database import Base, SessionLocal, engine
+    from app.core.security import create_access_token
+    from app.models.chat import Chat
+    from app.models.message import Message
+    from app.models.user import User
+
+    Base.metadata.create_all(engine)
+    with SessionLocal() as db:
+        user = User(email="bench@example.com", password_hash="x", nombre="Bench")
+        db.add(user)
+        db.flush()
+        chat = Chat(id_usuario=user.id_usuario)
+        db.add(chat)
+        db.flush()
+        for i in range(messages):
+            emisor = "USER" if i % 2 else "IA"
+            db.add(Message(id_chat=chat.id_chat, emisor=emisor, contenido=f"Mensaje de prueba número {i} " * 8))
+        db.commit()
+        return create_access_token(str(user.id_usuario)), chat.id_chat
+
+
+async def run_load(app, path: str, params: dict, headers: dict, total: int, concurrency: int):
+    """Send ``total`` requests with ``concurrency`` in flight; return (req/s, latencies ms, errors)."""
+    import httpx
+
+    latencies: list[float] = []
+    errors = 0
+    remaining = iter(range(total))
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def worker():
+            nonlocal errors
+            for _ in remaining:
+                start = time.perf_counter()
+                response = await client.get(path, params=params, headers=headers)
+                latencies.append((time.perf_counter() - start) * 1000)
+                errors += response.status_code != 200
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    return total / elapsed, latencies, errors
+
+
+async def main_async(args) -> None:
+    app = build_app()
+    token, chat_id = seed(args.messages)
+    headers = {"Authorization": f"Bearer {token}"}
+    params = {"chat_id": chat_id, "limit": 50}
+
+    stacks = [("sync", "/api/v1/messages"), ("async", "/bench/async/messages")]
+    for _, path in stacks:  # warm-up (connection pools, async engine)
+        await run_load(app, path, params, headers, 50, 5)
+
+    for concurrency in args.concurrency:
+        for name, path in stacks:
+            rps, latencies, errors = await run_load(app, path, params, headers, args.requests, concurrency)
+            latencies.sort()
+            print(
+                f"{name:<6} concurrency={concurrency:<4} {rps:8.1f} req/s  "
+                f"p50={statistics.median(latencies):7.2f} ms  "
+                f"p95={latencies[int(len(latencies) * 0.95) - 1]:7.2f} ms  "
+                f"errors={errors}",
+                flush=True,
+            )
+
+    from app.core.database import dispose_async_engine
+    await dispose_async_engine()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per stack and concurrency level")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[10, 50, 200], help="Requests in flight")
+    parser.add_argument("--messages", type=int, default=200, help="Messages in the benchmark chat")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        os.environ.setdefault("JWT_SECRET", "benchmark-secret-benchmark-secret-0123456789")
+        sys.path.insert(0, str(BACKEND_DIR))
+        asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
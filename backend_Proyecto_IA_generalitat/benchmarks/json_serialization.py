@@ -0,0 +1,139 @@
+"""
+Benchmark: serialization of a 200-message page.
+
+Fills a temporary SQLite database with interviews of 200 messages and times, for
+``GET /api/v1/messages?limit=200``, the three ways of producing the response body:
+
+- ``pydantic+json``: ORM objects validated through ``MessageResponse`` (``from_attributes``)
+  and encoded with the standard ``json`` module (the previous behaviour of the route),
+- ``pydantic+orjson``: the same validation encoded with orjson (``default_response_class``),
+- ``rows+orjson``: row tuples read into dicts (``message_repo.list_rows_for_chat``) and
+  encoded with orjson (the current route).
+
+Query time (fetching the page) and serialization time are reported separately.
+
+Usage:
+    python benchmarks/json_serialization.py --chats 20 --reads 300
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+SENTENCES = [
+    "Has explicado correctamente la diferencia entre una clave primaria y una clave foránea.",
+    "Sería conveniente que profundizaras en cómo afectan los índices al rendimiento de las consultas.",
+    "Tu respuesta sobre el ciclo de vida de una petición HTTP ha sido clara y bien estructurada.",
+    "Vamos con la siguiente pregunta: ¿cómo organizarías las pruebas automatizadas de una API REST?",
+    "Valoro positivamente que menciones la importancia de la comunicación con el equipo.",
+    "Los patrones de diseño como el repositorio ayudan a separar la lógica de negocio del acceso a datos.",
+]
+
+PAGE = 200
+
+
+def _text(rng: random.Random, emisor: str) -> str:
+    count = rng.randint(1, 2) if emisor == "USER" else rng.randint(4, 10)
+    return " ".join(rng.choice(SENTENCES) for _ in range(count))
+
+
+def _report(name: str, query_ms: list[float], serialize_ms: list[float], sizes: list[int]) -> None:
+    print(
+        f"{name:<16} query p50={statistics.median(query_ms):6.2f} ms  "
+        f"serialize p50={statistics.median(serialize_ms):6.2f} ms  "
+        f"p95={statistics.quantiles(serialize_ms, n=20)[18]:6.2f} ms  body={statistics.mean(sizes) / 1024:6.1f} KiB"
+    )
+
+
+def run(chats: int, reads: int, seed: int) -> None:
+    """Populate a database and time each serialization path."""
+    import orjson
+    from pydantic import TypeAdapter
+    from sqlalchemy import create_engine, select
+    from sqlalchemy.orm import sessionmaker
+
+    from app.core.database import Base
+    from app.models.chat import Chat
+    from app.models.message import Message
+    from app.models.user import User
+    from app.repositories.message_repo import message_repo
+    from app.schemas.message import MessageResponse
+
+    rng = random.Random(seed)
+    adapter = TypeAdapter(list[MessageResponse])
+
+    def pydantic_json(messages):
+        content = adapter.dump_python(adapter.validate_python(messages, from_attributes=True), mode="json")
+        return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+    def pydantic_orjson(messages):
+        return orjson.dumps(adapter.dump_python(adapter.validate_python(messages, from_attributes=True), mode="json"))
+
+    paths = [
+        ("pydantic+json", message_repo.list_for_chat, pydantic_json),
+        ("pydantic+orjson", message_repo.list_for_chat, pydantic_orjson),
+        ("rows+orjson", message_repo.list_rows_for_chat, orjson.dumps),
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(engine)
+        Session = sessionmaker(bind=engine)
+
+        with Session() as db:
+            user = User(email="bench@example.com", password_hash="x", nombre="Bench")
+            db.add(user)
+            db.flush()
+            for _ in range(chats):
+                chat = Chat(id_usuario=user.id_usuario)
+                db.add(chat)
+                db.flush()
+                for i in range(PAGE):
+                    emisor = "USER" if i % 2 else "IA"
+                    db.add(Message(id_chat=chat.id_chat, emisor=emisor, contenido=_text(rng, emisor)))
+            db.commit()
+            chat_ids = list(db.scalars(select(Chat.id_chat)))
+
+        for name, fetch, serialize in paths:
+            rng.seed(seed)  # same pages for every path
+            query_ms, serialize_ms, sizes = [], [], []
+            for _ in range(reads):
+                chat_id = rng.choice(chat_ids)
+                with Session() as db:
+                    start = time.perf_counter()
+                    page = fetch(db, chat_id, limit=PAGE)
+                    query_ms.append((time.perf_counter() - start) * 1000)
+                    start = time.perf_counter()
+                    body = serialize(page)
+                    serialize_ms.append((time.perf_counter() - start) * 1000)
+                    sizes.append(len(body))
+                    assert len(page) == PAGE
+            _report(name, query_ms, serialize_ms, sizes)
+
+        engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chats", type=int, default=20, help="Interviews of 200 messages to create")
+    parser.add_argument("--reads", type=int, default=300, help="Pages serialized per path")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the generated content")
+    args = parser.parse_args()
+
+    os.environ.setdefault("JWT_SECRET", "benchmark-secret-benchmark-secret-0123456789")
+    os.environ.setdefault("DATABASE_URL", "sqlite://")
+    sys.path.insert(0, str(BACKEND_DIR))
+
+    run(args.chats, args.reads, args.seed)
+
+
+if __name__ == "__main__":
+    main()
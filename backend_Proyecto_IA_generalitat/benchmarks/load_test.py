@@ -0,0 +1,358 @@
+"""
+Benchmark: end-to-end load test of full interviews against a fake Bedrock agent.
+
+Starts the real app in a separate uvicorn process (one worker) on a temporary SQLite
+database, with ``bedrock_service._client`` replaced by ``FakeAgentRuntime``: a local
+stand-in for the ``bedrock-agent-runtime`` client with configurable latency, chunk
+size, delay between chunks and throttling rate. With ``--replay`` the agent
+responses recorded with ``BEDROCK_AGENT_BACKEND=record`` are served instead
+(``AgentReplayer``). The rate limits are disabled there, since every virtual user
+connects from 127.0.0.1.
+
+Virtual users then run complete interviews the way the frontend does:
+
+    register → POST /chats/start → "empezar" + 4 configuration answers (answered by
+    the server) → answers to technical questions until the agent closes → POST /ai/generate-report
+
+with ``GET /chats/{id}`` after every reply. Throttled turns (500) are retried.
+Reports throughput and p50/p95/p99 latency per route, plus completed interviews
+per minute, so runs can be compared as a capacity baseline.
+
+Usage:
+    python benchmarks/load_test.py --interviews 40 --concurrency 10 --latency-ms 800
+    python benchmarks/load_test.py --concurrency 50 --throttle-rate 0.05 --think-ms 2000
+    python benchmarks/load_test.py --replay agent_recordings --replay-speed 0
+"""
+
+import argparse
+import asyncio
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+NAMES = ["Lucía Martí", "Pau Ferrer", "Marta Soler", "Jordi Vidal", "Carmen Ruiz", "Iván Gómez"]
+
+# Answers sent after the configuration before giving up on an interview that never closes
+MAX_QUESTIONS = 50
+
+CONFIG_ANSWERS = ["empezar", "Junior", "Grado Superior", "Desarrollo de Aplicaciones Web", "Media"]
+
+ANSWERS = [
+    "Una API REST expone recursos mediante URLs y usa los verbos HTTP para operar sobre ellos.",
+    "Con un índice en la columna que se filtra, la consulta evita recorrer toda la tabla.",
+    "Git permite trabajar en ramas y fusionar los cambios cuando están revisados.",
+    "Una clase abstracta no se puede instanciar y sirve de base para otras clases.",
+    "Usaría HTTPS, contraseñas cifradas con bcrypt y tokens con caducidad.",
+    "Las pruebas unitarias comprueban cada función por separado y se ejecutan en cada cambio.",
+]
+
+# First agent turn: the configuration is done locally and the agent receives the profile
+PRESENTATION = "Perfecto, ya tengo tu perfil. Antes de empezar, preséntate brevemente: nombre, experiencia y motivación."
+
+CLOSING = (
+    "Hemos terminado la entrevista. Gracias por tus respuestas. "
+    "Se generará un informe en PDF con tu evaluación y recomendaciones."
+)
+
+REPORT = """## Resumen de la evaluación
+
+El candidato demuestra conocimientos sólidos de desarrollo web y bases de datos, con
+explicaciones claras aunque algo superficiales en seguridad.
+
+**Puntos fuertes:** API REST, control de versiones, pruebas unitarias.
+
+**Áreas de mejora:** profundizar en patrones de diseño y en optimización de consultas.
+
+**Nivel de empleabilidad:** Medio
+"""
+
+
+class FakeAgentRuntime:
+    """
+    Local stand-in for the boto3 ``bedrock-agent-runtime`` client.
+
+    Follows the interview script per session (presentation, technical questions,
+    closing message, report) and streams each reply in chunks the way
+    ``invoke_agent`` does.
+    """
+
+    def __init__(
+        self,
+        latency_ms: float,
+        chunk_size: int,
+        chunk_delay_ms: float,
+        throttle_rate: float,
+        questions: int,
+        seed: int,
+    ):
+        """
+        Args:
+            latency_ms (float): Time before the response stream is returned (time to first byte).
+            chunk_size (int): Characters per streamed chunk.
+            chunk_delay_ms (float): Delay before each chunk after the first one.
+            throttle_rate (float): Fraction of calls rejected with ``ThrottlingException``.
+            questions (int): Technical questions asked before the closing message.
+            seed (int): Random seed for throttling and latency jitter.
+        """
+        self.latency_ms = latency_ms
+        self.chunk_size = max(chunk_size, 1)
+        self.chunk_delay_ms = chunk_delay_ms
+        self.throttle_rate = throttle_rate
+        self.questions = questions
+        self._rng = random.Random(seed)
+        self._turns: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _reply(self, turn: int) -> str:
+        """Return the scripted agent reply to the ``turn``-th user message of a session."""
+        if turn == 0:
+            return PRESENTATION
+        question = turn
+        if question <= self.questions:
+            return (
+                f"Gracias. Pregunta {question} de {self.questions}: explica con un ejemplo práctico cómo "
+                f"aplicarías este concepto en un proyecto real de {CONFIG_ANSWERS[3]}."
+            )
+        if question == self.questions + 1:
+            return CLOSING
+        return REPORT
+
+    def _stream(self, text: str):
+        for index, start in enumerate(range(0, len(text), self.chunk_size)):
+            if index and self.chunk_delay_ms:
+                time.sleep(self.chunk_delay_ms / 1000)
+            yield {"chunk": {"bytes": text[start:start + self.chunk_size].encode("utf-8")}}
+
+    def invoke_agent(self, agentId: str, agentAliasId: str, sessionId: str, inputText: str, **kwargs) -> dict:
+        """Mimic ``bedrock-agent-runtime.invoke_agent`` (same keyword arguments and response shape)."""
+        from botocore.exceptions import ClientError
+
+        with self._lock:
+            throttled = self._rng.random() < self.throttle_rate
+            jitter = self._rng.uniform(0.8, 1.2)
+            if not throttled:
+                turn = self._turns.get(sessionId, 0)
+                self._turns[sessionId] = turn + 1
+
+        time.sleep(self.latency_ms * jitter / 1000)
+        if throttled:
+            raise ClientError(
+                {"Error": {"Code": "throttlingException", "Message": "Rate exceeded"}}, "InvokeAgent"
+            )
+        return {"completion": self._stream(self._reply(turn))}
+
+
+def serve(args) -> None:
+    """Run the app with the fake agent (server process)."""
+    import uvicorn
+
+    from app.api.v1 import ai as ai_module
+    from app.main import app
+    from app.services.ai import bedrock_service
+    from app.services.ai.agent_backend import AgentReplayer
+
+    if args.replay:
+        bedrock_service._client = AgentReplayer(args.replay, args.replay_speed)
+    else:
+        bedrock_service._client = FakeAgentRuntime(
+            args.latency_ms, args.chunk_size, args.chunk_delay_ms, args.throttle_rate, args.questions, args.seed
+        )
+    app.state.limiter.enabled = False
+    ai_module.limiter.enabled = False
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
+
+
+def percentile(sorted_values: list[float], p: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    return sorted_values[max(math.ceil(p / 100 * len(sorted_values)) - 1, 0)]
+
+
+class Recorder:
+    """Latencies and failures per route."""
+
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+
+    async def request(self, client, route: str, method: str, url: str, ok=(200,), **kwargs):
+        """Send a request and record it under ``route``; return the response."""
+        start = time.perf_counter()
+        response = await client.request(method, url, **kwargs)
+        await response.aread()
+        self.latencies[route].append((time.perf_counter() - start) * 1000)
+        if response.status_code not in ok:
+            self.errors[route] += 1
+        return response
+
+    def print_report(self, elapsed: float, completed: int, failed: int) -> None:
+        print(f"{'route':<28} {'count':>6} {'errors':>6} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+        for route, latencies in self.latencies.items():
+            latencies = sorted(latencies)
+            print(
+                f"{route:<28} {len(latencies):>6} {self.errors[route]:>6} {len(latencies) / elapsed:>8.1f} "
+                f"{percentile(latencies, 50):>9.1f} {percentile(latencies, 95):>9.1f} {percentile(latencies, 99):>9.1f}"
+            )
+        total = sum(len(latencies) for latencies in self.latencies.values())
+        print(
+            f"\n{completed} interviews completed, {failed} failed in {elapsed:.1f} s: "
+            f"{completed / elapsed * 60:.1f} interviews/min, {total / elapsed:.1f} req/s"
+        )
+
+
+async def interview(client, recorder: Recorder, number: int, args) -> bool:
+    """Run one complete interview; return True if it ended with a report."""
+    response = await recorder.request(
+        client, "POST /auth/register", "POST", "/api/v1/auth/register",
+        json={"email": f"carga{number}@example.com", "password": "Carga1234", "nombre": NAMES[number % len(NAMES)]},
+    )
+    if response.status_code != 200:
+        return False
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    response = await recorder.request(client, "POST /chats/start", "POST", "/api/v1/chats/start", headers=headers)
+    if response.status_code != 200:
+        return False
+    chat_id = response.json()["chat"]["id_chat"]
+
+    # Answer until the agent closes the interview (the chat is then marked completed)
+    answers = CONFIG_ANSWERS + [ANSWERS[i % len(ANSWERS)] for i in range(MAX_QUESTIONS)]
+    for contenido in answers:
+        if args.think_ms:
+            await asyncio.sleep(args.think_ms / 1000)
+        for _ in range(args.retries + 1):
+            response = await recorder.request(
+                client, "POST /ai/reply", "POST", "/api/v1/ai/reply",
+                json={"chat_id": chat_id, "contenido": contenido}, headers=headers,
+            )
+            if response.status_code == 200:
+                break
+        else:
+            return False
+        response = await recorder.request(
+            client, "GET /chats/{id}", "GET", f"/api/v1/chats/{chat_id}", headers=headers
+        )
+        if response.status_code == 200 and response.json()["status"] == "completed":
+            break
+    else:
+        return False
+
+    for _ in range(args.retries + 1):
+        response = await recorder.request(
+            client, "POST /ai/generate-report", "POST", "/api/v1/ai/generate-report",
+            json={"chat_id": chat_id}, headers=headers,
+        )
+        if response.status_code == 200:
+            return True
+    return False
+
+
+async def drive(args, base_url: str) -> None:
+    """Run ``args.interviews`` interviews with ``args.concurrency`` in progress at a time."""
+    import httpx
+
+    recorder = Recorder()
+    numbers = iter(range(args.interviews))
+    completed = failed = 0
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+        async def virtual_user():
+            nonlocal completed, failed
+            for number in numbers:
+                try:
+                    ok = await interview(client, recorder, number, args)
+                except httpx.HTTPError as e:
+                    print(f"interview {number}: {type(e).__name__}", file=sys.stderr)
+                    ok = False
+                completed += ok
+                failed += not ok
+
+        start = time.perf_counter()
+        await asyncio.gather(*(virtual_user() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - start
+
+    recorder.print_report(elapsed, completed, failed)
+
+
+def wait_until_ready(base_url: str, server: subprocess.Popen, timeout: float = 30) -> None:
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise SystemExit(f"server exited with code {server.returncode}")
+        try:
+            httpx.get(f"{base_url}/", timeout=1)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise SystemExit("server did not start in time")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--interviews", type=int, default=40, help="Interviews to run in total")
+    parser.add_argument("--concurrency", type=int, default=10, help="Interviews in progress at the same time")
+    parser.add_argument("--questions", type=int, default=5, help="Technical questions per interview")
+    parser.add_argument("--think-ms", type=float, default=0, help="Pause of the candidate before each answer")
+    parser.add_argument("--latency-ms", type=float, default=800, help="Fake agent time to first byte (±20%%)")
+    parser.add_argument("--chunk-size", type=int, default=64, help="Characters per fake agent chunk")
+    parser.add_argument("--chunk-delay-ms", type=float, default=20, help="Delay between fake agent chunks")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction of agent calls throttled")
+    parser.add_argument("--replay", help="Serve agent recordings from this folder instead of the fake agent")
+    parser.add_argument("--replay-speed", type=float, default=1.0, help="Replay timing factor (0: no delays)")
+    parser.add_argument("--retries", type=int, default=3, help="Retries of a failed reply or report")
+    parser.add_argument("--timeout", type=float, default=120, help="Client timeout per request (seconds)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed of the fake agent")
+    parser.add_argument("--port", type=int, default=0, help="Port of the app (0: any free port)")
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        sys.path.insert(0, str(BACKEND_DIR))
+        serve(args)
+        return
+
+    args.port = args.port or free_port()
+    base_url = f"http://127.0.0.1:{args.port}"
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            **os.environ,
+            "DATABASE_URL": f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+            "JWT_SECRET": os.environ.get("JWT_SECRET", "benchmark-secret-benchmark-secret-0123456789"),
+            "REPORT_CACHE_DIR": os.path.join(tmp, "reports"),
+        }
+        log_path = os.path.join(tmp, "server.log")
+        with open(log_path, "w") as log:
+            server = subprocess.Popen(
+                [sys.executable, __file__, "--serve", *sys.argv[1:], "--port", str(args.port)],
+                cwd=BACKEND_DIR, env=env, stdout=log, stderr=subprocess.STDOUT,
+            )
+            try:
+                wait_until_ready(base_url, server)
+                asyncio.run(drive(args, base_url))
+            finally:
+                server.terminate()
+                server.wait(timeout=30)
+        if server.returncode not in (0, -15):
+            print(Path(log_path).read_text()[-4000:], file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
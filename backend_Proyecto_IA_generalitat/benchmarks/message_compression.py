@@ -0,0 +1,134 @@
+"""
+Benchmark: plain vs. compressed message storage.
+
+Fills a temporary SQLite database with interviews of 50 messages (short candidate
+answers, long AI turns in Spanish) once per storage mode and measures, for reads of
+a 50-message history (``message_repo.list_for_chat``):
+
+- bytes read from the database (``contenido`` + ``contenido_comprimido``),
+- query time without touching the text (e.g. listing metadata),
+- query time including building the Bedrock history (decompression included).
+
+Usage:
+    python benchmarks/message_compression.py --chats 200 --reads 500
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+SENTENCES = [
+    "Has explicado correctamente la diferencia entre una clave primaria y una clave foránea.",
+    "Sería conveniente que profundizaras en cómo afectan los índices al rendimiento de las consultas.",
+    "En un entorno profesional es habitual trabajar con control de versiones y revisiones de código.",
+    "Tu respuesta sobre el ciclo de vida de una petición HTTP ha sido clara y bien estructurada.",
+    "Vamos con la siguiente pregunta: ¿cómo organizarías las pruebas automatizadas de una API REST?",
+    "Valoro positivamente que menciones la importancia de la comunicación con el equipo.",
+    "Recuerda que la normalización reduce redundancias, aunque a veces conviene desnormalizar por rendimiento.",
+    "Describe una situación en la que tuviste que resolver un conflicto durante un proyecto en grupo.",
+    "Los patrones de diseño como el repositorio ayudan a separar la lógica de negocio del acceso a datos.",
+    "Para un puesto junior es importante demostrar capacidad de aprendizaje y curiosidad técnica.",
+]
+
+
+def _ai_turn(rng: random.Random) -> str:
+    return " ".join(rng.choice(SENTENCES) for _ in range(rng.randint(12, 25)))
+
+
+def _user_turn(rng: random.Random) -> str:
+    return " ".join(rng.choice(SENTENCES) for _ in range(rng.randint(1, 2)))
+
+
+def run_mode(mode: str, chats: int, reads: int, seed: int) -> None:
+    """Populate a database with ``mode`` storage and time history reads."""
+    from sqlalchemy import create_engine, func, select
+    from sqlalchemy.orm import sessionmaker
+
+    from app.core.config import settings
+    from app.core.database import Base
+    from app.models.chat import Chat
+    from app.models.message import Message
+    from app.models.user import User
+    from app.repositories.message_repo import message_repo
+
+    settings.message_compression = mode
+    rng = random.Random(seed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(engine)
+        Session = sessionmaker(bind=engine)
+
+        with Session() as db:
+            user = User(email="bench@example.com", password_hash="x", nombre="Bench")
+            db.add(user)
+            db.flush()
+            for _ in range(chats):
+                chat = Chat(id_usuario=user.id_usuario)
+                db.add(chat)
+                db.flush()
+                for i in range(50):
+                    emisor = "USER" if i % 2 else "IA"
+                    text = _user_turn(rng) if emisor == "USER" else _ai_turn(rng)
+                    db.add(Message(id_chat=chat.id_chat, emisor=emisor, contenido=text))
+            db.commit()
+
+            stored = db.scalar(
+                select(
+                    func.sum(func.length(Message._contenido))
+                    + func.coalesce(func.sum(func.length(Message.contenido_comprimido)), 0)
+                )
+            )
+            chat_ids = list(db.scalars(select(Chat.id_chat)))
+
+        raw_times, full_times, read_bytes = [], [], []
+        for _ in range(reads):
+            chat_id = rng.choice(chat_ids)
+            with Session() as db:
+                start = time.perf_counter()
+                msgs = message_repo.list_for_chat(db, chat_id, limit=50)
+                raw_times.append((time.perf_counter() - start) * 1000)
+                read_bytes.append(
+                    sum(len(m._contenido.encode("utf-8")) + len(m.contenido_comprimido or b"") for m in msgs)
+                )
+            with Session() as db:
+                start = time.perf_counter()
+                msgs = message_repo.list_for_chat(db, chat_id, limit=50)
+                history = [{"role": m.emisor, "content": m.contenido} for m in reversed(msgs)]
+                full_times.append((time.perf_counter() - start) * 1000)
+                assert len(history) == 50
+
+        engine.dispose()
+
+    print(
+        f"{mode:<6} stored={stored / 1024 / 1024:7.2f} MiB  "
+        f"bytes/read={statistics.mean(read_bytes) / 1024:7.1f} KiB  "
+        f"query p50={statistics.median(raw_times):6.2f} ms  "
+        f"query+history p50={statistics.median(full_times):6.2f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chats", type=int, default=200, help="Interviews of 50 messages to create")
+    parser.add_argument("--reads", type=int, default=500, help="History reads measured per mode")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the generated content")
+    args = parser.parse_args()
+
+    os.environ.setdefault("JWT_SECRET", "benchmark-secret-benchmark-secret-0123456789")
+    os.environ.setdefault("DATABASE_URL", "sqlite://")
+    sys.path.insert(0, str(BACKEND_DIR))
+
+    for mode in ("none", "zlib"):
+        run_mode(mode, args.chats, args.reads, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+Benchmark: chat endpoint latency while PDF reports render.
+
+Starts the API in a separate process (single uvicorn worker, SQLite database) and
+measures the latency of ``GET /api/v1/chats`` while N report renders run
+concurrently, comparing in-process WeasyPrint rendering against the pre-warmed
+render pool.
+
+Usage:
+    python benchmarks/pdf_pool_latency.py --renders 4 --pool-size 2 --samples 200
+"""
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+SAMPLE_REPORT = "\n".join(
+    [
+        "## Valoración general",
+        "El candidato muestra una base técnica sólida con margen de mejora en la comunicación.",
+        "## Puntos fuertes",
+        *[f"- Punto fuerte número {i}: explica con claridad conceptos de bases de datos." for i in range(15)],
+        "## Aspectos a mejorar",
+        *[f"- Aspecto {i}: profundizar en patrones de diseño y pruebas automatizadas." for i in range(15)],
+        "## Recomendaciones prácticas",
+        *[f"- Recomendación {i}: practicar entrevistas simuladas semanalmente." for i in range(15)],
+        "## Nivel estimado profesional",
+        "Nivel de Empleabilidad: Medio",
+    ]
+)
+
+
+def serve(port: int) -> None:
+    """Run the API with an extra benchmark-only route that renders a sample report."""
+    sys.path.insert(0, str(BACKEND_DIR))
+    import uvicorn
+    from app.main import app
+    from app.services.ai.pdf_pool import get_pdf_render_pool
+    from app.services.ai.pdf_service import generate_pdf_report_spooled
+
+    @app.post("/bench/render")
+    def bench_render():
+        pdf_file, _ = generate_pdf_report_spooled(
+            report_content=SAMPLE_REPORT,
+            candidate_name="Benchmark",
+            rol_laboral="Junior",
+            nivel_academico="FP Superior",
+            ciclo_formativo="DAW - Desarrollo de Aplicaciones Web",
+            duracion="Media",
+            interview_date=datetime.now(),
+            messages=[],
+            render_pool=get_pdf_render_pool(),
+        )
+        size = pdf_file.seek(0, os.SEEK_END)
+        pdf_file.close()
+        return {"bytes": size}
+
+    uvicorn.run(app, host="127.0.0.1", port=port, workers=1, log_level="warning")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start_server(pool_size: int, db_path: str) -> tuple[subprocess.Popen, str]:
+    port = _free_port()
+    env = dict(os.environ)
+    env.setdefault("JWT_SECRET", "benchmark-secret-benchmark-secret-0123456789")
+    env["DATABASE_URL"] = f"sqlite:///{db_path}"
+    env["PDF_RENDER_POOL_SIZE"] = str(pool_size)
+    proc = subprocess.Popen(
+        [sys.executable, __file__, "--serve", "--port", str(port)],
+        cwd=BACKEND_DIR,
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"{base_url}/", timeout=1).status_code == 200:
+                return proc, base_url
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError("Server did not start")
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_scenario(label: str, pool_size: int, renders: int, samples: int) -> None:
+    """Measure chat list latency with ``renders`` concurrent report renders in flight."""
+    with tempfile.TemporaryDirectory() as tmp:
+        proc, base_url = _start_server(pool_size, os.path.join(tmp, "bench.db"))
+        try:
+            client = httpx.Client(base_url=base_url, timeout=120)
+            token = client.post(
+                "/api/v1/auth/register",
+                json={"email": "bench@example.com", "password": "Bench1234", "nombre": "Bench User"},
+            ).json()["access_token"]
+            headers = {"Authorization": f"Bearer {token}"}
+            client.post("/api/v1/chats", headers=headers)
+
+            stop = threading.Event()
+            render_count = [0]
+
+            def render_loop():
+                with httpx.Client(base_url=base_url, timeout=120) as render_client:
+                    while not stop.is_set():
+                        render_client.post("/bench/render")
+                        render_count[0] += 1
+
+            workers = [threading.Thread(target=render_loop, daemon=True) for _ in range(renders)]
+            for worker in workers:
+                worker.start()
+            time.sleep(1.0 if renders else 0)
+
+            latencies = []
+            for _ in range(samples):
+                start = time.perf_counter()
+                client.get("/api/v1/chats", headers=headers)
+                latencies.append((time.perf_counter() - start) * 1000)
+
+            stop.set()
+            for worker in workers:
+                worker.join()
+
+            print(
+                f"{label:<28} p50={statistics.median(latencies):8.1f} ms  "
+                f"p95={_percentile(latencies, 95):8.1f} ms  max={max(latencies):8.1f} ms  "
+                f"renders={render_count[0]}"
+            )
+        finally:
+            proc.terminate()
+            proc.wait(timeout=30)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--renders", type=int, default=4, help="Concurrent report renders")
+    parser.add_argument("--pool-size", type=int, default=2, help="Render pool size for the pooled scenario")
+    parser.add_argument("--samples", type=int, default=200, help="Chat list requests measured per scenario")
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, default=0, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.port)
+        return
+
+    run_scenario("no renders", 0, 0, args.samples)
+    run_scenario(f"{args.renders} renders in-process", 0, args.renders, args.samples)
+    run_scenario(f"{args.renders} renders pool={args.pool_size}", args.pool_size, args.renders, args.samples)
+
+
+if __name__ == "__main__":
+    main()
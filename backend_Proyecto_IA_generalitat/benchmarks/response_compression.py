@@ -0,0 +1,108 @@
+"""
+Benchmark: bytes on the wire for a 50-message page.
+
+Seeds a temporary SQLite database with an interview of 50 messages (short candidate
+answers, long AI turns; real Spanish text taken from the interviewer prompt),
+requests ``GET /api/v1/messages?limit=50`` from the real app and reports, for the
+identity body and each encoding/level of ``CompressionMiddleware``, the body size
+and the time spent compressing it.
+
+Usage:
+    python benchmarks/response_compression.py --repeat 200
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Real Spanish text: consecutive, non-overlapping slices of the interviewer prompt
+CORPUS = (BACKEND_DIR / "app" / "services" / "ai" / "system_prompt.txt").read_text(encoding="utf-8")
+
+
+def seed(rng: random.Random) -> tuple[str, int]:
+    """Create a user with one 50-message chat; return a token and the chat ID."""
+    from app.core.database import Base, SessionLocal, engine
+    from app.core.security import create_access_token
+    from app.models.chat import Chat
+    from app.models.message import Message
+    from app.models.user import User
+
+    Base.metadata.create_all(engine)
+    with SessionLocal() as db:
+        user = User(email="bench@example.com", password_hash="x", nombre="Bench")
+        db.add(user)
+        db.flush()
+        chat = Chat(id_usuario=user.id_usuario)
+        db.add(chat)
+        db.flush()
+        offset = 0
+        for i in range(50):
+            emisor = "USER" if i % 2 else "IA"
+            length = rng.randint(80, 300) if emisor == "USER" else rng.randint(400, 1000)
+            contenido = CORPUS[offset:offset + length] or CORPUS[:length]
+            offset = (offset + length) % len(CORPUS)
+            db.add(Message(id_chat=chat.id_chat, emisor=emisor, contenido=contenido))
+        db.commit()
+        return create_access_token(str(user.id_usuario)), chat.id_chat
+
+
+def run(repeat: int, seed_value: int) -> None:
+    """Fetch the page through the app and compress it with every encoding/level."""
+    from fastapi.testclient import TestClient
+
+    from app.core import compression
+    from app.core.compression import CompressionMiddleware
+    from app.main import app
+
+    token, chat_id = seed(random.Random(seed_value))
+    with TestClient(app) as client:
+        params = {"chat_id": chat_id, "limit": 50}
+        headers = {"Authorization": f"Bearer {token}"}
+        identity = client.get("/api/v1/messages", params=params, headers={**headers, "Accept-Encoding": "identity"})
+        wire = client.get("/api/v1/messages", params=params, headers={**headers, "Accept-Encoding": "gzip"})
+
+    body = identity.content
+    print(f"{'identity':<10} {len(body) / 1024:7.1f} KiB")
+    print(f"{'app gzip':<10} {wire.num_bytes_downloaded / 1024:7.1f} KiB  (Content-Encoding: {wire.headers.get('content-encoding')})")
+
+    variants = [("gzip", level) for level in (1, 6, 9)]
+    if compression.brotli is not None:
+        variants += [("br", quality) for quality in (4, 6, 11)]
+    else:
+        print("brotli     not installed (pip install brotli) - skipped")
+
+    for encoding, level in variants:
+        middleware = CompressionMiddleware(None, encoding=encoding, minimum_size=0, level=level)
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            compressed = middleware._compress(encoding, body)
+            times.append((time.perf_counter() - start) * 1000)
+        print(
+            f"{encoding:<4} l={level:<3} {len(compressed) / 1024:7.1f} KiB  "
+            f"ratio={len(body) / len(compressed):5.1f}x  compress p50={statistics.median(times):6.3f} ms"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=200, help="Compressions timed per encoding and level")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the generated content")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        os.environ.setdefault("JWT_SECRET", "benchmark-secret-benchmark-secret-0123456789")
+        sys.path.insert(0, str(BACKEND_DIR))
+        run(args.repeat, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -26,9 +26,17 @@ CREATE TABLE IF NOT EXISTS chats (
   created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
   last_message_at TIMESTAMP NULL DEFAULT NULL,
   completed_at TIMESTAMP NULL DEFAULT NULL,
+  deleted_at TIMESTAMP NULL DEFAULT NULL,
+  archived_at TIMESTAMP NULL DEFAULT NULL,
+  config_step VARCHAR(20) NOT NULL DEFAULT 'welcome',
+  rol_laboral VARCHAR(20) NULL DEFAULT NULL,
+  nivel_academico VARCHAR(50) NULL DEFAULT NULL,
+  ciclo_formativo VARCHAR(150) NULL DEFAULT NULL,
+  duracion VARCHAR(20) NULL DEFAULT NULL,
   PRIMARY KEY (id_chat),
   KEY idx_chats_usuario (id_usuario),
   KEY idx_chats_status (status),
+  KEY idx_chats_deleted_at (deleted_at),
   CONSTRAINT fk_chats_usuario
     FOREIGN KEY (id_usuario)
     REFERENCES users (id_usuario)
@@ -43,12 +51,118 @@ CREATE TABLE IF NOT EXISTS mensajes (
   id_chat INT UNSIGNED NOT NULL,
   emisor ENUM('USER','IA') NOT NULL,
   contenido TEXT NOT NULL,
+  formato VARCHAR(10) NOT NULL DEFAULT 'plain',
+  contenido_comprimido MEDIUMBLOB NULL,
+  terminos TEXT NULL,
   sent_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
   PRIMARY KEY (id_mensaje),
   KEY idx_mensajes_chat (id_chat),
   KEY idx_mensajes_fecha (sent_at),
+  FULLTEXT KEY ft_mensajes_contenido (contenido, terminos),
   CONSTRAINT fk_mensajes_chat
     FOREIGN KEY (id_chat)
     REFERENCES chats (id_chat)
     ON DELETE CASCADE
 ) ENGINE=InnoDB;
+
+-- =========================
+-- TABLA: chat_resumenes
+-- =========================
+CREATE TABLE IF NOT EXISTS chat_resumenes (
+  id_chat INT UNSIGNED NOT NULL,
+  contenido TEXT NOT NULL,
+  id_ultimo_mensaje INT UNSIGNED NOT NULL,
+  mensajes_resumidos INT NOT NULL DEFAULT 0,
+  updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  PRIMARY KEY (id_chat),
+  CONSTRAINT fk_resumenes_chat
+    FOREIGN KEY (id_chat)
+    REFERENCES chats (id_chat)
+    ON DELETE CASCADE
+) ENGINE=InnoDB;
+
+-- =========================
+-- TABLA: chat_archivos
+-- =========================
+CREATE TABLE IF NOT EXISTS chat_archivos (
+  id_chat INT UNSIGNED NOT NULL,
+  transcript MEDIUMBLOB NOT NULL,
+  mensajes INT NOT NULL DEFAULT 0,
+  archived_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (id_chat),
+  CONSTRAINT fk_archivos_chat
+    FOREIGN KEY (id_chat)
+    REFERENCES chats (id_chat)
+    ON DELETE CASCADE
+) ENGINE=InnoDB;
+
+-- =========================
+-- TABLA: chat_archivos_busqueda (palabras indexadas de los mensajes archivados)
+-- =========================
+CREATE TABLE IF NOT EXISTS chat_archivos_busqueda (
+  id_mensaje INT UNSIGNED NOT NULL,
+  id_chat INT UNSIGNED NOT NULL,
+  emisor VARCHAR(10) NOT NULL,
+  terminos TEXT NOT NULL,
+  sent_at TIMESTAMP NULL DEFAULT NULL,
+  PRIMARY KEY (id_mensaje),
+  KEY idx_archivos_busqueda_chat (id_chat),
+  FULLTEXT KEY ft_chat_archivos_busqueda_terminos (terminos),
+  CONSTRAINT fk_archivos_busqueda_archivo
+    FOREIGN KEY (id_chat)
+    REFERENCES chat_archivos (id_chat)
+    ON DELETE CASCADE
+) ENGINE=InnoDB;
+
+-- =========================
+-- TABLA: chat_stats (resumen incremental por entrevista)
+-- =========================
+CREATE TABLE IF NOT EXISTS chat_stats (
+  id_chat INT UNSIGNED NOT NULL,
+  user_turns INT NOT NULL DEFAULT 0,
+  ai_turns INT NOT NULL DEFAULT 0,
+  employability_level VARCHAR(20) NULL DEFAULT NULL,
+  report_at TIMESTAMP NULL DEFAULT NULL,
+  PRIMARY KEY (id_chat),
+  CONSTRAINT fk_chat_stats_chat
+    FOREIGN KEY (id_chat)
+    REFERENCES chats (id_chat)
+    ON DELETE CASCADE
+) ENGINE=InnoDB;
+
+-- =========================
+-- TABLA: user_stats (resumen incremental por usuario)
+-- =========================
+CREATE TABLE IF NOT EXISTS user_stats (
+  id_usuario INT UNSIGNED NOT NULL,
+  total_chats INT NOT NULL DEFAULT 0,
+  completed_chats INT NOT NULL DEFAULT 0,
+  completed_turns INT NOT NULL DEFAULT 0,
+  last_employability_level VARCHAR(20) NULL DEFAULT NULL,
+  last_report_at TIMESTAMP NULL DEFAULT NULL,
+  PRIMARY KEY (id_usuario),
+  CONSTRAINT fk_user_stats_usuario
+    FOREIGN KEY (id_usuario)
+    REFERENCES users (id_usuario)
+    ON DELETE CASCADE
+) ENGINE=InnoDB;
+
+-- =========================
+-- TABLA: idempotency_keys (Idempotency-Key y último turno de cada chat, compartidos entre workers)
+-- =========================
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+  id INT UNSIGNED NOT NULL AUTO_INCREMENT,
+  id_usuario INT UNSIGNED NOT NULL,
+  route VARCHAR(30) NOT NULL,
+  idem_key VARCHAR(255) NOT NULL,
+  fingerprint CHAR(64) NOT NULL,
+  id_mensaje INT UNSIGNED NULL DEFAULT NULL,
+  expires_at TIMESTAMP NOT NULL,
+  PRIMARY KEY (id),
+  UNIQUE KEY uq_idempotency_key (id_usuario, route, idem_key),
+  KEY ix_idempotency_keys_expires_at (expires_at),
+  CONSTRAINT fk_idempotency_keys_usuario
+    FOREIGN KEY (id_usuario)
+    REFERENCES users (id_usuario)
+    ON DELETE CASCADE
+) ENGINE=InnoDB;
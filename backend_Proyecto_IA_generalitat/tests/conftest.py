@@ -1,12 +1,18 @@
 """Pytest configuration and fixtures."""
+import time
+from dataclasses import dataclass, field
+
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
 from app.main import app
 from app.core.database import Base, get_db
+from app.models.chat import Chat
+from app.api.conditional import completed_pages
+from app.api.deps import get_read_db
 
 
 # Test database setup (in-memory SQLite)
@@ -17,9 +23,101 @@ engine = create_engine(
     connect_args={"check_same_thread": False},
     poolclass=StaticPool,
 )
+
+
+@event.listens_for(engine, "connect")
+def enable_foreign_keys(dbapi_conn, connection_record):
+    """Enforce foreign keys (ON DELETE CASCADE) like the MySQL database does."""
+    dbapi_conn.execute("PRAGMA foreign_keys=ON")
+
+
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+def pytest_addoption(parser):
+    parser.addoption(
+        "--explain-queries", action="store_true", help="Capture EXPLAIN QUERY PLAN of every distinct SELECT in query_log"
+    )
+
+
+@dataclass
+class ExecutedStatement:
+    """A SQL statement executed on the test engine."""
+    statement: str
+    parameters: tuple
+    duration_ms: float = 0.0
+    rows: int = 0  # rows returned (SELECT) or affected (INSERT/UPDATE/DELETE)
+
+
+@dataclass
+class RequestQueries:
+    """Statements executed while the app handled one request."""
+    method: str
+    path: str
+    statements: list[ExecutedStatement] = field(default_factory=list)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    @property
+    def rows(self) -> int:
+        return sum(s.rows for s in self.statements)
+
+    @property
+    def duration_ms(self) -> float:
+        return sum(s.duration_ms for s in self.statements)
+
+    def describe(self) -> str:
+        """Multi-line listing of the statements (for assertion messages)."""
+        return "\n".join(
+            f"  [{s.rows:>4} rows {s.duration_ms:6.2f} ms] {' '.join(s.statement.split())[:160]}"
+            for s in self.statements
+        )
+
+
+class QueryLog:
+    """
+    Record every statement executed on the test engine, grouped by test client request.
+
+    Rows of a SELECT are counted by running it wrapped in ``SELECT COUNT(*)`` on the
+    same connection right after it executes.
+    """
+
+    def __init__(self, explain: bool = False):
+        self.requests: list[RequestQueries] = []
+        self.explain = explain
+        self.plans: dict[str, list[str]] = {}  # statement -> EXPLAIN QUERY PLAN lines
+        self._current: RequestQueries | None = None
+
+    def before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info["query_log_start"] = time.perf_counter()
+
+    def after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if self._current is None:
+            return
+        executed = ExecutedStatement(
+            statement, parameters, (time.perf_counter() - conn.info.pop("query_log_start")) * 1000
+        )
+        if statement.lstrip().upper().startswith("SELECT"):
+            raw = cursor.connection
+            executed.rows = raw.execute(f"SELECT COUNT(*) FROM ({statement})", parameters).fetchone()[0]
+            if self.explain and statement not in self.plans:
+                self.plans[statement] = [row[-1] for row in raw.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)]
+        else:
+            executed.rows = max(cursor.rowcount, 0)
+        self._current.statements.append(executed)
+
+    def record(self, method: str, path: str) -> RequestQueries:
+        """Start collecting the statements of a request."""
+        self._current = RequestQueries(method, path)
+        self.requests.append(self._current)
+        return self._current
+
+    def stop(self) -> None:
+        self._current = None
+
+
 @pytest.fixture(scope="function")
 def db_session():
     """Create a fresh database session for each test."""
@@ -30,6 +128,7 @@ def db_session():
     finally:
         session.close()
         Base.metadata.drop_all(bind=engine)
+        completed_pages.clear()
 
 
 @pytest.fixture(scope="function")
@@ -42,6 +141,7 @@ def client(db_session):
             pass
     
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
     
     with TestClient(app) as test_client:
         yield test_client
@@ -63,3 +163,44 @@ def auth_headers(client):
     )
     token = response.json()["access_token"]
     return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def configured_chat(client, auth_headers, db_session):
+    """Create a chat whose configuration phase is already done, so replies go to the agent."""
+    chat_id = client.post("/api/v1/chats", headers=auth_headers).json()["id_chat"]
+    chat = db_session.get(Chat, chat_id)
+    chat.config_step = "done"
+    chat.rol_laboral, chat.nivel_academico = "Junior", "FP Superior"
+    chat.ciclo_formativo, chat.duracion = "DAW - Desarrollo de Aplicaciones Web", "Corta"
+    db_session.commit()
+    return chat_id
+
+
+@pytest.fixture
+def query_log(client, request):
+    """
+    Record the SQL statements of every request sent through ``client`` afterwards.
+
+    Yields:
+        QueryLog: ``requests`` holds one ``RequestQueries`` per request, in order.
+    """
+    log = QueryLog(explain=request.config.getoption("--explain-queries"))
+    event.listen(engine, "before_cursor_execute", log.before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", log.after_cursor_execute)
+    send = client.request
+
+    def recorded_request(method, url, *args, **kwargs):
+        log.record(method.upper(), client.base_url.join(url).path)
+        try:
+            return send(method, url, *args, **kwargs)
+        finally:
+            log.stop()
+
+    client.request = recorded_request
+    try:
+        yield log
+    finally:
+        client.request = send
+        event.remove(engine, "before_cursor_execute", log.before_cursor_execute)
+        event.remove(engine, "after_cursor_execute", log.after_cursor_execute)
@@ -0,0 +1,73 @@
+"""Unit tests for recording and replaying Bedrock Agent responses."""
+import json
+
+import pytest
+
+from app.services.ai import bedrock_service
+from app.services.ai.agent_backend import AgentRecorder, AgentReplayer, create_agent_backend
+from app.services.ai.bedrock_service import generate_reply, stream_reply
+
+
+class FakeAgent:
+    """Live agent stand-in answering each message in three chunks."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def invoke_agent(self, agentId, agentAliasId, sessionId, inputText):
+        self.calls += 1
+        chunks = [f"Turno {self.calls}. ", "¿Qué es ", "una API REST?"]
+        return {"completion": [{"chunk": {"bytes": text.encode("utf-8")}} for text in chunks]}
+
+
+def _history(text):
+    return [{"role": "user", "content": text}]
+
+
+def _record(monkeypatch, tmp_path, chat_id, messages):
+    monkeypatch.setattr(bedrock_service, "_client", AgentRecorder(FakeAgent(), str(tmp_path)))
+    return [list(stream_reply(_history(message), chat_id)) for message in messages]
+
+
+class TestAgentBackend:
+    """Test the recorder, the replayer and the backend selection."""
+
+    def test_recorder_saves_chunks_and_timing(self, monkeypatch, tmp_path):
+        replies = _record(monkeypatch, tmp_path, 7, ["empezar", "Junior"])
+        assert replies[0] == ["Turno 1. ", "¿Qué es ", "una API REST?"]
+
+        turns = [json.loads(line) for line in (tmp_path / "chat_7.jsonl").read_text(encoding="utf-8").splitlines()]
+        assert [turn["input_text"] for turn in turns] == ["empezar", "Junior"]
+        assert [chunk["text"] for chunk in turns[1]["chunks"]] == ["Turno 2. ", "¿Qué es ", "una API REST?"]
+        assert all(chunk["after_ms"] >= 0 for chunk in turns[0]["chunks"])
+        assert turns[0]["first_byte_ms"] >= 0
+
+    def test_replay_preserves_chunk_boundaries(self, monkeypatch, tmp_path):
+        recorded = _record(monkeypatch, tmp_path, 7, ["empezar", "Junior"])
+
+        monkeypatch.setattr(bedrock_service, "_client", AgentReplayer(str(tmp_path), speed=0))
+        assert list(stream_reply(_history("empezar"), 7)) == recorded[0]
+        assert generate_reply(_history("Junior"), 7) == "".join(recorded[1])
+
+    def test_new_sessions_get_recordings_in_order(self, monkeypatch, tmp_path):
+        _record(monkeypatch, tmp_path, 1, ["empezar"])
+        _record(monkeypatch, tmp_path, 2, ["empezar"])
+        replayer = AgentReplayer(str(tmp_path), speed=0)
+
+        def reply(session_id):
+            completion = replayer.invoke_agent("agent", "alias", session_id, "empezar")["completion"]
+            return b"".join(event["chunk"]["bytes"] for event in completion).decode("utf-8")
+
+        assert reply("chat_50") == reply("chat_1")
+        reply("chat_51")
+        assert replayer._sessions["chat_50"][0] == "chat_1"
+        assert replayer._sessions["chat_51"][0] == "chat_2"
+        with pytest.raises(RuntimeError):
+            reply("chat_50")
+
+    def test_backend_selection(self, tmp_path):
+        live = FakeAgent()
+        assert create_agent_backend(live, "live", str(tmp_path)) is live
+        assert isinstance(create_agent_backend(live, "record", str(tmp_path)), AgentRecorder)
+        with pytest.raises(ValueError):
+            create_agent_backend(live, "replay", str(tmp_path))
@@ -0,0 +1,76 @@
+"""Unit tests for archiving completed interviews."""
+from datetime import datetime, timedelta
+
+from app.models.chat import Chat
+from app.models.chat_archive import ChatArchive
+from app.models.message import Message
+from app.repositories.archive_repo import archive_repo
+from app.services.archive_service import archive_service
+
+
+def _completed_chat(client, auth_headers, db_session, completed_days_ago, messages=4):
+    chat_id = client.post("/api/v1/chats", headers=auth_headers).json()["id_chat"]
+    for i in range(messages):
+        db_session.add(Message(id_chat=chat_id, emisor="USER" if i % 2 else "IA", contenido=f"mensaje {i} ñ"))
+    chat = db_session.get(Chat, chat_id)
+    chat.status = "completed"
+    chat.completed_at = datetime.now() - timedelta(days=completed_days_ago)
+    db_session.commit()
+    return chat_id
+
+
+class TestArchive:
+    """Test moving old interviews to the archive and reading them back."""
+
+    def test_archives_only_old_completed_chats(self, client, auth_headers, db_session):
+        old_id = _completed_chat(client, auth_headers, db_session, completed_days_ago=40)
+        recent_id = _completed_chat(client, auth_headers, db_session, completed_days_ago=1)
+        active_id = client.post("/api/v1/chats", headers=auth_headers).json()["id_chat"]
+
+        assert archive_service.archive_completed(db_session) == 1
+
+        assert db_session.query(Message).filter(Message.id_chat == old_id).count() == 0
+        assert db_session.query(Message).filter(Message.id_chat == recent_id).count() == 4
+        assert db_session.get(ChatArchive, old_id).mensajes == 4
+        assert db_session.get(Chat, old_id).archived_at is not None
+        assert db_session.get(ChatArchive, active_id) is None
+
+        # Already archived chats are skipped on the next run
+        assert archive_service.archive_completed(db_session) == 0
+
+    def test_chat_claimed_by_another_worker_is_skipped(self, client, auth_headers, db_session, monkeypatch):
+        """A chat archived between listing and archiving is not written twice."""
+        chat_id = _completed_chat(client, auth_headers, db_session, completed_days_ago=40)
+        list_archivable = archive_repo.list_archivable
+
+        def list_then_claim(db, completed_before, limit):
+            chat_ids = list_archivable(db, completed_before, limit)
+            db.get(Chat, chat_id).archived_at = datetime.now()  # the other worker's claim
+            db.commit()
+            return chat_ids
+
+        monkeypatch.setattr(archive_repo, "list_archivable", list_then_claim)
+        assert archive_service.archive_completed(db_session) == 0
+        assert db_session.get(ChatArchive, chat_id) is None
+        assert db_session.query(Message).filter(Message.id_chat == chat_id).count() == 4
+
+    def test_archived_messages_are_read_through(self, client, auth_headers, db_session):
+        chat_id = _completed_chat(client, auth_headers, db_session, completed_days_ago=40, messages=6)
+        params = {"chat_id": chat_id}
+        before = client.get("/api/v1/messages", params=params, headers=auth_headers).json()
+
+        archive_service.archive_completed(db_session)
+
+        after = client.get("/api/v1/messages", params=params, headers=auth_headers).json()
+        newest_first = sorted(before, key=lambda m: m["id_mensaje"], reverse=True)
+        assert after == newest_first
+        limited = client.get("/api/v1/messages", params={**params, "limit": 2}, headers=auth_headers).json()
+        assert limited == newest_first[:2]
+
+    def test_deleting_archived_chat_removes_archive(self, client, auth_headers, db_session):
+        chat_id = _completed_chat(client, auth_headers, db_session, completed_days_ago=40)
+        archive_service.archive_completed(db_session)
+
+        db_session.query(Chat).filter(Chat.id_chat == chat_id).delete()
+        db_session.commit()
+        assert db_session.get(ChatArchive, chat_id) is None
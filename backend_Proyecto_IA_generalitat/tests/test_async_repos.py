@@ -0,0 +1,108 @@
+"""Unit tests for the async repositories (aiosqlite)."""
+import asyncio
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.api.deps import get_current_user_async
+from app.core.database import Base, async_database_url, get_async_db
+from app.core.security import create_access_token
+from app.models.chat_stats import ChatStats
+from app.repositories.chat_repo import async_chat_repo
+from app.repositories.message_repo import async_message_repo
+from app.repositories.user_repo import async_user_repo
+
+
+@pytest.fixture
+def async_session_factory(tmp_path):
+    """Async sessions on a temporary SQLite file with the full schema."""
+    path = tmp_path / "async.db"
+    sync_engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(sync_engine)
+    sync_engine.dispose()
+    engine = create_async_engine(async_database_url(f"sqlite:///{path}"))
+    yield async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
+    asyncio.run(engine.dispose())
+
+
+class TestAsyncDatabaseUrl:
+    """Test the sync to async driver mapping."""
+
+    def test_maps_drivers(self):
+        assert async_database_url("mysql+pymysql://u:p@db:3306/app") == "mysql+aiomysql://u:p@db:3306/app"
+        assert async_database_url("sqlite:///test.db") == "sqlite+aiosqlite:///test.db"
+        assert async_database_url("sqlite+aiosqlite:///test.db") == "sqlite+aiosqlite:///test.db"
+
+
+class TestAsyncRepos:
+    """Test the async repositories against the same models as the sync ones."""
+
+    def test_chat_and_message_roundtrip(self, async_session_factory):
+        async def scenario():
+            async with async_session_factory() as db:
+                user = await async_user_repo.create(db, "async@example.com", "hash", "Async")
+                assert (await async_user_repo.get_by_email(db, "async@example.com")).id_usuario == user.id_usuario
+
+                chat = await async_chat_repo.create(db, user.id_usuario)
+                first = await async_message_repo.create(db, chat.id_chat, "IA", "Hola")
+                second = await async_message_repo.create(db, chat.id_chat, "USER", "empezar")
+
+                messages = await async_message_repo.list_for_chat(db, chat.id_chat)
+                assert {m.id_mensaje for m in messages} == {first.id_mensaje, second.id_mensaje}
+                assert await async_message_repo.count_after(db, chat.id_chat, first.id_mensaje) == 1
+                assert [m.contenido for m in await async_message_repo.list_after(db, chat.id_chat, 0)] == ["empezar", "Hola"]
+                assert chat.last_message_at is not None
+
+                # Model events (stats) run inside async flushes too
+                stats = await db.get(ChatStats, chat.id_chat)
+                assert (stats.user_turns, stats.ai_turns) == (1, 1)
+
+                assert await async_chat_repo.get_for_user(db, chat.id_chat, user.id_usuario + 1) is None
+                assert (await async_chat_repo.update_title(db, chat.id_chat, "Async")).title == "Async"
+                assert (await async_chat_repo.mark_as_completed(db, chat.id_chat)).status == "completed"
+                assert await async_chat_repo.soft_delete_many(db, user.id_usuario, [chat.id_chat]) == 1
+                assert await async_chat_repo.list_for_user(db, user.id_usuario) == []
+
+        asyncio.run(scenario())
+
+    def test_add_with_greeting(self, async_session_factory):
+        async def scenario():
+            async with async_session_factory() as db:
+                user = await async_user_repo.create(db, "greet@example.com", "hash", "Greet")
+                chat, greeting = await async_chat_repo.add_with_greeting(db, user.id_usuario, "Hola", "Entrevista")
+                await db.commit()
+                assert greeting.id_chat == chat.id_chat
+                chats = await async_chat_repo.list_for_user_by_ids(db, user.id_usuario, [chat.id_chat])
+                assert [c.title for c in chats] == ["Entrevista"]
+
+        asyncio.run(scenario())
+
+
+class TestAsyncDependencies:
+    """Test get_async_db / get_current_user_async in an async route."""
+
+    def test_async_route_authenticates(self, async_session_factory):
+        async def create_user():
+            async with async_session_factory() as db:
+                return (await async_user_repo.create(db, "route@example.com", "hash", "Route")).id_usuario
+
+        user_id = asyncio.run(create_user())
+        app = FastAPI()
+
+        @app.get("/whoami")
+        async def whoami(user=Depends(get_current_user_async)):
+            return {"id_usuario": user.id_usuario}
+
+        async def override_get_async_db():
+            async with async_session_factory() as db:
+                yield db
+
+        app.dependency_overrides[get_async_db] = override_get_async_db
+        with TestClient(app) as client:
+            headers = {"Authorization": f"Bearer {create_access_token(str(user_id))}"}
+            assert client.get("/whoami", headers=headers).json() == {"id_usuario": user_id}
+            headers = {"Authorization": f"Bearer {create_access_token(str(user_id + 1))}"}
+            assert client.get("/whoami", headers=headers).status_code == 401
@@ -0,0 +1,116 @@
+"""Unit tests for the direct model invocation path."""
+import logging
+
+import pytest
+
+from app.core.config import settings
+from app.services.ai import bedrock_service
+from app.services.ai.bedrock_service import converse_reply, window_history
+
+
+def _history(n):
+    return [
+        {"role": "user" if i % 2 == 0 else "assistant", "content": f"mensaje {i} " + "x" * 36}
+        for i in range(n)
+    ]
+
+
+class TestWindowHistory:
+    """Test history windowing and token budgeting."""
+
+    def test_keeps_everything_within_budget(self):
+        window = window_history(_history(4), token_budget=1000, max_messages=10)
+        assert [m["role"] for m in window] == ["user", "assistant", "user", "assistant"]
+        assert window[0]["content"] == [{"text": _history(4)[0]["content"]}]
+
+    def test_budget_keeps_most_recent_turns(self):
+        # Each message is ~12 estimated tokens
+        window = window_history(_history(10), token_budget=40, max_messages=10)
+        assert window[-1]["content"][0]["text"].startswith("mensaje 9")
+        assert window[0]["role"] == "user"
+        assert len(window) <= 3
+
+    def test_max_messages_limit(self):
+        window = window_history(_history(11), token_budget=10_000, max_messages=5)
+        assert len(window) == 5
+        assert window[0]["content"][0]["text"].startswith("mensaje 6")
+
+    def test_latest_message_always_kept(self):
+        history = [{"role": "user", "content": "y" * 4000}]
+        assert len(window_history(history, token_budget=10, max_messages=10)) == 1
+
+    def test_consecutive_roles_are_merged(self):
+        history = [
+            {"role": "assistant", "content": "saludo"},
+            {"role": "user", "content": "hola"},
+            {"role": "user", "content": "informe"},
+        ]
+        window = window_history(history, token_budget=1000, max_messages=10)
+        assert window == [{"role": "user", "content": [{"text": "hola\n\ninforme"}]}]
+
+
+class FakeRuntime:
+    """Record the Converse arguments and return a fixed usage."""
+
+    def __init__(self, usage):
+        self.usage = usage
+        self.calls = []
+
+    def converse(self, **kwargs):
+        self.calls.append(kwargs)
+        return {
+            "output": {"message": {"role": "assistant", "content": [{"text": "Respuesta"}]}},
+            "usage": self.usage,
+            "metrics": {"latencyMs": 450},
+        }
+
+
+class TestConverseReply:
+    """Test the Converse call and token accounting."""
+
+    def test_no_cache_point_by_default(self, monkeypatch):
+        runtime = FakeRuntime({"inputTokens": 120, "outputTokens": 30})
+        monkeypatch.setattr(bedrock_service, "_runtime_client", runtime)
+        converse_reply(_history(3), chat_id=1)
+        assert not any("cachePoint" in block for block in runtime.calls[0]["system"])
+
+    @pytest.mark.parametrize("usage, expected_warning", [
+        ({"inputTokens": 120, "outputTokens": 30}, True),
+        ({"inputTokens": 120, "outputTokens": 30, "cacheWriteInputTokens": 1500}, False),
+    ])
+    def test_prompt_cache_activity_is_checked_once(self, monkeypatch, caplog, usage, expected_warning):
+        runtime = FakeRuntime(usage)
+        monkeypatch.setattr(bedrock_service, "_runtime_client", runtime)
+        monkeypatch.setattr(bedrock_service, "_prompt_cache_checked", False)
+        monkeypatch.setattr(settings, "bedrock_prompt_cache", True)
+
+        with caplog.at_level(logging.WARNING, logger=bedrock_service.logger.name):
+            converse_reply(_history(3), chat_id=1)
+            converse_reply(_history(3), chat_id=1)
+
+        assert runtime.calls[0]["system"][1] == {"cachePoint": {"type": "default"}}
+        warnings = [r for r in caplog.records if "BEDROCK_PROMPT_CACHE" in r.getMessage()]
+        assert len(warnings) == (1 if expected_warning else 0)
+
+    def test_usage_is_reported(self, monkeypatch):
+        captured = {}
+
+        class FakeRuntime:
+            def converse(self, **kwargs):
+                captured.update(kwargs)
+                return {
+                    "output": {"message": {"role": "assistant", "content": [{"text": "Respuesta"}]}},
+                    "usage": {"inputTokens": 120, "outputTokens": 30, "cacheReadInputTokens": 900},
+                    "metrics": {"latencyMs": 450},
+                }
+
+        monkeypatch.setattr(bedrock_service, "_runtime_client", FakeRuntime())
+        reply = converse_reply(_history(3), chat_id=1)
+
+        assert reply.text == "Respuesta"
+        assert reply.usage.input_tokens == 120
+        assert reply.usage.cache_read_tokens == 900
+        assert reply.usage.latency_ms == 450
+        assert reply.usage.history_messages == 3
+        assert captured["system"][0]["text"] == bedrock_service.SYSTEM_PROMPT
+        assert captured["messages"][-1]["role"] == "user"
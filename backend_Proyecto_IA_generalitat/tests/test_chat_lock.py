@@ -0,0 +1,84 @@
+"""Unit tests for per-chat single-flight locks."""
+import threading
+import time
+from contextlib import contextmanager
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.v1 import ai as ai_module
+from app.core import periodic
+from app.core.chat_lock import ChatLocks, chat_locks
+from app.core.periodic import PeriodicTask
+
+
+class TestChatLocks:
+    """Test serialization of turns of the same chat."""
+
+    def test_overlapping_turn_is_rejected(self):
+        locks = ChatLocks("local", timeout=0)
+        with locks.hold(1):
+            with pytest.raises(HTTPException) as exc:
+                with locks.hold(1):
+                    pass
+            assert exc.value.status_code == 409
+            with locks.hold(2):  # other chats are independent
+                pass
+        assert locks._locks == {}
+
+    def test_overlapping_turn_waits_with_timeout(self):
+        locks = ChatLocks("local", timeout=2)
+        order = []
+        held = threading.Event()
+
+        def first_turn():
+            with locks.hold(1):
+                held.set()
+                time.sleep(0.1)
+                order.append("first")
+
+        worker = threading.Thread(target=first_turn)
+        worker.start()
+        held.wait()
+        with locks.hold(1):
+            order.append("second")
+        worker.join()
+
+        assert order == ["first", "second"]
+        assert locks._locks == {}
+
+    def test_reply_while_chat_busy_returns_409(self, client, auth_headers, monkeypatch):
+        calls = []
+        monkeypatch.setattr(ai_module, "bedrock_chat", lambda history, chat_id: calls.append(chat_id) or "Pregunta")
+        chat_id = client.post("/api/v1/chats", headers=auth_headers).json()["id_chat"]
+
+        with chat_locks.hold(chat_id):
+            response = client.post(
+                "/api/v1/ai/reply", json={"chat_id": chat_id, "contenido": "Hola"}, headers=auth_headers
+            )
+
+        assert response.status_code == 409
+        assert calls == []
+        messages = client.get("/api/v1/messages", params={"chat_id": chat_id}, headers=auth_headers).json()
+        assert messages == []
+
+
+class TestPeriodicTaskLock:
+    """Maintenance tasks run in one worker at a time."""
+
+    @pytest.mark.parametrize("held_elsewhere", [False, True])
+    def test_run_is_skipped_while_another_worker_holds_the_lock(self, monkeypatch, held_elsewhere):
+        requested = []
+
+        @contextmanager
+        def fake_database_lock(name, timeout):
+            requested.append((name, timeout))
+            yield not held_elsewhere
+
+        monkeypatch.setattr(periodic, "database_lock", fake_database_lock)
+        runs = []
+        task = PeriodicTask("chat-purge", runs.append, lambda: 60)
+
+        assert task.run_once() is not held_elsewhere
+        assert requested == [("aula_task_chat-purge", 0)]
+        assert len(runs) == (0 if held_elsewhere else 1)
@@ -1,6 +1,12 @@
 """Unit tests for chat endpoints."""
+from datetime import datetime, timedelta
+
 import pytest
 
+from app.models.chat import Chat
+from app.models.message import Message
+from app.services.chat_purge_service import chat_purge_service
+
 
 class TestChats:
     """Test chat CRUD operations."""
@@ -13,6 +19,28 @@ class TestChats:
         assert "id_chat" in data
         assert isinstance(data["id_chat"], int)
     
+    def test_start_chat(self, client, auth_headers):
+        """Test creating a chat with its greeting in a single request."""
+        response = client.post("/api/v1/chats/start", json={"title": "Ana - Entrevista"}, headers=auth_headers)
+        assert response.status_code == 200
+        data = response.json()
+        chat_id = data["chat"]["id_chat"]
+        assert data["chat"]["title"] == "Ana - Entrevista"
+        assert data["chat"]["status"] == "active"
+        assert data["greeting"]["id_chat"] == chat_id
+        assert data["greeting"]["emisor"] == "IA"
+        assert "Evalio" in data["greeting"]["contenido"]
+        
+        # The greeting is persisted as the first message of the chat
+        messages = client.get("/api/v1/messages", params={"chat_id": chat_id}, headers=auth_headers).json()
+        assert [m["id_mensaje"] for m in messages] == [data["greeting"]["id_mensaje"]]
+    
+    def test_start_chat_default_title(self, client, auth_headers):
+        """Test starting a chat without a body uses the default title."""
+        response = client.post("/api/v1/chats/start", headers=auth_headers)
+        assert response.status_code == 200
+        assert response.json()["chat"]["title"] == "Nuevo Chat"
+    
     def test_list_chats(self, client, auth_headers):
         """Test listing user's chats."""
         # Create some chats
@@ -69,6 +97,35 @@ class TestChats:
         get_response = client.get(f"/api/v1/chats/{chat_id}", headers=auth_headers)
         assert get_response.status_code == 404
     
+    def test_bulk_delete_chats(self, client, auth_headers):
+        """Test deleting several chats with one request."""
+        chat_ids = [client.post("/api/v1/chats", headers=auth_headers).json()["id_chat"] for _ in range(3)]
+        
+        response = client.post(
+            "/api/v1/chats/bulk-delete", json={"chat_ids": chat_ids[:2] + [9999]}, headers=auth_headers
+        )
+        assert response.status_code == 200
+        assert response.json() == {"deleted": 2}
+        
+        remaining = [c["id_chat"] for c in client.get("/api/v1/chats", headers=auth_headers).json()]
+        assert remaining == [chat_ids[2]]
+    
+    def test_purge_removes_deleted_chats_and_messages(self, client, auth_headers, db_session):
+        """Test that the purge deletes expired chats and cascades to their messages."""
+        kept_id = client.post("/api/v1/chats/start", headers=auth_headers).json()["chat"]["id_chat"]
+        deleted_id = client.post("/api/v1/chats/start", headers=auth_headers).json()["chat"]["id_chat"]
+        client.delete(f"/api/v1/chats/{deleted_id}", headers=auth_headers)
+        
+        # Still inside the retention period
+        assert chat_purge_service.purge(db_session) == 0
+        assert db_session.get(Chat, deleted_id) is not None
+        
+        assert chat_purge_service.purge(db_session, now=datetime.now() + timedelta(days=8)) == 1
+        db_session.expire_all()
+        assert db_session.get(Chat, deleted_id) is None
+        assert db_session.query(Message).filter(Message.id_chat == deleted_id).count() == 0
+        assert db_session.query(Message).filter(Message.id_chat == kept_id).count() == 1
+    
     def test_cannot_access_other_user_chat(self, client):
         """Test that users cannot access other users' chats."""
         # Create first user and chat
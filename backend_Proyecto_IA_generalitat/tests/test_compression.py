@@ -0,0 +1,73 @@
+"""Unit tests for the response compression middleware."""
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core import compression
+from app.core.compression import CompressionMiddleware, accepted_encodings
+from app.repositories.message_repo import message_repo
+
+TEXT = "La normalización de bases de datos evita redundancias y anomalías. " * 40
+
+
+def _app(**options) -> TestClient:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, **options)
+
+    @app.get("/json")
+    def big_json():
+        return JSONResponse({"contenido": TEXT})
+
+    @app.get("/small")
+    def small_json():
+        return JSONResponse({"ok": True})
+
+    @app.get("/pdf")
+    def pdf():
+        return Response(TEXT.encode(), media_type="application/pdf")
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(iter([TEXT.encode(), TEXT.encode()]), media_type="text/event-stream")
+
+    return TestClient(app)
+
+
+class TestCompression:
+    """Test which responses are compressed and how."""
+
+    def test_compresses_large_json(self):
+        response = _app(minimum_size=500).get("/json", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.num_bytes_downloaded < len(TEXT) / 5
+        assert response.json() == {"contenido": TEXT}
+
+    def test_skips_small_excluded_and_streamed_responses(self):
+        client = _app(minimum_size=500)
+        for path in ("/small", "/pdf", "/stream"):
+            response = client.get(path, headers={"Accept-Encoding": "gzip"})
+            assert "content-encoding" not in response.headers, path
+        assert client.get("/stream").text == TEXT * 2
+
+    def test_respects_accept_encoding(self):
+        client = _app(minimum_size=500)
+        assert "content-encoding" not in client.get("/json", headers={"Accept-Encoding": "identity"}).headers
+        assert "content-encoding" not in client.get("/json", headers={"Accept-Encoding": "gzip;q=0"}).headers
+        assert accepted_encodings("br;q=1.0, gzip; q=0.5, deflate;q=0") == {"br", "gzip"}
+
+    def test_brotli_falls_back_to_gzip_when_missing(self, monkeypatch):
+        monkeypatch.setattr(compression, "brotli", None)
+        response = _app(encoding="br", minimum_size=500).get("/json", headers={"Accept-Encoding": "br, gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+
+    def test_message_list_is_compressed(self, client, auth_headers, db_session):
+        chat_id = client.post("/api/v1/chats", headers=auth_headers).json()["id_chat"]
+        for i in range(10):
+            message_repo.create(db_session, chat_id, "IA" if i % 2 == 0 else "USER", TEXT[:400])
+
+        response = client.get(
+            "/api/v1/messages", params={"chat_id": chat_id}, headers={**auth_headers, "Accept-Encoding": "gzip"}
+        )
+        assert response.headers["content-encoding"] == "gzip"
+        assert len(response.json()) == 10
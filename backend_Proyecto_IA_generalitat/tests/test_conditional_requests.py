@@ -0,0 +1,85 @@
+"""Unit tests for ETag/Last-Modified handling of chat and message reads."""
+from datetime import datetime
+
+from app.models.chat import Chat
+from app.repositories.message_repo import message_repo
+
+
+def _complete(db_session, chat_id):
+    chat = db_session.get(Chat, chat_id)
+    chat.status = "completed"
+    chat.completed_at = datetime.now()
+    db_session.commit()
+
+
+class TestConditionalRequests:
+    """Test validators, 304 responses and caching of completed interviews."""
+
+    def test_chat_detail_not_modified_until_it_changes(self, client, auth_headers):
+        chat_id = client.post("/api/v1/chats", headers=auth_headers).json()["id_chat"]
+        first = client.get(f"/api/v1/chats/{chat_id}", headers=auth_headers)
+        etag = first.headers["etag"]
+        assert first.headers["cache-control"] == "private, no-cache"
+        assert "last-modified" in first.headers
+
+        cached = client.get(f"/api/v1/chats/{chat_id}", headers={**auth_headers, "If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.content == b""
+        assert cached.headers["etag"] == etag
+
+        client.put(f"/api/v1/chats/{chat_id}/title", json={"title": "Entrevista DAW"}, headers=auth_headers)
+        changed = client.get(f"/api/v1/chats/{chat_id}", headers={**auth_headers, "If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.json()["title"] == "Entrevista DAW"
+
+    def test_message_page_changes_with_every_message(self, client, auth_headers, db_session):
+        chat_id = client.post("/api/v1/chats", headers=auth_headers).json()["id_chat"]
+        message_repo.create(db_session, chat_id, "IA", "Hola")
+        params = {"chat_id": chat_id}
+        etag = client.get("/api/v1/messages", params=params, headers=auth_headers).headers["etag"]
+
+        weak = {**auth_headers, "If-None-Match": f"W/{etag}"}
+        assert client.get("/api/v1/messages", params=params, headers=weak).status_code == 304
+
+        message_repo.create(db_session, chat_id, "USER", "empezar")  # same second as the previous message
+        response = client.get("/api/v1/messages", params=params, headers=weak)
+        assert response.status_code == 200
+        assert len(response.json()) == 2
+        assert response.headers["cache-control"] == "private, no-cache"
+
+    def test_if_modified_since(self, client, auth_headers):
+        chat_id = client.post("/api/v1/chats", headers=auth_headers).json()["id_chat"]
+        last_modified = client.get(f"/api/v1/chats/{chat_id}", headers=auth_headers).headers["last-modified"]
+        since = {**auth_headers, "If-Modified-Since": last_modified}
+        assert client.get(f"/api/v1/chats/{chat_id}", headers=since).status_code == 304
+        old = {**auth_headers, "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"}
+        assert client.get(f"/api/v1/chats/{chat_id}", headers=old).status_code == 200
+
+    def test_completed_pages_are_cacheable_and_served_from_memory(self, client, auth_headers, db_session, monkeypatch):
+        chat_id = client.post("/api/v1/chats", headers=auth_headers).json()["id_chat"]
+        message_repo.create(db_session, chat_id, "IA", "¿Qué es una API REST?")
+        _complete(db_session, chat_id)
+        params = {"chat_id": chat_id}
+
+        first = client.get("/api/v1/messages", params=params, headers=auth_headers)
+        assert first.headers["cache-control"] == "private, max-age=86400"
+
+        def unexpected_query(*args, **kwargs):
+            raise AssertionError("completed page should be served from memory")
+
+        monkeypatch.setattr(message_repo, "list_rows_for_chat", unexpected_query)
+        second = client.get("/api/v1/messages", params=params, headers=auth_headers)
+        assert second.json() == first.json()
+        assert second.headers["etag"] == first.headers["etag"]
+
+    def test_other_users_get_404_not_304(self, client, auth_headers):
+        chat_id = client.post("/api/v1/chats", headers=auth_headers).json()["id_chat"]
+        etag = client.get(f"/api/v1/chats/{chat_id}", headers=auth_headers).headers["etag"]
+        other = client.post(
+            "/api/v1/auth/register",
+            json={"email": "otro@example.com", "password": "Test1234", "nombre": "Otro"},
+        ).json()["access_token"]
+        response = client.get(
+            f"/api/v1/chats/{chat_id}", headers={"Authorization": f"Bearer {other}", "If-None-Match": etag}
+        )
+        assert response.status_code == 404
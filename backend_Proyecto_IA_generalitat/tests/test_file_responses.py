@@ -0,0 +1,72 @@
+"""Unit tests for chunked file streaming with Range support."""
+import io
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.api.file_responses import file_streaming_response, parse_range_header
+
+
+PAYLOAD = bytes(range(256)) * 4  # 1024 bytes
+
+
+@pytest.fixture
+def file_client():
+    """Minimal app serving an in-memory file through the streaming helper."""
+    test_app = FastAPI()
+
+    @test_app.get("/file")
+    def serve(request: Request):
+        return file_streaming_response(request, io.BytesIO(PAYLOAD), "test.pdf")
+
+    return TestClient(test_app)
+
+
+class TestParseRangeHeader:
+    """Test Range header parsing."""
+
+    def test_no_header(self):
+        assert parse_range_header(None, 100) is None
+
+    def test_explicit_range(self):
+        assert parse_range_header("bytes=10-19", 100) == (10, 19)
+
+    def test_open_ended_range(self):
+        assert parse_range_header("bytes=90-", 100) == (90, 99)
+
+    def test_suffix_range(self):
+        assert parse_range_header("bytes=-10", 100) == (90, 99)
+
+    def test_multi_range_ignored(self):
+        assert parse_range_header("bytes=0-1,5-6", 100) is None
+
+    def test_unsatisfiable_range(self):
+        with pytest.raises(ValueError):
+            parse_range_header("bytes=200-300", 100)
+
+    def test_empty_file(self):
+        with pytest.raises(ValueError):
+            parse_range_header("bytes=-10", 0)
+
+
+class TestFileStreamingResponse:
+    """Test the streamed response headers and bodies."""
+
+    def test_full_file(self, file_client):
+        response = file_client.get("/file")
+        assert response.status_code == 200
+        assert response.headers["content-length"] == str(len(PAYLOAD))
+        assert response.headers["accept-ranges"] == "bytes"
+        assert response.content == PAYLOAD
+
+    def test_partial_content(self, file_client):
+        response = file_client.get("/file", headers={"Range": "bytes=100-199"})
+        assert response.status_code == 206
+        assert response.headers["content-range"] == f"bytes 100-199/{len(PAYLOAD)}"
+        assert response.content == PAYLOAD[100:200]
+
+    def test_range_not_satisfiable(self, file_client):
+        response = file_client.get("/file", headers={"Range": "bytes=5000-"})
+        assert response.status_code == 416
+        assert response.headers["content-range"] == f"bytes */{len(PAYLOAD)}"
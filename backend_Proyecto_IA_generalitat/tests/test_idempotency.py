@@ -0,0 +1,143 @@
+"""Unit tests for Idempotency-Key handling on the AI routes."""
+import warnings
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.api.v1 import ai as ai_module
+from app.core.idempotency import idempotency_store, recent_turns
+from app.models.chat import Chat
+from app.models.idempotency_key import IdempotencyKey
+from app.models.message import Message
+
+
+@pytest.fixture
+def fake_bedrock(monkeypatch):
+    """Replace the Bedrock calls and count how often they are made."""
+    calls = []
+
+    def fake_chat(history, chat_id):
+        calls.append(chat_id)
+        return f"Siguiente pregunta {len(calls)}"
+
+    monkeypatch.setattr(ai_module, "bedrock_chat", fake_chat)
+    monkeypatch.setattr(ai_module, "generate_initial_greeting", lambda: "Hola, soy Evalio")
+    return calls
+
+
+def _count_messages(db_session, chat_id):
+    return db_session.query(Message).filter(Message.id_chat == chat_id).count()
+
+
+class TestIdempotency:
+    """Test that retried AI requests do not repeat work."""
+
+    def test_reply_retry_returns_same_message(self, client, auth_headers, db_session, fake_bedrock, configured_chat):
+        chat_id = configured_chat
+        headers = {**auth_headers, "Idempotency-Key": "turn-1"}
+        body = {"chat_id": chat_id, "contenido": "Mi respuesta"}
+
+        first = client.post("/api/v1/ai/reply", json=body, headers=headers)
+        retry = client.post("/api/v1/ai/reply", json=body, headers=headers)
+
+        assert first.status_code == 200
+        assert retry.status_code == 200
+        assert retry.json()["id_mensaje"] == first.json()["id_mensaje"]
+        assert retry.headers["Idempotent-Replayed"] == "true"
+        assert fake_bedrock == [chat_id]
+        assert _count_messages(db_session, chat_id) == 2
+
+    def test_reply_without_key_is_not_deduplicated(
+        self, client, auth_headers, db_session, monkeypatch, fake_bedrock, configured_chat
+    ):
+        monkeypatch.setattr(recent_turns, "window_seconds", 0)  # Outside the duplicate-turn window
+        chat_id = configured_chat
+        body = {"chat_id": chat_id, "contenido": "Mi respuesta"}
+
+        client.post("/api/v1/ai/reply", json=body, headers=auth_headers)
+        client.post("/api/v1/ai/reply", json=body, headers=auth_headers)
+
+        assert len(fake_bedrock) == 2
+        assert _count_messages(db_session, chat_id) == 4
+
+    def test_key_reused_with_different_body(self, client, auth_headers, fake_bedrock, configured_chat):
+        chat_id = configured_chat
+        headers = {**auth_headers, "Idempotency-Key": "turn-1"}
+
+        client.post("/api/v1/ai/reply", json={"chat_id": chat_id, "contenido": "Primera"}, headers=headers)
+        response = client.post("/api/v1/ai/reply", json={"chat_id": chat_id, "contenido": "Otra"}, headers=headers)
+
+        assert response.status_code == 422
+        assert len(fake_bedrock) == 1
+
+    def test_failed_request_releases_key(self, client, auth_headers, fake_bedrock, monkeypatch, configured_chat):
+        chat_id = configured_chat
+        headers = {**auth_headers, "Idempotency-Key": "turn-1"}
+        body = {"chat_id": chat_id, "contenido": "Mi respuesta"}
+
+        def failing_chat(history, chat_id):
+            raise RuntimeError("Bedrock unavailable")
+
+        monkeypatch.setattr(ai_module, "bedrock_chat", failing_chat)
+        assert client.post("/api/v1/ai/reply", json=body, headers=headers).status_code == 500
+
+        monkeypatch.setattr(ai_module, "bedrock_chat", lambda history, chat_id: "Siguiente pregunta")
+        response = client.post("/api/v1/ai/reply", json=body, headers=headers)
+        assert response.status_code == 200
+        assert "Idempotent-Replayed" not in response.headers
+
+    def test_initialize_retry_returns_same_greeting(self, client, auth_headers, db_session, fake_bedrock, configured_chat):
+        chat_id = configured_chat
+        headers = {**auth_headers, "Idempotency-Key": "init-1"}
+
+        first = client.post("/api/v1/ai/initialize", json={"chat_id": chat_id}, headers=headers)
+        retry = client.post("/api/v1/ai/initialize", json={"chat_id": chat_id}, headers=headers)
+
+        assert retry.json()["id_mensaje"] == first.json()["id_mensaje"]
+        assert _count_messages(db_session, chat_id) == 1
+
+    def test_keys_are_stored_with_the_turn(self, client, auth_headers, db_session, fake_bedrock, configured_chat):
+        """Keys live in the database, so a retry served by another worker is also replayed."""
+        headers = {**auth_headers, "Idempotency-Key": "turn-1"}
+        first = client.post("/api/v1/ai/reply", json={"chat_id": configured_chat, "contenido": "Mi respuesta"}, headers=headers)
+
+        routes = {row.route: row for row in db_session.query(IdempotencyKey).all()}
+        assert set(routes) == {"ai_reply", "recent_turn"}
+        assert routes["ai_reply"].id_mensaje == first.json()["id_mensaje"]
+
+    def test_recording_a_loaded_key_updates_its_row(self, db_session, configured_chat, monkeypatch):
+        monkeypatch.setattr(recent_turns, "window_seconds", 60)
+        user_id = db_session.get(Chat, configured_chat).id_usuario
+        recent_turns.remember(db_session, user_id, configured_chat, "Primera")
+        recent_turns.remember(db_session, user_id, configured_chat + 1, "Otro chat")
+        db_session.commit()
+        row_id = db_session.query(IdempotencyKey).filter_by(idem_key=str(configured_chat)).one().id
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            # is_duplicate loads the row into the session before it is recorded again
+            assert recent_turns.is_duplicate(db_session, user_id, configured_chat, "Primera")
+            recent_turns.remember(db_session, user_id, configured_chat, "Segunda")
+            db_session.commit()
+
+        assert db_session.query(IdempotencyKey).filter_by(idem_key=str(configured_chat)).one().id == row_id
+        assert recent_turns.is_duplicate(db_session, user_id, configured_chat, "Segunda")
+        assert not recent_turns.is_duplicate(db_session, user_id, configured_chat, "Primera")
+
+    def test_expired_keys_are_ignored_and_purged(self, client, auth_headers, db_session, fake_bedrock, configured_chat):
+        headers = {**auth_headers, "Idempotency-Key": "turn-1"}
+        body = {"chat_id": configured_chat, "contenido": "Mi respuesta"}
+        client.post("/api/v1/ai/reply", json=body, headers=headers)
+
+        for row in db_session.query(IdempotencyKey).all():
+            row.expires_at = datetime.now() - timedelta(seconds=1)
+        db_session.commit()
+
+        response = client.post("/api/v1/ai/reply", json=body, headers=headers)
+        assert response.status_code == 200
+        assert "Idempotent-Replayed" not in response.headers
+        assert len(fake_bedrock) == 2
+
+        later = datetime.now() + timedelta(seconds=idempotency_store.ttl_seconds + 1)
+        assert idempotency_store.purge_expired(db_session, later) == 2
+        assert db_session.query(IdempotencyKey).count() == 0
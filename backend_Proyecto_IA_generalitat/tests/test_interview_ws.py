@@ -0,0 +1,177 @@
+"""Unit tests for the interview WebSocket."""
+from contextlib import contextmanager
+
+import pytest
+from limits import parse
+from starlette.websockets import WebSocketDisconnect
+
+from app.api.v1 import ai as ai_module
+from app.models.chat import Chat
+
+
+def _fake_stream(*chunks):
+    def stream(history, chat_id, on_chunk):
+        for chunk in chunks:
+            on_chunk(chunk)
+        return "".join(chunks).strip()
+    return stream
+
+
+@contextmanager
+def _connect(client, auth_headers, chat_id):
+    """Open the socket and authenticate with the first frame."""
+    with client.websocket_connect(f"/api/v1/ai/ws/{chat_id}") as ws:
+        ws.send_json({"type": "auth", "token": auth_headers["Authorization"].split()[1]})
+        yield ws
+
+
+def _receive_turn(ws):
+    """Collect the events of one turn up to its final message or error."""
+    events = []
+    while not events or events[-1]["type"] not in ("message", "error"):
+        events.append(ws.receive_json())
+    return events
+
+
+class TestInterviewSocket:
+    """Test the WebSocket interview channel."""
+
+    def test_streams_chunks_and_stores_turn(self, client, auth_headers, monkeypatch, configured_chat):
+        monkeypatch.setattr(ai_module, "bedrock_stream_chat", _fake_stream("¿Qué es ", "una API REST?"))
+        chat_id = configured_chat
+
+        with _connect(client, auth_headers, chat_id) as ws:
+            assert ws.receive_json() == {"type": "ready", "chat_id": chat_id}
+            ws.send_json({"type": "message", "contenido": "empezar"})
+            events = _receive_turn(ws)
+
+        assert [e["contenido"] for e in events if e["type"] == "chunk"] == ["¿Qué es ", "una API REST?"]
+        final = events[-1]
+        assert final["message"]["emisor"] == "IA"
+        assert final["message"]["contenido"] == "¿Qué es una API REST?"
+        assert final["user_message"]["contenido"] == "empezar"
+        assert final["completed"] is False
+
+        messages = client.get("/api/v1/messages", params={"chat_id": chat_id}, headers=auth_headers).json()
+        assert [m["emisor"] for m in messages] == ["IA", "USER"]  # newest first
+
+    def test_pushes_completion_and_rejects_later_turns(self, client, auth_headers, db_session, monkeypatch, configured_chat):
+        monkeypatch.setattr(ai_module, "bedrock_stream_chat", _fake_stream("Hemos terminado, gracias por tu tiempo."))
+        chat_id = configured_chat
+
+        with _connect(client, auth_headers, chat_id) as ws:
+            ws.receive_json()
+            ws.send_json({"type": "message", "contenido": "Mi última respuesta"})
+            assert _receive_turn(ws)[-1]["completed"] is True
+            assert ws.receive_json() == {"type": "completed", "chat_id": chat_id}
+
+            ws.send_json({"type": "message", "contenido": "¿Sigues ahí?"})
+            error = _receive_turn(ws)[-1]
+            assert error["type"] == "error" and error["status"] == 400
+
+        assert db_session.get(Chat, chat_id).status == "completed"
+
+    @pytest.mark.parametrize("frame", [
+        {"type": "auth", "token": "invalid"},
+        {"type": "message", "contenido": "Hola"},
+    ])
+    def test_invalid_auth_frame_closes_connection(self, client, configured_chat, frame):
+        with client.websocket_connect(f"/api/v1/ai/ws/{configured_chat}") as ws:
+            ws.send_json(frame)
+            with pytest.raises(WebSocketDisconnect) as exc:
+                ws.receive_json()
+        assert exc.value.code == 1008
+
+    def test_token_in_query_is_not_accepted(self, client, auth_headers, configured_chat):
+        token = auth_headers["Authorization"].split()[1]
+        with client.websocket_connect(f"/api/v1/ai/ws/{configured_chat}?token={token}") as ws:
+            ws.send_json({"type": "message", "contenido": "Hola"})
+            with pytest.raises(WebSocketDisconnect) as exc:
+                ws.receive_json()
+        assert exc.value.code == 1008
+
+    def test_idempotency_key_replays_turn_across_channels(self, client, auth_headers, monkeypatch, configured_chat):
+        calls = []
+
+        def stream(history, chat_id, on_chunk):
+            calls.append(chat_id)
+            on_chunk("Cuéntame más.")
+            return "Cuéntame más."
+
+        monkeypatch.setattr(ai_module, "bedrock_stream_chat", stream)
+        monkeypatch.setattr(ai_module.limiter, "enabled", False)
+        chat_id = configured_chat
+        turn = {"type": "message", "contenido": "Trabajo con Django", "idempotency_key": "turn-1"}
+
+        with _connect(client, auth_headers, chat_id) as ws:
+            ws.receive_json()
+            ws.send_json(turn)
+            first = _receive_turn(ws)[-1]
+            ws.send_json(turn)
+            replay = _receive_turn(ws)[-1]
+            ws.send_json({**turn, "contenido": "Otra cosa"})
+            mismatch = _receive_turn(ws)[-1]
+
+        assert replay["replayed"] is True and replay["message"] == first["message"]
+        assert mismatch["type"] == "error" and mismatch["status"] == 422
+        assert len(calls) == 1
+
+        retried = client.post(
+            "/api/v1/ai/reply",
+            json={"chat_id": chat_id, "contenido": "Trabajo con Django"},
+            headers={**auth_headers, "Idempotency-Key": "turn-1"},
+        )
+        assert retried.json()["id_mensaje"] == first["message"]["id_mensaje"]
+        assert len(calls) == 1
+
+    def test_socket_and_reply_share_the_rate_budget(self, client, auth_headers, monkeypatch, configured_chat):
+        monkeypatch.setattr(ai_module, "bedrock_stream_chat", _fake_stream("Siguiente pregunta"))
+        monkeypatch.setattr(ai_module, "bedrock_chat", lambda history, chat_id: "Siguiente pregunta")
+        ai_module.limiter.reset()
+        rate = parse(ai_module.REPLY_RATE)
+        for _ in range(rate.amount - 2):
+            ai_module.limiter.limiter.hit(rate, "testclient", ai_module.REPLY_RATE_SCOPE)
+
+        try:
+            with _connect(client, auth_headers, configured_chat) as ws:
+                ws.receive_json()
+                ws.send_json({"type": "message", "contenido": "Primera respuesta"})
+                assert _receive_turn(ws)[-1]["type"] == "message"
+                assert client.post(
+                    "/api/v1/ai/reply", json={"chat_id": configured_chat, "contenido": "Segunda"}, headers=auth_headers
+                ).status_code == 200
+                assert client.post(
+                    "/api/v1/ai/reply", json={"chat_id": configured_chat, "contenido": "Tercera"}, headers=auth_headers
+                ).status_code == 429
+                ws.send_json({"type": "message", "contenido": "Cuarta respuesta"})
+                assert _receive_turn(ws)[-1]["status"] == 429
+        finally:
+            ai_module.limiter.reset()
+
+    def test_invalid_payload_keeps_connection_open(self, client, auth_headers, monkeypatch, configured_chat):
+        monkeypatch.setattr(ai_module, "bedrock_stream_chat", _fake_stream("Pregunta"))
+        chat_id = configured_chat
+
+        with _connect(client, auth_headers, chat_id) as ws:
+            ws.receive_json()
+            ws.send_json({"type": "message", "contenido": ""})
+            assert ws.receive_json()["status"] == 422
+            ws.send_json({"type": "message", "contenido": "Hola"})
+            assert _receive_turn(ws)[-1]["type"] == "message"
+
+    def test_failed_generation_reports_error(self, client, auth_headers, monkeypatch, configured_chat):
+        def failing_stream(history, chat_id, on_chunk):
+            on_chunk("Pregunta a medias")
+            raise RuntimeError("Bedrock unavailable")
+
+        monkeypatch.setattr(ai_module, "bedrock_stream_chat", failing_stream)
+        chat_id = configured_chat
+
+        with _connect(client, auth_headers, chat_id) as ws:
+            ws.receive_json()
+            ws.send_json({"type": "message", "contenido": "Hola"})
+            events = _receive_turn(ws)
+
+        assert events[-1] == {"type": "error", "status": 500, "detail": "Error generating reply"}
+        messages = client.get("/api/v1/messages", params={"chat_id": chat_id}, headers=auth_headers).json()
+        assert messages == []  # the user message is rolled back with the turn
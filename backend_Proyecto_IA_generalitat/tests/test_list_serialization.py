@@ -0,0 +1,57 @@
+"""Unit tests for the row-based serialization of list endpoints."""
+from datetime import datetime, timedelta
+
+from pydantic import TypeAdapter
+
+from app.core.config import settings
+from app.models.chat import Chat
+from app.repositories.chat_repo import chat_repo
+from app.repositories.message_repo import message_repo
+from app.schemas.chat import ChatResponse
+from app.schemas.message import MessageResponse
+from app.services.archive_service import archive_service
+
+
+def _pydantic_json(schema, objects):
+    """Serialize like a ``response_model`` route does."""
+    adapter = TypeAdapter(list[schema])
+    return adapter.dump_python(adapter.validate_python(objects, from_attributes=True), mode="json")
+
+
+class TestListSerialization:
+    """The fast path must produce the same JSON as validating ORM objects."""
+
+    def test_messages_match_pydantic_output(self, client, auth_headers, db_session, monkeypatch):
+        monkeypatch.setattr(settings, "message_compression", "zlib")
+        monkeypatch.setattr(settings, "message_compression_min_length", 50)
+        chat_id = client.post("/api/v1/chats", headers=auth_headers).json()["id_chat"]
+        message_repo.create(db_session, chat_id, "USER", "empezar")
+        message_repo.create(db_session, chat_id, "IA", "¿Qué diferencia hay entre una clave primaria y una foránea? " * 5)
+
+        response = client.get("/api/v1/messages", params={"chat_id": chat_id}, headers=auth_headers)
+        assert response.headers["content-type"] == "application/json"
+        expected = _pydantic_json(MessageResponse, message_repo.list_for_chat(db_session, chat_id))
+        assert response.json() == expected
+        assert len(expected) == 2
+
+    def test_archived_messages_match_pydantic_output(self, client, auth_headers, db_session):
+        chat_id = client.post("/api/v1/chats", headers=auth_headers).json()["id_chat"]
+        for i in range(4):
+            message_repo.create(db_session, chat_id, "IA" if i % 2 == 0 else "USER", f"Mensaje {i}")
+        chat = db_session.get(Chat, chat_id)
+        chat.status = "completed"
+        chat.completed_at = datetime.now() - timedelta(days=60)
+        db_session.commit()
+        archive_service.archive_completed(db_session)
+
+        response = client.get("/api/v1/messages", params={"chat_id": chat_id, "limit": 3}, headers=auth_headers)
+        assert response.json() == _pydantic_json(MessageResponse, message_repo.list_for_chat(db_session, chat_id, limit=3))
+        assert [m["contenido"] for m in response.json()] == ["Mensaje 3", "Mensaje 2", "Mensaje 1"]
+
+    def test_chats_match_pydantic_output(self, client, auth_headers, db_session):
+        for _ in range(3):
+            client.post("/api/v1/chats", headers=auth_headers)
+        response = client.get("/api/v1/chats", headers=auth_headers)
+        user_id = client.get("/api/v1/auth/me", headers=auth_headers).json()["id_usuario"]
+        assert response.json() == _pydantic_json(ChatResponse, chat_repo.list_for_user(db_session, user_id))
+        assert len(response.json()) == 3
@@ -0,0 +1,66 @@
+"""Unit tests for compressed message storage."""
+import pytest
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.models.message import Message
+from app.repositories.message_repo import message_repo
+
+
+@pytest.fixture
+def compression(monkeypatch):
+    """Compress messages of at least 100 characters."""
+    monkeypatch.setattr(settings, "message_compression", "zlib")
+    monkeypatch.setattr(settings, "message_compression_min_length", 100)
+
+
+class TestMessageCompression:
+    """Test transparent compression of long message contents."""
+
+    def test_long_message_is_stored_compressed(self, client, auth_headers, db_session, compression):
+        chat_id = client.post("/api/v1/chats", headers=auth_headers).json()["id_chat"]
+        long_text = "La normalización de bases de datos evita redundancias y anomalías. " * 20
+        msg = message_repo.create(db_session, chat_id, "IA", long_text)
+
+        raw = db_session.execute(
+            text("SELECT contenido, formato, length(contenido_comprimido) FROM mensajes WHERE id_mensaje = :id"),
+            {"id": msg.id_mensaje},
+        ).one()
+        assert raw[0] == ""
+        assert raw[1] == "zlib"
+        assert raw[2] < len(long_text.encode("utf-8")) / 4
+
+        messages = client.get("/api/v1/messages", params={"chat_id": chat_id}, headers=auth_headers).json()
+        assert messages[0]["contenido"] == long_text
+
+    def test_short_message_stays_plain(self, client, auth_headers, db_session, compression):
+        chat_id = client.post("/api/v1/chats", headers=auth_headers).json()["id_chat"]
+        msg = message_repo.create(db_session, chat_id, "USER", "empezar")
+        assert msg.formato == "plain"
+        assert msg.contenido_comprimido is None
+        assert msg.contenido == "empezar"
+
+    def test_plain_rows_readable_after_enabling_compression(self, client, auth_headers, db_session, monkeypatch):
+        chat_id = client.post("/api/v1/chats", headers=auth_headers).json()["id_chat"]
+        long_text = "Respuesta detallada del candidato. " * 50
+        message_repo.create(db_session, chat_id, "IA", long_text)
+
+        monkeypatch.setattr(settings, "message_compression", "zlib")
+        db_session.expire_all()
+        stored = db_session.query(Message).filter(Message.id_chat == chat_id).one()
+        assert stored.formato == "plain"
+        assert stored.contenido == long_text
+
+    def test_compressed_content_is_deferred(self, client, auth_headers, db_session, compression):
+        chat_id = client.post("/api/v1/chats", headers=auth_headers).json()["id_chat"]
+        long_text = "Explicación larga sobre índices compuestos. " * 20
+        message_id = message_repo.create(db_session, chat_id, "IA", long_text).id_mensaje
+        db_session.expunge_all()
+
+        message = message_repo.get_by_id(db_session, message_id)
+        assert "contenido_comprimido" not in message.__dict__
+        assert message.contenido == long_text  # loaded on first access
+
+        db_session.expunge_all()
+        listed = message_repo.list_for_chat(db_session, chat_id)
+        assert "contenido_comprimido" in listed[0].__dict__  # bulk reads load it with the rows
@@ -0,0 +1,144 @@
+"""Unit tests for the out-of-process PDF render pool."""
+import os
+import threading
+import time
+
+import pytest
+
+from app.api.v1 import ai as ai_module
+from app.models.chat import Chat
+from app.models.message import Message
+from app.services import report_service as report_service_module
+from app.services.ai.pdf_pool import PdfPoolBusyError, PdfPoolUnavailableError, PdfRenderPool, PdfRenderTimeoutError
+from app.services.ai.report_cache import report_cache
+
+
+# Jobs run in spawned worker processes, so they must be importable module-level functions
+def _no_init():
+    pass
+
+
+def _echo(html: str) -> bytes:
+    return html.encode("utf-8")
+
+
+def _slow_or_echo(html: str) -> bytes:
+    if html == "slow":
+        time.sleep(30)
+    return html.encode("utf-8")
+
+
+def _crash_or_echo(html: str) -> bytes:
+    if html == "crash":
+        os._exit(1)
+    return html.encode("utf-8")
+
+
+def _sleep_and_echo(html: str) -> bytes:
+    time.sleep(float(html))
+    return html.encode("utf-8")
+
+
+def _fail_or_echo(html: str) -> bytes:
+    if html == "fail":
+        raise ValueError("bad html")
+    return html.encode("utf-8")
+
+
+def _pool(job, timeout=10.0, queue_depth=0) -> PdfRenderPool:
+    return PdfRenderPool(size=1, queue_depth=queue_depth, timeout=timeout, initializer=_no_init, job=job)
+
+
+class TestPdfRenderPool:
+    """Test the queue bound, the timeout and the recovery from crashed workers."""
+
+    def test_full_queue_is_rejected(self):
+        pool = _pool(_slow_or_echo, timeout=1.0)
+        try:
+            worker = threading.Thread(target=lambda: pytest.raises(PdfRenderTimeoutError, pool.render, "slow"))
+            worker.start()
+            time.sleep(0.2)
+            with pytest.raises(PdfPoolBusyError):
+                pool.render("<p>informe</p>")
+            worker.join()
+            pool.timeout = 10.0
+            assert pool.render("<p>informe</p>") == b"<p>informe</p>"
+        finally:
+            pool.shutdown()
+
+    def test_timeout_terminates_the_stuck_worker(self):
+        pool = _pool(_slow_or_echo, timeout=0.5)
+        try:
+            stuck = [worker.process for worker in pool._workers]
+            with pytest.raises(PdfRenderTimeoutError):
+                pool.render("slow")
+            assert all(not process.is_alive() for process in stuck)
+            # The slot was freed and a fresh worker (given time to spawn) serves the next report
+            pool.timeout = 10.0
+            assert pool.render("<p>ok</p>") == b"<p>ok</p>"
+        finally:
+            pool.shutdown()
+
+    def test_timeout_does_not_fail_renders_in_other_workers(self):
+        pool = PdfRenderPool(size=2, queue_depth=0, timeout=10.0, initializer=_no_init, job=_sleep_and_echo)
+        try:
+            assert pool.render("0") == b"0"  # both workers are up before timing
+            results = {}
+            other = threading.Thread(target=lambda: results.update(other=pool.render("1.5")))
+            other.start()
+            time.sleep(0.2)
+            pool.timeout = 0.5
+            with pytest.raises(PdfRenderTimeoutError):
+                pool.render("30")
+            other.join()
+            assert results == {"other": b"1.5"}
+        finally:
+            pool.shutdown()
+
+    def test_job_errors_keep_the_worker(self):
+        pool = _pool(_fail_or_echo)
+        try:
+            workers = set(pool._workers)
+            with pytest.raises(ValueError, match="bad html"):
+                pool.render("fail")
+            assert pool.render("<p>ok</p>") == b"<p>ok</p>"
+            assert pool._workers == workers
+        finally:
+            pool.shutdown()
+
+    def test_crashed_worker_is_replaced(self):
+        pool = _pool(_crash_or_echo)
+        try:
+            with pytest.raises(PdfPoolUnavailableError):
+                pool.render("crash")
+            assert pool.render("<p>ok</p>") == b"<p>ok</p>"
+        finally:
+            pool.shutdown()
+
+
+class TestReportPoolErrors:
+    """Test the HTTP status of each render pool failure."""
+
+    @pytest.mark.parametrize("error, status", [
+        (PdfPoolBusyError, 503),
+        (PdfPoolUnavailableError, 503),
+        (PdfRenderTimeoutError, 504),
+    ])
+    def test_status(self, client, auth_headers, db_session, monkeypatch, tmp_path, error, status):
+        class FailingPool:
+            def render(self, html_content):
+                raise error("pool failure")
+
+        monkeypatch.setattr(ai_module, "get_pdf_render_pool", lambda: FailingPool())
+        monkeypatch.setattr(ai_module.limiter, "enabled", False)
+        monkeypatch.setattr(report_service_module, "generate_reply", lambda history, chat_id, **kwargs: "## Valoración\nMedio")
+        monkeypatch.setattr(report_cache, "directory", tmp_path)
+
+        chat_id = client.post("/api/v1/chats", headers=auth_headers).json()["id_chat"]
+        for i in range(6):
+            db_session.add(Message(id_chat=chat_id, emisor="USER" if i % 2 else "IA", contenido=f"Mensaje {i}"))
+        db_session.commit()
+
+        response = client.post("/api/v1/ai/generate-report", json={"chat_id": chat_id}, headers=auth_headers)
+        assert response.status_code == status
+        assert db_session.get(Chat, chat_id).status == "active"
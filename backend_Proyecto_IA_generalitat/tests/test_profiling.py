@@ -0,0 +1,54 @@
+"""Unit tests for the opt-in request profiling middleware."""
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.profiling import ProfilingMiddleware
+from app.main import app as main_app
+from app.services.ai.bedrock_service import _sanitize_user_input
+
+TOKEN = "profiling-token-profiling-token-01"
+
+
+def _app(tmp_path, **options) -> TestClient:
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware, output_dir=str(tmp_path), interval_ms=1, **options)
+
+    @app.get("/slow")
+    def slow():
+        deadline = time.perf_counter() + 0.1
+        while time.perf_counter() < deadline:
+            _sanitize_user_input("Una API REST expone recursos mediante URLs. " * 20)
+        return {"ok": True}
+
+    return TestClient(app)
+
+
+class TestProfiling:
+    """Test which requests are profiled and what is stored."""
+
+    def test_admin_header_profiles_the_request(self, tmp_path):
+        response = _app(tmp_path, token=TOKEN).get("/slow", headers={"X-Profile": TOKEN})
+        assert response.status_code == 200
+        profile_id = response.headers["x-profile-id"]
+
+        folded = next(tmp_path.glob(f"{profile_id}_*.folded")).read_text(encoding="utf-8")
+        assert "_sanitize_user_input (app/services/ai/bedrock_service.py" in folded
+        assert all(line.rsplit(" ", 1)[1].isdigit() for line in folded.splitlines())
+
+        alloc = next(tmp_path.glob(f"{profile_id}_*.alloc.txt")).read_text(encoding="utf-8")
+        assert alloc.startswith("GET /slow\nwall time:")
+
+    def test_requests_without_a_valid_header_are_not_profiled(self, tmp_path):
+        client = _app(tmp_path, token=TOKEN)
+        assert "x-profile-id" not in client.get("/slow").headers
+        assert "x-profile-id" not in client.get("/slow", headers={"X-Profile": "guess"}).headers
+        assert "x-profile-id" not in _app(tmp_path).get("/slow", headers={"X-Profile": ""}).headers
+        assert list(tmp_path.iterdir()) == []
+
+    def test_sampling(self, tmp_path):
+        assert "x-profile-id" in _app(tmp_path, sample_rate=1.0).get("/slow").headers
+
+    def test_not_installed_when_disabled(self):
+        assert ProfilingMiddleware not in [middleware.cls for middleware in main_app.user_middleware]
@@ -0,0 +1,119 @@
+"""Query-count and row budgets of the API routes (N+1 and unbounded read guards)."""
+import re
+from typing import NamedTuple
+
+import pytest
+
+from app.api.v1 import ai as ai_module
+from app.models.message import Message
+from app.services import report_service as report_service_module
+from app.services.ai.report_cache import report_cache
+
+
+class Budget(NamedTuple):
+    queries: int  # statements per request
+    rows: int  # rows read or written per request
+
+
+# Measured on the interviews below; lower them when a route gets cheaper, never raise them silently
+BUDGETS = {
+    "POST /api/v1/auth/login": Budget(queries=1, rows=1),
+    "GET /api/v1/auth/me": Budget(queries=1, rows=1),
+    "POST /api/v1/chats/start": Budget(queries=7, rows=7),
+    "GET /api/v1/chats": Budget(queries=2, rows=3),
+    "GET /api/v1/chats/{id}": Budget(queries=2, rows=2),
+    "PUT /api/v1/chats/{id}/title": Budget(queries=4, rows=4),
+    "DELETE /api/v1/chats/{id}": Budget(queries=5, rows=5),  # +3: subtract the chat from user_stats
+    "GET /api/v1/messages": Budget(queries=4, rows=53),
+    "POST /api/v1/ai/reply": Budget(queries=22, rows=66),  # +3: duplicate-turn record shared by all workers
+    "POST /api/v1/ai/generate-report": Budget(queries=11, rows=210),
+    "GET /api/v1/stats/me": Budget(queries=2, rows=2),
+    "GET /api/v1/stats/chats/{id}": Budget(queries=3, rows=3),
+    "GET /api/v1/search": Budget(queries=2, rows=22),
+}
+
+ANSWERS = [
+    "empezar", "Junior", "Grado Superior", "DAW", "Media",
+    "Soy Ana y estudio DAW", "Una API REST usa los verbos HTTP",
+]
+
+
+def _budget_for(method: str, path: str) -> tuple[str, Budget | None]:
+    for route, budget in BUDGETS.items():
+        route_method, template = route.split(" ", 1)
+        if route_method == method and re.fullmatch(re.sub(r"\{[^}]+\}", "[^/]+", template), path):
+            return route, budget
+    return f"{method} {path}", None
+
+
+def assert_within_budgets(query_log) -> None:
+    """Fail listing every request over its budget (or without one) and its statements."""
+    failures = []
+    for request in query_log.requests:
+        route, budget = _budget_for(request.method, request.path)
+        if budget is None:
+            failures.append(f"{route}: no budget declared ({request.count} queries, {request.rows} rows)")
+        elif request.count > budget.queries or request.rows > budget.rows:
+            failures.append(
+                f"{route}: {request.count} queries / {request.rows} rows, budget {budget.queries} / {budget.rows}\n"
+                + request.describe()
+            )
+    plans = [f"EXPLAIN {' '.join(sql.split())[:160]}\n  " + "\n  ".join(plan) for sql, plan in query_log.plans.items()]
+    assert not failures, "\n".join(failures + plans)
+
+
+@pytest.fixture
+def fake_ai(monkeypatch, tmp_path):
+    """Scripted agent replies after the local configuration (the last one closes the interview) and a stub report."""
+    replies = iter(["Preséntate brevemente.", "Pregunta 1", "Hemos terminado la entrevista."])
+    monkeypatch.setattr(ai_module, "bedrock_chat", lambda history, chat_id: next(replies))
+    monkeypatch.setattr(ai_module.limiter, "enabled", False)
+    monkeypatch.setattr(
+        report_service_module, "generate_reply", lambda history, chat_id, **kwargs: "## Valoración\nNivel Medio"
+    )
+    monkeypatch.setattr(report_cache, "directory", tmp_path)
+
+
+class TestQueryBudgets:
+    """Run realistic interviews and check every request against its budget."""
+
+    def test_full_interview(self, client, auth_headers, query_log, fake_ai):
+        client.post("/api/v1/auth/login", json={"email": "test@example.com", "password": "Test1234"})
+        client.get("/api/v1/auth/me", headers=auth_headers)
+        chat_id = client.post("/api/v1/chats/start", headers=auth_headers).json()["chat"]["id_chat"]
+        for contenido in ANSWERS:
+            response = client.post("/api/v1/ai/reply", json={"chat_id": chat_id, "contenido": contenido}, headers=auth_headers)
+            assert response.status_code == 200
+        client.get("/api/v1/chats", headers=auth_headers)
+        client.get(f"/api/v1/chats/{chat_id}", headers=auth_headers)
+        client.get("/api/v1/messages", params={"chat_id": chat_id}, headers=auth_headers)
+        assert client.post("/api/v1/ai/generate-report", json={"chat_id": chat_id}, headers=auth_headers).status_code == 200
+        client.get("/api/v1/stats/me", headers=auth_headers)
+        client.get(f"/api/v1/stats/chats/{chat_id}", headers=auth_headers)
+        client.get("/api/v1/search", params={"q": "API"}, headers=auth_headers)
+        client.put(f"/api/v1/chats/{chat_id}/title", json={"title": "Entrevista DAW"}, headers=auth_headers)
+        client.delete(f"/api/v1/chats/{chat_id}", headers=auth_headers)
+
+        assert len(query_log.requests) == 19
+        assert_within_budgets(query_log)
+
+    def test_long_interview_reads_are_bounded(self, client, auth_headers, db_session, query_log, fake_ai):
+        chat_id = client.post("/api/v1/chats/start", headers=auth_headers).json()["chat"]["id_chat"]
+        for i in range(300):
+            db_session.add(Message(id_chat=chat_id, emisor="USER" if i % 2 else "IA", contenido=f"API mensaje {i}"))
+        db_session.commit()
+
+        client.post("/api/v1/ai/reply", json={"chat_id": chat_id, "contenido": "empezar"}, headers=auth_headers)
+        client.get("/api/v1/messages", params={"chat_id": chat_id}, headers=auth_headers)
+        client.get("/api/v1/search", params={"q": "API"}, headers=auth_headers)
+        client.post("/api/v1/ai/generate-report", json={"chat_id": chat_id}, headers=auth_headers)
+
+        assert_within_budgets(query_log)
+
+    def test_message_page_uses_an_index(self, client, auth_headers, db_session, query_log):
+        chat_id = client.post("/api/v1/chats", headers=auth_headers).json()["id_chat"]
+        query_log.explain = True
+        client.get("/api/v1/messages", params={"chat_id": chat_id}, headers=auth_headers)
+
+        plans = [plan for sql, plan in query_log.plans.items() if "FROM mensajes" in sql]
+        assert plans and all(not line.startswith("SCAN mensajes") for plan in plans for line in plan), plans
@@ -0,0 +1,125 @@
+"""Unit tests for read-replica routing (two SQLite files stand in for primary and replica)."""
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from app.api import deps
+from app.api.deps import get_read_db
+from app.core import database
+from app.core.database import Base, RoutingSession, get_db, recent_writes
+from app.main import app
+from app.models.user import User
+
+
+@pytest.fixture
+def engines(tmp_path):
+    """Primary and replica databases with the same schema but independent contents."""
+    primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}", connect_args={"check_same_thread": False})
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(primary)
+    Base.metadata.create_all(replica)
+    yield primary, replica
+    primary.dispose()
+    replica.dispose()
+
+
+@pytest.fixture
+def replica_client(engines, monkeypatch):
+    """Test client whose routes use the two databases (read-only routes go through get_read_db)."""
+    primary, replica = engines
+    PrimarySession = sessionmaker(bind=primary, autoflush=False)
+    monkeypatch.setattr(database, "replica_engine", replica)
+    monkeypatch.setattr(database, "SessionLocal", PrimarySession)
+    monkeypatch.setattr(database, "ReadSessionLocal", sessionmaker(
+        class_=RoutingSession, primary=primary, replica=replica, autoflush=False
+    ))
+
+    def override_get_db():
+        db = PrimarySession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides.pop(get_read_db, None)
+    with TestClient(app) as test_client:
+        yield test_client
+    app.dependency_overrides.clear()
+
+
+def _register(client):
+    response = client.post(
+        "/api/v1/auth/register",
+        json={"email": "replica@example.com", "password": "Test1234", "nombre": "Replica"},
+    )
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+class TestRoutingSession:
+    """Test the primary/replica session."""
+
+    def test_reads_replica_until_first_write(self, engines):
+        primary, replica = engines
+        with sessionmaker(bind=replica)() as db:
+            db.add(User(email="only-replica@example.com", password_hash="x", nombre="R"))
+            db.commit()
+
+        with RoutingSession(primary, replica) as db:
+            assert db.scalar(select(User.email)) == "only-replica@example.com"
+            db.add(User(email="primary@example.com", password_hash="x", nombre="P"))
+            db.commit()
+            # After writing, the session keeps reading from the primary
+            assert db.scalars(select(User.email)).all() == ["primary@example.com"]
+
+    def test_without_replica_uses_primary(self, engines):
+        primary, _ = engines
+        with RoutingSession(primary) as db:
+            assert db.get_bind() is primary
+
+
+class TestReadYourWrites:
+    """Test that read-only routes fall back to the primary after the user's writes."""
+
+    def test_recent_writer_reads_primary(self, replica_client):
+        headers = _register(replica_client)
+        # The replica does not have the new user yet, but the user just wrote
+        assert replica_client.get("/api/v1/auth/me", headers=headers).status_code == 200
+
+    def test_reads_go_to_replica_after_window(self, replica_client, engines, monkeypatch):
+        headers = _register(replica_client)
+        monkeypatch.setattr(recent_writes, "window_seconds", 0)
+        assert replica_client.get("/api/v1/auth/me", headers=headers).status_code == 401
+
+        # Replication catches up
+        primary, replica = engines
+        with sessionmaker(bind=primary)() as src, sessionmaker(bind=replica)() as dst:
+            user = src.scalar(select(User))
+            dst.add(User(id_usuario=user.id_usuario, email=user.email, password_hash=user.password_hash, nombre=user.nombre))
+            dst.commit()
+        assert replica_client.get("/api/v1/auth/me", headers=headers).status_code == 200
+        assert replica_client.get("/api/v1/chats", headers=headers).json() == []
+
+    def test_write_routes_mark_user(self, replica_client, monkeypatch):
+        headers = _register(replica_client)
+        user_id = replica_client.get("/api/v1/auth/me", headers=headers).json()["id_usuario"]
+        recent_writes._written_at.clear()
+
+        chat_id = replica_client.post("/api/v1/chats", headers=headers).json()["id_chat"]
+        assert recent_writes.wrote_recently(user_id)
+        # The new chat is visible right away even though the replica never received it
+        assert replica_client.get(f"/api/v1/chats/{chat_id}", headers=headers).status_code == 200
+
+    def test_read_routes_decode_the_token_once(self, replica_client, monkeypatch):
+        headers = _register(replica_client)
+        decoded = []
+
+        def counting_decode(token):
+            decoded.append(token)
+            return original_decode(token)
+
+        original_decode = deps.decode_token
+        monkeypatch.setattr(deps, "decode_token", counting_decode)
+        assert replica_client.get("/api/v1/chats", headers=headers).status_code == 200
+        assert len(decoded) == 1
@@ -0,0 +1,170 @@
+"""Unit tests for report generation and batch export."""
+import io
+import threading
+import time
+import zipfile
+from datetime import datetime
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.models.chat import Chat
+from app.models.chat_stats import ChatStats
+from app.models.message import Message
+from app.models.user import User
+from app.services import report_service as report_service_module
+from app.services.report_service import PreparedReport, ReportMessage, report_service
+from app.services.ai.report_cache import report_cache
+
+
+@pytest.fixture
+def fake_report(monkeypatch, tmp_path):
+    """Avoid Bedrock calls and keep cached reports in a temporary folder."""
+    calls = []
+
+    def fake_generate_reply(history, chat_id, **kwargs):
+        calls.append(chat_id)
+        return "## Valoración general\nBuen desempeño.\n## Nivel estimado profesional\nNivel de Empleabilidad: Medio"
+
+    monkeypatch.setattr(report_service_module, "generate_reply", fake_generate_reply)
+    monkeypatch.setattr(report_cache, "directory", tmp_path)
+    return calls
+
+
+def _create_chat_with_messages(client, auth_headers, db_session, status="completed"):
+    chat_id = client.post("/api/v1/chats", headers=auth_headers).json()["id_chat"]
+    for i in range(6):
+        db_session.add(Message(id_chat=chat_id, emisor="USER" if i % 2 else "IA", contenido=f"Mensaje {i}"))
+    chat = db_session.get(Chat, chat_id)
+    chat.status = status
+    db_session.commit()
+    return chat_id
+
+
+class TestBatchReportExport:
+    """Test the ZIP export of several reports."""
+
+    def test_batch_export_streams_zip_and_reuses_cache(self, client, auth_headers, db_session, fake_report):
+        """Each completed chat gets a PDF entry; a second export is served from the cache."""
+        chat_ids = [_create_chat_with_messages(client, auth_headers, db_session) for _ in range(2)]
+
+        response = client.post("/api/v1/ai/generate-reports", headers=auth_headers, json={"chat_ids": chat_ids})
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/zip"
+        names = zipfile.ZipFile(io.BytesIO(response.content)).namelist()
+        assert len(names) == 2
+        assert all(name.endswith(".pdf") for name in names)
+        assert sorted(fake_report) == sorted(chat_ids)
+
+        response = client.post("/api/v1/ai/generate-reports", headers=auth_headers, json={"chat_ids": chat_ids})
+        assert response.status_code == 200
+        assert len(zipfile.ZipFile(io.BytesIO(response.content)).namelist()) == 2
+        assert len(fake_report) == 2  # no new AI calls
+
+    def test_batch_export_rejects_active_chats(self, client, auth_headers, db_session, fake_report):
+        """Only completed interviews can be exported."""
+        chat_id = _create_chat_with_messages(client, auth_headers, db_session, status="active")
+        response = client.post("/api/v1/ai/generate-reports", headers=auth_headers, json={"chat_ids": [chat_id]})
+        assert response.status_code == 400
+        assert fake_report == []
+
+    def test_prepared_report_does_not_need_the_session(self, client, auth_headers, db_session, fake_report):
+        """Batch workers render from plain copies, never from ORM objects."""
+        chat_id = _create_chat_with_messages(client, auth_headers, db_session)
+        prepared = report_service.prepare(db_session, db_session.get(Chat, chat_id), db_session.query(User).one())
+        db_session.close()
+
+        assert all(isinstance(message, ReportMessage) for message in prepared.messages)
+        pdf_file = report_service._render_and_cache(prepared)
+        assert pdf_file.read(4) == b"%PDF"
+        assert list(report_cache.directory.glob(f"chat_{chat_id}_*.pdf"))
+
+    def test_failed_prepare_closes_cached_reports(self, client, auth_headers, db_session, fake_report, monkeypatch):
+        """A chat with too few messages is a 400 and the cached files already opened are closed."""
+        cached_id = _create_chat_with_messages(client, auth_headers, db_session)
+        assert client.post("/api/v1/ai/generate-report", json={"chat_id": cached_id}, headers=auth_headers).status_code == 200
+        short_id = client.post("/api/v1/chats", headers=auth_headers).json()["id_chat"]
+        db_session.get(Chat, short_id).status = "completed"
+        db_session.commit()
+
+        opened = []
+        original_open = report_cache.open
+
+        def tracking_open(chat):
+            pdf_file = original_open(chat)
+            if pdf_file is not None:
+                opened.append(pdf_file)
+            return pdf_file
+
+        monkeypatch.setattr(report_cache, "open", tracking_open)
+        response = client.post("/api/v1/ai/generate-reports", headers=auth_headers, json={"chat_ids": [cached_id, short_id]})
+        assert response.status_code == 400
+        assert len(opened) == 1 and opened[0].closed
+
+
+    def test_batch_export_records_employability_levels(
+        self, client, auth_headers, db_session, fake_report, monkeypatch
+    ):
+        """Levels detected while the archive streams reach chat_stats and user_stats."""
+        monkeypatch.setattr(report_service_module, "SessionLocal", sessionmaker(bind=db_session.get_bind()))
+        chat_ids = [_create_chat_with_messages(client, auth_headers, db_session) for _ in range(2)]
+
+        response = client.post("/api/v1/ai/generate-reports", headers=auth_headers, json={"chat_ids": chat_ids})
+        assert response.status_code == 200
+        db_session.expire_all()
+        assert {db_session.get(ChatStats, chat_id).employability_level for chat_id in chat_ids} == {"Medio"}
+        assert client.get("/api/v1/stats/me", headers=auth_headers).json()["last_employability_level"] == "Medio"
+
+    def test_disconnect_cancels_pending_renders_and_closes_results(self, monkeypatch):
+        """Closing the stream does not wait for running renders and closes every unread PDF."""
+        monkeypatch.setattr(settings, "report_batch_concurrency", 1)
+        release = threading.Event()
+        started, files = [], []
+
+        def fake_render(prepared, render_pool=None):
+            started.append(prepared.chat_id)
+            if prepared.chat_id == 2:
+                release.wait(5)
+            pdf_file = io.BytesIO(b"%PDF-1.4 informe")
+            files.append(pdf_file)
+            return pdf_file
+
+        monkeypatch.setattr(report_service, "_render_and_cache", fake_render)
+        monkeypatch.setattr(report_service, "_record_levels", lambda reports: None)
+        pending = [
+            PreparedReport(chat_id=chat_id, user_id=1, candidate_name="Ana", interview_date=datetime.now(), messages=[], history=[])
+            for chat_id in (1, 2, 3)
+        ]
+
+        stream = report_service.stream_batch_zip({}, pending)
+        next(stream)
+        while len(started) < 2:
+            time.sleep(0.01)
+        start = time.monotonic()
+        stream.close()
+        assert time.monotonic() - start < 1
+
+        release.set()
+        deadline = time.monotonic() + 5
+        while (len(files) < 2 or not files[1].closed) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert started == [1, 2]
+        assert all(pdf_file.closed for pdf_file in files)
+
+
+class TestReportRanges:
+    """Range requests are only served from the cached report."""
+
+    def test_range_on_cache_miss_gets_the_whole_report(self, client, auth_headers, db_session, fake_report):
+        chat_id = _create_chat_with_messages(client, auth_headers, db_session)
+        headers = {**auth_headers, "Range": "bytes=0-9"}
+
+        first = client.post("/api/v1/ai/generate-report", json={"chat_id": chat_id}, headers=headers)
+        assert first.status_code == 200
+        assert first.headers["accept-ranges"] == "none"
+
+        cached = client.post("/api/v1/ai/generate-report", json={"chat_id": chat_id}, headers=headers)
+        assert cached.status_code == 206
+        assert cached.content == first.content[:10]
+        assert fake_report == [chat_id]
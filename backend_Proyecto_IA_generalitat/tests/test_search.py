@@ -0,0 +1,107 @@
+"""Unit tests for full-text search over interviews."""
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select, text
+
+from app.core.config import settings
+from app.models.chat import Chat
+from app.models.chat_archive import ChatArchiveSearch
+from app.repositories.chat_repo import chat_repo
+from app.repositories.message_repo import message_repo
+from app.repositories.search_repo import make_snippet, search_terms
+from app.services.archive_service import archive_service
+
+
+def _chat_with(client, auth_headers, db_session, *contents):
+    chat_id = client.post("/api/v1/chats", headers=auth_headers).json()["id_chat"]
+    for i, contenido in enumerate(contents):
+        message_repo.create(db_session, chat_id, "IA" if i % 2 == 0 else "USER", contenido)
+    return chat_id
+
+
+def _search(client, auth_headers, q, **params):
+    return client.get("/api/v1/search", params={"q": q, **params}, headers=auth_headers)
+
+
+class TestSearch:
+    """Test the search endpoint."""
+
+    def test_finds_messages_ranked(self, client, auth_headers, db_session):
+        sql_chat = _chat_with(
+            client, auth_headers, db_session,
+            "¿Qué es la normalización en bases de datos?",
+            "La normalización evita redundancia en una base de datos relacional.",
+        )
+        _chat_with(client, auth_headers, db_session, "Háblame de tu experiencia con Docker.")
+
+        response = _search(client, auth_headers, "normalizacion bases")
+        assert response.status_code == 200
+        data = response.json()
+        assert {hit["id_chat"] for hit in data["results"]} == {sql_chat}
+        assert data["results"][0]["snippet"].startswith("¿Qué es la normalización")
+        assert data["results"][0]["score"] >= data["results"][1]["score"]
+        assert data["has_more"] is False
+
+    def test_pagination(self, client, auth_headers, db_session):
+        _chat_with(client, auth_headers, db_session, *[f"Pregunta {i} sobre Python" for i in range(5)])
+
+        first = _search(client, auth_headers, "python", page_size=3).json()
+        second = _search(client, auth_headers, "python", page=2, page_size=3).json()
+        assert len(first["results"]) == 3 and first["has_more"] is True
+        assert len(second["results"]) == 2 and second["has_more"] is False
+        ids = [hit["id_mensaje"] for hit in first["results"] + second["results"]]
+        assert len(set(ids)) == 5
+
+    def test_scoped_to_user_and_excludes_deleted(self, client, auth_headers, db_session):
+        deleted_chat = _chat_with(client, auth_headers, db_session, "Kubernetes en producción")
+        client.delete(f"/api/v1/chats/{deleted_chat}", headers=auth_headers)
+
+        other = client.post(
+            "/api/v1/auth/register",
+            json={"email": "otro@example.com", "password": "Test1234", "nombre": "Otro"},
+        ).json()["access_token"]
+        other_headers = {"Authorization": f"Bearer {other}"}
+        _chat_with(client, other_headers, db_session, "Kubernetes y contenedores")
+
+        assert _search(client, auth_headers, "kubernetes").json()["results"] == []
+        assert len(_search(client, other_headers, "kubernetes").json()["results"]) == 1
+
+    def test_finds_compressed_and_archived_messages(self, client, auth_headers, db_session, monkeypatch):
+        archived = _chat_with(client, auth_headers, db_session, "Explica el patrón repositorio con un ejemplo.")
+        chat = db_session.get(Chat, archived)
+        chat.status = "completed"
+        chat.completed_at = datetime.now() - timedelta(days=60)
+        db_session.commit()
+        live = _chat_with(client, auth_headers, db_session, "El patrón repositorio aísla el acceso a datos.")
+
+        archive_service.archive_completed(db_session)
+        monkeypatch.setattr(settings, "message_compression", "zlib")
+        monkeypatch.setattr(settings, "message_compression_min_length", 10)
+        compressed = _chat_with(client, auth_headers, db_session, "Un repositorio comprimido también se encuentra.")
+
+        results = _search(client, auth_headers, "repositorio").json()["results"]
+        snippets = {hit["id_chat"]: hit["snippet"] for hit in results}
+        assert snippets == {
+            archived: "Explica el patrón repositorio con un ejemplo.",
+            live: "El patrón repositorio aísla el acceso a datos.",
+            compressed: "Un repositorio comprimido también se encuentra.",
+        }
+
+        # Purging the chat removes its archived index entries
+        client.delete(f"/api/v1/chats/{archived}", headers=auth_headers)
+        assert chat_repo.purge_deleted(db_session, datetime.now() + timedelta(seconds=1)) == [archived]
+        assert db_session.scalar(select(func.count()).select_from(ChatArchiveSearch)) == 0
+        fts_matches = db_session.execute(
+            text("SELECT count(*) FROM chat_archivos_busqueda_fts WHERE chat_archivos_busqueda_fts MATCH 'repositorio'")
+        ).scalar()
+        assert fts_matches == 0
+
+    def test_query_without_words_is_rejected(self, client, auth_headers):
+        assert _search(client, auth_headers, '"*" ?!').status_code == 400
+
+    def test_search_terms_and_snippet(self):
+        assert search_terms('normalización AND "bases" -x') == ["normalización", "and", "bases"]
+        text = "Introducción. " * 30 + "Aquí hablamos de normalización de datos." + " Final." * 30
+        snippet = make_snippet(text, ["normalizacion"], width=60)
+        assert "normalización" in snippet
+        assert snippet.startswith("…") and snippet.endswith("…")
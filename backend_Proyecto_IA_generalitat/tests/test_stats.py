@@ -0,0 +1,121 @@
+"""Unit tests for the incrementally maintained progress statistics."""
+import pytest
+
+from app.models.chat import Chat
+from app.repositories.message_repo import message_repo
+from app.services import report_service as report_service_module
+from app.services.ai.report_cache import report_cache
+
+
+@pytest.fixture
+def fake_report(monkeypatch, tmp_path):
+    """Avoid Bedrock calls and keep cached reports in a temporary folder."""
+    def fake_generate_reply(history, chat_id, **kwargs):
+        return "## Valoración general\nBuen desempeño.\n## Nivel estimado profesional\nNivel de Empleabilidad: Bueno"
+
+    monkeypatch.setattr(report_service_module, "generate_reply", fake_generate_reply)
+    monkeypatch.setattr(report_cache, "directory", tmp_path)
+
+
+def _chat_with_turns(client, auth_headers, db_session, user_turns):
+    chat_id = client.post("/api/v1/chats", headers=auth_headers).json()["id_chat"]
+    for i in range(user_turns):
+        message_repo.create(db_session, chat_id, "IA", f"Pregunta {i}")
+        message_repo.create(db_session, chat_id, "USER", f"Respuesta {i}")
+    return chat_id
+
+
+def _complete(db_session, chat_id, status="completed"):
+    db_session.get(Chat, chat_id).status = status
+    db_session.commit()
+
+
+class TestStats:
+    """Test the progress statistics endpoints."""
+
+    def test_new_user_has_empty_stats(self, client, auth_headers):
+        response = client.get("/api/v1/stats/me", headers=auth_headers)
+        assert response.status_code == 200
+        assert response.json() == {
+            "total_chats": 0,
+            "completed_chats": 0,
+            "average_turns": 0.0,
+            "last_employability_level": None,
+            "last_report_at": None,
+        }
+
+    def test_counters_follow_messages_and_completion(self, client, auth_headers, db_session):
+        first = _chat_with_turns(client, auth_headers, db_session, 3)
+        second = _chat_with_turns(client, auth_headers, db_session, 4)
+        _chat_with_turns(client, auth_headers, db_session, 1)
+        _complete(db_session, first)
+        _complete(db_session, second)
+        _complete(db_session, second)  # unchanged status is not counted twice
+
+        data = client.get("/api/v1/stats/me", headers=auth_headers).json()
+        assert data["total_chats"] == 3
+        assert data["completed_chats"] == 2
+        assert data["average_turns"] == 3.5
+
+        chat = client.get(f"/api/v1/stats/chats/{first}", headers=auth_headers).json()
+        assert chat["user_turns"] == 3
+        assert chat["ai_turns"] == 3
+
+        # Reopening an interview removes it from the completed counters
+        _complete(db_session, second, status="active")
+        data = client.get("/api/v1/stats/me", headers=auth_headers).json()
+        assert data["completed_chats"] == 1
+        assert data["average_turns"] == 3.0
+
+    def test_deleted_chats_are_subtracted(self, client, auth_headers, db_session):
+        first = _chat_with_turns(client, auth_headers, db_session, 3)
+        second = _chat_with_turns(client, auth_headers, db_session, 5)
+        _chat_with_turns(client, auth_headers, db_session, 1)
+        _complete(db_session, first)
+        _complete(db_session, second)
+
+        assert client.delete(f"/api/v1/chats/{second}", headers=auth_headers).status_code == 200
+        data = client.get("/api/v1/stats/me", headers=auth_headers).json()
+        assert data["total_chats"] == 2
+        assert data["completed_chats"] == 1
+        assert data["average_turns"] == 3.0
+
+        # Deleting an already deleted chat does not subtract it again
+        response = client.post(
+            "/api/v1/chats/bulk-delete", headers=auth_headers, json={"chat_ids": [first, second]}
+        )
+        assert response.json()["deleted"] == 1
+        data = client.get("/api/v1/stats/me", headers=auth_headers).json()
+        assert data["total_chats"] == 1
+        assert data["completed_chats"] == 0
+        assert data["average_turns"] == 0.0
+
+    def test_start_chat_counts_greeting(self, client, auth_headers):
+        chat_id = client.post("/api/v1/chats/start", headers=auth_headers).json()["chat"]["id_chat"]
+        chat = client.get(f"/api/v1/stats/chats/{chat_id}", headers=auth_headers).json()
+        assert chat["ai_turns"] == 1
+        assert chat["user_turns"] == 0
+        assert client.get("/api/v1/stats/me", headers=auth_headers).json()["total_chats"] == 1
+
+    def test_report_records_employability_level(self, client, auth_headers, db_session, fake_report):
+        chat_id = _chat_with_turns(client, auth_headers, db_session, 3)
+
+        response = client.post("/api/v1/ai/generate-report", headers=auth_headers, json={"chat_id": chat_id})
+        assert response.status_code == 200
+
+        data = client.get("/api/v1/stats/me", headers=auth_headers).json()
+        assert data["last_employability_level"] == "Bueno"
+        assert data["last_report_at"] is not None
+        assert data["completed_chats"] == 1
+        assert data["average_turns"] == 3.0
+        chat = client.get(f"/api/v1/stats/chats/{chat_id}", headers=auth_headers).json()
+        assert chat["employability_level"] == "Bueno"
+
+    def test_chat_stats_of_other_user_not_found(self, client, auth_headers):
+        chat_id = client.post("/api/v1/chats", headers=auth_headers).json()["id_chat"]
+        token = client.post(
+            "/api/v1/auth/register",
+            json={"email": "other@example.com", "password": "Test1234", "nombre": "Other"},
+        ).json()["access_token"]
+        response = client.get(f"/api/v1/stats/chats/{chat_id}", headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == 404
@@ -0,0 +1,104 @@
+"""Unit tests for rolling conversation summaries."""
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.core.chat_lock import summary_locks
+from app.core.config import settings
+from app.models.chat_summary import ChatSummary
+from app.models.message import Message
+from app.repositories.summary_repo import summary_repo
+from app.services import summary_service as summary_service_module
+from app.services.ai.bedrock_service import ModelReply, TokenUsage
+from app.services.message_service import message_service
+from app.services.summary_service import summary_service
+
+
+@pytest.fixture
+def summary_settings(monkeypatch):
+    """Enable summaries every 2 turns with a recent window of 4 messages."""
+    monkeypatch.setattr(settings, "bedrock_invocation_mode", "model")
+    monkeypatch.setattr(settings, "summary_every_n_turns", 2)
+    monkeypatch.setattr(settings, "summary_recent_messages", 4)
+    folded = []
+
+    def fake_summarize(previous_summary, history, chat_id):
+        folded.append((previous_summary, [m["content"] for m in history]))
+        return ModelReply(text=f"resumen {len(folded)}", usage=TokenUsage())
+
+    monkeypatch.setattr(summary_service_module, "summarize_conversation", fake_summarize)
+    return folded
+
+
+def _add_messages(db_session, chat_id, start, count):
+    for i in range(start, start + count):
+        db_session.add(Message(id_chat=chat_id, emisor="USER" if i % 2 else "IA", contenido=f"m{i}"))
+    db_session.commit()
+
+
+class TestSummaries:
+    """Test summary refresh and history construction."""
+
+    def test_no_summary_below_threshold(self, client, auth_headers, db_session, summary_settings):
+        chat_id = client.post("/api/v1/chats", headers=auth_headers).json()["id_chat"]
+        _add_messages(db_session, chat_id, 0, 7)  # threshold is 4 + 2 * 2 = 8
+        assert summary_service.maybe_refresh(db_session, chat_id) is None
+        assert summary_settings == []
+
+    def test_summary_folds_older_messages(self, client, auth_headers, db_session, summary_settings):
+        chat_id = client.post("/api/v1/chats", headers=auth_headers).json()["id_chat"]
+        user_id = client.get("/api/v1/auth/me", headers=auth_headers).json()["id_usuario"]
+        _add_messages(db_session, chat_id, 0, 10)
+
+        summary = summary_service.maybe_refresh(db_session, chat_id)
+        assert summary.contenido == "resumen 1"
+        assert summary.mensajes_resumidos == 6
+        assert summary_settings[0] == (None, [f"m{i}" for i in range(6)])
+
+        history = message_service.build_bedrock_history(db_session, chat_id, user_id)
+        assert history[0]["role"] == "system"
+        assert "resumen 1" in history[0]["content"]
+        assert [m["content"] for m in history[1:]] == ["m6", "m7", "m8", "m9"]
+
+        # Next refresh only folds what the summary does not cover yet
+        _add_messages(db_session, chat_id, 10, 4)
+        summary = summary_service.maybe_refresh(db_session, chat_id)
+        assert summary.mensajes_resumidos == 10
+        assert summary_settings[1] == ("resumen 1", ["m6", "m7", "m8", "m9"])
+
+    def test_late_refresh_does_not_overwrite_a_summary_further_ahead(self, client, auth_headers, db_session):
+        chat_id = client.post("/api/v1/chats", headers=auth_headers).json()["id_chat"]
+        summary_repo.upsert(db_session, chat_id, "resumen nuevo", 10, 10)
+
+        summary = summary_repo.upsert(db_session, chat_id, "resumen viejo", 6, 6)
+        assert (summary.contenido, summary.mensajes_resumidos) == ("resumen nuevo", 10)
+
+    def test_racing_first_summaries_keep_the_one_further_ahead(self, client, auth_headers, db_session, monkeypatch):
+        chat_id = client.post("/api/v1/chats", headers=auth_headers).json()["id_chat"]
+        late = sessionmaker(bind=db_session.get_bind())()
+        lookups = []
+
+        def get_before_other_insert(entity, ident, **kwargs):
+            # The first lookup sees no summary, then another refresh stores its own
+            lookups.append(ident)
+            if len(lookups) == 1:
+                summary_repo.upsert(db_session, chat_id, "resumen 1", 4, 4)
+                return None
+            return type(late).get(late, entity, ident, **kwargs)
+
+        monkeypatch.setattr(late, "get", get_before_other_insert)
+        try:
+            summary = summary_repo.upsert(late, chat_id, "resumen 2", 8, 8)
+            assert (summary.contenido, summary.mensajes_resumidos) == ("resumen 2", 8)
+        finally:
+            late.close()
+        db_session.expire_all()
+        assert db_session.get(ChatSummary, chat_id).mensajes_resumidos == 8
+
+    def test_overlapping_background_refresh_is_skipped(self, client, auth_headers, db_session, summary_settings):
+        chat_id = client.post("/api/v1/chats", headers=auth_headers).json()["id_chat"]
+        _add_messages(db_session, chat_id, 0, 10)
+
+        with summary_locks.try_hold(chat_id) as held:
+            assert held
+            summary_service.refresh_in_background(chat_id)
+        assert summary_settings == []
@@ -1,14 +1,13 @@
-import { ref, watch, nextTick, onMounted } from 'vue';
+import { ref, watch, nextTick, onMounted, onUnmounted } from 'vue';
 import {
-  createChat,
-  initializeChat,
+  startChat,
   getAiReply,
   getChatDetails,
   getChatMessages,
-  updateChatTitle,
   generateDocument,
 } from '../services/chatService';
 import { chatState } from '../services/chatState';
+import { openInterviewSocket } from '../services/interviewSocket';
 import {
   showInterviewFinishedAlert,
   showCompletionPrompt,
@@ -45,12 +44,40 @@ export function useChatInterface(props) {
   const chatTitle = ref('Nuevo Chat');
   /** @type {boolean} */
   const isTextareaFocused = ref(false);
+  /** @type {object|null} Canal WebSocket del chat activo (no reactivo). */
+  let interviewSocket = null;
+
+  /**
+   * @description Cierra el canal WebSocket del chat activo, si lo hay.
+   */
+  const closeInterviewSocket = () => {
+    if (interviewSocket) {
+      interviewSocket.close();
+      interviewSocket = null;
+    }
+  };
+
+  /**
+   * @description Devuelve el canal WebSocket del chat activo, abriéndolo si hace falta.
+   * @returns {Promise<object|null>} El canal, o null si no se puede abrir (se usará la API HTTP).
+   */
+  const getInterviewSocket = async () => {
+    if (interviewSocket && interviewSocket.isOpen()) return interviewSocket;
+    try {
+      interviewSocket = await openInterviewSocket(chatId.value);
+    } catch (err) {
+      console.warn('Canal WebSocket no disponible, se usará la API HTTP:', err);
+      interviewSocket = null;
+    }
+    return interviewSocket;
+  };
 
   /**
    * @description Carga el historial de mensajes de un chat existente.
    * @param {number} existingChatId - El ID del chat a cargar.
    */
   const loadExistingChat = async (existingChatId) => {
+    closeInterviewSocket();
     loading.value = true;
     error.value = '';
     conversation.value = [];
@@ -85,6 +112,7 @@ export function useChatInterface(props) {
    * @description Inicia una nueva conversación desde cero, creando un nuevo chat y asignándole un título.
    */
   const startNewChat = async () => {
+    closeInterviewSocket();
     loading.value = true;
     error.value = '';
     conversation.value = [];
@@ -94,22 +122,18 @@ export function useChatInterface(props) {
     sessionStorage.removeItem('activeChatId');
 
     try {
-      const createResponse = await createChat();
-      const newChatId = createResponse.data.id_chat;
-      chatId.value = newChatId;
-      sessionStorage.setItem('activeChatId', newChatId);
-
       const now = new Date();
       const date = now.toLocaleDateString('es-ES');
       const time = now.toLocaleTimeString('es-ES', { hour: '2-digit', minute: '2-digit' });
       const userName = props.userData?.nombre || 'Usuario';
       const newTitle = `${userName} - ${date} ${time}`;
 
-      await updateChatTitle(newChatId, newTitle);
-      chatTitle.value = newTitle;
-
-      const initResponse = await initializeChat(newChatId);
-      const initialMessage = initResponse.data;
+      const startResponse = await startChat(newTitle);
+      const { chat, greeting: initialMessage } = startResponse.data;
+      chatId.value = chat.id_chat;
+      sessionStorage.setItem('activeChatId', chat.id_chat);
+      chatTitle.value = chat.title;
+      chatStatus.value = chat.status;
 
       conversation.value.push({
         id: initialMessage.id_mensaje || Date.now(),
@@ -117,9 +141,6 @@ export function useChatInterface(props) {
         sender: 'ai'
       });
 
-      const details = await getChatDetails(newChatId);
-      chatStatus.value = details.data.status;
-
     } catch (err) {
       error.value = 'No se pudo iniciar una nueva conversación con la IA.';
       console.error('Error al inicializar el chat:', err);
@@ -212,16 +233,34 @@ export function useChatInterface(props) {
     loading.value = true;
     error.value = '';
 
+    let streamingEntry = null;
     try {
-      const replyResponse = await getAiReply(chatId.value, userMessage);
-      conversation.value.push({
-        id: Date.now() + 1,
-        parts: processAiMessage(replyResponse.data.contenido),
-        sender: 'ai'
-      });
+      const socket = await getInterviewSocket();
 
-      const details = await getChatDetails(chatId.value);
-      chatStatus.value = details.data.status;
+      if (socket) {
+        // La respuesta se va pintando según llegan los fragmentos y se sustituye por el mensaje guardado al final
+        conversation.value.push({ id: Date.now() + 1, parts: [], sender: 'ai' });
+        streamingEntry = conversation.value[conversation.value.length - 1];
+        let streamedText = '';
+        const reply = await socket.sendMessage(userMessage, (chunk) => {
+          streamedText += chunk;
+          streamingEntry.parts = processAiMessage(streamedText);
+        });
+        streamingEntry.id = reply.message.id_mensaje;
+        streamingEntry.parts = processAiMessage(reply.message.contenido);
+        streamingEntry = null;
+        if (reply.completed) chatStatus.value = 'completed';
+      } else {
+        const replyResponse = await getAiReply(chatId.value, userMessage);
+        conversation.value.push({
+          id: Date.now() + 1,
+          parts: processAiMessage(replyResponse.data.contenido),
+          sender: 'ai'
+        });
+
+        const details = await getChatDetails(chatId.value);
+        chatStatus.value = details.data.status;
+      }
 
       if (chatStatus.value === 'completed') {
         const result = await showCompletionPrompt();
@@ -232,6 +271,9 @@ export function useChatInterface(props) {
       }
 
     } catch (err) {
+      if (streamingEntry) {
+        conversation.value = conversation.value.filter(entry => entry !== streamingEntry);
+      }
       error.value = 'Ha ocurrido un error al contactar con la IA.';
       console.error('Error en la llamada al chat:', err);
     } finally {
@@ -239,6 +281,11 @@ export function useChatInterface(props) {
     }
   };
 
+  /**
+   * @description Cierra el canal WebSocket al desmontar el componente.
+   */
+  onUnmounted(closeInterviewSocket);
+
   /**
    * @description Maneja el evento de pulsar una tecla en el textarea, enviando el mensaje con Enter.
    * @param {KeyboardEvent} event - El evento del teclado.
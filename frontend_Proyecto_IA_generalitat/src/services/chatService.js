@@ -8,6 +8,15 @@ export const createChat = () => {
   return apiClient.post('/api/v1/chats');
 };
 
+/**
+ * Inicia una nueva entrevista: crea el chat con su título y el saludo inicial de la IA en una sola petición.
+ * @param {string} title - El título del nuevo chat.
+ * @returns {Promise<object>} Una promesa que se resuelve con la respuesta de la API, con el chat (`chat`) y el primer mensaje de la IA (`greeting`).
+ */
+export const startChat = (title) => {
+  return apiClient.post('/api/v1/chats/start', { title });
+};
+
 /**
  * Inicializa la conversación con la IA para un chat recién creado.
  * @param {number} chatId - El ID del chat a inicializar.
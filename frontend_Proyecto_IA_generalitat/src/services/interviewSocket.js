@@ -0,0 +1,60 @@
+import apiClient from './api';
+import { getToken } from './authService';
+
+/**
+ * Abre el canal WebSocket de una entrevista. El token se envía en el primer mensaje (no en la URL, para que no
+ * quede en los logs) y el servidor lo valida junto con el chat una sola vez; después cada turno viaja por la
+ * misma conexión y la respuesta de la IA llega por fragmentos.
+ * @param {number} chatId - El ID del chat.
+ * @returns {Promise<object>} Una promesa que se resuelve, cuando el servidor acepta la conexión, con un objeto
+ * con `sendMessage(message, onChunk)` y `close()`. Se rechaza si la conexión no se puede establecer.
+ */
+export const openInterviewSocket = (chatId) => {
+  const baseURL = apiClient.defaults.baseURL.replace(/^http/, 'ws');
+  const socket = new WebSocket(`${baseURL}/api/v1/ai/ws/${chatId}`);
+  /** @type {{onChunk: Function, resolve: Function, reject: Function}|null} */
+  let turn = null;
+
+  return new Promise((resolveOpen, rejectOpen) => {
+    socket.onopen = () => socket.send(JSON.stringify({ type: 'auth', token: getToken() }));
+
+    socket.onmessage = (event) => {
+      const data = JSON.parse(event.data);
+      if (data.type === 'ready') {
+        resolveOpen({ sendMessage, close: () => socket.close(), isOpen: () => socket.readyState === WebSocket.OPEN });
+        return;
+      }
+      if (!turn) return;
+      if (data.type === 'chunk') {
+        turn.onChunk(data.contenido);
+      } else if (data.type === 'message') {
+        turn.resolve({ message: data.message, completed: data.completed });
+        turn = null;
+      } else if (data.type === 'error') {
+        turn.reject(Object.assign(new Error(String(data.detail)), { status: data.status }));
+        turn = null;
+      }
+    };
+
+    socket.onclose = () => {
+      rejectOpen(new Error('No se pudo abrir el canal de la entrevista.'));
+      if (turn) {
+        turn.reject(new Error('Se ha cerrado la conexión con la entrevista.'));
+        turn = null;
+      }
+    };
+  });
+
+  /**
+   * Envía un mensaje del usuario y espera a que el turno termine.
+   * @param {string} message - El mensaje del usuario.
+   * @param {Function} onChunk - Se llama con cada fragmento de la respuesta de la IA según llega.
+   * @returns {Promise<object>} Una promesa que se resuelve con el mensaje de la IA (`message`) y si la entrevista ha finalizado (`completed`).
+   */
+  function sendMessage(message, onChunk) {
+    return new Promise((resolve, reject) => {
+      turn = { onChunk, resolve, reject };
+      socket.send(JSON.stringify({ type: 'message', contenido: message }));
+    });
+  }
+};